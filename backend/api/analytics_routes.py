@@ -1164,6 +1164,8 @@ async def get_provider_overview(
     - Average costs
     - Response times
     - Quality scores
+    - LLM response cache savings
+    - Vision payload bytes saved by downscaling
 
     **Admin only**
     """
@@ -1182,12 +1184,20 @@ async def get_provider_overview(
         # Get fallback statistics
         fallback_stats = metrics_service.get_fallback_statistics(days=days)
 
+        # Get LLM response cache savings
+        cache_savings = metrics_service.get_cache_savings(days=days)
+
+        # Get vision payload size reduction
+        payload_savings = metrics_service.get_payload_savings(days=days)
+
         return {
             "success": True,
             "period_days": days,
             "provider_comparison": comparison,
             "success_rates": success_rates,
             "fallback_statistics": fallback_stats,
+            "cache_savings": cache_savings,
+            "payload_savings": payload_savings,
             "generated_at": datetime.now().isoformat()
         }
 
@@ -2,7 +2,7 @@
 Chapter API routes for generation and management
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
@@ -135,6 +135,7 @@ class SectionResponse(BaseModel):
     regeneration_status: Optional[str] = None
     version: str
     cost_usd: Optional[float] = None
+    saved_work: Optional[Dict[str, Any]] = None
     updated_at: str
 
 
@@ -864,6 +865,35 @@ async def regenerate_chapter(
     return ChapterResponse(**new_chapter.to_dict())
 
 
+@router.post(
+    "/{chapter_id}/resume",
+    response_model=ChapterResponse,
+    summary="Resume chapter generation",
+    description="Continue an interrupted or failed generation from its first incomplete stage"
+)
+async def resume_chapter(
+    chapter_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> ChapterResponse:
+    """
+    Resume chapter generation
+
+    Completed stages and sections are reused from checkpoints.
+    Requires authentication.
+    """
+    chapter_service = ChapterService(db)
+
+    chapter = await chapter_service.resume_chapter(
+        chapter_id=chapter_id,
+        user=current_user
+    )
+
+    logger.info(f"Chapter generation resumed by user {current_user.email}: {chapter.id}")
+
+    return ChapterResponse(**chapter.to_dict())
+
+
 @router.patch(
     "/{chapter_id}/sections/{section_number}",
     response_model=SectionResponse,
@@ -918,6 +948,8 @@ async def edit_section(
     This operation:
     - Reuses existing research data (stages 3-5)
     - Only re-runs stage 6 for the target section
+    - Recomputes only that section's images, citations, fact-check claims
+      and formatting (reported in `saved_work`)
     - Creates a new version automatically
     - Cost: ~$0.08 (84% savings vs full regeneration)
     - Time: ~10-20 seconds
@@ -956,6 +988,7 @@ async def regenerate_section(
         updated_content=result.get("new_content"),
         version=result["version"],
         cost_usd=result.get("cost_usd"),
+        saved_work=result.get("saved_work"),
         updated_at=result["updated_at"]
     )
 
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from typing import Dict, Any, List
 
 from backend.services.circuit_breaker import circuit_breaker_manager
+from backend.services.llm_scheduler import llm_scheduler
 from backend.utils import get_logger, get_current_admin_user
 from backend.database import User
 
@@ -80,6 +81,24 @@ async def get_circuit_breaker_status() -> CircuitBreakerStatusResponse:
         )
 
 
+@router.get(
+    "/scheduler",
+    summary="Get LLM request scheduler queueing metrics",
+    description="""
+    Returns admission counts and queueing delay (avg/p95/max) per provider
+    and priority (interactive/batch) for this process, plus how often each
+    provider still returned 429.
+    """
+)
+async def get_llm_scheduler_stats() -> Dict[str, Any]:
+    """
+    Get LLM scheduler statistics
+
+    No authentication required (monitoring endpoint)
+    """
+    return llm_scheduler.stats()
+
+
 @router.get(
     "/{provider}/status",
     summary="Get circuit breaker status for specific provider",
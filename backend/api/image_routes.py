@@ -43,6 +43,7 @@ class DuplicateDetectionRequest(BaseModel):
     pdf_id: Optional[str] = Field(default=None, description="Optional PDF ID to limit scope")
     similarity_threshold: float = Field(default=0.95, ge=0.8, le=1.0, description="Similarity threshold")
     mark_duplicates: bool = Field(default=True, description="Whether to mark duplicates in database")
+    strategy: str = Field(default="matrix", pattern="^(matrix|knn)$", description="Neighbor search: exact blocked matrix or HNSW k-NN")
 
 
 # ==================== IMAGE RECOMMENDATIONS ====================
@@ -216,6 +217,7 @@ async def detect_duplicates(
     - **pdf_id**: Optional PDF ID to limit detection scope
     - **similarity_threshold**: Threshold for considering images as duplicates (0.8-1.0)
     - **mark_duplicates**: Whether to mark duplicates in database
+    - **strategy**: "matrix" (exact) or "knn" (pgvector index, for very large collections)
 
     **Returns:**
     - Detection results with duplicate groups and statistics
@@ -228,7 +230,8 @@ async def detect_duplicates(
         results = await service.detect_duplicates(
             pdf_id=request.pdf_id,
             similarity_threshold=request.similarity_threshold,
-            mark_duplicates=request.mark_duplicates
+            mark_duplicates=request.mark_duplicates,
+            strategy=request.strategy
         )
 
         logger.info(f"Duplicate detection complete: {results.get('duplicate_groups', 0)} groups found")
@@ -50,7 +50,7 @@ class SuggestionsRequest(BaseModel):
 class RelatedContentRequest(BaseModel):
     """Related content request"""
     content_id: str
-    content_type: str = Field(..., pattern="^(chapter|pdf)$")
+    content_type: str = Field(..., pattern="^(chapter|pdf|pdf_chapter)$")
     max_results: int = Field(default=5, ge=1, le=20)
 
 
@@ -3,10 +3,9 @@ Textbook/Chapter Upload API Routes
 Phase 5: Chapter-Level Vector Search Upload Infrastructure
 """
 
-import io
-import re
+import os
 from typing import List, Optional
-from fastapi import APIRouter, Depends, UploadFile, File, Query, status, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Query, Response, status, HTTPException
 from pydantic import BaseModel, Field, validator
 from sqlalchemy.orm import Session
 from sqlalchemy import func
@@ -14,17 +13,26 @@ import uuid as uuid_module
 from datetime import datetime
 
 from backend.database import get_db, User
-from backend.services.textbook_processor import TextbookProcessorService
 from backend.services.chapter_embedding_service import (
-    generate_chapter_embeddings,
     generate_chunk_embeddings,
     get_embedding_progress
 )
-from backend.services.chapter_vector_search_service import check_for_duplicates
 from backend.services.title_extraction_tasks import extract_title_from_cover, batch_extract_titles
-from backend.services.background_tasks import extract_images_task, analyze_images_task
+from backend.services.background_tasks import analyze_images_task
+from backend.services.blob_store import BlobStore
+from backend.services.pdf_service import PDFService
+from backend.services.storage_service import StorageService
+from backend.services.task_service import TaskService
+from backend.services.textbook_ingestion_tasks import ingest_textbook_upload
+from backend.services.upload_ingestion import (
+    UploadRejectedError,
+    claim_inflight_upload,
+    find_ingested_book,
+    release_inflight_upload,
+    stream_upload_to_disk
+)
 from backend.utils import get_logger, get_current_active_user
-from backend.database.models import PDFBook, PDFChapter, PDFChunk, PDF
+from backend.database.models import PDF, PDFBook, PDFChapter, PDFChunk
 
 logger = get_logger(__name__)
 
@@ -134,25 +142,23 @@ class BookResponse(BaseModel):
 
 
 class UploadResponse(BaseModel):
-    """Response model for upload operations"""
-    status: str
+    """Response model for an accepted upload (processing continues in a worker)"""
+    status: str  # accepted | duplicate
     message: str
-    book_id: str
-    chapters_created: int
-    pdf_type: str
-    total_pages: int
-    embedding_tasks_queued: int
+    job_id: Optional[str] = None
+    book_id: Optional[str] = None
+    content_sha256: str
+    file_size_bytes: int
 
     class Config:
         json_schema_extra = {
             "example": {
-                "status": "success",
-                "message": "PDF uploaded and processed successfully",
-                "book_id": "456e7890-e89b-12d3-a456-426614174000",
-                "chapters_created": 25,
-                "pdf_type": "textbook",
-                "total_pages": 850,
-                "embedding_tasks_queued": 25
+                "status": "accepted",
+                "message": "Upload received, processing started",
+                "job_id": "9b2f6c1e-5a0d-4b7e-8f3a-2c1d0e9f8a7b",
+                "book_id": None,
+                "content_sha256": "3f786850e387550fdab836ed7e6dc881de23001b...",
+                "file_size_bytes": 52428800
             }
         }
 
@@ -162,31 +168,54 @@ class BatchUploadResponse(BaseModel):
     status: str
     message: str
     total_files: int
-    successful_uploads: int
+    accepted_uploads: int
+    duplicate_uploads: int
     failed_uploads: int
-    books_created: List[str]
-    total_chapters_created: int
-    total_embedding_tasks_queued: int
+    uploads: List[UploadResponse]
     failures: Optional[List[dict]] = None
 
     class Config:
         json_schema_extra = {
             "example": {
-                "status": "completed",
-                "message": "Batch upload completed with 8/10 successful uploads",
+                "status": "accepted",
+                "message": "Batch upload accepted: 8 queued, 1 duplicate, 1 failed",
                 "total_files": 10,
-                "successful_uploads": 8,
-                "failed_uploads": 2,
-                "books_created": ["uuid1", "uuid2", "uuid3"],
-                "total_chapters_created": 150,
-                "total_embedding_tasks_queued": 150,
+                "accepted_uploads": 8,
+                "duplicate_uploads": 1,
+                "failed_uploads": 1,
+                "uploads": [],
                 "failures": [
-                    {"filename": "corrupt.pdf", "error": "Invalid PDF format"}
+                    {"filename": "corrupt.pdf", "error": "File is not a valid PDF"}
                 ]
             }
         }
 
 
+class UploadJobResponse(BaseModel):
+    """Response model for an upload ingestion job"""
+    job_id: str
+    status: str  # queued | processing | completed | failed
+    progress: int
+    book_id: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "9b2f6c1e-5a0d-4b7e-8f3a-2c1d0e9f8a7b",
+                "status": "processing",
+                "progress": 45,
+                "book_id": None,
+                "result": None,
+                "error": None
+            }
+        }
+
+
 class UploadProgressResponse(BaseModel):
     """Response model for upload progress"""
     book_id: str
@@ -262,15 +291,108 @@ class TitleUpdateRequest(BaseModel):
 
 # ==================== Upload Routes ====================
 
+async def _accept_upload(
+    file: UploadFile,
+    current_user: User,
+    db: Session,
+    storage: StorageService
+) -> UploadResponse:
+    """
+    Stream an upload to storage and queue its ingestion job
+
+    Identical content is not processed twice: an existing book is returned
+    as a duplicate, and an upload already being ingested returns that job.
+
+    Raises:
+        UploadRejectedError: Invalid or oversized file
+    """
+    streamed = await stream_upload_to_disk(file, str(storage.upload_staging_path))
+
+    try:
+        existing_book = find_ingested_book(db, streamed.sha256)
+        if existing_book:
+            os.unlink(streamed.path)
+            logger.info(f"Upload {file.filename} is identical to book {existing_book.id}, not reprocessed")
+            return UploadResponse(
+                status="duplicate",
+                message="Identical file already uploaded",
+                book_id=str(existing_book.id),
+                content_sha256=streamed.sha256,
+                file_size_bytes=streamed.size_bytes
+            )
+
+        job_id = str(uuid_module.uuid4())
+        running_job = claim_inflight_upload(streamed.sha256, job_id)
+        if running_job:
+            os.unlink(streamed.path)
+            logger.info(f"Upload {file.filename} is identical to in-flight job {running_job}")
+            return UploadResponse(
+                status="duplicate",
+                message="Identical file is already being processed",
+                job_id=running_job,
+                content_sha256=streamed.sha256,
+                file_size_bytes=streamed.size_bytes
+            )
+    except Exception:
+        if os.path.exists(streamed.path):
+            os.unlink(streamed.path)
+        raise
+
+    try:
+        # Registered before the file is stored so garbage collection cannot
+        # remove an identical, unreferenced copy underneath this upload
+        BlobStore(db).register("pdf", [(
+            streamed.sha256,
+            storage.content_path(storage.pdf_storage_path, streamed.sha256, ".pdf"),
+            streamed.size_bytes
+        )])
+        db.commit()
+        stored = storage.store_staged_pdf(streamed.path, streamed.original_filename, streamed.sha256)
+        TaskService(db).create_task(
+            task_id=job_id,
+            task_type="textbook_ingestion",
+            user=current_user,
+            entity_type="pdf_book",
+            total_steps=3
+        )
+        ingest_textbook_upload.apply_async(
+            kwargs={
+                "file_path": stored["file_path"],
+                "original_filename": streamed.original_filename,
+                "content_sha256": streamed.sha256,
+                "file_size_bytes": streamed.size_bytes,
+                "uploaded_by": str(current_user.id)
+            },
+            task_id=job_id
+        )
+    except Exception:
+        release_inflight_upload(streamed.sha256)
+        if os.path.exists(streamed.path):
+            os.unlink(streamed.path)
+        raise
+
+    logger.info(f"Upload {file.filename} stored ({streamed.size_bytes} bytes), ingestion job {job_id} queued")
+
+    return UploadResponse(
+        status="accepted",
+        message="Upload received, processing started",
+        job_id=job_id,
+        content_sha256=streamed.sha256,
+        file_size_bytes=streamed.size_bytes
+    )
+
+
 @router.post(
     "/upload",
     response_model=UploadResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Upload a textbook or chapter PDF",
     description="""
     Upload a PDF (textbook, standalone chapter, or research paper) for chapter-level processing.
 
-    The system will:
+    The file is streamed to storage and a background job is queued; the
+    response carries the job id (poll GET /textbooks/upload-jobs/{job_id}).
+    The job will:
     1. Classify the PDF (textbook/chapter/paper)
     2. Detect and extract chapters (3-tier detection: TOC/Pattern/Heading)
     3. Create PDFBook and PDFChapter records
@@ -279,211 +401,53 @@ class TitleUpdateRequest(BaseModel):
        - Chunk generation (for long chapters >4000 words)
        - Duplicate detection (>95% similarity threshold)
 
+    A file identical to an existing book returns 200 with that book's id.
+
     Maximum file size: 100MB
     Supported formats: PDF
     """
 )
 async def upload_textbook(
+    response: Response,
     file: UploadFile = File(..., description="PDF file to upload (textbook/chapter/paper)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> UploadResponse:
     """
-    Upload PDF and process into chapters with automatic embedding generation
-
-    Workflow:
-    1. Save file to storage
-    2. Classify PDF type
-    3. Detect chapters
-    4. Extract chapter content
-    5. Queue Celery tasks for embeddings
+    Accept a PDF upload for background processing
 
     Requires authentication.
     """
     logger.info(f"Textbook upload started by user {current_user.email}: {file.filename}")
 
-    # Validate file
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(
-            status_code=400,
-            detail="Only PDF files are supported"
-        )
-
-    # Save file to storage
-    from backend.services.storage_service import StorageService
-    storage = StorageService()
-
     try:
-        file_content = await file.read()
-        storage_result = storage.save_pdf(
-            io.BytesIO(file_content),
-            file.filename
-        )
-        file_path = storage_result["file_path"]
-        original_filename = storage_result["original_filename"]
-
-        logger.info(f"PDF saved to storage: {file_path} (original: {original_filename})")
-
+        result = await _accept_upload(file, current_user, db, StorageService())
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to save PDF: {str(e)}", exc_info=True)
+        logger.error(f"Failed to accept upload {file.filename}: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to save PDF file: {str(e)}"
-        )
-
-    # Process PDF with TextbookProcessor
-    processor = TextbookProcessorService(db)
-
-    try:
-        result = processor.process_pdf(
-            file_path=file_path,
-            uploaded_by=current_user.id,
-            original_filename=original_filename
+            detail=f"Failed to accept upload: {str(e)}"
         )
 
-        book_id = result['book_id']
-        chapters_created = result['chapters_created']
-
-        logger.info(
-            f"PDF processed successfully: {chapters_created} chapters created "
-            f"for book {book_id}"
-        )
-
-        # Get book record (used for both image extraction and title extraction)
-        book = db.query(PDFBook).filter(
-            PDFBook.id == uuid_module.UUID(book_id)
-        ).first()
-
-        # ========== IMAGE EXTRACTION INTEGRATION ==========
-        # Create pdfs table entry to enable image extraction pipeline
-        # (Fixes architecture gap where textbooks bypass image extraction)
-        if book:
-            try:
-                # Create pdfs table record
-                pdf_record = PDF(
-                    id=uuid_module.uuid4(),
-                    file_path=file_path,
-                    filename=original_filename,
-                    file_size_bytes=len(file_content),
-                    indexing_status="pending",  # Valid status: will transition to extracting_images
-                    text_extracted=True  # Text already extracted by textbook processor
-                )
-                db.add(pdf_record)
-                db.flush()  # Get pdf_record.id without committing
-
-                # Link book to pdf record (enables image lookup)
-                book.pdf_id = pdf_record.id
-                db.commit()
-
-                logger.info(
-                    f"Created pdfs record {pdf_record.id} for book {book_id}, "
-                    f"queuing image extraction pipeline"
-                )
-
-                # Queue image extraction tasks
-                # Chain: extract_images → analyze_images (Claude Vision)
-                extract_images_task.delay(str(pdf_record.id))
-
-                logger.info(
-                    f"Queued image extraction pipeline for PDF {pdf_record.id} "
-                    f"(book: {book.title})"
-                )
-
-            except Exception as e:
-                logger.error(
-                    f"Failed to queue image extraction for book {book_id}: {str(e)}",
-                    exc_info=True
-                )
-                # Don't fail the entire upload if image extraction queueing fails
-                # Book and chapters are already created, images can be extracted later
-
-            # ========== END IMAGE EXTRACTION INTEGRATION ==========
-
-        # Queue Celery tasks for embedding generation
-        # Get all chapter IDs for this book
-        chapters = db.query(PDFChapter).filter(
-            PDFChapter.book_id == uuid_module.UUID(book_id)
-        ).all()
-
-        embedding_tasks_queued = 0
-        for chapter in chapters:
-            try:
-                # Queue chapter embedding generation
-                generate_chapter_embeddings.delay(str(chapter.id))
-                embedding_tasks_queued += 1
-
-                logger.debug(f"Queued embedding task for chapter {chapter.id}")
-
-            except Exception as e:
-                logger.error(f"Failed to queue embedding task for chapter {chapter.id}: {str(e)}")
-
-        # Queue deduplication check for each chapter (runs after embeddings)
-        for chapter in chapters:
-            try:
-                # Deduplication runs after embedding generation
-                check_for_duplicates.delay(str(chapter.id))
-                logger.debug(f"Queued deduplication task for chapter {chapter.id}")
-
-            except Exception as e:
-                logger.error(f"Failed to queue deduplication task for chapter {chapter.id}: {str(e)}")
-
-        logger.info(
-            f"Upload complete: {embedding_tasks_queued} embedding tasks queued "
-            f"for book {book_id}"
-        )
-
-        # Auto-queue title extraction if book has UUID or generic title (Enhancement #2)
-        # Note: book variable already fetched above for image extraction
-        if book:
-            title = book.title
-            # Check if title is a UUID (8-4-4-4-12 pattern) or generic placeholder
-            is_uuid_title = re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', title.lower())
-            is_placeholder = title in [
-                "Untitled Book - Please Edit",
-                "Untitled Book",
-                "Unknown",
-                original_filename,  # Sometimes filename is used as title
-            ]
-
-            if is_uuid_title or is_placeholder:
-                try:
-                    extract_title_from_cover.delay(str(book_id), auto_apply_threshold=0.8)
-                    logger.info(
-                        f"Auto-queued title extraction for book {book_id} "
-                        f"(current title: '{title}')"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to queue title extraction for book {book_id}: {str(e)}")
-
-        return UploadResponse(
-            status="success",
-            message=f"PDF uploaded and {chapters_created} chapters extracted. Background processing started.",
-            book_id=book_id,
-            chapters_created=chapters_created,
-            pdf_type=result['pdf_type'],
-            total_pages=result['total_pages'],
-            embedding_tasks_queued=embedding_tasks_queued
-        )
-
-    except Exception as e:
-        logger.error(f"PDF processing failed: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"PDF processing failed: {str(e)}"
-        )
+    if result.book_id:
+        response.status_code = status.HTTP_200_OK
+    return result
 
 
 @router.post(
     "/batch-upload",
     response_model=BatchUploadResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Upload multiple PDFs in batch",
     description="""
     Upload multiple PDF files in a single request for batch processing.
 
-    Each PDF will be processed independently:
-    - Successful uploads will be processed normally
-    - Failed uploads will be reported but won't block others
+    Each PDF is streamed to storage and gets its own background job:
+    - Accepted uploads are processed independently
+    - Identical files (to each other or to existing books) are processed once
+    - Rejected files are reported but won't block others
 
     Maximum: 50 files per batch
     Maximum file size: 100MB per file
@@ -495,10 +459,9 @@ async def batch_upload_textbooks(
     db: Session = Depends(get_db)
 ) -> BatchUploadResponse:
     """
-    Upload multiple PDFs in batch
+    Accept multiple PDFs for background processing
 
-    Each file is processed independently.
-    Returns summary of successes and failures.
+    Returns one entry per accepted or duplicate file and the failures.
 
     Requires authentication.
     """
@@ -510,81 +473,86 @@ async def batch_upload_textbooks(
             detail="Maximum 50 files per batch upload"
         )
 
-    successful_uploads = 0
-    failed_uploads = 0
-    books_created = []
-    total_chapters_created = 0
-    total_embedding_tasks_queued = 0
-    failures = []
-
     storage = StorageService()
-    processor = TextbookProcessorService(db)
+    uploads = []
+    failures = []
 
     for file in files:
         try:
-            # Validate file
-            if not file.filename.lower().endswith('.pdf'):
-                raise ValueError("Only PDF files are supported")
-
-            # Save file
-            file_content = await file.read()
-            storage_result = storage.save_pdf(io.BytesIO(file_content), file.filename)
-            file_path = storage_result["file_path"]
-            original_filename = storage_result["original_filename"]
-
-            # Process PDF
-            result = processor.process_pdf(
-                file_path=file_path,
-                uploaded_by=current_user.id,
-                original_filename=original_filename
-            )
-
-            book_id = result['book_id']
-            chapters_created = result['chapters_created']
-
-            # Queue embedding tasks
-            chapters = db.query(PDFChapter).filter(
-                PDFChapter.book_id == uuid_module.UUID(book_id)
-            ).all()
-
-            for chapter in chapters:
-                generate_chapter_embeddings.delay(str(chapter.id))
-                check_for_duplicates.delay(str(chapter.id))
-
-            successful_uploads += 1
-            books_created.append(book_id)
-            total_chapters_created += chapters_created
-            total_embedding_tasks_queued += len(chapters)
-
-            logger.info(f"Batch upload: {file.filename} processed successfully ({chapters_created} chapters)")
-
+            uploads.append(await _accept_upload(file, current_user, db, storage))
         except Exception as e:
-            failed_uploads += 1
             failures.append({
                 "filename": file.filename,
                 "error": str(e)
             })
             logger.error(f"Batch upload: {file.filename} failed: {str(e)}")
 
+    accepted = sum(1 for u in uploads if u.status == "accepted")
+    duplicates = len(uploads) - accepted
+
     logger.info(
-        f"Batch upload complete: {successful_uploads}/{len(files)} successful, "
-        f"{total_chapters_created} total chapters, "
-        f"{total_embedding_tasks_queued} embedding tasks queued"
+        f"Batch upload accepted: {accepted}/{len(files)} queued, "
+        f"{duplicates} duplicates, {len(failures)} failed"
     )
 
     return BatchUploadResponse(
-        status="completed",
-        message=f"Batch upload completed with {successful_uploads}/{len(files)} successful uploads",
+        status="accepted",
+        message=f"Batch upload accepted: {accepted} queued, {duplicates} duplicate, {len(failures)} failed",
         total_files=len(files),
-        successful_uploads=successful_uploads,
-        failed_uploads=failed_uploads,
-        books_created=books_created,
-        total_chapters_created=total_chapters_created,
-        total_embedding_tasks_queued=total_embedding_tasks_queued,
+        accepted_uploads=accepted,
+        duplicate_uploads=duplicates,
+        failed_uploads=len(failures),
+        uploads=uploads,
         failures=failures if failures else None
     )
 
 
+@router.get(
+    "/upload-jobs/{job_id}",
+    response_model=UploadJobResponse,
+    summary="Get progress of an upload ingestion job",
+    description="""
+    Progress of the background job queued by /upload or /batch-upload.
+
+    Once completed, book_id and the result (chapters created, PDF type,
+    pages) are set; chapter embedding progress is then available from
+    /textbooks/upload-progress/{book_id}.
+    """
+)
+async def get_upload_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> UploadJobResponse:
+    """
+    Get upload ingestion job status
+
+    Requires authentication.
+    """
+    task = TaskService(db).get_task(job_id)
+    if task.task_type != "textbook_ingestion":
+        raise HTTPException(status_code=404, detail=f"Upload job not found: {job_id}")
+
+    if not current_user.is_admin and str(task.created_by) != str(current_user.id):
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to access this upload job"
+        )
+
+    task_data = task.to_dict()
+    return UploadJobResponse(
+        job_id=job_id,
+        status=task_data["status"],
+        progress=task_data["progress"] or 0,
+        book_id=(task_data["result"] or {}).get("book_id"),
+        result=task_data["result"],
+        error=task_data["error"],
+        created_at=task_data["created_at"],
+        started_at=task_data["started_at"],
+        completed_at=task_data["completed_at"]
+    )
+
+
 # ==================== Progress Monitoring Routes ====================
 
 @router.get(
@@ -974,11 +942,16 @@ async def get_similar_chapters(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid chapter ID format")
 
-    chapter = db.query(PDFChapter).filter(PDFChapter.id == chapter_uuid).first()
+    # Project only what the response needs (skip extracted_text / embedding payloads)
+    chapter = db.query(
+        PDFChapter.id,
+        PDFChapter.chapter_title,
+        PDFChapter.embedding.isnot(None).label("has_embedding")
+    ).filter(PDFChapter.id == chapter_uuid).first()
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
-    if chapter.embedding is None:
+    if not chapter.has_embedding:
         raise HTTPException(status_code=400, detail="Chapter does not have an embedding yet")
 
     # Use vector search service to find similar chapters
@@ -1025,7 +998,8 @@ async def delete_book(
     1. Delete all chapters belonging to this book
     2. Delete all chunks belonging to those chapters
     3. Delete the book record
-    4. Delete the PDF file from storage (optional)
+    4. Delete the linked PDF record and its extracted images
+    5. Release the stored files (deleted once nothing else references them)
 
     Requires authentication.
     """
@@ -1051,27 +1025,39 @@ async def delete_book(
     # Delete all chapters
     db.query(PDFChapter).filter(PDFChapter.book_id == book_uuid).delete(synchronize_session=False)
 
-    # Delete book
+    # Delete book (a content-addressed file is shared: release its reference instead)
     file_path = book.file_path
+    content_sha256 = book.content_sha256
+    pdf = db.query(PDF).filter(PDF.id == book.pdf_id).first() if book.pdf_id else None
+    BlobStore(db).release([content_sha256])
     db.delete(book)
+
+    # The pdfs record created for image extraction holds its own references
+    # (file and images); it goes with the book
+    images_deleted = 0
+    if pdf:
+        db.flush()
+        images_deleted = PDFService(db).delete_pdf_records(pdf)
     db.commit()
 
-    # Optionally delete file from storage
-    try:
-        from backend.services.storage_service import StorageService
-        storage = StorageService()
-        storage.delete_pdf(file_path)
-        logger.info(f"Deleted PDF file: {file_path}")
-    except Exception as e:
-        logger.warning(f"Failed to delete PDF file {file_path}: {str(e)}")
+    # Files stored before content addressing are deleted directly
+    # (the linked PDF record already deleted the file it shares with the book)
+    if not content_sha256 and not (pdf and pdf.file_path == file_path):
+        try:
+            storage = StorageService()
+            storage.delete_pdf(file_path)
+            logger.info(f"Deleted PDF file: {file_path}")
+        except Exception as e:
+            logger.warning(f"Failed to delete PDF file {file_path}: {str(e)}")
 
-    logger.info(f"Deleted book {book_id} and {chapter_count} chapters")
+    logger.info(f"Deleted book {book_id}, {chapter_count} chapters and {images_deleted} images")
 
     return {
         "status": "success",
         "message": f"Book deleted successfully",
         "book_id": book_id,
-        "chapters_deleted": chapter_count
+        "chapters_deleted": chapter_count,
+        "images_deleted": images_deleted
     }
 
 
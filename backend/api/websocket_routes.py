@@ -9,6 +9,7 @@ import asyncio
 import json
 
 from backend.services.websocket_manager import manager
+from backend.services.generation_stream import generation_streams
 from backend.services.auth_service import AuthService
 from backend.utils import get_logger
 from backend.database import get_db
@@ -63,15 +64,22 @@ async def chapter_progress_websocket(
     websocket: WebSocket,
     chapter_id: str,
     token: str = Query(..., description="JWT access token"),
+    resume_from: Optional[int] = Query(None, ge=0, description="Last section stream seq applied"),
     db: Session = Depends(get_db)
 ):
     """
     WebSocket endpoint for real-time chapter generation progress
 
-    Sends updates for all 14 stages of chapter generation.
+    Sends updates for all 14 stages of chapter generation, plus section
+    token streaming during stage 6.
 
     Query Parameters:
     - token: JWT access token for authentication
+    - resume_from: Last section stream `seq` the client applied (reconnects)
+
+    Client Messages:
+    - {"type": "resume", "seq": N}: replay stream events after seq N
+      (send when a gap in seq is detected)
 
     Events:
     - chapter_started: Generation started
@@ -79,6 +87,12 @@ async def chapter_progress_websocket(
     - chapter_stage_update: Stage changed
     - chapter_completed: Generation completed
     - chapter_failed: Generation failed
+    - section_stream_started / section_token / section_stream_completed:
+      Streamed section text (seq-ordered; token events carry the section offset)
+    - section_stream_snapshot: Full text so far, sent on resume when the
+      missed events are no longer buffered
+
+    Clients ignore stream events with seq <= the last seq they applied.
     """
     try:
         # Authenticate user
@@ -107,11 +121,16 @@ async def chapter_progress_websocket(
             }
         })
 
+        # Catch up a reconnecting client on streamed section text
+        if resume_from is not None:
+            for event in generation_streams.replay(chapter_id, resume_from):
+                await websocket.send_json(event)
+
         # Start heartbeat
         heartbeat_task = asyncio.create_task(manager.heartbeat_loop(websocket, interval=30))
 
         try:
-            # Listen for client messages (mainly for pong responses)
+            # Listen for client messages (pong responses and stream resumes)
             while True:
                 data = await websocket.receive_text()
                 message = json.loads(data)
@@ -121,6 +140,12 @@ async def chapter_progress_websocket(
                     logger.debug(f"Received pong from user {user.id}")
                     continue
 
+                # Handle stream resume (client detected a seq gap)
+                if message.get("type") == "resume":
+                    for event in generation_streams.replay(chapter_id, int(message.get("seq", 0))):
+                        await websocket.send_json(event)
+                    continue
+
                 # Handle disconnect request
                 if message.get("type") == "disconnect":
                     break
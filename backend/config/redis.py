@@ -235,6 +235,26 @@ class RedisManager:
             logger.error(f"Redis HSET failed: {str(e)}")
             return 0
 
+    def hset_many(
+        self,
+        name: str,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        serialize: str = "json"
+    ) -> bool:
+        """Set several hash fields (and the key's TTL) in one transaction"""
+        try:
+            client = self.get_client()
+            pipe = client.pipeline(transaction=True)
+            pipe.hset(name, mapping={k: self._serialize(v, method=serialize) for k, v in mapping.items()})
+            if ttl:
+                pipe.expire(name, ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis HSET (many) failed: {str(e)}")
+            return False
+
     def hget(self, name: str, key: str, deserialize: str = "json", default: Any = None) -> Any:
         """Get hash field"""
         try:
@@ -101,13 +101,84 @@ class Settings(BaseSettings):
     PRIMARY_SYNTHESIS_PROVIDER: str = "anthropic"
     SECONDARY_SYNTHESIS_PROVIDER: str = "openai"
 
+    # Vision payloads: images are downscaled to the providers' effective
+    # resolution and re-encoded within a byte budget before upload
+    VISION_MAX_LONG_EDGE: int = 1568
+    VISION_MAX_PIXELS: int = 1_150_000
+    VISION_PAYLOAD_MAX_BYTES: int = 1_000_000
+    VISION_PAYLOAD_CACHE_SIZE: int = 256  # Prepared payloads kept in-process (by content hash)
+
     # ==================== Chapter Generation Performance ====================
     # Parallel section generation (10x speedup: 11 min → 1 min for large chapters)
     PARALLEL_SECTION_GENERATION: bool = True
-    # Batch size for parallel generation (higher = faster but more memory)
+    # Initial number of sections in flight (sliding window, no batch barriers)
     # Conservative default: 5 sections at once (balances speed & API limits)
     # Aggressive: 10+ sections (for fast AI providers like Gemini)
     SECTION_GENERATION_BATCH_SIZE: int = 5
+    # Adaptive concurrency bounds: grows while healthy, halves on 429s,
+    # shrinks when a section takes longer than the latency target
+    SECTION_GENERATION_MIN_CONCURRENCY: int = 1
+    SECTION_GENERATION_MAX_CONCURRENCY: int = 10
+    SECTION_GENERATION_LATENCY_TARGET_SECONDS: float = 45.0
+    # Per-section retry with exponential backoff
+    SECTION_GENERATION_MAX_ATTEMPTS: int = 3
+    SECTION_GENERATION_RETRY_BASE_DELAY: float = 2.0
+    # Fact-checking: concurrent sections, per-section source subset, claim cache
+    FACT_CHECK_MAX_CONCURRENCY: int = 4
+    FACT_CHECK_SOURCES_PER_SECTION: int = 8
+    FACT_CHECK_CLAIM_CACHE_ENABLED: bool = True
+    FACT_CHECK_CLAIM_CACHE_TTL_SECONDS: int = 2592000  # 30 days
+    # Image integration (stage 7): global placement and concurrent cached captions
+    IMAGE_PLACEMENT_MIN_SIMILARITY: float = 0.3
+    IMAGE_CAPTION_MAX_CONCURRENCY: int = 5
+    IMAGE_CAPTION_CACHE_TTL_SECONDS: int = 2592000  # 30 days
+    # Source prompt compaction: deduped, relevance-ranked passages packed to a
+    # per-call token budget instead of raw source JSON
+    PROMPT_COMPACTION_ENABLED: bool = True
+    PROMPT_SECTION_SOURCE_TOKEN_BUDGET: int = 2500
+    PROMPT_SUBSECTION_SOURCE_TOKEN_BUDGET: int = 1200
+    PROMPT_PASSAGE_MAX_TOKENS: int = 160
+    PROMPT_PASSAGE_DEDUP_JACCARD: float = 0.7
+    PROMPT_PASSAGE_EMBEDDING_BATCH_SIZE: int = 128  # Outlines/passages per embeddings request
+    # Local tokenizer (tiktoken) for prompt budgets and embedding chunk sizes
+    TOKENIZER_ENCODING: str = "cl100k_base"
+
+    # LLM request scheduler: per-provider request/token budgets shared by all
+    # processes through Redis; Celery (batch) work queues behind interactive work
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_SCHEDULER_DISTRIBUTED: bool = True
+    LLM_SCHEDULER_BURST_SECONDS: float = 10.0  # Bucket capacity in seconds of budget
+    LLM_SCHEDULER_INTERACTIVE_RESERVE: float = 0.2  # Bucket share batch work cannot use
+    LLM_SCHEDULER_MAX_WAIT_SECONDS: float = 120.0
+    LLM_SCHEDULER_CLAUDE_RPM: int = 50
+    LLM_SCHEDULER_CLAUDE_TPM: int = 80000
+    LLM_SCHEDULER_GPT4_RPM: int = 500
+    LLM_SCHEDULER_GPT4_TPM: int = 300000
+    LLM_SCHEDULER_GEMINI_RPM: int = 1000
+    LLM_SCHEDULER_GEMINI_TPM: int = 2000000
+    LLM_SCHEDULER_PERPLEXITY_RPM: int = 50
+    LLM_SCHEDULER_PERPLEXITY_TPM: int = 200000
+
+    # LLM response cache: opt-in per call site for deterministic requests
+    LLM_RESPONSE_CACHE_ENABLED: bool = True
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 604800  # 7 days
+    LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 262144  # 256 KB
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 50000
+
+    # Section token streaming: provider stream -> per-chapter channel -> WebSocket
+    SECTION_STREAMING_ENABLED: bool = True
+    GENERATION_STREAM_BUFFER_SIZE: int = 256  # Queued events per chapter before producers wait
+    GENERATION_STREAM_SEND_TIMEOUT_SECONDS: float = 2.0  # Max producer wait; later events come via resume
+    GENERATION_STREAM_REPLAY_EVENTS: int = 2000  # Recent events kept for resume-from-offset
+    GENERATION_STREAM_CHECKPOINT_CHARS: int = 2000  # Persist partial sections every N characters
+    GENERATION_STREAM_CHECKPOINT_TTL_SECONDS: int = 86400
+    # Threads reading provider streams (dedicated pool; one per section in flight,
+    # default covers two chapters at SECTION_GENERATION_MAX_CONCURRENCY)
+    GENERATION_STREAM_MAX_THREADS: int = 20
+    # Threads for blocking (non-streaming) provider SDK calls, so concurrent
+    # sections, fact checks and captions overlap instead of queueing behind
+    # the loop's small default executor
+    PROVIDER_CALL_MAX_THREADS: int = 32
     FALLBACK_SYNTHESIS_PROVIDER: str = "anthropic"
 
     # External Research: Gemini Pro 2.5 → Perplexity → OpenAI
@@ -118,6 +189,10 @@ class Settings(BaseSettings):
     PDF_STORAGE_PATH: str = "/data/pdfs"
     IMAGE_STORAGE_PATH: str = "/data/images"
     MAX_UPLOAD_SIZE_MB: int = 100
+    # Upload bodies are streamed to disk in chunks (hashed on the way) and
+    # processed by a worker; identical in-flight uploads share one job
+    UPLOAD_CHUNK_SIZE_BYTES: int = 1024 * 1024
+    UPLOAD_INFLIGHT_TTL_SECONDS: int = 6 * 3600
     ALLOWED_PDF_EXTENSIONS: list = [".pdf"]
     ALLOWED_IMAGE_EXTENSIONS: list = [".png", ".jpg", ".jpeg", ".gif", ".webp"]
 
@@ -126,11 +201,32 @@ class Settings(BaseSettings):
     PDF_EXTRACT_IMAGES: bool = True
     PDF_EXTRACT_TABLES: bool = True
     PDF_OCR_ENABLED: bool = True
+    PDF_IMAGE_ANALYSIS_BATCH_SIZE: int = 8  # Images per parallel Claude Vision sub-batch task
+    PDF_IMAGE_EXTRACTION_WORKERS: int = 4  # Pool writing image files/thumbnails (0 = inline)
+    PDF_IMAGE_MIN_DIMENSION: int = 32  # Smaller embedded images (icons, rules) are not extracted
+    PDF_IMAGE_MIN_BYTES: int = 512
+    PDF_THUMBNAIL_SIZE: int = 300
+    # Perceptual-hash dedup: extracted images within these Hamming distances
+    # (of 64 bits) of an analyzed image reuse its analysis and embedding
+    PDF_IMAGE_PERCEPTUAL_DEDUP: bool = True
+    PDF_IMAGE_PHASH_MAX_DISTANCE: int = 8
+    PDF_IMAGE_DHASH_MAX_DISTANCE: int = 10
 
     # ==================== Vector Search ====================
     VECTOR_DIMENSIONS: int = 1536  # text-embedding-3-large with dimensions=1536
     VECTOR_SEARCH_LIMIT: int = 50
     VECTOR_SIMILARITY_THRESHOLD: float = 0.7
+    # PDF chunk embeddings: every chunk embedded (batched) and searched through
+    # the pdf_chunks HNSW index; chunk hits are aggregated per PDF at query time
+    PDF_CHUNK_EMBEDDING_BATCH_SIZE: int = 128  # Chunks per embeddings request
+    PDF_CHUNK_HNSW_EF_SEARCH: int = 100
+    PDF_CHUNK_CANDIDATES_PER_RESULT: int = 10  # Chunk hits fetched per requested PDF
+    PDF_CHUNK_AGGREGATION: str = "max"  # "max" (best chunk) or "topk_sum"
+    PDF_CHUNK_AGGREGATION_TOP_K: int = 3
+    # Image description embeddings: batched requests, a few in flight at once;
+    # each window of concurrent requests is written with one bulk UPDATE
+    PDF_IMAGE_EMBEDDING_BATCH_SIZE: int = 128  # Descriptions per embeddings request
+    PDF_IMAGE_EMBEDDING_CONCURRENCY: int = 4  # Requests in flight per task
 
     # ==================== Chapter Generation ====================
 
@@ -229,6 +325,10 @@ class Settings(BaseSettings):
     THUMBNAIL_SIZE: tuple = (300, 300)
     ALLOWED_PDF_EXTENSIONS: list = [".pdf"]
     ALLOWED_IMAGE_EXTENSIONS: list = [".png", ".jpg", ".jpeg", ".gif", ".bmp"]
+    # PDFs and images are stored once per content (SHA-256) and reference
+    # counted; unreferenced blobs are removed by collect_orphaned_blobs
+    STORAGE_BLOB_GC_GRACE_HOURS: int = 24  # Unreferenced this long before deletion
+    STORAGE_BLOB_GC_BATCH_SIZE: int = 500
 
     # ==================== Monitoring & Observability ====================
     ENABLE_METRICS: bool = True
@@ -328,6 +428,30 @@ class Settings(BaseSettings):
     GAP_ANALYSIS_MIN_COMPLETENESS: float = 0.75  # Minimum completeness score to pass
     GAP_ANALYSIS_CRITICAL_GAP_THRESHOLD: int = 0  # Max critical gaps allowed before requiring revision
 
+    # ==================== Near-Duplicate Detection (MinHash-LSH) ====================
+    # Signature parameters are persisted alongside signatures; changing them
+    # requires re-indexing (content_minhash_signatures is rebuilt lazily)
+    MINHASH_NUM_PERM: int = 128  # Signature length
+    MINHASH_LSH_BANDS: int = 32  # 32 bands x 4 rows -> candidate threshold ~0.42 Jaccard
+    MINHASH_SHINGLE_SIZE: int = 5  # Words per shingle
+    MINHASH_SEED: int = 1
+    # Duplicate thresholds are 5-word-shingle Jaccard, not cosine: editing ~1%
+    # of the words already lowers Jaccard to ~0.9, ~10% to ~0.5
+    MINHASH_DUPLICATE_JACCARD: float = 0.9  # strict=True; also marks exact duplicates
+    MINHASH_NEAR_DUPLICATE_JACCARD: float = 0.5  # strict=False; keep above the ~0.42 LSH threshold
+
+    # ==================== Related Chapters (Materialized Neighbors) ====================
+    # Size of each precomputed pdf_chapter_neighbors list; changing it requires
+    # running the rebuild_chapter_neighbors task
+    CHAPTER_NEIGHBORS_K: int = 30
+
+    # ==================== Book Ingestion (Chapter Embeddings + Dedup) ====================
+    # One task embeds all chapters of a book; duplicate detection runs once
+    # for the book after its embeddings are written
+    CHAPTER_EMBEDDING_BATCH_SIZE: int = 16  # Chapters (up to ~8k tokens each) per embeddings request
+    CHAPTER_DUPLICATE_THRESHOLD: float = 0.95  # Cosine similarity marking chapters as duplicates
+    CHAPTER_DUPLICATE_CANDIDATES: int = 20  # Nearest neighbours checked per chapter
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
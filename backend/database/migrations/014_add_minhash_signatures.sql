@@ -0,0 +1,61 @@
+-- Migration 014: MinHash Signatures & LSH Buckets
+-- Near-duplicate detection without all-pairs text comparison
+
+-- ============================================================================
+-- 1. Create MinHash Signature Store
+-- ============================================================================
+
+-- One signature per content item (chapter, pdf)
+CREATE TABLE IF NOT EXISTS content_minhash_signatures (
+    content_type VARCHAR(50) NOT NULL,
+    content_id UUID NOT NULL,
+
+    signature BYTEA NOT NULL,        -- num_perm little-endian uint32 MinHash values
+    num_perm INTEGER NOT NULL,
+    shingle_size INTEGER NOT NULL,
+    shingle_count INTEGER NOT NULL DEFAULT 0,
+
+    indexed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (content_type, content_id)
+);
+
+-- ============================================================================
+-- 2. Create LSH Band Buckets
+-- ============================================================================
+
+-- One row per (content item, band); items sharing a bucket are candidate duplicates
+CREATE TABLE IF NOT EXISTS content_lsh_buckets (
+    content_type VARCHAR(50) NOT NULL,
+    content_id UUID NOT NULL,
+    band_index SMALLINT NOT NULL,
+    bucket_hash BIGINT NOT NULL,
+
+    PRIMARY KEY (content_type, content_id, band_index),
+    FOREIGN KEY (content_type, content_id)
+        REFERENCES content_minhash_signatures(content_type, content_id)
+        ON DELETE CASCADE
+);
+
+-- ============================================================================
+-- 3. Create Indexes
+-- ============================================================================
+
+-- Bucket lookup (query + self-join for candidate pairs)
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_lookup
+ON content_lsh_buckets(content_type, band_index, bucket_hash);
+
+-- Staleness checks against source tables
+CREATE INDEX IF NOT EXISTS idx_minhash_signatures_indexed_at
+ON content_minhash_signatures(content_type, indexed_at);
+
+-- ============================================================================
+-- 4. Add Table Comments
+-- ============================================================================
+
+COMMENT ON TABLE content_minhash_signatures IS 'MinHash signatures of word shingles for near-duplicate detection';
+COMMENT ON TABLE content_lsh_buckets IS 'LSH band buckets over MinHash signatures (candidate generation)';
+
+COMMENT ON COLUMN content_minhash_signatures.signature IS 'MinHash signature, num_perm little-endian uint32 values';
+COMMENT ON COLUMN content_minhash_signatures.shingle_count IS 'Number of distinct word shingles in the source text';
+COMMENT ON COLUMN content_lsh_buckets.bucket_hash IS 'Hash of one signature band (rows = num_perm / bands)';
@@ -0,0 +1,38 @@
+-- Migration 015: Materialized Related-Chapter Neighbors
+-- Precomputed k-nearest-neighbor lists for pdf_chapters (chapter detail sidebar)
+
+-- ============================================================================
+-- 1. Create Neighbor Table
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS pdf_chapter_neighbors (
+    chapter_id UUID NOT NULL REFERENCES pdf_chapters(id) ON DELETE CASCADE,
+    neighbor_id UUID NOT NULL REFERENCES pdf_chapters(id) ON DELETE CASCADE,
+
+    rank SMALLINT NOT NULL,                -- 1 = most similar
+    cosine_similarity REAL NOT NULL,       -- 1 - cosine distance
+
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (chapter_id, neighbor_id)
+);
+
+-- ============================================================================
+-- 2. Create Indexes
+-- ============================================================================
+
+-- Sidebar lookup: WHERE chapter_id = ? ORDER BY rank
+CREATE INDEX IF NOT EXISTS idx_chapter_neighbors_lookup
+ON pdf_chapter_neighbors(chapter_id, rank);
+
+-- Incremental maintenance: find lists containing a changed chapter
+CREATE INDEX IF NOT EXISTS idx_chapter_neighbors_neighbor
+ON pdf_chapter_neighbors(neighbor_id);
+
+-- ============================================================================
+-- 3. Add Table Comments
+-- ============================================================================
+
+COMMENT ON TABLE pdf_chapter_neighbors IS 'Materialized k-NN lists over pdf_chapters.embedding, maintained on embedding change';
+COMMENT ON COLUMN pdf_chapter_neighbors.rank IS '1-based rank within chapter_id''s neighbor list';
+COMMENT ON COLUMN pdf_chapter_neighbors.cosine_similarity IS 'Cosine similarity (1 - cosine distance) at computation time';
@@ -0,0 +1,12 @@
+-- Migration: Add Chapter Stage Timings Column
+-- Date: 2026-10-18
+-- Description: Add stage_timings JSONB column to chapters for the dependency-graph stage scheduler
+
+-- Per-stage start/finish offsets, wall time and critical path of the last generation run
+ALTER TABLE chapters
+ADD COLUMN IF NOT EXISTS stage_timings JSONB;
+
+-- Add comment to describe the column
+COMMENT ON COLUMN chapters.stage_timings IS 'Stage scheduler report: per-stage start/finish offsets, wall time, critical path';
+
+-- Migration complete
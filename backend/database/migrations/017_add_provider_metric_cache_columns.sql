@@ -0,0 +1,17 @@
+-- Migration: Add Response Cache Columns to AI Provider Metrics
+-- Date: 2026-10-18
+-- Description: Track LLM response cache hits and the cost/latency they avoided
+
+ALTER TABLE ai_provider_metrics
+ADD COLUMN IF NOT EXISTS cache_hit BOOLEAN DEFAULT FALSE,
+ADD COLUMN IF NOT EXISTS cost_avoided_usd DECIMAL(10, 6),
+ADD COLUMN IF NOT EXISTS latency_avoided_ms INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_ai_metrics_cache_hit ON ai_provider_metrics(cache_hit);
+
+-- Add comments to describe the columns
+COMMENT ON COLUMN ai_provider_metrics.cache_hit IS 'Response served from the LLM response cache (no provider call)';
+COMMENT ON COLUMN ai_provider_metrics.cost_avoided_usd IS 'Cost of the original provider call the cache hit replaced';
+COMMENT ON COLUMN ai_provider_metrics.latency_avoided_ms IS 'Latency of the original provider call minus cache lookup time';
+
+-- Migration complete
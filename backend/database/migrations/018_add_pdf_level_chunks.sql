@@ -0,0 +1,28 @@
+-- Migration: PDF-Level Chunks
+-- Date: 2026-10-18
+-- Description: Store chunk embeddings of whole PDFs in pdf_chunks (previously chapter chunks only)
+
+-- A chunk belongs to a PDF chapter or directly to a PDF
+ALTER TABLE pdf_chunks
+ADD COLUMN IF NOT EXISTS pdf_id UUID REFERENCES pdfs(id) ON DELETE CASCADE;
+
+ALTER TABLE pdf_chunks ALTER COLUMN chapter_id DROP NOT NULL;
+
+ALTER TABLE pdf_chunks DROP CONSTRAINT IF EXISTS chk_chunks_parent;
+ALTER TABLE pdf_chunks
+ADD CONSTRAINT chk_chunks_parent CHECK (chapter_id IS NOT NULL OR pdf_id IS NOT NULL);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_chunks_pdf_index
+ON pdf_chunks(pdf_id, chunk_index)
+WHERE pdf_id IS NOT NULL;
+
+-- Vector search index (created by 006; repeated for databases that predate it)
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+ON pdf_chunks USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- Add comments to describe the columns
+COMMENT ON COLUMN pdf_chunks.pdf_id IS 'Parent PDF for chunks of a whole document (NULL for chapter chunks)';
+COMMENT ON COLUMN pdf_chunks.chapter_id IS 'Parent chapter (NULL for chunks of a whole PDF)';
+
+-- Migration complete
@@ -0,0 +1,13 @@
+-- Migration: Add Vision Payload Size Columns to AI Provider Metrics
+-- Date: 2026-10-18
+-- Description: Track image bytes before and after vision payload preparation
+
+ALTER TABLE ai_provider_metrics
+ADD COLUMN IF NOT EXISTS payload_bytes_original INTEGER,
+ADD COLUMN IF NOT EXISTS payload_bytes_sent INTEGER;
+
+-- Add comments to describe the columns
+COMMENT ON COLUMN ai_provider_metrics.payload_bytes_original IS 'Size of the original image file for vision requests';
+COMMENT ON COLUMN ai_provider_metrics.payload_bytes_sent IS 'Size of the downscaled/re-encoded image actually sent';
+
+-- Migration complete
@@ -0,0 +1,17 @@
+-- Migration 020: Perceptual Image Hashes
+-- Near-duplicate figures are linked to a canonical image at extraction time
+-- and inherit its analysis/embedding instead of being sent to the providers
+
+ALTER TABLE images
+ADD COLUMN IF NOT EXISTS phash BIGINT,
+ADD COLUMN IF NOT EXISTS dhash BIGINT;
+
+-- Canonical candidates are loaded into an in-memory BK-tree at extraction time
+CREATE INDEX IF NOT EXISTS idx_images_phash_canonical
+ON images(phash)
+WHERE phash IS NOT NULL AND is_duplicate = FALSE;
+
+COMMENT ON COLUMN images.phash IS '64-bit perceptual (DCT) hash, stored signed';
+COMMENT ON COLUMN images.dhash IS '64-bit difference hash, stored signed';
+
+-- Migration complete
@@ -0,0 +1,14 @@
+-- Migration 021: Book Content Hash
+-- Uploads are hashed while streamed to disk; an identical re-upload returns
+-- the existing book instead of being processed again
+
+ALTER TABLE pdf_books
+ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS idx_pdf_books_content_sha256
+ON pdf_books(content_sha256)
+WHERE content_sha256 IS NOT NULL;
+
+COMMENT ON COLUMN pdf_books.content_sha256 IS 'SHA-256 (hex) of the uploaded PDF file';
+
+-- Migration complete
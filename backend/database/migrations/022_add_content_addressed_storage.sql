@@ -0,0 +1,48 @@
+-- Migration 022: Content-Addressed Storage
+-- PDFs and extracted images are stored once per content (SHA-256) and shared
+-- by every record with identical content; storage_blobs counts the records
+-- referencing each file so unreferenced files can be garbage collected
+
+CREATE TABLE IF NOT EXISTS storage_blobs (
+    sha256 VARCHAR(64) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('pdf', 'image')),
+    file_path VARCHAR(1000) NOT NULL,
+    size_bytes BIGINT,
+    ref_count INTEGER NOT NULL DEFAULT 0 CHECK (ref_count >= 0),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    released_at TIMESTAMP
+);
+
+-- Garbage collection scans unreferenced blobs only
+CREATE INDEX IF NOT EXISTS idx_storage_blobs_unreferenced
+ON storage_blobs(COALESCE(released_at, created_at))
+WHERE ref_count = 0;
+
+-- Logical records -> blob (pdf_books.content_sha256 was added by 021)
+ALTER TABLE pdfs
+ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64);
+
+ALTER TABLE images
+ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS idx_pdfs_content_sha256
+ON pdfs(content_sha256)
+WHERE content_sha256 IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_images_content_sha256
+ON images(content_sha256)
+WHERE content_sha256 IS NOT NULL;
+
+-- Records with identical content now share one file path
+ALTER TABLE pdfs DROP CONSTRAINT IF EXISTS pdfs_file_path_key;
+ALTER TABLE images DROP CONSTRAINT IF EXISTS images_file_path_key;
+
+CREATE INDEX IF NOT EXISTS idx_pdfs_file_path ON pdfs(file_path);
+CREATE INDEX IF NOT EXISTS idx_images_file_path ON images(file_path);
+
+COMMENT ON TABLE storage_blobs IS 'Content-addressed files with the number of records referencing them';
+COMMENT ON COLUMN storage_blobs.released_at IS 'When ref_count last dropped to zero';
+COMMENT ON COLUMN pdfs.content_sha256 IS 'Storage blob holding the file (NULL for files stored before 022)';
+COMMENT ON COLUMN images.content_sha256 IS 'Storage blob holding the file (NULL for files stored before 022)';
+
+-- Migration complete
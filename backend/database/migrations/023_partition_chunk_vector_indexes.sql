@@ -0,0 +1,22 @@
+-- Migration 023: Per-Parent Chunk Vector Indexes
+-- pdf_chunks holds chapter chunks and whole-PDF chunks (018). A single HNSW
+-- index over both returns the nearest chunks of either kind, and the parent
+-- filter is applied after the scan: with ef_search candidates dominated by
+-- the other kind, PDF (or chapter) searches come back with few or no hits.
+-- One partial index per parent type keeps each scan within its own kind; the
+-- planner uses it when the query repeats the predicate.
+
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw_pdf
+ON pdf_chunks USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE pdf_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw_chapter
+ON pdf_chunks USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64)
+WHERE chapter_id IS NOT NULL;
+
+-- Every vector search over pdf_chunks names its parent type
+DROP INDEX IF EXISTS idx_chunks_embedding_hnsw;
+
+-- Migration complete
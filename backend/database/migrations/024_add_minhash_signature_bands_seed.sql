@@ -0,0 +1,14 @@
+-- Migration 024: MinHash Signature Bands & Seed
+-- LSH bucket rows depend on the band count and signatures on the hash seed;
+-- both are stored with each signature so changing either re-indexes it
+
+ALTER TABLE content_minhash_signatures
+ADD COLUMN IF NOT EXISTS lsh_bands INTEGER;
+
+ALTER TABLE content_minhash_signatures
+ADD COLUMN IF NOT EXISTS seed BIGINT;
+
+COMMENT ON COLUMN content_minhash_signatures.lsh_bands IS 'LSH band count the bucket rows were built with (NULL: unknown, re-indexed)';
+COMMENT ON COLUMN content_minhash_signatures.seed IS 'MinHash permutation seed (NULL: unknown, re-indexed)';
+
+-- Migration complete
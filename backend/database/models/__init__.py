@@ -14,11 +14,13 @@ from backend.database.models.cache_analytics import CacheAnalytics
 from backend.database.models.task import Task
 from backend.database.models.export_template import ExportTemplate, CitationStyle, ExportHistory
 from backend.database.models.ai_provider_metric import AIProviderMetric
+from backend.database.models.storage_blob import StorageBlob
 
 # Chapter-level vector search models (Phase 2)
 from backend.database.models.pdf_book import PDFBook
 from backend.database.models.pdf_chapter import PDFChapter
 from backend.database.models.pdf_chunk import PDFChunk
+from backend.database.models.pdf_chapter_neighbor import PDFChapterNeighbor
 
 __all__ = [
     # Base classes
@@ -39,9 +41,11 @@ __all__ = [
     "CitationStyle",
     "ExportHistory",
     "AIProviderMetric",
+    "StorageBlob",
 
     # Chapter-level vector search models
     "PDFBook",
     "PDFChapter",
     "PDFChunk",
+    "PDFChapterNeighbor",
 ]
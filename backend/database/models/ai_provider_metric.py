@@ -22,6 +22,7 @@ class AIProviderMetric(Base):
     - Cost: tokens used, USD cost
     - Errors: parse failures, validation failures
     - Fallback: was this a fallback provider?
+    - Cache: responses served from the LLM response cache (cost/latency avoided)
     """
 
     __tablename__ = "ai_provider_metrics"
@@ -66,6 +67,15 @@ class AIProviderMetric(Base):
     original_provider = Column(String(50), nullable=True)
     fallback_reason = Column(String(200), nullable=True)
 
+    # Response Cache Tracking
+    cache_hit = Column(Boolean, default=False, index=True)
+    cost_avoided_usd = Column(DECIMAL(10, 6), nullable=True)
+    latency_avoided_ms = Column(Integer, nullable=True)
+
+    # Vision Payload Tracking
+    payload_bytes_original = Column(Integer, nullable=True)
+    payload_bytes_sent = Column(Integer, nullable=True)
+
     # Timestamps
     created_at = Column(TIMESTAMP(timezone=True), default=datetime.utcnow)
 
@@ -104,5 +114,10 @@ class AIProviderMetric(Base):
             "was_fallback": self.was_fallback,
             "original_provider": self.original_provider,
             "fallback_reason": self.fallback_reason,
+            "cache_hit": self.cache_hit,
+            "cost_avoided_usd": float(self.cost_avoided_usd) if self.cost_avoided_usd else None,
+            "latency_avoided_ms": self.latency_avoided_ms,
+            "payload_bytes_original": self.payload_bytes_original,
+            "payload_bytes_sent": self.payload_bytes_sent,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
@@ -141,6 +141,13 @@ class Chapter(Base, UUIDMixin, TimestampMixin):
         comment="AI-powered quality review: contradictions, readability issues, flow problems, improvement suggestions"
     )
 
+    # Pipeline scheduling: per-stage timings and critical path
+    stage_timings: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Stage scheduler report: per-stage start/finish offsets, wall time, critical path"
+    )
+
     # ==================== Phase 2 Week 5: Comprehensive Gap Analysis ====================
 
     gap_analysis: Mapped[Optional[Dict[str, Any]]] = mapped_column(
@@ -3,7 +3,7 @@ Image model for extracted images from PDFs with AI analysis
 Part of Process A: Background PDF Indexation - Images are first-class citizens
 """
 
-from sqlalchemy import String, Integer, Float, Boolean, ForeignKey, Text, ARRAY
+from sqlalchemy import String, Integer, BigInteger, Float, Boolean, ForeignKey, Text, ARRAY
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List, Optional
@@ -56,8 +56,15 @@ class Image(Base, UUIDMixin, TimestampMixin):
     file_path: Mapped[str] = mapped_column(
         String(1000),
         nullable=False,
-        unique=True,
-        comment="Full path to stored image file"
+        index=True,
+        comment="Full path to stored image file (shared by images with identical content)"
+    )
+
+    content_sha256: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="Storage blob (SHA-256) holding the file; NULL for files stored before Migration 022"
     )
 
     thumbnail_path: Mapped[Optional[str]] = mapped_column(
@@ -185,6 +192,18 @@ class Image(Base, UUIDMixin, TimestampMixin):
         comment="ID of original image if this is a duplicate"
     )
 
+    phash: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="64-bit perceptual (DCT) hash, signed; near-duplicates differ in few bits"
+    )
+
+    dhash: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="64-bit difference hash, signed; confirms pHash matches"
+    )
+
     # ==================== Relationships ====================
 
     pdf: Mapped["PDF"] = relationship(
@@ -35,8 +35,8 @@ class PDF(Base, UUIDMixin, TimestampMixin):
     file_path: Mapped[str] = mapped_column(
         String(1000),
         nullable=False,
-        unique=True,
-        comment="Full path to stored PDF file"
+        index=True,
+        comment="Full path to stored PDF file (shared by records with identical content)"
     )
 
     file_size_bytes: Mapped[Optional[int]] = mapped_column(
@@ -45,6 +45,13 @@ class PDF(Base, UUIDMixin, TimestampMixin):
         comment="File size in bytes"
     )
 
+    content_sha256: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="Storage blob (SHA-256) holding the file; NULL for files stored before Migration 022"
+    )
+
     total_pages: Mapped[Optional[int]] = mapped_column(
         Integer,
         nullable=True,
@@ -91,6 +91,13 @@ class PDFBook(Base, UUIDMixin, TimestampMixin):
         comment="File size in bytes"
     )
 
+    content_sha256: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="SHA-256 of the uploaded file (identical re-uploads reuse the book, Migration 021)"
+    )
+
     # ==================== Upload Tracking ====================
 
     uploaded_by: Mapped[Optional[uuid.UUID]] = mapped_column(
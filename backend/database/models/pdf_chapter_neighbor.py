@@ -0,0 +1,65 @@
+"""
+SQLAlchemy model for pdf_chapter_neighbors table
+Materialized k-nearest-neighbor lists for related-chapter lookups
+(Migration 015)
+"""
+
+from sqlalchemy import Float, ForeignKey, SmallInteger, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import datetime
+import uuid
+from backend.database.base import Base
+
+
+class PDFChapterNeighbor(Base):
+    """
+    One entry of a chapter's precomputed neighbor list
+
+    Maintained by ChapterVectorSearchService.refresh_chapter_neighbors when a
+    chapter embedding changes, and rebuilt in bulk by rebuild_chapter_neighbors.
+    """
+
+    __tablename__ = "pdf_chapter_neighbors"
+
+    chapter_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey('pdf_chapters.id', ondelete='CASCADE'),
+        primary_key=True,
+        comment="Chapter owning this neighbor list"
+    )
+
+    neighbor_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey('pdf_chapters.id', ondelete='CASCADE'),
+        primary_key=True,
+        comment="Similar chapter"
+    )
+
+    rank: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        comment="1 = most similar"
+    )
+
+    cosine_similarity: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="1 - cosine distance"
+    )
+
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # ==================== Relationships ====================
+
+    neighbor: Mapped["PDFChapter"] = relationship(
+        "PDFChapter",
+        foreign_keys=[neighbor_id]
+    )
+
+    def __repr__(self) -> str:
+        return f"<PDFChapterNeighbor(chapter_id={self.chapter_id}, neighbor_id={self.neighbor_id}, rank={self.rank})>"
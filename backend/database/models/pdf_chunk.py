@@ -1,7 +1,7 @@
 """
 SQLAlchemy model for pdf_chunks table
-Fine-grained chunks for long chapters (>4000 words)
-Part of Chapter-Level Vector Search (Migration 006)
+Fine-grained chunks for long chapters (>4000 words) and whole PDFs
+Part of Chapter-Level Vector Search (Migration 006, PDF chunks: Migration 018)
 """
 
 from sqlalchemy import String, Integer, ForeignKey, Text, ARRAY
@@ -26,18 +26,29 @@ class PDFChunk(Base, UUIDMixin, TimestampMixin):
 
     Use case: When chapter-level embedding is too coarse,
     chunk-level search provides precise section retrieval
+
+    Parent: a chunk belongs to a PDFChapter (chapter_id) or, for
+    PDFs embedded as a whole document, directly to a PDF (pdf_id)
     """
 
     __tablename__ = "pdf_chunks"
 
     # ==================== Hierarchy ====================
 
-    chapter_id: Mapped[uuid.UUID] = mapped_column(
+    chapter_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         PG_UUID(as_uuid=True),
         ForeignKey('pdf_chapters.id', ondelete='CASCADE'),
-        nullable=False,
+        nullable=True,
+        index=True,
+        comment="Parent chapter containing this chunk (NULL for PDF chunks)"
+    )
+
+    pdf_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey('pdfs.id', ondelete='CASCADE'),
+        nullable=True,
         index=True,
-        comment="Parent chapter containing this chunk"
+        comment="Parent PDF for chunks of a whole document (NULL for chapter chunks)"
     )
 
     chunk_index: Mapped[int] = mapped_column(
@@ -103,19 +114,21 @@ class PDFChunk(Base, UUIDMixin, TimestampMixin):
 
     # ==================== Relationships ====================
 
-    chapter: Mapped["PDFChapter"] = relationship(
+    chapter: Mapped[Optional["PDFChapter"]] = relationship(
         "PDFChapter",
         back_populates="chunks"
     )
 
     def __repr__(self) -> str:
-        return f"<PDFChunk(id={self.id}, chapter_id={self.chapter_id}, index={self.chunk_index}, tokens={self.token_count})>"
+        parent = f"chapter_id={self.chapter_id}" if self.chapter_id else f"pdf_id={self.pdf_id}"
+        return f"<PDFChunk(id={self.id}, {parent}, index={self.chunk_index}, tokens={self.token_count})>"
 
     def to_dict(self) -> dict:
         """Convert PDFChunk to dictionary"""
         return {
             "id": str(self.id),
-            "chapter_id": str(self.chapter_id),
+            "chapter_id": str(self.chapter_id) if self.chapter_id else None,
+            "pdf_id": str(self.pdf_id) if self.pdf_id else None,
             "chunk_index": self.chunk_index,
             "chunk_text": self.chunk_text,
             "token_count": self.token_count,
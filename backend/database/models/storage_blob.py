@@ -0,0 +1,69 @@
+"""
+SQLAlchemy model for storage_blobs table
+Content-addressed files (PDFs, extracted images) with reference counts
+(Migration 022)
+"""
+
+from sqlalchemy import String, BigInteger, Integer, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from datetime import datetime
+from backend.database.base import Base
+
+
+class StorageBlob(Base):
+    """
+    One stored file, keyed by the SHA-256 of its content
+
+    Logical records point at their blob through their content_sha256 column
+    (pdfs, pdf_books, images); each such record holds one reference. Blobs
+    whose count dropped to zero are deleted by collect_orphaned_blobs.
+    """
+
+    __tablename__ = "storage_blobs"
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="SHA-256 (hex) of the file content"
+    )
+
+    kind: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="pdf or image"
+    )
+
+    file_path: Mapped[str] = mapped_column(
+        String(1000),
+        nullable=False,
+        comment="Path of the stored file (derived from the hash)"
+    )
+
+    size_bytes: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="File size in bytes"
+    )
+
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Number of records referencing this blob"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False
+    )
+
+    released_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="When ref_count last dropped to zero (garbage-collection clock)"
+    )
+
+    def __repr__(self) -> str:
+        return f"<StorageBlob({self.sha256[:12]}, kind='{self.kind}', refs={self.ref_count})>"
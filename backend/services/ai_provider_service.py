@@ -7,22 +7,136 @@ Features:
 - Automatic fallback on provider failure
 - Per-provider health tracking
 - Fail-fast on repeated failures
+- Shared per-provider request/token budgets (LLM scheduler)
 """
 
 import anthropic
 import openai
 import google.generativeai as genai
 import httpx
+import asyncio
+import contextvars
+import threading
 import time
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Dict, Any, List, AsyncIterator, Callable, Iterator
 from enum import Enum
 
 from backend.config import settings
 from backend.utils import get_logger
 from backend.services.circuit_breaker import circuit_breaker_manager, CircuitState
+from backend.services.llm_scheduler import llm_scheduler, estimate_tokens, SchedulerTimeoutError
+from backend.services.llm_response_cache import llm_response_cache
+from backend.services.section_work_queue import is_rate_limit_error
 
 logger = get_logger(__name__)
 
+# Approximate input tokens of one image in a vision request (budgeting only)
+VISION_IMAGE_TOKEN_ESTIMATE = 1600
+
+# Provider chunks buffered between a streaming SDK thread and the event loop
+STREAM_CHUNK_BUFFER = 64
+
+
+_stream_executor: Optional[ThreadPoolExecutor] = None
+_stream_executor_lock = threading.Lock()
+_call_executor: Optional[ThreadPoolExecutor] = None
+_call_executor_lock = threading.Lock()
+
+
+def _get_stream_executor() -> ThreadPoolExecutor:
+    """
+    Threads that read provider streams
+
+    A stream holds its thread for the whole generation, so streams get their
+    own bounded pool (GENERATION_STREAM_MAX_THREADS) instead of sharing the
+    pool of blocking SDK calls. Streams beyond the limit wait for a thread.
+    """
+    global _stream_executor
+    with _stream_executor_lock:
+        if _stream_executor is None:
+            _stream_executor = ThreadPoolExecutor(
+                max_workers=settings.GENERATION_STREAM_MAX_THREADS,
+                thread_name_prefix="provider-stream"
+            )
+        return _stream_executor
+
+
+def _get_call_executor() -> ThreadPoolExecutor:
+    """Threads that run blocking SDK calls (PROVIDER_CALL_MAX_THREADS)"""
+    global _call_executor
+    with _call_executor_lock:
+        if _call_executor is None:
+            _call_executor = ThreadPoolExecutor(
+                max_workers=settings.PROVIDER_CALL_MAX_THREADS,
+                thread_name_prefix="provider-call"
+            )
+        return _call_executor
+
+
+async def _in_thread(call: Callable, *args, **kwargs):
+    """
+    Run a blocking SDK call without blocking the event loop
+
+    The provider clients are synchronous, so every request runs in the
+    provider call pool; concurrent requests overlap instead of serialising
+    on the loop.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _get_call_executor(), partial(context.run, call, *args, **kwargs)
+    )
+
+
+async def _iterate_in_thread(make_iterator: Callable[[], Iterator]) -> AsyncIterator:
+    """
+    Iterate a blocking (sync SDK) stream in a worker thread
+
+    Items reach the event loop as they arrive, through a bounded buffer: when
+    the consumer falls behind, the worker thread blocks and stops reading from
+    the provider connection. Threads come from the dedicated stream pool.
+    """
+    loop = asyncio.get_running_loop()
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=STREAM_CHUNK_BUFFER)
+    finished = object()
+    stopped = False
+
+    def produce():
+        iterator = make_iterator()
+        try:
+            for item in iterator:
+                if stopped:
+                    break
+                asyncio.run_coroutine_threadsafe(buffer.put((item, None)), loop).result()
+        except Exception as e:
+            asyncio.run_coroutine_threadsafe(buffer.put((finished, e)), loop).result()
+        else:
+            asyncio.run_coroutine_threadsafe(buffer.put((finished, None)), loop).result()
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+
+    worker = loop.run_in_executor(_get_stream_executor(), produce)
+    try:
+        while True:
+            item, error = await buffer.get()
+            if item is finished:
+                await worker
+                if error is not None:
+                    raise error
+                break
+            yield item
+    finally:
+        # Consumer stopped early: unblock the worker so it can close the stream
+        stopped = True
+        while not worker.done():
+            while not buffer.empty():
+                buffer.get_nowait()
+            await asyncio.sleep(0.01)
+
 
 class AIProvider(str, Enum):
     """Available AI providers"""
@@ -42,6 +156,14 @@ class AITask(str, Enum):
     EMBEDDING = "embedding"                        # OpenAI (text-embedding-3-large)
 
 
+# Model each text provider is configured with (part of the response cache key)
+PROVIDER_MODELS = {
+    AIProvider.CLAUDE: settings.ANTHROPIC_MODEL,
+    AIProvider.GPT4: settings.OPENAI_CHAT_MODEL,
+    AIProvider.GEMINI: settings.GOOGLE_MODEL,
+}
+
+
 class AIProviderService:
     """
     Unified interface for multiple AI providers with intelligent routing
@@ -141,7 +263,8 @@ class AIProviderService:
         system_prompt: Optional[str] = None,
         max_tokens: int = 4000,
         temperature: float = 0.7,
-        provider: Optional[AIProvider] = None
+        provider: Optional[AIProvider] = None,
+        cache: bool = False
     ) -> Dict[str, Any]:
         """
         Generate text using the appropriate AI provider with circuit breaker protection
@@ -153,9 +276,12 @@ class AIProviderService:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0-1)
             provider: Override provider selection
+            cache: Serve/store the response through the LLM response cache
+                (only for deterministic requests)
 
         Returns:
             dict with keys: text, provider, tokens_used, cost_usd
+            (cache hits also carry cache_hit=True and cost_usd=0)
 
         Circuit Breaker Logic:
             1. Check if primary provider circuit is closed
@@ -166,6 +292,19 @@ class AIProviderService:
         if provider is None:
             provider = self.get_preferred_provider(task)
 
+        if cache:
+            model = PROVIDER_MODELS[provider]
+            cache_key = llm_response_cache.make_key(
+                provider.value, model, prompt, system_prompt,
+                params={"max_tokens": max_tokens, "temperature": temperature}
+            )
+            # Fallback responses come from another model: they are returned but not cached
+            return await self._cached(
+                cache_key, task,
+                partial(self.generate_text, prompt, task, system_prompt, max_tokens, temperature, provider),
+                expected_model=model
+            )
+
         # Try primary provider with circuit breaker
         result = await self._try_provider_with_circuit_breaker(
             provider=provider,
@@ -227,20 +366,31 @@ class AIProviderService:
             return None
 
         try:
-            # Attempt provider call
             if provider == AIProvider.CLAUDE:
-                result = await self._generate_claude(prompt, system_prompt, max_tokens, temperature)
+                call = partial(self._generate_claude, prompt, system_prompt, max_tokens, temperature)
             elif provider == AIProvider.GPT4:
-                result = await self._generate_gpt4(prompt, system_prompt, max_tokens, temperature)
+                call = partial(self._generate_gpt4, prompt, system_prompt, max_tokens, temperature)
             elif provider == AIProvider.GEMINI:
-                result = await self._generate_gemini(prompt, max_tokens, temperature, system_prompt)
+                call = partial(self._generate_gemini, prompt, max_tokens, temperature, system_prompt)
             else:
                 raise ValueError(f"Unknown provider: {provider}")
 
+            # Attempt provider call once its budget admits it
+            result = await self._scheduled(
+                provider_name,
+                estimate_tokens(prompt, system_prompt, max_tokens=max_tokens),
+                call
+            )
+
             # Success - record and return
             breaker.record_success()
             return result
 
+        except SchedulerTimeoutError as e:
+            # Budget exhausted, not a provider failure: fall back without tripping the breaker
+            logger.warning(f"Provider {provider_name} skipped: {str(e)}")
+            return None
+
         except Exception as e:
             # Failure - record for circuit breaker
             breaker.record_failure(error=e)
@@ -249,6 +399,57 @@ class AIProviderService:
             )
             return None
 
+    async def _cached(
+        self,
+        cache_key: str,
+        task: AITask,
+        call,
+        expected_model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Serve a request from the LLM response cache, or run it and cache the result
+
+        Args:
+            cache_key: Key from llm_response_cache.make_key
+            task: Task type (reported with cache hits)
+            call: Zero-argument coroutine function making the uncached request
+            expected_model: Only cache results produced by this model
+
+        Returns:
+            The cached or freshly generated result dict
+        """
+        cached = llm_response_cache.get(cache_key, task.value)
+        if cached is not None:
+            return cached
+
+        start_time = time.time()
+        result = await call()
+        if expected_model is None or result.get("model") == expected_model:
+            llm_response_cache.set(cache_key, result, int((time.time() - start_time) * 1000))
+        return result
+
+    async def _scheduled(self, provider: str, estimated_tokens: int, call) -> Dict[str, Any]:
+        """
+        Run a provider call once the LLM scheduler admits it
+
+        Actual token usage is settled against the estimate, and provider 429s
+        pause further admissions for that provider.
+
+        Returns:
+            The call's result dict, with queue_delay_ms added
+        """
+        async with llm_scheduler.admit(provider, estimated_tokens) as admission:
+            try:
+                result = await call()
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    llm_scheduler.record_rate_limited(provider)
+                raise
+            llm_scheduler.settle(admission, result.get("tokens_used"))
+
+        result["queue_delay_ms"] = admission.queue_delay_ms
+        return result
+
     def _get_fallback_chain(self, primary_provider: AIProvider) -> List[AIProvider]:
         """
         Get ordered fallback provider chain
@@ -282,7 +483,8 @@ class AIProviderService:
 
         messages = [{"role": "user", "content": prompt}]
 
-        response = self.claude_client.messages.create(
+        response = await _in_thread(
+            self.claude_client.messages.create,
             model=settings.ANTHROPIC_MODEL,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -337,7 +539,8 @@ class AIProviderService:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        response = self.openai_client.chat.completions.create(
+        response = await _in_thread(
+            self.openai_client.chat.completions.create,
             model=settings.OPENAI_CHAT_MODEL,  # gpt-4o
             messages=messages,
             max_tokens=max_tokens,
@@ -399,7 +602,8 @@ class AIProviderService:
 
         # Generate content with safety settings adjusted for medical content
         # Note: Medical content should be allowed since this is a medical knowledge base
-        response = model.generate_content(
+        response = await _in_thread(
+            model.generate_content,
             full_prompt,
             generation_config=genai.types.GenerationConfig(
                 max_output_tokens=max_tokens,
@@ -486,7 +690,8 @@ class AIProviderService:
         if not self.openai_client:
             raise ValueError("OpenAI client not initialized")
 
-        response = self.openai_client.embeddings.create(
+        response = await _in_thread(
+            self.openai_client.embeddings.create,
             model=model,
             input=text,
             dimensions=settings.OPENAI_EMBEDDING_DIMENSIONS  # CRITICAL: 1536 for pgvector compatibility
@@ -508,6 +713,50 @@ class AIProviderService:
             "cost_usd": cost_usd
         }
 
+    async def generate_embeddings_batch(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-large"
+    ) -> Dict[str, Any]:
+        """
+        Generate embeddings for several texts in a single OpenAI request
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model to use
+
+        Returns:
+            dict with keys: embeddings (list of vectors, in input order), dimensions, cost_usd
+        """
+        if not self.openai_client:
+            raise ValueError("OpenAI client not initialized")
+
+        response = await _in_thread(
+            self.openai_client.embeddings.create,
+            model=model,
+            input=texts,
+            dimensions=settings.OPENAI_EMBEDDING_DIMENSIONS  # CRITICAL: 1536 for pgvector compatibility
+        )
+
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        tokens_used = response.usage.total_tokens
+
+        # Calculate cost
+        cost_usd = (tokens_used / 1000) * settings.OPENAI_EMBEDDING_COST_PER_1K
+
+        logger.debug(
+            f"Batch embeddings generated: {len(embeddings)} texts, "
+            f"{tokens_used} tokens, ${cost_usd:.6f}"
+        )
+
+        return {
+            "embeddings": embeddings,
+            "dimensions": len(embeddings[0]) if embeddings else 0,
+            "model": model,
+            "tokens_used": tokens_used,
+            "cost_usd": cost_usd
+        }
+
     async def analyze_image(
         self,
         image_data: bytes,
@@ -544,7 +793,8 @@ class AIProviderService:
         }
         media_type = format_to_media.get(image_format.upper(), "image/png")
 
-        response = self.claude_client.messages.create(
+        response = await _in_thread(
+            self.claude_client.messages.create,
             model=settings.ANTHROPIC_MODEL,
             max_tokens=max_tokens,
             messages=[{
@@ -583,7 +833,7 @@ class AIProviderService:
             "provider": "claude_vision",
             "tokens_used": input_tokens + output_tokens,
             "cost_usd": cost_usd,
-            "model": "claude-sonnet-4"
+            "model": settings.ANTHROPIC_MODEL
         }
 
     async def _generate_claude_vision(
@@ -638,7 +888,8 @@ class AIProviderService:
         # Encode image to base64
         image_b64 = base64.b64encode(image_data).decode('utf-8')
 
-        response = self.openai_client.chat.completions.create(
+        response = await _in_thread(
+            self.openai_client.chat.completions.create,
             model="gpt-4o",  # GPT-4o with native vision support
             messages=[
                 {
@@ -722,7 +973,8 @@ class AIProviderService:
         model = genai.GenerativeModel(settings.GOOGLE_MODEL)
 
         # Generate response with image and text
-        response = model.generate_content(
+        response = await _in_thread(
+            model.generate_content,
             [prompt, image],
             generation_config=genai.types.GenerationConfig(
                 max_output_tokens=max_tokens,
@@ -780,7 +1032,9 @@ class AIProviderService:
         max_tokens: int = 4000,
         image_format: str = "PNG",
         image_id: Optional[str] = None,
-        chapter_id: Optional[str] = None
+        chapter_id: Optional[str] = None,
+        cache: bool = False,
+        original_image_bytes: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Generate vision analysis with hierarchical fallback
@@ -795,20 +1049,48 @@ class AIProviderService:
             image_format: Image format (JPEG, PNG, etc.)
             image_id: Optional image ID for metrics tracking
             chapter_id: Optional chapter ID for metrics tracking
+            cache: Serve/store the analysis through the LLM response cache,
+                keyed by the image content (not its ID)
+            original_image_bytes: Size of the image before payload preparation
+                (recorded with the sent size in provider metrics)
 
         Returns:
             Analysis result with provider info
         """
         import base64
 
+        if cache:
+            cache_key = llm_response_cache.make_key(
+                "vision", settings.ANTHROPIC_MODEL, prompt,
+                params={"max_tokens": max_tokens, "image_format": image_format},
+                image_bytes=image_base64.encode("ascii")
+            )
+            return await self._cached(
+                cache_key, task,
+                partial(
+                    self.generate_vision_analysis_with_fallback,
+                    image_base64, prompt, task, max_tokens, image_format, image_id, chapter_id,
+                    original_image_bytes=original_image_bytes
+                ),
+                expected_model=settings.ANTHROPIC_MODEL
+            )
+
         # Decode base64 to bytes
         image_data = base64.b64decode(image_base64)
+        payload_metrics = {
+            "payload_bytes_original": original_image_bytes,
+            "payload_bytes_sent": len(image_data)
+        }
 
         # Try Claude Vision first
         start_time = time.time()
         try:
             logger.info(f"Attempting Claude Vision analysis (format: {image_format})")
-            result = await self._generate_claude_vision(image_data, prompt, max_tokens, image_format)
+            result = await self._scheduled(
+                "claude",
+                estimate_tokens(prompt, max_tokens=max_tokens) + VISION_IMAGE_TOKEN_ESTIMATE,
+                partial(self._generate_claude_vision, image_data, prompt, max_tokens, image_format)
+            )
 
             # Record success metric
             response_time_ms = int((time.time() - start_time) * 1000)
@@ -816,7 +1098,7 @@ class AIProviderService:
                 try:
                     self.metrics_service.record_metric(
                         provider="claude",
-                        model=result.get("model", "claude-sonnet-4"),
+                        model=result.get("model", settings.ANTHROPIC_MODEL),
                         task_type=task.value,
                         success=True,
                         image_id=image_id,
@@ -827,7 +1109,8 @@ class AIProviderService:
                         total_tokens=result.get("tokens_used"),
                         cost_usd=result.get("cost_usd"),
                         json_parse_success=None,  # Will be set by caller
-                        was_fallback=False
+                        was_fallback=False,
+                        **payload_metrics
                     )
                 except Exception as metric_error:
                     logger.warning(f"Failed to record Claude metric: {metric_error}")
@@ -841,7 +1124,7 @@ class AIProviderService:
                 try:
                     self.metrics_service.record_metric(
                         provider="claude",
-                        model="claude-sonnet-4",
+                        model=settings.ANTHROPIC_MODEL,
                         task_type=task.value,
                         success=False,
                         image_id=image_id,
@@ -849,7 +1132,8 @@ class AIProviderService:
                         response_time_ms=response_time_ms,
                         error_type=error_type,
                         error_message=str(e)[:500],  # Limit error message length
-                        was_fallback=False
+                        was_fallback=False,
+                        **payload_metrics
                     )
                 except Exception as metric_error:
                     logger.warning(f"Failed to record Claude failure metric: {metric_error}")
@@ -860,7 +1144,11 @@ class AIProviderService:
         start_time = time.time()
         try:
             logger.info(f"Attempting OpenAI Vision analysis (format: {image_format})")
-            result = await self._generate_openai_vision(image_data, prompt, max_tokens, image_format)
+            result = await self._scheduled(
+                "gpt4",
+                estimate_tokens(prompt, max_tokens=max_tokens) + VISION_IMAGE_TOKEN_ESTIMATE,
+                partial(self._generate_openai_vision, image_data, prompt, max_tokens, image_format)
+            )
 
             # Record fallback success metric
             response_time_ms = int((time.time() - start_time) * 1000)
@@ -881,7 +1169,8 @@ class AIProviderService:
                         json_parse_success=None,
                         was_fallback=True,
                         original_provider="claude",
-                        fallback_reason="Claude Vision failed"
+                        fallback_reason="Claude Vision failed",
+                        **payload_metrics
                     )
                 except Exception as metric_error:
                     logger.warning(f"Failed to record GPT-4o metric: {metric_error}")
@@ -905,7 +1194,8 @@ class AIProviderService:
                         error_message=str(e)[:500],
                         was_fallback=True,
                         original_provider="claude",
-                        fallback_reason="Claude Vision failed"
+                        fallback_reason="Claude Vision failed",
+                        **payload_metrics
                     )
                 except Exception as metric_error:
                     logger.warning(f"Failed to record GPT-4o failure metric: {metric_error}")
@@ -916,7 +1206,11 @@ class AIProviderService:
         start_time = time.time()
         try:
             logger.info(f"Attempting Google Vision analysis (format: {image_format})")
-            result = await self._generate_google_vision(image_data, prompt, max_tokens, image_format)
+            result = await self._scheduled(
+                "gemini",
+                estimate_tokens(prompt, max_tokens=max_tokens) + VISION_IMAGE_TOKEN_ESTIMATE,
+                partial(self._generate_google_vision, image_data, prompt, max_tokens, image_format)
+            )
 
             # Record second fallback success metric
             response_time_ms = int((time.time() - start_time) * 1000)
@@ -937,7 +1231,8 @@ class AIProviderService:
                         json_parse_success=None,
                         was_fallback=True,
                         original_provider="claude",
-                        fallback_reason="Claude and OpenAI Vision failed"
+                        fallback_reason="Claude and OpenAI Vision failed",
+                        **payload_metrics
                     )
                 except Exception as metric_error:
                     logger.warning(f"Failed to record Gemini metric: {metric_error}")
@@ -961,7 +1256,8 @@ class AIProviderService:
                         error_message=str(e)[:500],
                         was_fallback=True,
                         original_provider="claude",
-                        fallback_reason="Claude and OpenAI Vision failed"
+                        fallback_reason="Claude and OpenAI Vision failed",
+                        **payload_metrics
                     )
                 except Exception as metric_error:
                     logger.warning(f"Failed to record Gemini failure metric: {metric_error}")
@@ -969,23 +1265,258 @@ class AIProviderService:
             logger.error(f"All vision providers failed: {str(e)}")
             raise ValueError("All vision providers failed for image analysis")
 
+    # ==================== Streaming ====================
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        task: AITask,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        provider: Optional[AIProvider] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream text from the appropriate AI provider
+
+        Args:
+            Same as generate_text
+
+        Yields:
+            {"chunk": str, "provider": str} for each text delta, then one final
+            dict in the generate_text format (text, provider, model,
+            tokens_used, cost_usd, queue_delay_ms)
+
+        Fallback:
+            The fallback chain is only used until the first chunk is yielded.
+            A provider failing mid-stream raises: the caller has already
+            forwarded partial output and must restart the request.
+        """
+        if provider is None:
+            provider = self.get_preferred_provider(task)
+
+        for candidate in [provider] + self._get_fallback_chain(provider):
+            provider_name = candidate.value
+            breaker = self.circuit_breakers.get_breaker(provider_name)
+            if not breaker.is_call_allowed():
+                logger.warning(f"Circuit breaker OPEN for {provider_name}, skipping stream")
+                continue
+
+            streamed = False
+            usage: Dict[str, int] = {}
+            full_text = ""
+            try:
+                async with llm_scheduler.admit(
+                    provider_name, estimate_tokens(prompt, system_prompt, max_tokens=max_tokens)
+                ) as admission:
+                    try:
+                        async for chunk in self._provider_stream(
+                            candidate, prompt, system_prompt, max_tokens, temperature, usage
+                        ):
+                            streamed = True
+                            full_text = chunk["full_text"]
+                            yield {"chunk": chunk["chunk"], "provider": chunk["provider"]}
+                    except Exception as e:
+                        if is_rate_limit_error(e):
+                            llm_scheduler.record_rate_limited(provider_name)
+                        raise
+
+                    result = self._streamed_result(candidate, full_text, usage, prompt, system_prompt)
+                    llm_scheduler.settle(admission, result["tokens_used"])
+
+            except SchedulerTimeoutError as e:
+                logger.warning(f"Provider {provider_name} stream skipped: {str(e)}")
+                continue
+
+            except Exception as e:
+                breaker.record_failure(error=e)
+                logger.error(f"Provider {provider_name} stream failed: {str(e)[:200]}")
+                if streamed:
+                    raise
+                continue
+
+            breaker.record_success()
+            result["queue_delay_ms"] = admission.queue_delay_ms
+            yield result
+            return
+
+        raise Exception(
+            f"All AI providers failed or circuit breakers open for streaming. Primary: {provider}"
+        )
+
+    def _provider_stream(
+        self,
+        provider: AIProvider,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Chunk stream of one provider (fills `usage` when the stream ends)"""
+        if provider == AIProvider.CLAUDE:
+            return self._generate_claude_streaming(prompt, system_prompt, max_tokens, temperature, usage)
+        elif provider == AIProvider.GPT4:
+            return self._generate_gpt4_streaming(prompt, system_prompt, max_tokens, temperature, usage)
+        elif provider == AIProvider.GEMINI:
+            return self._generate_gemini_streaming(prompt, max_tokens, temperature, system_prompt, usage)
+        raise ValueError(f"Unknown provider: {provider}")
+
+    def _streamed_result(
+        self,
+        provider: AIProvider,
+        text: str,
+        usage: Dict[str, int],
+        prompt: str,
+        system_prompt: Optional[str]
+    ) -> Dict[str, Any]:
+        """Final generate_text-style result of a completed stream"""
+        if provider == AIProvider.CLAUDE:
+            name, input_rate, output_rate = (
+                "claude", settings.ANTHROPIC_SONNET_INPUT_COST_PER_1K, settings.ANTHROPIC_SONNET_OUTPUT_COST_PER_1K
+            )
+        elif provider == AIProvider.GPT4:
+            name, input_rate, output_rate = (
+                "gpt4o", settings.OPENAI_GPT4_INPUT_COST_PER_1K, settings.OPENAI_GPT4_OUTPUT_COST_PER_1K
+            )
+        else:
+            name, input_rate, output_rate = (
+                "gemini", settings.GOOGLE_GEMINI_INPUT_COST_PER_1K, settings.GOOGLE_GEMINI_OUTPUT_COST_PER_1K
+            )
+
+        # Fallback: Estimate tokens (4 chars ≈ 1 token) when the stream reported no usage
+        input_tokens = usage.get("input_tokens") or estimate_tokens(prompt, system_prompt)
+        output_tokens = usage.get("output_tokens") or len(text) // 4
+        cost_usd = (input_tokens / 1000) * input_rate + (output_tokens / 1000) * output_rate
+
+        logger.info(
+            f"{name} streamed generation: {input_tokens} input + {output_tokens} output tokens, "
+            f"${cost_usd:.4f}"
+        )
+
+        return {
+            "text": text,
+            "provider": name,
+            "model": PROVIDER_MODELS[provider],
+            "tokens_used": input_tokens + output_tokens,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": cost_usd
+        }
+
+    async def _generate_claude_streaming(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Optional[Dict[str, int]] = None
+    ):
+        """
+        Generate text using Claude Sonnet 4.5 with streaming
+
+        Yields:
+            dict with chunk text and metadata; `usage` receives token counts
+            once the stream completes
+        """
+        if not self.claude_client:
+            raise ValueError("Claude client not initialized")
+
+        def text_stream():
+            with self.claude_client.messages.stream(
+                model=settings.ANTHROPIC_MODEL,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt or "You are an expert neurosurgeon and medical writer.",
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                yield from stream.text_stream
+                message = stream.get_final_message()
+            if usage is not None:
+                usage["input_tokens"] = message.usage.input_tokens
+                usage["output_tokens"] = message.usage.output_tokens
+
+        full_text = ""
+        async for text in _iterate_in_thread(text_stream):
+            if text:
+                full_text += text
+                yield {
+                    "chunk": text,
+                    "full_text": full_text,
+                    "provider": "claude",
+                    "model": settings.ANTHROPIC_MODEL
+                }
+
+    async def _generate_gpt4_streaming(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        usage: Optional[Dict[str, int]] = None
+    ):
+        """
+        Generate text using GPT-4o with streaming
+
+        Yields:
+            dict with chunk text and metadata; `usage` receives token counts
+            from the final stream chunk
+        """
+        if not self.openai_client:
+            raise ValueError("OpenAI client not initialized")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        def text_stream():
+            stream = self.openai_client.chat.completions.create(
+                model=settings.OPENAI_CHAT_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if getattr(chunk, "usage", None) and usage is not None:
+                    usage["input_tokens"] = chunk.usage.prompt_tokens
+                    usage["output_tokens"] = chunk.usage.completion_tokens
+
+        full_text = ""
+        async for text in _iterate_in_thread(text_stream):
+            full_text += text
+            yield {
+                "chunk": text,
+                "full_text": full_text,
+                "provider": "gpt4o",
+                "model": settings.OPENAI_CHAT_MODEL
+            }
+
     async def _generate_gemini_streaming(
         self,
         prompt: str,
         max_tokens: int,
         temperature: float,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None
     ):
         """
         Generate text using Gemini 2.0 Flash with streaming
 
         Yields text chunks as they're generated for real-time display.
+        The blocking SDK stream is read in a worker thread, so other requests
+        keep running while chunks arrive.
 
         Args:
             prompt: User prompt
             max_tokens: Maximum output tokens
             temperature: Sampling temperature
             system_prompt: Optional system instructions
+            usage: Optional dict receiving token counts once the stream completes
 
         Yields:
             dict with chunk text and metadata
@@ -999,36 +1530,43 @@ class AIProviderService:
         else:
             full_prompt = prompt
 
-        # Generate content with streaming
-        response = model.generate_content(
-            full_prompt,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=max_tokens,
-                temperature=temperature
-            ),
-            safety_settings={
-                genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-                genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
-            },
-            stream=True  # Enable streaming
-        )
+        def text_stream():
+            # Generate content with streaming
+            response = model.generate_content(
+                full_prompt,
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=max_tokens,
+                    temperature=temperature
+                ),
+                safety_settings={
+                    genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+                    genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH: genai.types.HarmBlockThreshold.BLOCK_NONE,
+                    genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+                    genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: genai.types.HarmBlockThreshold.BLOCK_NONE,
+                },
+                stream=True  # Enable streaming
+            )
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+
+            # Token counts are only available after streaming completes
+            usage_metadata = getattr(response, "usage_metadata", None)
+            if usage_metadata and usage is not None:
+                usage["input_tokens"] = usage_metadata.prompt_token_count
+                usage["output_tokens"] = usage_metadata.candidates_token_count
 
         # Stream chunks
         full_text = ""
-        for chunk in response:
-            if chunk.text:
-                full_text += chunk.text
-                yield {
-                    "chunk": chunk.text,
-                    "full_text": full_text,
-                    "provider": "gemini",
-                    "model": settings.GOOGLE_MODEL
-                }
+        async for text in _iterate_in_thread(text_stream):
+            full_text += text
+            yield {
+                "chunk": text,
+                "full_text": full_text,
+                "provider": "gemini",
+                "model": settings.GOOGLE_MODEL
+            }
 
-        # After streaming completes, get final token counts
-        # Note: Token counts are only available after streaming completes
         logger.info(f"Gemini streaming completed, generated {len(full_text)} characters")
 
     async def _generate_gemini_with_functions(
@@ -1076,7 +1614,8 @@ class AIProviderService:
         )]
 
         # Generate content with function calling
-        response = model.generate_content(
+        response = await _in_thread(
+            model.generate_content,
             full_prompt,
             generation_config=genai.types.GenerationConfig(
                 max_output_tokens=max_tokens,
@@ -1166,7 +1705,8 @@ class AIProviderService:
         full_prompt = f"{cache_context}\n\n{prompt}"
 
         # Generate content (caching is automatic for repeated contexts)
-        response = model.generate_content(
+        response = await _in_thread(
+            model.generate_content,
             full_prompt,
             generation_config=genai.types.GenerationConfig(
                 max_output_tokens=max_tokens,
@@ -1226,7 +1766,8 @@ class AIProviderService:
         task: AITask,
         system_prompt: Optional[str] = None,
         max_tokens: int = 4000,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        cache: bool = False
     ) -> Dict[str, Any]:
         """
         Generate text with JSON schema validation using GPT-4o Structured Outputs
@@ -1247,6 +1788,7 @@ class AIProviderService:
             system_prompt: Optional system instructions
             max_tokens: Maximum tokens to generate
             temperature: Lower = more deterministic (default 0.3 for structured data)
+            cache: Serve/store the response through the LLM response cache
 
         Returns:
             dict with keys:
@@ -1274,6 +1816,16 @@ class AIProviderService:
         if not self.openai_client:
             raise ValueError("OpenAI client not initialized")
 
+        if cache:
+            cache_key = llm_response_cache.make_key(
+                "gpt4", "gpt-4o", prompt, system_prompt, schema=schema,
+                params={"max_tokens": max_tokens, "temperature": temperature}
+            )
+            return await self._cached(
+                cache_key, task,
+                partial(self.generate_text_with_schema, prompt, schema, task, system_prompt, max_tokens, temperature)
+            )
+
         # Build messages
         messages = []
         if system_prompt:
@@ -1283,16 +1835,25 @@ class AIProviderService:
         # Use GPT-4o with structured outputs (response_format)
         logger.info(f"Generating structured output with schema: {schema.get('name', 'unknown')}")
 
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4o",  # Only GPT-4o supports structured outputs
-            messages=messages,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            response_format={
-                "type": "json_schema",
-                "json_schema": schema
-            }
-        )
+        async with llm_scheduler.admit(
+            "gpt4", estimate_tokens(prompt, system_prompt, max_tokens=max_tokens)
+        ) as admission:
+            try:
+                response = await _in_thread(
+                    self.openai_client.chat.completions.create,
+                    model="gpt-4o",  # Only GPT-4o supports structured outputs
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": schema
+                    }
+                )
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    llm_scheduler.record_rate_limited("gpt4")
+                raise
 
         # Extract and parse response
         # With structured outputs, this is GUARANTEED to be valid JSON matching the schema
@@ -1304,6 +1865,7 @@ class AIProviderService:
         input_tokens = response.usage.prompt_tokens
         output_tokens = response.usage.completion_tokens
         total_tokens = input_tokens + output_tokens
+        llm_scheduler.settle(admission, total_tokens)
 
         cost_usd = (
             (input_tokens / 1000) * settings.OPENAI_GPT4O_INPUT_COST_PER_1K +
@@ -1324,7 +1886,8 @@ class AIProviderService:
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
             "cost_usd": cost_usd,
-            "schema_name": schema.get("name", "unknown")
+            "schema_name": schema.get("name", "unknown"),
+            "queue_delay_ms": admission.queue_delay_ms
         }
 
     async def generate_batch_structured_outputs(
@@ -1612,7 +2175,8 @@ Emphasize ACTIONABLE clinical knowledge that neurosurgeons can apply in practice
             )
 
             # Generate content with grounding
-            response = client.models.generate_content(
+            response = await _in_thread(
+                client.models.generate_content,
                 model=settings.GOOGLE_MODEL,
                 contents=prompt,
                 config=config,
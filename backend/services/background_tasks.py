@@ -3,11 +3,14 @@ Background Tasks for PDF Processing
 Celery tasks for asynchronous PDF indexing, image analysis, and embedding generation
 """
 
-from celery import Task, chain, group
-from typing import Dict, Any, List
+from celery import Task, chain, chord, group
+from celery.canvas import Signature
+from celery.exceptions import Ignore
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import time
 
+from backend.config import settings
 from backend.services.celery_app import celery_app
 from backend.database.connection import db
 from backend.database.models import PDF, Image
@@ -45,6 +48,51 @@ class DatabaseTask(Task):
             self._db_session = None
 
 
+def _record_step(pdf_id: str, step: str, started: float, **metadata) -> None:
+    """Checkpoint a pipeline step with its duration (read back by finalize for timings)"""
+    TaskCheckpoint(task_id=pdf_id, task_type="pdf_processing").mark_step_complete(step, metadata={
+        "duration_seconds": round(time.time() - started, 3),
+        **metadata
+    })
+
+
+def build_pdf_pipeline(pdf_id: str) -> Signature:
+    """
+    Celery canvas for processing one PDF
+
+    Text extraction runs first; everything else depends only on text or on
+    extracted images, so three branches then run concurrently and join in a
+    chord on finalize:
+
+        extract_text ─┬─ extract_images → analyze_images (fan-out) → image embeddings ─┐
+                      ├─ text chunk embeddings ─────────────────────────────────────────┼─ finalize
+                      └─ citations ─────────────────────────────────────────────────────┘
+
+    Image tasks run on the `images` queue and embedding tasks on `embeddings`
+    (celery_app task_routes). Immutable signatures (.si) keep Celery from
+    passing results between tasks.
+
+    Steps share nothing in memory: branches run on different queues and
+    workers, so each step loads its own rows and text and image extraction
+    each open the PDF file once.
+    """
+    return chain(
+        extract_text_task.si(pdf_id),
+        chord(
+            group(
+                chain(
+                    extract_images_task.si(pdf_id),
+                    analyze_images_task.si(pdf_id),
+                    generate_image_embeddings_task.si(pdf_id)
+                ),
+                generate_embeddings_task.si(pdf_id),
+                extract_citations_task.si(pdf_id)
+            ),
+            finalize_pdf_processing.si(pdf_id)
+        )
+    )
+
+
 @celery_app.task(
     bind=True,
     base=DatabaseTask,
@@ -56,12 +104,17 @@ def process_pdf_async(self, pdf_id: str) -> Dict[str, Any]:
     """
     Main orchestration task for PDF processing pipeline
 
-    Workflow:
+    Workflow (see build_pdf_pipeline):
     1. Extract text
-    2. Extract images
-    3. Analyze images (Claude Vision)
-    4. Generate embeddings
-    5. Extract citations
+    2. Concurrently:
+       - Extract images → analyze images (Claude Vision, sub-batches) → image embeddings
+       - Generate text chunk embeddings
+       - Extract citations
+    3. Finalize (chord)
+
+    A PDF whose content (SHA-256) was already processed skips the pipeline:
+    text, chunks, images and embeddings are copied from that PDF and only
+    finalize runs.
 
     Args:
         pdf_id: PDF document ID
@@ -81,16 +134,22 @@ def process_pdf_async(self, pdf_id: str) -> Dict[str, Any]:
         pdf.processing_started_at = time.time()
         self.db_session.commit()
 
-        # Execute pipeline as chain
-        # Use .si() (immutable signature) to prevent Celery from passing previous results as arguments
-        workflow = chain(
-            extract_text_task.si(pdf_id),
-            extract_images_task.si(pdf_id),
-            analyze_images_task.si(pdf_id),
-            generate_embeddings_task.si(pdf_id),
-            extract_citations_task.si(pdf_id),
-            finalize_pdf_processing.si(pdf_id)
-        )
+        # Identical content already processed: reuse its results
+        pdf_service = PDFService(self.db_session)
+        source = pdf_service.find_processed_copy(pdf)
+        if source:
+            reused = pdf_service.reuse_processed_pdf(pdf, source)
+            result = finalize_pdf_processing.si(pdf_id).apply_async()
+
+            logger.info(f"PDF {pdf_id} is identical to processed PDF {source.id}, pipeline skipped")
+
+            return {
+                **reused,
+                "task_id": result.id
+            }
+
+        # Execute pipeline as a DAG: independent branches run concurrently
+        workflow = build_pdf_pipeline(pdf_id)
 
         result = workflow.apply_async()
 
@@ -179,6 +238,7 @@ def extract_text_task(self, pdf_id: str) -> Dict[str, Any]:
         }
 
     logger.info(f"Extracting text from PDF: {pdf_id}")
+    started = time.time()
 
     try:
         pdf_service = PDFService(self.db_session)
@@ -189,10 +249,13 @@ def extract_text_task(self, pdf_id: str) -> Dict[str, Any]:
         logger.info(f"Text extraction complete for {pdf_id}: {result.get('total_pages', 0)} pages, {result.get('total_words', 0)} words")
 
         # Mark step complete in checkpoint
-        checkpoint.mark_step_complete("text_extraction", metadata={
-            "page_count": result.get("total_pages", 0),
-            "text_length": result.get("total_text_length", 0)
-        })
+        _record_step(
+            pdf_id,
+            "text_extraction",
+            started,
+            page_count=result.get("total_pages", 0),
+            text_length=result.get("total_text_length", 0)
+        )
 
         # Emit WebSocket event
         import asyncio
@@ -233,6 +296,7 @@ def extract_images_task(self, pdf_id: str) -> Dict[str, Any]:
         Extraction summary
     """
     logger.info(f"Extracting images from PDF: {pdf_id}")
+    started = time.time()
 
     try:
         pdf_service = PDFService(self.db_session)
@@ -241,6 +305,13 @@ def extract_images_task(self, pdf_id: str) -> Dict[str, Any]:
         result = pdf_service.extract_images(pdf_id)
 
         logger.info(f"Image extraction complete for {pdf_id}: {result.get('total_images', 0)} images")
+        _record_step(
+            pdf_id,
+            "image_extraction",
+            started,
+            image_count=result.get('total_images', 0),
+            api_calls_avoided=result.get('api_calls_avoided', 0)
+        )
 
         # Emit WebSocket event
         import asyncio
@@ -272,97 +343,155 @@ def analyze_images_task(self, pdf_id: str) -> Dict[str, Any]:
     """
     Analyze images using Claude Vision (95% complete analysis)
 
+    Fans out: the task replaces itself with a group of analyze_image_batch_task
+    sub-batches (PDF_IMAGE_ANALYSIS_BATCH_SIZE images each) that run in
+    parallel on the images queue. Images that already have a description
+    and perceptual duplicates are not analyzed.
+
     Args:
         pdf_id: PDF document ID
 
     Returns:
-        Analysis summary
+        Analysis summary (when there is nothing to analyze)
     """
     logger.info(f"Analyzing images for PDF: {pdf_id}")
 
     try:
-        # Get all images for this PDF
-        images = self.db_session.query(Image).filter(Image.pdf_id == pdf_id).all()
-
-        if not images:
-            logger.info(f"No images found for PDF {pdf_id}")
+        # Only IDs here; each sub-batch loads its own rows. Perceptual
+        # duplicates inherit their canonical image's analysis instead
+        image_ids = [
+            str(image_id) for (image_id,) in self.db_session.query(Image.id).filter(
+                Image.pdf_id == pdf_id,
+                Image.ai_description.is_(None),
+                Image.is_duplicate.is_(False)
+            ).all()
+        ]
+
+        if not image_ids:
+            logger.info(f"No images to analyze for PDF {pdf_id}")
             return {
                 "pdf_id": pdf_id,
                 "image_count": 0,
                 "status": "no_images"
             }
 
-        # Get PDF for context
+        # Get PDF for context (shared by all sub-batches)
         pdf = self.db_session.query(PDF).filter(PDF.id == pdf_id).first()
-
-        # Analyze images
-        image_service = ImageAnalysisService()
-
-        # Build context
         context = {
             "pdf_title": pdf.title if pdf else "Unknown",
             "pdf_id": pdf_id
         }
 
+        batch_size = settings.PDF_IMAGE_ANALYSIS_BATCH_SIZE
+        batches = [image_ids[i:i + batch_size] for i in range(0, len(image_ids), batch_size)]
+
+        logger.info(f"Fanning out analysis of {len(image_ids)} images for {pdf_id} in {len(batches)} sub-batches")
+
+        # The rest of the chain (image embeddings) runs once every sub-batch is done
+        raise self.replace(group(
+            analyze_image_batch_task.si(pdf_id, batch, context, index)
+            for index, batch in enumerate(batches)
+        ))
+
+    except Exception as e:
+        if isinstance(e, Ignore):
+            raise
+        logger.error(f"Image analysis failed for {pdf_id}: {str(e)}", exc_info=True)
+        raise
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.background_tasks.analyze_image_batch_task"
+)
+def analyze_image_batch_task(
+    self,
+    pdf_id: str,
+    image_ids: List[str],
+    context: Optional[Dict[str, Any]] = None,
+    batch_index: int = 0
+) -> Dict[str, Any]:
+    """
+    Analyze one sub-batch of a PDF's images with Claude Vision
+
+    Args:
+        pdf_id: PDF document ID
+        image_ids: Images in this sub-batch
+        context: Shared analysis context (PDF title)
+        batch_index: Position of the sub-batch (for checkpoint timings)
+
+    Returns:
+        Analysis summary for the sub-batch
+    """
+    started = time.time()
+
+    try:
+        images = self.db_session.query(Image).filter(Image.id.in_(image_ids)).all()
+
         # Analyze images in batch (async operation)
         import asyncio
-        image_paths = [img.file_path for img in images]
+        image_service = ImageAnalysisService()
         analyses = asyncio.run(
-            image_service.analyze_images_batch(image_paths, context)
+            image_service.analyze_images_batch([img.file_path for img in images], context)
         )
 
         # Update image records with analysis
         for image, analysis in zip(images, analyses):
             if analysis.get("analysis"):
-                image.ai_description = self._build_description(analysis["analysis"])
+                image.ai_description = _build_image_description(analysis["analysis"])
                 image.analysis_metadata = analysis["analysis"]
                 image.analysis_confidence = analysis.get("confidence_score", 0.0)
 
         self.db_session.commit()
 
-        logger.info(f"Image analysis complete for {pdf_id}: {len(analyses)} images")
+        analyzed_count = sum(1 for a in analyses if a.get("analysis"))
+        _record_step(pdf_id, f"image_analysis_{batch_index}", started, image_count=len(images))
+
+        logger.info(f"Image analysis sub-batch {batch_index} complete for {pdf_id}: {analyzed_count}/{len(images)} images")
 
         # Emit WebSocket event
-        analyzed_count = sum(1 for a in analyses if a.get("analysis"))
         asyncio.run(emitter.emit_pdf_processing_event(
             pdf_id,
             EventType.PDF_IMAGES_ANALYZED,
             "image_analysis",
-            f"Analyzed {analyzed_count} images with Claude Vision",
+            f"Analyzed {analyzed_count} images with Claude Vision (batch {batch_index + 1})",
             progress=60
         ))
 
         return {
             "pdf_id": pdf_id,
-            "image_count": len(analyses),
+            "batch_index": batch_index,
+            "image_count": len(images),
             "analyzed_count": analyzed_count,
             "status": "completed"
         }
 
     except Exception as e:
-        logger.error(f"Image analysis failed for {pdf_id}: {str(e)}", exc_info=True)
+        logger.error(f"Image analysis sub-batch {batch_index} failed for {pdf_id}: {str(e)}", exc_info=True)
         raise
 
-    def _build_description(self, analysis: Dict[str, Any]) -> str:
-        """Build human-readable description from analysis"""
-        parts = []
 
-        image_type = analysis.get("image_type", "Unknown")
-        modality = analysis.get("modality", "")
-        parts.append(f"{image_type}")
+def _build_image_description(analysis: Dict[str, Any]) -> str:
+    """Build human-readable description from analysis"""
+    parts = []
 
-        if modality:
-            parts.append(f"({modality})")
+    image_type = analysis.get("image_type", "Unknown")
+    modality = analysis.get("modality", "")
+    parts.append(f"{image_type}")
 
-        structures = analysis.get("anatomical_structures", [])
-        if structures:
-            parts.append(f"showing {', '.join(structures[:3])}")
+    if modality:
+        parts.append(f"({modality})")
 
-        pathology = analysis.get("pathology")
-        if pathology:
-            parts.append(f"with {pathology}")
+    structures = analysis.get("anatomical_structures", [])
+    if structures:
+        parts.append(f"showing {', '.join(structures[:3])}")
 
-        return " ".join(parts)
+    pathology = analysis.get("pathology")
+    if pathology:
+        parts.append(f"with {pathology}")
+
+    return " ".join(parts)
 
 
 @celery_app.task(
@@ -372,7 +501,11 @@ def analyze_images_task(self, pdf_id: str) -> Dict[str, Any]:
 )
 def generate_embeddings_task(self, pdf_id: str) -> Dict[str, Any]:
     """
-    Generate vector embeddings for PDF and its images
+    Generate text chunk embeddings for a PDF
+
+    Needs only the extracted text, so it runs alongside image processing;
+    image embeddings are generated by generate_image_embeddings_task once
+    the images are analyzed.
 
     Args:
         pdf_id: PDF document ID
@@ -381,64 +514,134 @@ def generate_embeddings_task(self, pdf_id: str) -> Dict[str, Any]:
         Embedding generation summary
     """
     logger.info(f"Generating embeddings for PDF: {pdf_id}")
+    started = time.time()
 
-    try:
-        embedding_service = EmbeddingService(self.db_session)
-
-        # Generate PDF embeddings
-        import asyncio
-        pdf_result = asyncio.run(
-            embedding_service.generate_pdf_embeddings(pdf_id)
-        )
+    async def run() -> Dict[str, Any]:
+        # Generate PDF chunk embeddings (sets embeddings_generated)
+        pdf_result = await EmbeddingService(self.db_session).generate_pdf_embeddings(pdf_id)
 
-        # Generate image embeddings
-        images = self.db_session.query(Image).filter(
-            Image.pdf_id == pdf_id,
-            Image.ai_description.isnot(None)
-        ).all()
-
-        image_count = 0
-        for image in images:
-            try:
-                asyncio.run(
-                    embedding_service.generate_image_embeddings(
-                        str(image.id),
-                        image.ai_description
-                    )
-                )
-                image_count += 1
-            except Exception as img_error:
-                logger.error(f"Failed to generate embedding for image {image.id}: {str(img_error)}")
-
-        logger.info(f"Embedding generation complete for {pdf_id}: {image_count} images")
-
-        # Update PDF record
-        pdf = self.db_session.query(PDF).filter(PDF.id == pdf_id).first()
-        if pdf:
-            pdf.embeddings_generated = True
-            self.db_session.commit()
+        _record_step(pdf_id, "text_embeddings", started, chunk_count=pdf_result.get("num_chunks", 0))
+        logger.info(f"Text embedding generation complete for {pdf_id}: {pdf_result.get('num_chunks', 0)} chunks")
 
         # Emit WebSocket event
-        asyncio.run(emitter.emit_pdf_processing_event(
+        await emitter.emit_pdf_processing_event(
             pdf_id,
             EventType.PDF_EMBEDDINGS_GENERATED,
             "embedding_generation",
-            f"Generated embeddings for PDF and {image_count} images",
+            f"Generated embeddings for {pdf_result.get('num_chunks', 0)} text chunks",
             progress=80
-        ))
+        )
 
         return {
             "pdf_id": pdf_id,
             "pdf_embedding": "completed",
-            "image_embeddings": image_count,
+            "chunk_count": pdf_result.get("num_chunks", 0),
             "status": "completed"
         }
 
+    try:
+        import asyncio
+        return asyncio.run(run())
+
     except Exception as e:
         logger.error(f"Embedding generation failed for {pdf_id}: {str(e)}", exc_info=True)
         raise
 
 
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.background_tasks.generate_image_embeddings_task",
+    max_retries=3,
+    default_retry_delay=60
+)
+def generate_image_embeddings_task(self, pdf_id: str) -> Dict[str, Any]:
+    """
+    Generate embeddings for a PDF's analyzed images
+
+    Runs on a single event loop: descriptions are embedded in batched
+    requests and written with bulk updates. The id of the last image written
+    is kept as a cursor, so a retry resumes after it instead of re-embedding
+    the whole PDF. Perceptual duplicates are skipped and then inherit the
+    analysis and embedding of their canonical image.
+
+    Args:
+        pdf_id: PDF document ID
+
+    Returns:
+        Embedding generation summary
+    """
+    logger.info(f"Generating image embeddings for PDF: {pdf_id}")
+    started = time.time()
+    cursor = TaskCheckpoint(task_id=pdf_id, task_type="image_embeddings")
+
+    async def run() -> Dict[str, Any]:
+        resume = cursor.get_metadata() or {}
+        if resume:
+            logger.info(f"Resuming image embeddings for {pdf_id} after image {resume['last_image_id']}")
+
+        def save_cursor(last_image_id: str, embedded: int) -> None:
+            cursor.set_metadata({
+                "last_image_id": last_image_id,
+                "embedded_count": resume.get("embedded_count", 0) + embedded
+            })
+
+        result = await EmbeddingService(self.db_session).generate_pdf_image_embeddings(
+            pdf_id,
+            after_id=resume.get("last_image_id"),
+            on_progress=save_cursor
+        )
+        image_count = resume.get("embedded_count", 0) + result["embedded_count"]
+
+        # Duplicates reuse the canonical image's analysis and embedding
+        from backend.services.image_duplicate_detection_service import ImageDuplicateDetectionService
+        inherited_count = ImageDuplicateDetectionService(self.db_session).inherit_canonical_results(pdf_id)
+
+        _record_step(
+            pdf_id, "image_embeddings", started,
+            image_count=image_count,
+            failed_count=result["failed_count"],
+            requests=result["requests"],
+            inherited_count=inherited_count
+        )
+        cursor.clear_checkpoint()
+        logger.info(
+            f"Image embedding generation complete for {pdf_id}: {image_count} images "
+            f"in {result['requests']} requests, {inherited_count} duplicates inherited"
+        )
+
+        # Emit WebSocket event
+        await emitter.emit_pdf_processing_event(
+            pdf_id,
+            EventType.PDF_EMBEDDINGS_GENERATED,
+            "image_embedding_generation",
+            f"Generated embeddings for {image_count} images",
+            progress=85
+        )
+
+        return {
+            "pdf_id": pdf_id,
+            "image_embeddings": image_count,
+            "failed_embeddings": result["failed_count"],
+            "inherited_from_canonical": inherited_count,
+            "status": "completed"
+        }
+
+    try:
+        import asyncio
+        return asyncio.run(run())
+
+    except Exception as e:
+        logger.error(f"Image embedding generation failed for {pdf_id}: {str(e)}", exc_info=True)
+        self.db_session.rollback()
+
+        if self.request.retries < self.max_retries:
+            logger.info(f"Retrying image embeddings for {pdf_id} from cursor (attempt {self.request.retries + 1})")
+            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+
+        raise
+
+
 @celery_app.task(
     bind=True,
     base=DatabaseTask,
@@ -455,6 +658,7 @@ def extract_citations_task(self, pdf_id: str) -> Dict[str, Any]:
         Citation extraction summary
     """
     logger.info(f"Extracting citations from PDF: {pdf_id}")
+    started = time.time()
 
     try:
         pdf_service = PDFService(self.db_session)
@@ -478,6 +682,7 @@ def extract_citations_task(self, pdf_id: str) -> Dict[str, Any]:
         # Update PDF
         pdf.citations = citations
         self.db_session.commit()
+        _record_step(pdf_id, "citation_extraction", started, citation_count=len(citations))
 
         logger.info(f"Citation extraction complete for {pdf_id}: {len(citations)} citations")
 
@@ -511,7 +716,9 @@ def finalize_pdf_processing(self, pdf_id: str) -> Dict[str, Any]:
     """
     Finalize PDF processing after all stages complete
 
-    Clears checkpoint data on successful completion
+    Runs as the chord callback once every branch is done. Reports pipeline
+    wall time next to the per-step durations and clears checkpoint data on
+    successful completion
 
     Args:
         pdf_id: PDF document ID
@@ -531,22 +738,43 @@ def finalize_pdf_processing(self, pdf_id: str) -> Dict[str, Any]:
         pdf.indexing_status = "completed"
         pdf.processing_completed_at = time.time()
 
-        # Clear checkpoint (all steps complete)
+        # Step timings recorded by the pipeline tasks, then clear checkpoint (all steps complete)
         checkpoint = TaskCheckpoint(task_id=pdf_id, task_type="pdf_processing")
+        steps = checkpoint.get_all_steps()
+        timings = pipeline_timings(steps)
+        api_calls_avoided = (steps.get("image_extraction", {}).get("metadata") or {}).get("api_calls_avoided", 0)
         checkpoint.clear_checkpoint()
         logger.info(f"PDF processing complete, checkpoint cleared for: {pdf_id}")
 
-        # Calculate processing time
+        # Calculate processing time (wall clock, from orchestration start)
+        processing_time = None
         if pdf.processing_started_at:
             processing_time = float(pdf.processing_completed_at) - float(pdf.processing_started_at)
-            logger.info(f"PDF {pdf_id} processed in {processing_time:.2f} seconds")
+            logger.info(
+                f"PDF {pdf_id} processed in {processing_time:.2f} seconds wall time "
+                f"({timings['total_step_seconds']:.2f}s of step time, "
+                f"{timings['image_analysis_batches']} image analysis sub-batches)"
+            )
+        if api_calls_avoided:
+            logger.info(f"PDF {pdf_id}: {api_calls_avoided} vision/embedding calls avoided by perceptual dedup")
 
         self.db_session.commit()
 
+        # Index MinHash signature so near-duplicate lookups see this PDF immediately
+        try:
+            from backend.services.similarity_service import SimilarityService
+            SimilarityService(self.db_session).index_content("pdf", pdf_id, pdf.extracted_text)
+        except Exception as sig_error:
+            logger.warning(f"MinHash indexing failed for {pdf_id}: {str(sig_error)}")
+
         # Build summary
         summary = {
             "pdf_id": pdf_id,
             "status": "completed",
+            "wall_time_seconds": round(processing_time, 3) if processing_time is not None else None,
+            "step_seconds": timings["step_seconds"],
+            "total_step_seconds": timings["total_step_seconds"],
+            "api_calls_avoided": api_calls_avoided,
             "stages": {
                 "text_extraction": "completed",
                 "image_extraction": "completed",
@@ -564,7 +792,8 @@ def finalize_pdf_processing(self, pdf_id: str) -> Dict[str, Any]:
             pdf_id,
             EventType.PDF_PROCESSING_COMPLETED,
             "finalization",
-            "PDF processing completed successfully",
+            "PDF processing completed successfully"
+            + (f" in {processing_time:.1f}s" if processing_time is not None else ""),
             progress=100
         ))
 
@@ -585,6 +814,31 @@ def finalize_pdf_processing(self, pdf_id: str) -> Dict[str, Any]:
         raise
 
 
+def pipeline_timings(steps: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Per-step durations from a PDF's checkpoint (see _record_step)
+
+    Image analysis sub-batches are summed into one "image_analysis" entry.
+    With concurrent branches the total step time exceeds the wall time.
+    """
+    step_seconds: Dict[str, float] = {}
+    batches = 0
+    for name, data in steps.items():
+        duration = (data.get("metadata") or {}).get("duration_seconds")
+        if duration is None:
+            continue
+        if name.startswith("image_analysis_"):
+            name = "image_analysis"
+            batches += 1
+        step_seconds[name] = round(step_seconds.get(name, 0.0) + duration, 3)
+
+    return {
+        "step_seconds": step_seconds,
+        "total_step_seconds": round(sum(step_seconds.values()), 3),
+        "image_analysis_batches": batches
+    }
+
+
 # Helper function to start PDF processing
 def start_pdf_processing(pdf_id: str) -> Dict[str, Any]:
     """
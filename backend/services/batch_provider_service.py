@@ -18,6 +18,7 @@ from datetime import datetime
 from enum import Enum
 
 from backend.services.ai_provider_service import AIProviderService, AITask, AIProvider
+from backend.services.llm_scheduler import RequestPriority, set_request_priority
 from backend.schemas.ai_schemas import get_schema_by_name
 from backend.utils import get_logger
 
@@ -98,6 +99,8 @@ class BatchProviderService:
 
         async def process_single_prompt(prompt_data: Dict[str, Any], index: int):
             """Process a single prompt with rate limiting"""
+            # Runs as its own task (as_completed): queue behind interactive requests
+            set_request_priority(RequestPriority.BATCH)
             async with self.semaphore:
                 try:
                     result = await self.ai_service.generate_text(
@@ -238,6 +241,8 @@ class BatchProviderService:
 
         async def process_single_structured(prompt_data: Dict[str, Any], index: int):
             """Process a single structured output request"""
+            # Runs as its own task (as_completed): queue behind interactive requests
+            set_request_priority(RequestPriority.BATCH)
             async with self.semaphore:
                 try:
                     result = await self.ai_service.generate_text_with_schema(
@@ -0,0 +1,243 @@
+"""
+Blob Store
+Reference counts of content-addressed files (storage_blobs) and garbage
+collection of files no record references any more
+
+StorageService decides where a file lives (its path is derived from its
+SHA-256); this service records which blobs exist and how many logical
+records point at each one. A record takes a reference in the same
+transaction that inserts it and releases it when deleted:
+
+- pdfs.content_sha256 (one per PDF record)
+- pdf_books.content_sha256 (one per book)
+- images.content_sha256 (one per image row, shared across PDFs/editions)
+
+Uploads are registered with zero references before the record exists, so
+a file whose ingestion never finished is collected like any other orphan.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import time
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database.models import StorageBlob
+from backend.services.storage_service import StorageService
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+# (sha256, file_path, size_bytes); records without a hash predate content addressing
+BlobFile = Tuple[Optional[str], str, Optional[int]]
+
+
+class BlobStore:
+    """
+    Reference counting for content-addressed storage
+
+    Methods only execute statements; callers commit together with the
+    records that take or drop the references (except collect_garbage).
+    """
+
+    _UPSERT_SQL = text("""
+        INSERT INTO storage_blobs (sha256, kind, file_path, size_bytes, ref_count, created_at)
+        SELECT t.sha256, :kind, t.file_path, t.size_bytes, t.refs, NOW()
+        FROM unnest(
+            CAST(:shas AS VARCHAR[]),
+            CAST(:paths AS VARCHAR[]),
+            CAST(:sizes AS BIGINT[]),
+            CAST(:refs AS INTEGER[])
+        ) AS t(sha256, file_path, size_bytes, refs)
+        ON CONFLICT (sha256) DO UPDATE
+        SET ref_count = storage_blobs.ref_count + EXCLUDED.ref_count,
+            released_at = CASE
+                WHEN storage_blobs.ref_count + EXCLUDED.ref_count = 0 THEN NOW()
+                ELSE NULL
+            END
+    """)
+
+    _RELEASE_SQL = text("""
+        UPDATE storage_blobs AS b
+        SET ref_count = GREATEST(b.ref_count - r.refs, 0),
+            released_at = CASE WHEN b.ref_count <= r.refs THEN NOW() ELSE b.released_at END
+        FROM unnest(CAST(:shas AS VARCHAR[]), CAST(:refs AS INTEGER[])) AS r(sha256, refs)
+        WHERE b.sha256 = r.sha256
+    """)
+
+    _COUNT_REFERENCES_SQL = text("""
+        SELECT sha256, COUNT(*) FROM (
+            SELECT content_sha256 AS sha256 FROM pdfs WHERE content_sha256 = ANY(CAST(:shas AS VARCHAR[]))
+            UNION ALL
+            SELECT content_sha256 FROM pdf_books WHERE content_sha256 = ANY(CAST(:shas AS VARCHAR[]))
+            UNION ALL
+            SELECT content_sha256 FROM images WHERE content_sha256 = ANY(CAST(:shas AS VARCHAR[]))
+        ) AS refs
+        GROUP BY sha256
+    """)
+
+    def __init__(self, db: Session, storage: Optional[StorageService] = None):
+        """
+        Initialize blob store
+
+        Args:
+            db: Database session
+            storage: Storage service (created lazily; only garbage collection deletes files)
+        """
+        self.db = db
+        self._storage = storage
+
+    @property
+    def storage(self) -> StorageService:
+        if self._storage is None:
+            self._storage = StorageService()
+        return self._storage
+
+    def add_references(self, kind: str, files: Iterable[BlobFile]) -> int:
+        """
+        Take one reference per file (blobs are created on first reference)
+
+        Args:
+            kind: Blob kind (pdf or image)
+            files: (sha256, file_path, size_bytes) per referencing record
+
+        Returns:
+            Number of references taken
+        """
+        return self._upsert(kind, files, count_references=True)
+
+    def register(self, kind: str, files: Iterable[BlobFile]) -> None:
+        """
+        Record stored files without taking a reference
+
+        Used for uploads stored before their record exists; restarts the
+        garbage-collection clock of an unreferenced blob.
+        """
+        self._upsert(kind, files, count_references=False)
+
+    def _upsert(self, kind: str, files: Iterable[BlobFile], count_references: bool) -> int:
+        refs: Counter = Counter()
+        details: Dict[str, Tuple[str, Optional[int]]] = {}
+        for sha256, file_path, size_bytes in files:
+            if not sha256:
+                continue
+            refs[sha256] += 1 if count_references else 0
+            details[sha256] = (str(file_path), size_bytes)
+
+        if not details:
+            return 0
+
+        # One statement; each hash appears once so ON CONFLICT touches a row at most once
+        shas = sorted(details)
+        self.db.execute(self._UPSERT_SQL, {
+            "kind": kind,
+            "shas": shas,
+            "paths": [details[sha][0] for sha in shas],
+            "sizes": [details[sha][1] for sha in shas],
+            "refs": [refs[sha] for sha in shas]
+        })
+        return sum(refs.values())
+
+    def release(self, sha256s: Iterable[Optional[str]]) -> int:
+        """
+        Drop one reference per hash (records being deleted)
+
+        Args:
+            sha256s: content_sha256 of each deleted record (None entries ignored)
+
+        Returns:
+            Number of references released
+        """
+        refs = Counter(sha for sha in sha256s if sha)
+        if not refs:
+            return 0
+
+        shas = sorted(refs)
+        self.db.execute(self._RELEASE_SQL, {"shas": shas, "refs": [refs[sha] for sha in shas]})
+        return sum(refs.values())
+
+    def count_references(self, sha256s: List[str]) -> Dict[str, int]:
+        """Records actually pointing at each blob (ground truth for ref_count)"""
+        if not sha256s:
+            return {}
+        return {
+            sha: count
+            for sha, count in self.db.execute(self._COUNT_REFERENCES_SQL, {"shas": list(sha256s)})
+        }
+
+    def collect_garbage(
+        self,
+        grace_hours: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Delete one batch of blobs unreferenced for longer than the grace period
+
+        Candidate rows are locked (SKIP LOCKED, so concurrent collectors split
+        the work) and re-checked against the referencing tables: a blob whose
+        count drifted gets its count repaired instead of being deleted. A file
+        touched within the grace period (re-stored by a new upload or
+        extraction) is kept and its clock restarted. The file is deleted
+        before the row is, while the row is locked, so a concurrent upload of
+        the same content waits and then stores a fresh copy.
+
+        Args:
+            grace_hours: Minimum unreferenced time (STORAGE_BLOB_GC_GRACE_HOURS)
+            limit: Batch size (STORAGE_BLOB_GC_BATCH_SIZE)
+
+        Returns:
+            Dict with examined, deleted, bytes_freed, repaired, skipped_recent, failed
+        """
+        grace_hours = settings.STORAGE_BLOB_GC_GRACE_HOURS if grace_hours is None else grace_hours
+        limit = limit or settings.STORAGE_BLOB_GC_BATCH_SIZE
+        stats = {"examined": 0, "deleted": 0, "bytes_freed": 0, "repaired": 0, "skipped_recent": 0, "failed": 0}
+
+        unreferenced_since = func.coalesce(StorageBlob.released_at, StorageBlob.created_at)
+        blobs = self.db.query(StorageBlob).filter(
+            StorageBlob.ref_count == 0,
+            unreferenced_since < func.now() - timedelta(hours=grace_hours)
+        ).order_by(unreferenced_since).limit(limit).with_for_update(skip_locked=True).all()
+
+        stats["examined"] = len(blobs)
+        if not blobs:
+            self.db.commit()
+            return stats
+
+        references = self.count_references([blob.sha256 for blob in blobs])
+        touched_after = time.time() - grace_hours * 3600
+
+        for blob in blobs:
+            actual = references.get(blob.sha256, 0)
+            if actual:
+                logger.warning(f"Blob {blob.sha256} has {actual} references but ref_count 0, repaired")
+                blob.ref_count = actual
+                blob.released_at = None
+                stats["repaired"] += 1
+                continue
+
+            path = Path(blob.file_path)
+            if path.exists() and path.stat().st_mtime > touched_after:
+                blob.released_at = func.now()
+                stats["skipped_recent"] += 1
+                continue
+
+            if not self.storage.delete_blob(blob.kind, blob.file_path, blob.sha256):
+                stats["failed"] += 1
+                continue
+
+            self.db.delete(blob)
+            stats["deleted"] += 1
+            stats["bytes_freed"] += blob.size_bytes or 0
+
+        self.db.commit()
+
+        logger.info(
+            f"Blob garbage collection: {stats['deleted']}/{stats['examined']} deleted "
+            f"({stats['bytes_freed']} bytes), {stats['repaired']} repaired, "
+            f"{stats['skipped_recent']} recently stored, {stats['failed']} failed"
+        )
+        return stats
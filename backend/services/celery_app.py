@@ -4,10 +4,12 @@ Handles asynchronous PDF indexing, image analysis, and embedding generation
 """
 
 from celery import Celery
+from celery.signals import task_prerun
 from kombu import Queue
 import os
 
 from backend.config.settings import settings
+from backend.services.llm_scheduler import RequestPriority, set_request_priority
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
@@ -27,13 +29,23 @@ celery_app.conf.update(
         "backend.services.background_tasks.extract_text_task": {"queue": "default"},
         "backend.services.background_tasks.extract_images_task": {"queue": "images"},
         "backend.services.background_tasks.analyze_images_task": {"queue": "images"},
+        "backend.services.background_tasks.analyze_image_batch_task": {"queue": "images"},
         "backend.services.background_tasks.generate_embeddings_task": {"queue": "embeddings"},
+        "backend.services.background_tasks.generate_image_embeddings_task": {"queue": "embeddings"},
         "backend.services.background_tasks.extract_citations_task": {"queue": "default"},
         "backend.services.background_tasks.finalize_pdf_processing": {"queue": "default"},
         # Chapter-level vector search tasks (Phase 5)
         "backend.services.chapter_embedding_service.generate_chapter_embeddings": {"queue": "embeddings"},
         "backend.services.chapter_embedding_service.generate_chunk_embeddings": {"queue": "embeddings"},
+        "backend.services.chapter_embedding_service.embed_book_chapters": {"queue": "embeddings"},
         "backend.services.chapter_vector_search_service.check_for_duplicates": {"queue": "default"},
+        "backend.services.chapter_vector_search_service.deduplicate_book_chapters": {"queue": "default"},
+        "backend.services.chapter_vector_search_service.update_chapter_neighbors": {"queue": "default"},
+        "backend.services.chapter_vector_search_service.rebuild_chapter_neighbors": {"queue": "default"},
+        # Textbook upload ingestion (classification + chapter extraction)
+        "backend.services.textbook_ingestion_tasks.ingest_textbook_upload": {"queue": "default"},
+        # Storage maintenance (content-addressed blob garbage collection)
+        "backend.services.storage_tasks.collect_orphaned_blobs": {"queue": "default"},
         # AI title extraction tasks (Enhancement #2)
         "backend.services.title_extraction_tasks.extract_title_from_cover": {"queue": "default"},
         "backend.services.title_extraction_tasks.batch_extract_titles": {"queue": "default"},
@@ -76,6 +88,14 @@ celery_app.conf.update(
     # Monitoring
     worker_send_task_events=True,
     task_send_sent_event=True,
+
+    # Periodic tasks (celery beat)
+    beat_schedule={
+        "collect-orphaned-blobs": {
+            "task": "backend.services.storage_tasks.collect_orphaned_blobs",
+            "schedule": 6 * 3600,  # seconds
+        },
+    },
 )
 
 # Task autodiscovery
@@ -104,9 +124,29 @@ try:
 except ImportError as e:
     logger.error(f"Failed to import title extraction tasks: {e}")
 
+# Textbook upload ingestion tasks
+try:
+    from backend.services import textbook_ingestion_tasks
+    logger.info(f"Textbook ingestion tasks imported successfully")
+except ImportError as e:
+    logger.error(f"Failed to import textbook ingestion tasks: {e}")
+
+# Storage maintenance tasks
+try:
+    from backend.services import storage_tasks
+    logger.info(f"Storage maintenance tasks imported successfully")
+except ImportError as e:
+    logger.error(f"Failed to import storage maintenance tasks: {e}")
+
 logger.info("Celery app configured successfully")
 
 
+@task_prerun.connect
+def mark_llm_requests_as_batch(**kwargs):
+    """Worker tasks are background work: their LLM requests queue behind interactive ones"""
+    set_request_priority(RequestPriority.BATCH)
+
+
 @celery_app.task(bind=True)
 def debug_task(self):
     """Debug task to test Celery configuration"""
@@ -5,20 +5,27 @@ Part of Chapter-Level Vector Search (Phase 3)
 """
 
 import asyncio
-from celery import Task
+from celery import Task, chord, group
+from celery.canvas import Signature
+from sqlalchemy import update
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
-import re
 
 from backend.services.celery_app import celery_app
+from backend.config import settings
 from backend.database.connection import db
 from backend.database.models import PDFChapter, PDFChunk
 from backend.services.ai_provider_service import AIProviderService
+from backend.services.streaming_chunker import iter_chunks
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
 
+# text-embedding-3-large supports 8191 tokens; ~3 characters per token keeps
+# a chapter safely within the limit
+MAX_CHAPTER_EMBEDDING_CHARS = 24000
+
 
 class DatabaseTask(Task):
     """
@@ -84,9 +91,7 @@ def generate_chapter_embeddings(self, chapter_id: str) -> Dict[str, Any]:
             raise ValueError(f"Chapter {chapter_id} has no extracted text")
 
         # Truncate to 8k tokens (~24k characters to be safe)
-        # text-embedding-3-large supports 8191 tokens max
-        # Conservative estimate: 1 token ≈ 3 characters
-        max_chars = 24000
+        max_chars = MAX_CHAPTER_EMBEDDING_CHARS
         text = chapter.extracted_text[:max_chars]
         if len(chapter.extracted_text) > max_chars:
             logger.warning(f"Truncated chapter text from {len(chapter.extracted_text)} to {len(text)} characters to fit token limit")
@@ -108,6 +113,10 @@ def generate_chapter_embeddings(self, chapter_id: str) -> Dict[str, Any]:
             f"${result['cost_usd']:.6f}"
         )
 
+        # Refresh materialized related-chapter lists
+        from backend.services.chapter_vector_search_service import update_chapter_neighbors
+        update_chapter_neighbors.delay(chapter_id)
+
         # If long chapter, generate chunks
         if chapter.word_count and chapter.word_count > 4000:
             logger.info(f"Chapter {chapter_id} is long ({chapter.word_count} words), generating chunks")
@@ -134,6 +143,135 @@ def generate_chapter_embeddings(self, chapter_id: str) -> Dict[str, Any]:
         raise
 
 
+def build_book_ingestion_workflow(book_ids: List[str]) -> Signature:
+    """
+    Chapter embeddings and duplicate detection for newly uploaded books
+
+    One embed_book_chapters task per book (chord header); duplicate
+    detection runs once, set-based, after every header task has written its
+    embeddings (chord body).
+
+    Args:
+        book_ids: UUIDs of the books
+
+    Returns:
+        Chord signature (call apply_async to enqueue)
+    """
+    from backend.services.chapter_vector_search_service import deduplicate_book_chapters
+
+    book_ids = [str(book_id) for book_id in book_ids]
+    return chord(
+        group(embed_book_chapters.si(book_id) for book_id in book_ids),
+        deduplicate_book_chapters.s(book_ids=book_ids)
+    )
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.chapter_embedding_service.embed_book_chapters",
+    max_retries=3,
+    default_retry_delay=60
+)
+def embed_book_chapters(self, book_id: str) -> Dict[str, Any]:
+    """
+    Generate embeddings for all chapters of a book
+    Header task of the book ingestion workflow (build_book_ingestion_workflow)
+
+    Chapters without an embedding are embedded in batched requests
+    (CHAPTER_EMBEDDING_BATCH_SIZE per request) on one provider client and
+    event loop, written with one bulk update and committed together.
+
+    Args:
+        book_id: UUID of PDFBook
+
+    Returns:
+        Dict with status, chapters embedded, requests and cost
+    """
+    logger.info(f"Generating chapter embeddings for book: {book_id}")
+
+    try:
+        chapters = self.db_session.query(
+            PDFChapter.id, PDFChapter.extracted_text, PDFChapter.word_count
+        ).filter(
+            PDFChapter.book_id == uuid.UUID(book_id),
+            PDFChapter.embedding.is_(None),
+            PDFChapter.extracted_text.isnot(None)
+        ).order_by(PDFChapter.id).all()
+
+        if not chapters:
+            logger.info(f"Book {book_id} has no chapters to embed")
+            return {"status": "skipped", "reason": "no_pending_chapters", "book_id": book_id, "chapters_embedded": 0}
+
+        ai_service = AIProviderService()
+        batch_size = settings.CHAPTER_EMBEDDING_BATCH_SIZE
+        batches = [chapters[i:i + batch_size] for i in range(0, len(chapters), batch_size)]
+
+        async def embed_all():
+            return [
+                await ai_service.generate_embeddings_batch(
+                    [text[:MAX_CHAPTER_EMBEDDING_CHARS] for _, text, _ in batch]
+                )
+                for batch in batches
+            ]
+
+        results = asyncio.run(embed_all())
+
+        generated_at = datetime.utcnow()
+        self.db_session.execute(update(PDFChapter), [
+            {
+                "id": chapter_id,
+                "embedding": embedding,
+                "embedding_model": result["model"],
+                "embedding_generated_at": generated_at
+            }
+            for batch, result in zip(batches, results)
+            for (chapter_id, _, _), embedding in zip(batch, result["embeddings"])
+        ])
+        self.db_session.commit()
+
+        total_cost = sum(result["cost_usd"] for result in results)
+        tokens_used = sum(result["tokens_used"] for result in results)
+        logger.info(
+            f"Book {book_id}: embedded {len(chapters)} chapters in {len(batches)} requests, "
+            f"{tokens_used} tokens, ${total_cost:.6f}"
+        )
+
+        # Refresh materialized related-chapter lists in this task (no per-chapter tasks)
+        from backend.services.chapter_vector_search_service import ChapterVectorSearchService
+        search_service = ChapterVectorSearchService(self.db_session)
+        for chapter_id, _, _ in chapters:
+            try:
+                search_service.refresh_chapter_neighbors(chapter_id)
+            except Exception as e:
+                logger.warning(f"Neighbor refresh failed for chapter {chapter_id}: {str(e)}")
+
+        # Long chapters also get chunk-level embeddings
+        long_chapters = [str(chapter_id) for chapter_id, _, words in chapters if words and words > 4000]
+        for chapter_id in long_chapters:
+            generate_chunk_embeddings.delay(chapter_id)
+
+        return {
+            "status": "success",
+            "book_id": book_id,
+            "chapters_embedded": len(chapters),
+            "requests": len(batches),
+            "tokens_used": tokens_used,
+            "cost_usd": total_cost,
+            "chunk_tasks_queued": len(long_chapters)
+        }
+
+    except Exception as e:
+        logger.error(f"Error generating chapter embeddings for book {book_id}: {str(e)}", exc_info=True)
+        self.db_session.rollback()
+
+        if self.request.retries < self.max_retries:
+            logger.info(f"Retrying book chapter embeddings (attempt {self.request.retries + 1})")
+            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+
+        raise
+
+
 @celery_app.task(
     bind=True,
     base=DatabaseTask,
@@ -180,22 +318,22 @@ def generate_chunk_embeddings(self, chapter_id: str) -> Dict[str, Any]:
                 "existing_chunks": existing_chunks
             }
 
-        # Intelligent chunking with boundary respect
-        chunks = intelligent_chunk(
+        # Chunks are produced lazily: embedding starts with the first chunk
+        chunks = iter_chunks(
             chapter.extracted_text,
-            chunk_size=1024,  # ~1024 tokens
+            chunk_size=1024,  # 1024 tokens
             overlap=128,      # 128 tokens overlap
             respect_boundaries=True
         )
 
-        logger.info(f"Created {len(chunks)} chunks for chapter {chapter_id}")
-
         # Generate embeddings for each chunk
         ai_service = AIProviderService()
         total_cost = 0.0
         chunks_created = 0
+        total_chunks = 0
 
         for i, chunk_data in enumerate(chunks):
+            total_chunks += 1
             try:
                 # Generate embedding
                 result = asyncio.run(ai_service.generate_embedding(chunk_data['text']))
@@ -221,7 +359,7 @@ def generate_chunk_embeddings(self, chapter_id: str) -> Dict[str, Any]:
                 # Commit in batches of 10 to avoid memory issues
                 if (i + 1) % 10 == 0:
                     self.db_session.commit()
-                    logger.info(f"Committed batch of 10 chunks ({i + 1}/{len(chunks)})")
+                    logger.info(f"Committed batch of 10 chunks ({i + 1} so far)")
 
             except Exception as e:
                 logger.error(f"Error generating embedding for chunk {i}: {str(e)}")
@@ -239,7 +377,7 @@ def generate_chunk_embeddings(self, chapter_id: str) -> Dict[str, Any]:
             "status": "success",
             "chapter_id": chapter_id,
             "chunks_created": chunks_created,
-            "total_chunks": len(chunks),
+            "total_chunks": total_chunks,
             "total_cost_usd": total_cost
         }
 
@@ -267,128 +405,21 @@ def intelligent_chunk(
     - Respects paragraph boundaries (double newlines)
     - Respects sentence boundaries (periods, question marks, exclamation marks)
     - Preserves section headings for context
-    - Handles medical term coherence
     - Maintains overlap for continuity
 
+    Single pass over the text (see streaming_chunker); use iter_chunks
+    directly to consume chunks while they are produced.
+
     Args:
         text: Input text to chunk
-        chunk_size: Target chunk size in tokens (~4 chars per token)
+        chunk_size: Target chunk size in tokens
         overlap: Overlap size in tokens
         respect_boundaries: Whether to respect paragraph/sentence boundaries
 
     Returns:
         List of chunk dictionaries with text, offsets, and metadata
     """
-    # Approximate: 1 token ~= 4 characters
-    chunk_size_chars = chunk_size * 4
-    overlap_chars = overlap * 4
-
-    chunks = []
-
-    # Extract section headings (lines that are all caps or start with numbers)
-    headings_pattern = r'^([A-Z][A-Z\s]+|[\dIVX]+\.?\s+[^\n]+)$'
-    lines = text.split('\n')
-    headings = {}
-
-    for i, line in enumerate(lines):
-        if re.match(headings_pattern, line.strip()):
-            headings[i] = line.strip()
-
-    # Split into paragraphs first
-    paragraphs = text.split('\n\n')
-
-    current_chunk = ""
-    current_offset = 0
-    preceding_heading = None
-    contains_headings = []
-
-    for paragraph in paragraphs:
-        paragraph = paragraph.strip()
-        if not paragraph:
-            continue
-
-        # Check if this paragraph is a heading
-        is_heading = any(heading in paragraph for heading in headings.values())
-
-        if is_heading:
-            # Save current heading as context
-            preceding_heading = paragraph
-            contains_headings = []
-
-        # If adding this paragraph would exceed chunk size, start new chunk
-        if len(current_chunk) + len(paragraph) > chunk_size_chars and current_chunk:
-            # Save current chunk
-            chunks.append({
-                'text': current_chunk.strip(),
-                'token_count': len(current_chunk) // 4,  # Approximate
-                'start_offset': current_offset,
-                'end_offset': current_offset + len(current_chunk),
-                'preceding_heading': preceding_heading,
-                'contains_headings': contains_headings.copy() if contains_headings else None
-            })
-
-            # Start new chunk with overlap
-            if respect_boundaries:
-                # Take last sentence(s) for overlap
-                overlap_text = get_last_sentences(current_chunk, overlap_chars)
-                current_offset += len(current_chunk) - len(overlap_text)
-                current_chunk = overlap_text + "\n\n" + paragraph
-            else:
-                # Simple character overlap
-                current_offset += chunk_size_chars - overlap_chars
-                current_chunk = current_chunk[-overlap_chars:] + "\n\n" + paragraph
-
-            contains_headings = []
-
-        else:
-            # Add paragraph to current chunk
-            if current_chunk:
-                current_chunk += "\n\n" + paragraph
-            else:
-                current_chunk = paragraph
-                current_offset = text.find(paragraph)
-
-        # Track headings in current chunk
-        if is_heading and paragraph not in contains_headings:
-            contains_headings.append(paragraph)
-
-    # Add final chunk
-    if current_chunk:
-        chunks.append({
-            'text': current_chunk.strip(),
-            'token_count': len(current_chunk) // 4,
-            'start_offset': current_offset,
-            'end_offset': current_offset + len(current_chunk),
-            'preceding_heading': preceding_heading,
-            'contains_headings': contains_headings if contains_headings else None
-        })
-
-    return chunks
-
-
-def get_last_sentences(text: str, max_length: int) -> str:
-    """
-    Get last complete sentences from text up to max_length
-
-    Args:
-        text: Input text
-        max_length: Maximum length in characters
-
-    Returns:
-        Last complete sentences
-    """
-    # Split on sentence boundaries
-    sentence_endings = r'[.!?]\s+'
-    sentences = re.split(sentence_endings, text)
-
-    # Build from end
-    result = ""
-    for sentence in reversed(sentences):
-        if len(result) + len(sentence) > max_length:
-            break
-        result = sentence + ". " + result
-
-    return result.strip()
+    return list(iter_chunks(text, chunk_size, overlap, respect_boundaries))
 
 
 def get_embedding_progress() -> Dict[str, Any]:
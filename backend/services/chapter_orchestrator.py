@@ -3,16 +3,31 @@ Chapter Orchestrator - 14-Stage Workflow Manager
 Coordinates the complete "Alive Chapter" generation pipeline
 """
 
+import asyncio
+import copy
+import hashlib
 import json
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+
+import numpy as np
 from sqlalchemy.orm import Session
 
-from backend.database.models import Chapter, User
+from backend.config.redis import redis_manager
+from backend.database.models import Chapter, Image, User
 from backend.services.ai_provider_service import AIProviderService, AITask
 from backend.services.research_service import ResearchService
 from backend.services.deduplication_service import DeduplicationService  # Phase 2 Week 3-4
+from backend.services.embedding_service import EmbeddingService
 from backend.services.fact_checking_service import FactCheckingService  # Phase 3: GPT-4o Fact-Checking
+from backend.services.generation_stream import ChapterStream, generation_streams
+from backend.services.image_placement import assign_images, cosine_similarity_matrix
+from backend.services.prompt_compaction import SourceCompactor, section_outline
+from backend.services.section_work_queue import AdaptiveConcurrencyLimiter, SlidingWindowExecutor
+from backend.services.section_artifacts import SECTION_ARTIFACTS, dirty_artifacts, mark_clean
+from backend.services.stage_checkpoint import StageCheckpointer, content_hash
+from backend.services.stage_scheduler import Stage, StageGraph, StageScheduler
+from backend.services.task_checkpoint import TaskCheckpoint
 from backend.services.templates.chapter_template_guidance import ChapterTemplateGuidance, ChapterType  # Phase 22: Flexible Templates
 from backend.schemas.ai_schemas import CHAPTER_ANALYSIS_SCHEMA, CONTEXT_BUILDING_SCHEMA
 from backend.config import settings
@@ -47,8 +62,37 @@ class ChapterOrchestrator:
     - Each stage updates Chapter.generation_status
     - Intermediate results stored in JSONB columns
     - Errors logged and recoverable
+
+    Scheduling:
+    - Stages declare the artifacts they read/write (see _build_stage_graph)
+    - StageScheduler runs independent stages concurrently
+    - Per-stage timings and the critical path stored in Chapter.stage_timings
+
+    Crash Recovery:
+    - Each stage is checkpointed (inputs hash + the chapter fields it writes)
+    - resume_chapter restores completed stages and re-runs from the first
+      incomplete one; stage 6 also reuses sections generated before the crash
     """
 
+    # Chapter fields each stage writes (its checkpointed outputs)
+    STAGE_OUTPUT_FIELDS = {
+        "stage_1_input_validation": ("stage_1_input", "chapter_type"),
+        "stage_2_context_building": ("stage_2_context",),
+        "stage_3_internal_research": ("stage_3_internal_research",),
+        "stage_4_external_research": ("stage_4_external_research",),
+        "stage_5_synthesis_planning": ("stage_5_synthesis_metadata", "structure_metadata"),
+        # Stage 6 also records generation_stats inside stage_5_synthesis_metadata
+        "stage_6_section_generation": ("sections", "gap_analysis", "stage_5_synthesis_metadata"),
+        "stage_7_image_integration": ("sections",),
+        "stage_8_citation_network": ("references",),
+        "stage_9_quality_assurance": ("depth_score", "coverage_score", "evidence_score", "currency_score"),
+        "stage_10_fact_checking": ("stage_10_fact_check", "fact_checked", "fact_check_passed"),
+        "stage_11_formatting": ("sections", "stage_11_formatting"),
+        "stage_12_review_refinement": ("stage_12_review",),
+        "stage_13_finalization": ("version", "is_current_version", "total_words", "total_sections"),
+        "stage_14_delivery": ("generation_status",),
+    }
+
     def __init__(self, db_session: Session):
         """
         Initialize chapter orchestrator
@@ -61,6 +105,8 @@ class ChapterOrchestrator:
         self.research_service = ResearchService(db_session)
         self.dedup_service = DeduplicationService()  # Phase 2 Week 3-4
         self.fact_check_service = FactCheckingService()  # Phase 3: GPT-4o Fact-Checking
+        self.embedding_service = EmbeddingService(db_session, ai_service=self.ai_service)
+        self._source_compactors: Dict[str, SourceCompactor] = {}  # Per chapter, during stage 6
 
     async def generate_chapter(
         self,
@@ -92,49 +138,65 @@ class ChapterOrchestrator:
         self.db.commit()
         self.db.refresh(chapter)
 
-        try:
-            # Execute 14-stage workflow with WebSocket progress updates
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_1_INPUT, 1, "Validating input and analyzing topic")
-            await self._stage_1_input_validation(chapter, topic)
+        return await self._run_pipeline(chapter, topic)
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_2_CONTEXT, 2, "Building context and extracting entities")
-            await self._stage_2_context_building(chapter, topic)
-
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_3_RESEARCH_INTERNAL, 3, "Searching internal database for relevant sources")
-            await self._stage_3_internal_research(chapter)
+    async def resume_chapter(self, chapter_id: str) -> Chapter:
+        """
+        Resume an interrupted or failed chapter generation
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_4_RESEARCH_EXTERNAL, 4, "Querying PubMed for recent publications")
-            await self._stage_4_external_research(chapter)
+        Stages whose checkpoint matches their current inputs are restored
+        instead of re-run, so research and generated sections are not paid
+        for again.
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_5_PLANNING, 5, "Planning chapter structure and outline")
-            await self._stage_5_synthesis_planning(chapter)
+        Args:
+            chapter_id: Chapter to resume
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_6_GENERATION, 6, "Generating chapter sections with AI")
-            await self._stage_6_section_generation(chapter)
+        Returns:
+            Generated Chapter object
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_7_IMAGES, 7, "Integrating relevant images")
-            await self._stage_7_image_integration(chapter)
+        Raises:
+            ValueError: If the chapter does not exist
+        """
+        chapter = self.db.query(Chapter).filter(Chapter.id == chapter_id).first()
+        if not chapter:
+            raise ValueError(f"Chapter not found: {chapter_id}")
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_8_CITATIONS, 8, "Building citation network")
-            await self._stage_8_citation_network(chapter)
+        if chapter.generation_status == "completed":
+            return chapter
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_9_QA, 9, "Performing quality assurance checks")
-            await self._stage_9_quality_assurance(chapter)
+        logger.info(
+            f"Resuming chapter generation {chapter.id} "
+            f"(last status: {chapter.generation_status})"
+        )
+        chapter.generation_error = None
+        self.db.commit()
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_10_FACT_CHECK, 10, "Fact-checking with sources")
-            await self._stage_10_fact_checking(chapter)
+        return await self._run_pipeline(chapter, chapter.title)
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_11_FORMATTING, 11, "Applying formatting and structure")
-            await self._stage_11_formatting(chapter)
+    async def _run_pipeline(self, chapter: Chapter, topic: str) -> Chapter:
+        """Run the 14-stage graph for a chapter, resuming from its checkpoint"""
+        graph = self._build_stage_graph(chapter, topic)
+        checkpoint = self._checkpoint(chapter)
+        checkpointer = None
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_12_REVIEW, 12, "Reviewing and refining content")
-            await self._stage_12_review_refinement(chapter)
+        if checkpoint is not None:
+            checkpointer = StageCheckpointer(
+                checkpoint,
+                initial_inputs={"topic": topic},
+                capture=lambda stage: self._capture_stage_outputs(chapter, stage),
+                restore=lambda stage, outputs: self._restore_stage_outputs(chapter, stage, outputs)
+            )
+            graph = checkpointer.wrap(graph)
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_13_FINALIZATION, 13, "Finalizing chapter metadata")
-            await self._stage_13_finalization(chapter)
+        scheduler = StageScheduler(graph)
 
-            await emitter.emit_chapter_progress(str(chapter.id), ChapterStage.STAGE_14_DELIVERY, 14, "Delivering final chapter")
-            await self._stage_14_delivery(chapter)
+        try:
+            # Execute 14-stage workflow as a dependency graph with WebSocket progress updates
+            chapter.stage_timings = await scheduler.run()
+            if checkpointer is not None:
+                chapter.stage_timings["reused_stages"] = checkpointer.reused
+                checkpoint.clear_checkpoint()
+            self.db.commit()
 
             logger.info(f"Chapter generation completed: {chapter.id}")
 
@@ -151,22 +213,158 @@ class ChapterOrchestrator:
             )
 
         except Exception as e:
-            logger.error(f"Chapter generation failed at stage {chapter.generation_status}: {str(e)}", exc_info=True)
+            failed_stage = scheduler.failed_stage or chapter.generation_status
+            logger.error(f"Chapter generation failed at stage {failed_stage}: {str(e)}", exc_info=True)
             chapter.generation_status = "failed"
             chapter.generation_error = str(e)
+            chapter.stage_timings = scheduler.report()
             self.db.commit()
 
+            if checkpoint is not None and scheduler.failed_stage:
+                checkpoint.mark_step_failed(scheduler.failed_stage, str(e))
+
             # Emit failure event
             await emitter.emit_chapter_failed(
                 str(chapter.id),
                 str(e),
-                {"stage": chapter.generation_status}
+                {"stage": failed_stage}
             )
 
             raise
 
         return chapter
 
+    def _checkpoint(self, chapter: Chapter) -> Optional[TaskCheckpoint]:
+        """Checkpoint of a chapter's generation run (None when disabled)"""
+        if not settings.TASK_CHECKPOINT_ENABLED:
+            return None
+        return TaskCheckpoint(task_id=str(chapter.id), task_type="chapter_generation")
+
+    def _capture_stage_outputs(self, chapter: Chapter, stage: str) -> Dict[str, Any]:
+        return {field: getattr(chapter, field, None) for field in self.STAGE_OUTPUT_FIELDS.get(stage, ())}
+
+    def _restore_stage_outputs(self, chapter: Chapter, stage: str, outputs: Dict[str, Any]) -> None:
+        for field, value in outputs.items():
+            setattr(chapter, field, value)
+        self.db.commit()
+
+    def _build_stage_graph(self, chapter: Chapter, topic: str) -> StageGraph:
+        """
+        Declare the 14 stages with the chapter artifacts each reads and writes
+
+        Dependencies follow from the artifacts, so independent stages run
+        concurrently: internal/external research (3, 4); citations (8) as soon
+        as research is done; images, QA and fact-checking (7, 9, 10) once
+        sections exist. Formatting (11) replaces the section dicts, so it
+        waits for image placement and for fact-checking, whose per-section
+        fingerprints would otherwise land on the discarded dicts.
+        """
+        def progress(stage: ChapterStage, number: int, message: str):
+            async def emit() -> None:
+                await emitter.emit_chapter_progress(str(chapter.id), stage, number, message)
+            return emit
+
+        return StageGraph([
+            Stage(
+                "stage_1_input_validation",
+                lambda: self._stage_1_input_validation(chapter, topic),
+                inputs=("topic",),
+                outputs=("stage_1_input",),
+                on_start=progress(ChapterStage.STAGE_1_INPUT, 1, "Validating input and analyzing topic")
+            ),
+            Stage(
+                "stage_2_context_building",
+                lambda: self._stage_2_context_building(chapter, topic),
+                inputs=("topic", "stage_1_input"),
+                outputs=("stage_2_context",),
+                on_start=progress(ChapterStage.STAGE_2_CONTEXT, 2, "Building context and extracting entities")
+            ),
+            Stage(
+                "stage_3_internal_research",
+                lambda: self._stage_3_internal_research(chapter),
+                inputs=("stage_2_context",),
+                outputs=("stage_3_internal_research",),
+                on_start=progress(ChapterStage.STAGE_3_RESEARCH_INTERNAL, 3, "Searching internal database for relevant sources")
+            ),
+            Stage(
+                "stage_4_external_research",
+                lambda: self._stage_4_external_research(chapter),
+                inputs=("stage_2_context",),
+                outputs=("stage_4_external_research",),
+                on_start=progress(ChapterStage.STAGE_4_RESEARCH_EXTERNAL, 4, "Querying PubMed for recent publications")
+            ),
+            Stage(
+                "stage_5_synthesis_planning",
+                lambda: self._stage_5_synthesis_planning(chapter),
+                inputs=("stage_2_context", "stage_3_internal_research", "stage_4_external_research"),
+                outputs=("stage_5_synthesis_metadata",),
+                on_start=progress(ChapterStage.STAGE_5_PLANNING, 5, "Planning chapter structure and outline")
+            ),
+            Stage(
+                "stage_6_section_generation",
+                lambda: self._stage_6_section_generation(chapter),
+                inputs=("stage_3_internal_research", "stage_4_external_research", "stage_5_synthesis_metadata"),
+                outputs=("sections",),
+                on_start=progress(ChapterStage.STAGE_6_GENERATION, 6, "Generating chapter sections with AI")
+            ),
+            Stage(
+                "stage_7_image_integration",
+                lambda: self._stage_7_image_integration(chapter),
+                inputs=("sections", "stage_3_internal_research"),
+                outputs=("section_images",),
+                on_start=progress(ChapterStage.STAGE_7_IMAGES, 7, "Integrating relevant images")
+            ),
+            Stage(
+                "stage_8_citation_network",
+                lambda: self._stage_8_citation_network(chapter),
+                inputs=("stage_3_internal_research", "stage_4_external_research"),
+                outputs=("references",),
+                on_start=progress(ChapterStage.STAGE_8_CITATIONS, 8, "Building citation network")
+            ),
+            Stage(
+                "stage_9_quality_assurance",
+                lambda: self._stage_9_quality_assurance(chapter),
+                inputs=("sections", "references", "stage_3_internal_research", "stage_4_external_research"),
+                outputs=("quality_scores",),
+                on_start=progress(ChapterStage.STAGE_9_QA, 9, "Performing quality assurance checks")
+            ),
+            Stage(
+                "stage_10_fact_checking",
+                lambda: self._stage_10_fact_checking(chapter),
+                inputs=("sections", "stage_3_internal_research", "stage_4_external_research"),
+                outputs=("stage_10_fact_check",),
+                on_start=progress(ChapterStage.STAGE_10_FACT_CHECK, 10, "Fact-checking with sources")
+            ),
+            Stage(
+                "stage_11_formatting",
+                lambda: self._stage_11_formatting(chapter),
+                inputs=("sections", "section_images", "references", "stage_10_fact_check"),
+                outputs=("formatted_sections",),
+                on_start=progress(ChapterStage.STAGE_11_FORMATTING, 11, "Applying formatting and structure")
+            ),
+            Stage(
+                "stage_12_review_refinement",
+                lambda: self._stage_12_review_refinement(chapter),
+                inputs=("formatted_sections", "quality_scores"),
+                outputs=("stage_12_review",),
+                on_start=progress(ChapterStage.STAGE_12_REVIEW, 12, "Reviewing and refining content")
+            ),
+            Stage(
+                "stage_13_finalization",
+                lambda: self._stage_13_finalization(chapter),
+                inputs=("formatted_sections", "references", "stage_10_fact_check", "stage_12_review"),
+                outputs=("finalized",),
+                on_start=progress(ChapterStage.STAGE_13_FINALIZATION, 13, "Finalizing chapter metadata")
+            ),
+            Stage(
+                "stage_14_delivery",
+                lambda: self._stage_14_delivery(chapter),
+                inputs=("finalized",),
+                outputs=("delivered",),
+                on_start=progress(ChapterStage.STAGE_14_DELIVERY, 14, "Delivering final chapter")
+            ),
+        ], initial=("topic",))
+
     async def _stage_1_input_validation(self, chapter: Chapter, topic: str) -> None:
         """
         Stage 1: Validate and parse input using GPT-4o Structured Outputs
@@ -216,7 +414,8 @@ class ChapterOrchestrator:
             schema=CHAPTER_ANALYSIS_SCHEMA,
             task=AITask.METADATA_EXTRACTION,
             max_tokens=1000,
-            temperature=0.3  # Lower temperature for structured data extraction
+            temperature=0.3,  # Lower temperature for structured data extraction
+            cache=True
         )
 
         # No try/catch needed! response['data'] is guaranteed valid
@@ -751,10 +950,10 @@ class ChapterOrchestrator:
         PHILOSOPHY: Use section-type hints to guide generation, but maintain flexibility.
         Support hierarchical structure and track sources per section.
 
-        PERFORMANCE: Parallel section generation (configurable batch size)
+        PERFORMANCE: Sliding-window section generation (adaptive concurrency)
         - Sequential: 97 sections × 7s = ~11 minutes
-        - Parallel (batch=5): 20 batches × 7s = ~2.3 minutes (4.8x faster)
-        - Parallel (batch=10): 10 batches × 7s = ~1.2 minutes (9.2x faster)
+        - Parallel (5 in flight): ~97 × 7s / 5 = ~2.3 minutes, without batch barriers
+        - Concurrency grows toward SECTION_GENERATION_MAX_CONCURRENCY while healthy
 
         Process:
         1. Get section plan from Stage 5 (with section types and subsections)
@@ -765,6 +964,10 @@ class ChapterOrchestrator:
         6. Track which sources were actually used
         7. Preserve all content even if it doesn't fit perfectly
 
+        STREAMING: with SECTION_STREAMING_ENABLED, provider tokens are forwarded
+        to the chapter's WebSocket room as they arrive (section_token events,
+        resumable by seq; see generation_stream.ChapterStream).
+
         Note: external_sources includes BOTH PubMed papers AND AI-researched sources.
         Source types are tracked internally for analytics but presented uniformly to the AI
         to ensure seamless integration and consistent citation style.
@@ -792,24 +995,43 @@ class ChapterOrchestrator:
                 f"{sources_by_type.get('ai_research', 0)} AI-researched"
             )
 
-        # Choose parallel or sequential generation based on configuration
-        if settings.PARALLEL_SECTION_GENERATION and len(sections_plan) > 1:
-            logger.info(
-                f"Using PARALLEL section generation: {len(sections_plan)} sections "
-                f"in batches of {settings.SECTION_GENERATION_BATCH_SIZE}"
-            )
-            generated_sections, total_cost = await self._generate_sections_parallel(
-                chapter=chapter,
-                sections_plan=sections_plan,
-                all_sources=all_sources
-            )
-        else:
-            logger.info(f"Using SEQUENTIAL section generation: {len(sections_plan)} sections")
-            generated_sections, total_cost = await self._generate_sections_sequential(
-                chapter=chapter,
-                sections_plan=sections_plan,
-                all_sources=all_sources
-            )
+        # Stream section tokens to WebSocket clients while generating
+        if settings.SECTION_STREAMING_ENABLED:
+            generation_streams.open(str(chapter.id))
+
+        # Compact sources per prompt; passages and outlines are embedded once for the chapter
+        compactor = None
+        if settings.PROMPT_COMPACTION_ENABLED:
+            compactor = SourceCompactor(self.ai_service)
+            outlines = []
+            for plan in sections_plan:
+                outlines.append(section_outline(plan))
+                outlines.extend(section_outline(sub, plan.get("title")) for sub in plan.get("subsections", []))
+            await compactor.prepare(outlines, all_sources)
+            self._source_compactors[str(chapter.id)] = compactor
+
+        try:
+            # Choose parallel or sequential generation based on configuration
+            if settings.PARALLEL_SECTION_GENERATION and len(sections_plan) > 1:
+                logger.info(
+                    f"Using PARALLEL section generation: {len(sections_plan)} sections, "
+                    f"sliding window starting at {settings.SECTION_GENERATION_BATCH_SIZE} in flight"
+                )
+                generated_sections, total_cost = await self._generate_sections_parallel(
+                    chapter=chapter,
+                    sections_plan=sections_plan,
+                    all_sources=all_sources
+                )
+            else:
+                logger.info(f"Using SEQUENTIAL section generation: {len(sections_plan)} sections")
+                generated_sections, total_cost = await self._generate_sections_sequential(
+                    chapter=chapter,
+                    sections_plan=sections_plan,
+                    all_sources=all_sources
+                )
+        finally:
+            await generation_streams.close(str(chapter.id))
+            self._source_compactors.pop(str(chapter.id), None)
 
         # Store generated sections with hierarchical structure
         chapter.sections = generated_sections
@@ -823,7 +1045,8 @@ class ChapterOrchestrator:
                 ),
                 "total_cost_usd": total_cost,
                 "generated_at": datetime.utcnow().isoformat(),
-                "generation_mode": "parallel" if settings.PARALLEL_SECTION_GENERATION else "sequential"
+                "generation_mode": "parallel" if settings.PARALLEL_SECTION_GENERATION else "sequential",
+                "source_compaction": compactor.totals if compactor else None
             }
 
         self.db.commit()
@@ -955,97 +1178,117 @@ class ChapterOrchestrator:
         all_sources: List[Dict]
     ) -> tuple[List[Dict], float]:
         """
-        Generate sections in parallel batches for maximum performance
+        Generate sections through a sliding-window work queue
 
         Returns:
             Tuple of (generated_sections, total_cost)
 
         Performance Benefits:
-            - 97 sections: 679s → 68s (10x faster)
-            - Configurable batch size balances speed vs API limits
-            - Error handling per section (failures don't abort entire batch)
-        """
-        import asyncio
-
-        generated_sections = []
-        total_cost = 0.0
-        batch_size = settings.SECTION_GENERATION_BATCH_SIZE
-
-        # Process sections in batches
-        for batch_start in range(0, len(sections_plan), batch_size):
-            batch_end = min(batch_start + batch_size, len(sections_plan))
-            batch_sections = sections_plan[batch_start:batch_end]
+            - N generations stay in flight at all times: a slow section only
+              holds its own slot instead of stalling a whole batch
+            - Concurrency adapts to provider latency and 429 responses
+              (starts at SECTION_GENERATION_BATCH_SIZE)
+            - Per-section retry with exponential backoff; sections that still
+              fail become placeholders (failures don't abort the chapter)
+            - Per-section progress emitted as each section completes
+        """
+        total = len(sections_plan)
+        limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.SECTION_GENERATION_BATCH_SIZE,
+            minimum=settings.SECTION_GENERATION_MIN_CONCURRENCY,
+            maximum=settings.SECTION_GENERATION_MAX_CONCURRENCY,
+            latency_target=settings.SECTION_GENERATION_LATENCY_TARGET_SECONDS
+        )
+        executor = SlidingWindowExecutor(
+            limiter,
+            max_attempts=settings.SECTION_GENERATION_MAX_ATTEMPTS,
+            base_delay=settings.SECTION_GENERATION_RETRY_BASE_DELAY
+        )
+        completed = 0
 
-            logger.info(
-                f"Processing batch {batch_start//batch_size + 1}: "
-                f"sections {batch_start+1}-{batch_end} of {len(sections_plan)}"
+        async def generate(idx: int, section_plan: Dict) -> tuple[Dict, float]:
+            return await self._generate_single_section(
+                chapter=chapter,
+                section_plan=section_plan,
+                section_idx=idx,
+                all_sources=all_sources
             )
 
-            # Create tasks for parallel generation
-            tasks = []
-            for idx, section_plan in enumerate(batch_sections):
-                actual_idx = batch_start + idx
-                task = self._generate_single_section(
-                    chapter=chapter,
-                    section_plan=section_plan,
-                    section_idx=actual_idx,
-                    all_sources=all_sources
-                )
-                tasks.append(task)
-
-            # Execute batch in parallel
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Process results
-            for idx, result in enumerate(batch_results):
-                actual_idx = batch_start + idx
-
-                if isinstance(result, Exception):
-                    # Section generation failed - log error but continue
-                    logger.error(
-                        f"Section {actual_idx + 1} generation failed: {str(result)}",
-                        exc_info=result
-                    )
-                    # Create placeholder section
-                    section_data = {
-                        "section_num": actual_idx + 1,
-                        "title": batch_sections[idx].get('title', f'Section {actual_idx + 1}'),
-                        "section_type": batch_sections[idx].get('section_type', 'custom'),
-                        "content": f"<p><em>Error generating section: {str(result)[:200]}</em></p>",
-                        "word_count": 0,
-                        "sources_used": [],
-                        "generated_at": datetime.utcnow().isoformat(),
-                        "generation_error": str(result),
-                        "ai_model": "error",
-                        "ai_cost_usd": 0.0
-                    }
-                    generated_sections.append(section_data)
-                else:
-                    # Success
-                    section_data, section_cost = result
-                    generated_sections.append(section_data)
-                    total_cost += section_cost
-
-            # Emit batch progress
-            progress_percent = int((batch_end / len(sections_plan)) * 60)  # Stage 6 is 35-60%
-            await self.emit_chapter_progress(
-                chapter_id=str(chapter.id),
-                stage="stage_6_generation",
-                stage_number=6,
-                message=f"Generated {batch_end}/{len(sections_plan)} sections",
-                progress_percent=35 + progress_percent
+        async def on_complete(idx: int, result: Any) -> None:
+            nonlocal completed
+            completed += 1
+            section_data = (
+                self._failed_section_placeholder(sections_plan[idx], idx, result)
+                if isinstance(result, Exception) else result[0]
             )
+            await self._emit_section_progress(chapter, section_data, completed, total, limiter.slots)
 
-        # Sort sections by section_num to ensure correct order
-        generated_sections.sort(key=lambda s: s["section_num"])
+        results = await executor.run(sections_plan, generate, on_complete)
+
+        generated_sections = []
+        total_cost = 0.0
+        for idx, result in enumerate(results):
+            if isinstance(result, Exception):
+                # Section generation failed after retries - log error but continue
+                logger.error(
+                    f"Section {idx + 1} generation failed: {str(result)}",
+                    exc_info=result
+                )
+                generated_sections.append(self._failed_section_placeholder(sections_plan[idx], idx, result))
+            else:
+                section_data, section_cost = result
+                generated_sections.append(section_data)
+                total_cost += section_cost
 
         logger.info(
             f"Parallel generation complete: {len(generated_sections)} sections, "
-            f"${total_cost:.4f}"
+            f"${total_cost:.4f}, {executor.retries} retries, concurrency {limiter.stats()}"
         )
 
         return generated_sections, total_cost
 
+    def _failed_section_placeholder(self, section_plan: Dict, idx: int, error: Exception) -> Dict:
+        """Placeholder section stored when generation fails"""
+        return {
+            "section_num": idx + 1,
+            "title": section_plan.get('title', f'Section {idx + 1}'),
+            "section_type": section_plan.get('section_type', 'custom'),
+            "content": f"<p><em>Error generating section: {str(error)[:200]}</em></p>",
+            "word_count": 0,
+            "sources_used": [],
+            "generated_at": datetime.utcnow().isoformat(),
+            "generation_error": str(error),
+            "ai_model": "error",
+            "ai_cost_usd": 0.0
+        }
+
+    async def _emit_section_progress(
+        self,
+        chapter: Chapter,
+        section_data: Dict,
+        completed: int,
+        total: int,
+        concurrency: Optional[int] = None
+    ) -> None:
+        """Emit section_generated plus a stage 6 progress update for one finished section"""
+        await emitter.emit_section_generated(
+            str(chapter.id),
+            section_data["section_num"] - 1,
+            section_data.get("title", ""),
+            section_data.get("content", ""),
+            total
+        )
+        details = {"sections_completed": completed, "total_sections": total}
+        if concurrency is not None:
+            details["concurrency"] = concurrency
+        await emitter.emit_chapter_progress(
+            str(chapter.id),
+            ChapterStage.STAGE_6_GENERATION,
+            6,
+            f"Generated {completed}/{total} sections",
+            details
+        )
+
     async def _generate_sections_sequential(
         self,
         chapter: Chapter,
@@ -1088,29 +1331,11 @@ class ChapterOrchestrator:
                     exc_info=e
                 )
                 # Create placeholder
-                section_data = {
-                    "section_num": idx + 1,
-                    "title": section_plan.get('title', f'Section {idx + 1}'),
-                    "section_type": section_plan.get('section_type', 'custom'),
-                    "content": f"<p><em>Error generating section: {str(e)[:200]}</em></p>",
-                    "word_count": 0,
-                    "sources_used": [],
-                    "generated_at": datetime.utcnow().isoformat(),
-                    "generation_error": str(e),
-                    "ai_model": "error",
-                    "ai_cost_usd": 0.0
-                }
+                section_data = self._failed_section_placeholder(section_plan, idx, e)
                 generated_sections.append(section_data)
 
             # Emit progress
-            progress_percent = int(((idx + 1) / len(sections_plan)) * 60)
-            await self.emit_chapter_progress(
-                chapter_id=str(chapter.id),
-                stage="stage_6_generation",
-                stage_number=6,
-                message=f"Generated {idx + 1}/{len(sections_plan)} sections",
-                progress_percent=35 + progress_percent
-            )
+            await self._emit_section_progress(chapter, section_data, idx + 1, len(sections_plan))
 
         logger.info(
             f"Sequential generation complete: {len(generated_sections)} sections, "
@@ -1160,13 +1385,33 @@ class ChapterOrchestrator:
             allocation_hint=source_allocation_hint
         )
 
+        # Reuse a section generated before an interrupted run
+        checkpoint = self._checkpoint(chapter)
+        section_step = f"section:{section_idx}"
+        section_inputs_hash = content_hash({
+            "chapter_title": chapter.title,
+            "section_plan": section_plan,
+            "sources": relevant_sources
+        })
+        if checkpoint is not None and checkpoint.is_step_complete(section_step):
+            saved = checkpoint.get_step_metadata(section_step) or {}
+            if saved.get("inputs_hash") == section_inputs_hash:
+                logger.info(f"Section {section_idx + 1} restored from checkpoint")
+                return saved["section_data"], 0.0
+
+        # Token stream for this chapter (None when streaming is disabled)
+        stream = generation_streams.get(str(chapter.id))
+        compactor = self._source_compactors.get(str(chapter.id))
+
         # Generate main section content
         section_generation_result = await self._generate_section_content(
             chapter_title=chapter.title,
             section_plan=section_plan,
             section_hints=section_hints,
             relevant_sources=relevant_sources,
-            section_num=section_idx + 1
+            section_num=section_idx + 1,
+            stream=stream,
+            compactor=compactor
         )
 
         section_content = section_generation_result["content"]
@@ -1199,7 +1444,10 @@ class ChapterOrchestrator:
                     parent_section_title=section_title,
                     subsection_plan=subsection_plan,
                     relevant_sources=relevant_sources,
-                    subsection_num=sub_idx + 1
+                    subsection_num=sub_idx + 1,
+                    stream=stream,
+                    stream_id=f"{section_idx + 1}.{sub_idx + 1}",
+                    compactor=compactor
                 )
 
                 generated_subsections.append({
@@ -1216,6 +1464,12 @@ class ChapterOrchestrator:
             section_data["subsections"] = generated_subsections
             section_data["has_subsections"] = True
 
+        if checkpoint is not None:
+            checkpoint.mark_step_complete(
+                section_step,
+                metadata={"inputs_hash": section_inputs_hash, "section_data": section_data, "cost_usd": section_cost}
+            )
+
         return section_data, section_cost
 
     async def _stage_7_image_integration(self, chapter: Chapter) -> None:
@@ -1228,11 +1482,13 @@ class ChapterOrchestrator:
 
         Process:
         1. Get available images from Stage 3 research
-        2. For each section, analyze content and find most relevant images
-        3. Match images semantically using keywords and content
-        4. Allow multiple images per section if relevant
-        5. Generate contextual captions for each image placement
-        6. Track image usage to avoid duplication
+        2. Build one placement slot per section (up to 3 images) and
+           subsection (up to 2 images)
+        3. Score every (slot, image) pair in one matrix: embedding cosine
+           similarity, or keyword matching when embeddings are unavailable
+        4. Assign images globally, best pairs first, never reusing an image
+        5. Generate contextual captions concurrently, cached per
+           (image, section text)
         """
         logger.info(f"Stage 7: Semantic image integration for chapter {chapter.id}")
         chapter.generation_status = "stage_7_images"
@@ -1243,97 +1499,112 @@ class ChapterOrchestrator:
 
         if not images:
             logger.info("No images available for integration")
+            for section in sections:
+                mark_clean(section, "images", "embedding")
             self.db.commit()
             return
 
-        logger.info(f"Semantically matching {len(images)} images to {len(sections)} sections")
-
-        # Track which images have been used
-        used_image_ids = set()
-
-        # Process each section (including subsections)
-        for section_idx, section in enumerate(sections):
-            section_title = section.get("title", "")
-            section_content = section.get("content", "")
-            section_type = section.get("section_type", "custom")
-
-            # Find relevant images for this section
-            relevant_images = self._match_images_to_content(
-                section_title=section_title,
-                section_content=section_content,
-                section_type=section_type,
-                available_images=images,
-                used_image_ids=used_image_ids
-            )
+        slots = self._image_slots(sections)
+        logger.info(f"Semantically matching {len(images)} images to {len(slots)} sections and subsections")
 
-            # Generate contextual captions for matched images
-            section_images_with_captions = []
-            for image in relevant_images:
-                caption = await self._generate_image_caption(
-                    image=image,
-                    section_title=section_title,
-                    section_context=section_content[:500]  # First 500 chars for context
-                )
+        placed = await self._place_images(slots, images)
+        for section in sections:
+            mark_clean(section, "images", "embedding")
 
-                section_images_with_captions.append({
-                    "image_id": image.get("id"),
-                    "file_path": image.get("file_path"),
-                    "caption": caption,
-                    "relevance_score": image.get("_relevance_score", 0.0),
-                    "source_pdf": image.get("source_pdf")
-                })
+        chapter.sections = sections
 
-                # Mark image as used
-                image_id = image.get("id")
-                if image_id:
-                    used_image_ids.add(image_id)
+        self.db.commit()
+        logger.info(
+            f"Stage 7 complete: Semantically integrated {placed}/{len(images)} images "
+            f"across sections and subsections"
+        )
 
-            section["images"] = section_images_with_captions
+    def _image_slots(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        One placement slot per section and subsection
 
-            # Process subsections if present
-            subsections = section.get("subsections", [])
-            for subsection in subsections:
+        Subsections are matched under their parent title but captioned with their own.
+        """
+        slots = []
+        for section in sections:
+            section_title = section.get("title", "")
+            section_type = section.get("section_type", "custom")
+            slots.append({
+                "target": section,
+                "match_title": section_title,
+                "caption_title": section_title,
+                "content": section.get("content", ""),
+                "section_type": section_type,
+                "max_images": 3,
+                "context_chars": 500,
+                "subsection": False
+            })
+            for subsection in section.get("subsections", []):
                 subsection_title = subsection.get("title", "")
-                subsection_content = subsection.get("content", "")
-
-                # Find images for subsection
-                subsection_images = self._match_images_to_content(
-                    section_title=f"{section_title} - {subsection_title}",
-                    section_content=subsection_content,
-                    section_type=section_type,
-                    available_images=images,
-                    used_image_ids=used_image_ids,
-                    max_images=2  # Limit subsections to 2 images each
-                )
-
-                subsection_images_with_captions = []
-                for image in subsection_images:
-                    caption = await self._generate_image_caption(
-                        image=image,
-                        section_title=subsection_title,
-                        section_context=subsection_content[:300]
-                    )
-
-                    subsection_images_with_captions.append({
-                        "image_id": image.get("id"),
-                        "file_path": image.get("file_path"),
-                        "caption": caption,
-                        "relevance_score": image.get("_relevance_score", 0.0)
-                    })
-
-                    image_id = image.get("id")
-                    if image_id:
-                        used_image_ids.add(image_id)
+                slots.append({
+                    "target": subsection,
+                    "match_title": f"{section_title} - {subsection_title}",
+                    "caption_title": subsection_title,
+                    "content": subsection.get("content", ""),
+                    "section_type": section_type,
+                    "max_images": 2,  # Limit subsections to 2 images each
+                    "context_chars": 300,
+                    "subsection": True
+                })
+        return slots
 
-                subsection["images"] = subsection_images_with_captions
+    async def _place_images(self, slots: List[Dict[str, Any]], images: List[Dict[str, Any]]) -> int:
+        """
+        Assign images to slots and caption them (replaces each slot's images)
 
-        chapter.sections = sections
+        Returns:
+            Number of images placed
+        """
+        scores, min_score = await self._image_placement_scores(slots, images)
+        assignments = assign_images(scores, [slot["max_images"] for slot in slots], min_score=min_score)
+
+        placements = [
+            (slot_idx, image_idx, score)
+            for slot_idx, assigned in enumerate(assignments)
+            for image_idx, score in assigned
+        ]
+
+        async def caption(idx: int, placement) -> str:
+            slot_idx, image_idx, _ = placement
+            slot = slots[slot_idx]
+            return await self._cached_image_caption(
+                image=images[image_idx],
+                section_title=slot["caption_title"],
+                section_context=slot["content"][:slot["context_chars"]]
+            )
 
-        self.db.commit()
-        logger.info(
-            f"Stage 7 complete: Semantically integrated {len(used_image_ids)}/{len(images)} images "
-            f"across sections and subsections"
+        concurrency = settings.IMAGE_CAPTION_MAX_CONCURRENCY
+        executor = SlidingWindowExecutor(
+            AdaptiveConcurrencyLimiter(initial=concurrency, maximum=concurrency),
+            max_attempts=1
         )
+        captions = await executor.run(placements, caption)
+
+        for slot in slots:
+            slot["target"]["images"] = []
+
+        for (slot_idx, image_idx, score), image_caption in zip(placements, captions):
+            slot = slots[slot_idx]
+            image = images[image_idx]
+            if isinstance(image_caption, Exception):
+                image_caption = image.get("caption") or f"Figure: {slot['caption_title']}"
+
+            placed = {
+                "image_id": self._image_id(image),
+                "file_path": image.get("file_path"),
+                "caption": image_caption,
+                "relevance_score": round(score, 4)
+            }
+            if not slot["subsection"]:
+                placed["source_pdf"] = image.get("source_pdf")
+            slot["target"]["images"].append(placed)
+
+        return len(placements)
 
     async def _stage_8_citation_network(self, chapter: Chapter) -> None:
         """
@@ -1461,49 +1732,14 @@ class ChapterOrchestrator:
                 chapter_title=chapter.title
             )
 
-            # Get verification summary for easy access
-            summary = self.fact_check_service.get_verification_summary(fact_check_results)
+            self._store_fact_check(chapter, fact_check_results, len(all_sources))
+            for section in sections:
+                mark_clean(section, "fact_check")
+            self.db.commit()
 
-            # Determine pass/fail based on accuracy and critical issues
+            passed = chapter.fact_check_passed
             accuracy = fact_check_results["overall_accuracy"]
             critical_issues = fact_check_results["critical_issues_count"]
-            critical_severity = fact_check_results["critical_severity_claims"]
-
-            # Passing criteria:
-            # - Accuracy >= 90% OR
-            # - Accuracy >= 80% AND no critical severity issues
-            # - AND no more than 2 critical issues overall
-            passed = (
-                (accuracy >= 0.90) or
-                (accuracy >= 0.80 and critical_severity == 0)
-            ) and critical_issues <= 2
-
-            # Store comprehensive results
-            chapter.fact_checked = True
-            chapter.fact_check_passed = passed
-            chapter.stage_10_fact_check = {
-                "overall_accuracy": accuracy,
-                "accuracy_percentage": accuracy * 100,
-                "accuracy_grade": summary["accuracy_grade"],
-                "total_claims": fact_check_results["total_claims"],
-                "verified_claims": fact_check_results["verified_claims"],
-                "unverified_claims": fact_check_results["unverified_claims"],
-                "critical_issues": fact_check_results["all_critical_issues"],
-                "critical_issues_count": critical_issues,
-                "critical_severity_claims": critical_severity,
-                "high_severity_claims": fact_check_results["high_severity_claims"],
-                "sections_checked": fact_check_results["sections_checked"],
-                "sources_used": len(all_sources),
-                "by_category": summary["by_category"],
-                "unverified_by_severity": summary["unverified_by_severity"],
-                "requires_attention": summary["requires_attention"],
-                "passed": passed,
-                "ai_cost_usd": fact_check_results["total_cost_usd"],
-                "checked_at": fact_check_results["checked_at"],
-                "section_results": fact_check_results["section_results"]  # Detailed per-section results
-            }
-
-            self.db.commit()
 
             # Log comprehensive summary
             status = "PASSED ✓" if passed else "FAILED ✗"
@@ -1534,6 +1770,50 @@ class ChapterOrchestrator:
             self.db.commit()
             raise
 
+    def _store_fact_check(self, chapter: Chapter, fact_check_results: Dict[str, Any], sources_used: int) -> None:
+        """Store aggregated fact-check results and the pass/fail verdict on the chapter"""
+        # Get verification summary for easy access
+        summary = self.fact_check_service.get_verification_summary(fact_check_results)
+
+        # Determine pass/fail based on accuracy and critical issues
+        accuracy = fact_check_results["overall_accuracy"]
+        critical_issues = fact_check_results["critical_issues_count"]
+        critical_severity = fact_check_results["critical_severity_claims"]
+
+        # Passing criteria:
+        # - Accuracy >= 90% OR
+        # - Accuracy >= 80% AND no critical severity issues
+        # - AND no more than 2 critical issues overall
+        passed = (
+            (accuracy >= 0.90) or
+            (accuracy >= 0.80 and critical_severity == 0)
+        ) and critical_issues <= 2
+
+        # Store comprehensive results
+        chapter.fact_checked = True
+        chapter.fact_check_passed = passed
+        chapter.stage_10_fact_check = {
+            "overall_accuracy": accuracy,
+            "accuracy_percentage": accuracy * 100,
+            "accuracy_grade": summary["accuracy_grade"],
+            "total_claims": fact_check_results["total_claims"],
+            "verified_claims": fact_check_results["verified_claims"],
+            "unverified_claims": fact_check_results["unverified_claims"],
+            "critical_issues": fact_check_results["all_critical_issues"],
+            "critical_issues_count": critical_issues,
+            "critical_severity_claims": critical_severity,
+            "high_severity_claims": fact_check_results["high_severity_claims"],
+            "sections_checked": fact_check_results["sections_checked"],
+            "sources_used": sources_used,
+            "by_category": summary["by_category"],
+            "unverified_by_severity": summary["unverified_by_severity"],
+            "requires_attention": summary["requires_attention"],
+            "passed": passed,
+            "ai_cost_usd": fact_check_results["total_cost_usd"],
+            "checked_at": fact_check_results["checked_at"],
+            "section_results": fact_check_results["section_results"]  # Detailed per-section results
+        }
+
     # ==================== Stage 11 Helper Methods ====================
 
     def _extract_all_headings(self, sections: List[Dict[str, Any]], parent_num: str = "") -> List[Dict[str, Any]]:
@@ -1734,6 +2014,47 @@ class ChapterOrchestrator:
             "philosophy_note": "Flexible validation - warnings are suggestions, not requirements"
         }
 
+    def _link_section_citations(
+        self,
+        section: Dict[str, Any],
+        references: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Match a section's (Author, Year) citations to reference numbers
+
+        Args:
+            section: Section dictionary (subsections included)
+            references: Chapter reference list from stage 8
+
+        Returns:
+            One entry per distinct citation: marker and ref_num (None when unmatched)
+        """
+        import re
+
+        texts = [section.get("content", "")]
+        texts.extend(sub.get("content", "") for sub in section.get("subsections") or [])
+
+        citations = []
+        seen = set()
+        for marker in re.findall(r'\[([A-Za-z\s&]+,?\s*\d{4})\]', "\n".join(texts)):
+            if marker in seen:
+                continue
+            seen.add(marker)
+
+            year = marker[-4:]
+            surname = re.split(r'[\s,&]+', marker.strip())[0].lower()
+            ref_num = next(
+                (
+                    ref.get("ref_num") for ref in references
+                    if str(ref.get("year")) == year
+                    and any(surname in str(author).lower() for author in ref.get("authors") or [])
+                ),
+                None
+            )
+            citations.append({"marker": marker, "ref_num": ref_num})
+
+        return citations
+
     def _normalize_markdown_formatting(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Apply consistent markdown formatting to sections.
@@ -1836,6 +2157,11 @@ class ChapterOrchestrator:
             logger.info("Normalizing markdown formatting...")
             formatted_sections = self._normalize_markdown_formatting(sections)
 
+            # Link in-text citations to the reference list
+            for section in formatted_sections:
+                section["citations"] = self._link_section_citations(section, chapter.references or [])
+                mark_clean(section, "formatting", "citations")
+
             # Step 4: Update chapter with formatted sections
             chapter.sections = formatted_sections
 
@@ -2346,7 +2672,9 @@ Please provide a comprehensive, honest review that will help improve this chapte
         section_plan: Dict[str, Any],
         section_hints: Dict[str, Any],
         relevant_sources: List[Dict[str, Any]],
-        section_num: int
+        section_num: int,
+        stream: Optional[ChapterStream] = None,
+        compactor: Optional[SourceCompactor] = None
     ) -> Dict[str, Any]:
         """
         Generate content for a single section using type-specific hints.
@@ -2357,6 +2685,8 @@ Please provide a comprehensive, honest review that will help improve this chapte
             section_hints: Type-specific generation hints (if available)
             relevant_sources: Sources allocated for this section
             section_num: Section number
+            stream: Optional chapter token stream to forward content to
+            compactor: Chapter's source compactor (one is created if omitted)
 
         Returns:
             Dictionary with content, word count, sources used, cost
@@ -2366,6 +2696,14 @@ Please provide a comprehensive, honest review that will help improve this chapte
         key_points = section_plan.get('key_points', [])
         word_count_estimate = section_plan.get('word_count_estimate', 500)
 
+        sources_block = await self._sources_prompt_block(
+            compactor,
+            section_outline(section_plan),
+            relevant_sources,
+            settings.PROMPT_SECTION_SOURCE_TOKEN_BUDGET,
+            label=f"section {section_num}"
+        )
+
         # Build prompt with flexible section-type guidance
         prompt = f"""
 Write a comprehensive neurosurgery section for:
@@ -2395,7 +2733,7 @@ KEY POINTS TO COVER (based on available knowledge):
 {json.dumps(key_points, indent=2)}
 
 AVAILABLE SOURCES for this section (use for evidence and citations):
-{json.dumps(relevant_sources, indent=2)}
+{sources_block}
 
 REQUIREMENTS:
 - Target word count: {word_count_estimate} words (flexible based on content)
@@ -2411,7 +2749,10 @@ Write the section content in markdown format.
 Return ONLY the content (no meta-commentary).
 """
 
-        response = await self.ai_service.generate_text(
+        response = await self._generate_section_text(
+            stream,
+            str(section_num),
+            section_title,
             prompt=prompt,
             task=AITask.SECTION_WRITING,
             max_tokens=word_count_estimate * 2,  # 2 tokens per word approx
@@ -2437,13 +2778,45 @@ Return ONLY the content (no meta-commentary).
             "model": response.get("model", "unknown")
         }
 
+    async def _generate_section_text(
+        self,
+        stream: Optional[ChapterStream],
+        stream_id: str,
+        title: str,
+        **generate_kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate section text, forwarding tokens to the chapter stream if one is open
+
+        A retried section restarts its stream (clients reset it on
+        section_stream_started).
+
+        Returns:
+            Response dict in the generate_text format
+        """
+        if stream is None:
+            return await self.ai_service.generate_text(**generate_kwargs)
+
+        await stream.start_section(stream_id, title)
+        response = None
+        async for event in self.ai_service.generate_text_stream(**generate_kwargs):
+            if "chunk" in event:
+                await stream.publish(stream_id, event["chunk"])
+            else:
+                response = event
+        await stream.complete_section(stream_id)
+        return response
+
     async def _generate_subsection_content(
         self,
         chapter_title: str,
         parent_section_title: str,
         subsection_plan: Dict[str, Any],
         relevant_sources: List[Dict[str, Any]],
-        subsection_num: int
+        subsection_num: int,
+        stream: Optional[ChapterStream] = None,
+        stream_id: Optional[str] = None,
+        compactor: Optional[SourceCompactor] = None
     ) -> Dict[str, Any]:
         """
         Generate content for a subsection (hierarchical support).
@@ -2456,6 +2829,9 @@ Return ONLY the content (no meta-commentary).
             subsection_plan: Subsection plan from Stage 5
             relevant_sources: Sources allocated for parent section
             subsection_num: Subsection number
+            stream: Optional chapter token stream to forward content to
+            stream_id: Stream ID of the subsection (e.g. "3.2")
+            compactor: Chapter's source compactor (one is created if omitted)
 
         Returns:
             Dictionary with content, word count, sources used, cost
@@ -2464,6 +2840,14 @@ Return ONLY the content (no meta-commentary).
         key_points = subsection_plan.get('key_points', [])
         word_count_estimate = subsection_plan.get('word_count_estimate', 200)
 
+        sources_block = await self._sources_prompt_block(
+            compactor,
+            section_outline(subsection_plan, parent_section_title),
+            relevant_sources[:5],
+            settings.PROMPT_SUBSECTION_SOURCE_TOKEN_BUDGET,
+            label=f"subsection {stream_id or subsection_num}"
+        )
+
         prompt = f"""
 Write a focused subsection for:
 
@@ -2475,7 +2859,7 @@ KEY POINTS TO COVER:
 {json.dumps(key_points, indent=2)}
 
 AVAILABLE SOURCES:
-{json.dumps(relevant_sources[:5], indent=2)}
+{sources_block}
 
 REQUIREMENTS:
 - Target word count: {word_count_estimate} words (concise and focused)
@@ -2489,7 +2873,10 @@ Write the subsection content in markdown format.
 Return ONLY the content.
 """
 
-        response = await self.ai_service.generate_text(
+        response = await self._generate_section_text(
+            stream,
+            stream_id or str(subsection_num),
+            subsection_title,
             prompt=prompt,
             task=AITask.SECTION_WRITING,
             max_tokens=word_count_estimate * 2,
@@ -2513,97 +2900,169 @@ Return ONLY the content.
             "cost_usd": response.get("cost_usd", 0.0)
         }
 
-    def _match_images_to_content(
+    async def _sources_prompt_block(
         self,
-        section_title: str,
-        section_content: str,
-        section_type: str,
-        available_images: List[Dict[str, Any]],
-        used_image_ids: set,
-        max_images: int = 3
-    ) -> List[Dict[str, Any]]:
+        compactor: Optional[SourceCompactor],
+        outline: str,
+        sources: List[Dict[str, Any]],
+        budget: int,
+        label: str
+    ) -> str:
+        """Sources for a generation prompt: packed passages, or raw JSON when compaction is disabled"""
+        if not settings.PROMPT_COMPACTION_ENABLED:
+            return json.dumps(sources, indent=2)
+        compactor = compactor or SourceCompactor(self.ai_service)
+        compacted = await compactor.pack(outline, sources, budget, label=label)
+        return compacted.text
+
+    @staticmethod
+    def _image_id(image: Dict[str, Any]) -> Optional[str]:
+        """Image ID from stage 3 image metadata (search results use 'image_id')"""
+        image_id = image.get("id") or image.get("image_id")
+        return str(image_id) if image_id else None
+
+    async def _image_placement_scores(
+        self,
+        slots: List[Dict[str, Any]],
+        images: List[Dict[str, Any]]
+    ):
         """
-        Semantically match images to section content.
-
-        Uses keyword matching and content analysis to find most relevant images.
-
-        Args:
-            section_title: Section title
-            section_content: Section content text
-            section_type: Type of section (for relevance hints)
-            available_images: All available images
-            used_image_ids: Set of image IDs already used (to avoid duplication)
-            max_images: Maximum images to return
+        Relevance matrix (slots x images) for image placement
 
         Returns:
-            List of most relevant images with relevance scores
+            Tuple of (scores, minimum score for a placement)
         """
-        if not available_images:
-            return []
+        try:
+            scores = await self._embedding_image_scores(slots, images)
+            return scores, settings.IMAGE_PLACEMENT_MIN_SIMILARITY
+        except Exception as e:
+            logger.warning(f"Embedding image matching unavailable, using keyword matching: {str(e)}")
+            return self._keyword_image_scores(slots, images), 0.0
 
-        # Extract keywords from section
-        section_keywords = []
-        section_keywords.extend(section_title.lower().split())
-        section_keywords.extend(section_content.lower().split()[:200])  # First 200 words
+    async def _embedding_image_scores(
+        self,
+        slots: List[Dict[str, Any]],
+        images: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Cosine similarity between section text and image embeddings
+
+        Stored image embeddings are loaded in one query; sections (and images
+        without a stored embedding) are embedded in one batched request.
+        """
+        image_ids = [self._image_id(image) for image in images]
+        stored = {}
+        known_ids = [image_id for image_id in image_ids if image_id]
+        if known_ids:
+            rows = self.db.query(Image.id, Image.embedding).filter(
+                Image.id.in_(known_ids),
+                Image.embedding.isnot(None)
+            ).all()
+            stored = {str(row.id): row.embedding for row in rows}
+
+        missing = [idx for idx, image_id in enumerate(image_ids) if image_id not in stored]
+        texts = [f"{slot['match_title']}\n{slot['content'][:2000]}" for slot in slots]
+        for idx in missing:
+            image = images[idx]
+            texts.append(
+                " ".join(
+                    str(part) for part in (image.get("caption"), image.get("description"), image.get("keywords"))
+                    if part
+                ) or "medical figure"
+            )
 
-        # Remove common words
+        response = await self.ai_service.generate_embeddings_batch(texts)
+        vectors = response["embeddings"]
+
+        image_vectors = [stored.get(image_id) for image_id in image_ids]
+        for offset, idx in enumerate(missing):
+            image_vectors[idx] = vectors[len(slots) + offset]
+
+        return cosine_similarity_matrix(vectors[:len(slots)], image_vectors)
+
+    def _keyword_image_scores(
+        self,
+        slots: List[Dict[str, Any]],
+        images: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """
+        Keyword relevance matrix (slots x images) from image metadata
+
+        Caption matches weigh most, then description, then keywords; images
+        matching the section type (surgical, pathology, imaging) get a bonus.
+        """
         common_words = {
             'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
             'is', 'are', 'was', 'were', 'been', 'be', 'have', 'has', 'had', 'this', 'that', 'these',
             'those', 'can', 'will', 'should', 'may', 'also', 'such', 'which', 'from', 'not'
         }
-        section_keywords = [k for k in section_keywords if k not in common_words and len(k) > 3]
-
-        # Score each image
-        scored_images = []
-        for image in available_images:
-            image_id = image.get("id")
-
-            # Skip already used images
-            if image_id and image_id in used_image_ids:
-                continue
+        type_terms = {
+            "surgical_technique": ["surgical", "procedure", "approach", "technique"],
+            "pathophysiology": ["anatomy", "pathology", "microscopic", "cellular"],
+            "diagnostic_evaluation": ["mri", "ct", "imaging", "scan", "x-ray"]
+        }
 
-            score = 0.0
+        image_fields = [
+            (
+                (image.get("caption") or "").lower(),
+                (image.get("description") or "").lower(),
+                str(image.get("keywords", [])).lower()
+            )
+            for image in images
+        ]
+
+        scores = np.zeros((len(slots), len(images)), dtype=np.float32)
+        for slot_idx, slot in enumerate(slots):
+            # First 200 words of content plus the title
+            keywords = slot["match_title"].lower().split() + slot["content"].lower().split()[:200]
+            keywords = [k for k in keywords if k not in common_words and len(k) > 3]
+            bonus_terms = type_terms.get(slot["section_type"], [])
+
+            for image_idx, (caption, description, image_keywords) in enumerate(image_fields):
+                score = 0.0
+                for keyword in keywords:
+                    if keyword in caption:
+                        score += 3.0
+                    if keyword in description:
+                        score += 2.0
+                    if keyword in image_keywords:
+                        score += 1.5
+                if score > 0 and any(term in caption for term in bonus_terms):
+                    score += 2.0
+                scores[slot_idx, image_idx] = score
 
-            # Match against image metadata
-            image_caption = image.get("caption", "").lower()
-            image_description = image.get("description", "").lower()
-            image_keywords = image.get("keywords", [])
+        return scores
 
-            # Score based on keyword matches
-            for keyword in section_keywords:
-                if keyword in image_caption:
-                    score += 3.0
-                if keyword in image_description:
-                    score += 2.0
-                if keyword in str(image_keywords).lower():
-                    score += 1.5
+    async def _cached_image_caption(
+        self,
+        image: Dict[str, Any],
+        section_title: str,
+        section_context: str
+    ) -> str:
+        """
+        Contextual caption, cached per (image, section title + context)
+        """
+        image_key = self._image_id(image) or hashlib.sha256(
+            json.dumps(image, sort_keys=True, default=str).encode()
+        ).hexdigest()[:32]
+        section_hash = hashlib.sha256(f"{section_title}\n{section_context}".encode()).hexdigest()[:32]
+        cache_key = redis_manager.make_key("image_caption", image_key, section_hash)
 
-            # Bonus for section type relevance
-            if section_type == "surgical_technique":
-                # Prioritize surgical/procedural images
-                if any(term in image_caption.lower() for term in ["surgical", "procedure", "approach", "technique"]):
-                    score += 2.0
-            elif section_type == "pathophysiology":
-                # Prioritize anatomical/pathological images
-                if any(term in image_caption.lower() for term in ["anatomy", "pathology", "microscopic", "cellular"]):
-                    score += 2.0
-            elif section_type == "diagnostic_evaluation":
-                # Prioritize imaging/diagnostic images
-                if any(term in image_caption.lower() for term in ["mri", "ct", "imaging", "scan", "x-ray"]):
-                    score += 2.0
+        cached = redis_manager.get(cache_key)
+        if cached:
+            return cached
 
-            if score > 0:
-                image_copy = image.copy()
-                image_copy["_relevance_score"] = score
-                scored_images.append((score, image_copy))
+        caption = await self._generate_image_caption(
+            image=image,
+            section_title=section_title,
+            section_context=section_context
+        )
 
-        # Sort by relevance score
-        scored_images.sort(key=lambda x: x[0], reverse=True)
+        # Fallback captions are not cached so a later run can retry generation
+        if caption != (image.get("caption", "") or f"Figure: {section_title}"):
+            redis_manager.set(cache_key, caption, ttl=settings.IMAGE_CAPTION_CACHE_TTL_SECONDS)
 
-        # Return top N most relevant images
-        relevant_count = min(max_images, len(scored_images))
-        return [img for score, img in scored_images[:relevant_count]]
+        return caption
 
     async def _generate_image_caption(
         self,
@@ -2694,7 +3153,9 @@ Return ONLY the caption text.
         This method provides 84% cost savings by:
         - Reusing stages 1-5 data (input validation, context, research, planning)
         - Only re-running stage 6 for the target section
-        - Skipping stages 7-14 (images, citations, QA, etc. - already done)
+        - Recomputing only this section's stale artifacts from stages 7-11
+          (images, section embeddings, citations, fact-check claims,
+          formatting); other sections' artifacts are reused
 
         Cost comparison:
         - Full regeneration: $0.50-0.70 (all 14 stages)
@@ -2778,7 +3239,7 @@ Return ONLY the caption text.
         try:
             response = await self.ai_service.generate_text(
                 prompt=prompt,
-                task=AITask.CONTENT_GENERATION,
+                task=AITask.SECTION_WRITING,
                 max_tokens=2000,
                 temperature=0.7
             )
@@ -2795,6 +3256,8 @@ Return ONLY the caption text.
             word_count = len(new_content.split())
             chapter.sections[section_number]["word_count"] = word_count
 
+            saved_work = await self._refresh_section_artifacts(chapter, section_number)
+
             self.db.commit()
 
             logger.info(f"Section {section_number} regenerated successfully, cost: ${cost_usd:.4f}")
@@ -2812,9 +3275,162 @@ Return ONLY the caption text.
                 "new_content": new_content,
                 "cost_usd": cost_usd,
                 "word_count": word_count,
-                "section_title": section_title
+                "section_title": section_title,
+                "saved_work": saved_work
             }
 
         except Exception as e:
             logger.error(f"Section regeneration failed: {str(e)}", exc_info=True)
             raise
+
+    async def _refresh_section_artifacts(self, chapter: Chapter, section_number: int) -> Dict[str, Any]:
+        """
+        Recompute the dirty downstream artifacts of one section
+
+        Other sections keep their images, citations, fact-check claims and
+        embeddings; chapter fact-check totals are re-aggregated from the
+        stored per-section results. A refresh that fails leaves its artifact
+        dirty for the next regeneration. Any change re-embeds the chapter
+        search vector; if that fails the vector is cleared so the chapter is
+        picked up for re-embedding.
+
+        Args:
+            chapter: Chapter whose section content was just replaced
+            section_number: Section index (0-based)
+
+        Returns:
+            Saved-work report: per artifact, the units recomputed vs. a full
+            chapter pass, and the fact-check cost of the sections not re-checked
+        """
+        sections = copy.deepcopy(chapter.sections)
+        section = sections[section_number]
+        others = [s for idx, s in enumerate(sections) if idx != section_number]
+        dirty = dirty_artifacts(section)
+
+        refreshed = []
+        recomputed = dict.fromkeys(SECTION_ARTIFACTS, 0)
+        fact_check_cost_avoided = 0.0
+
+        if "formatting" in dirty:
+            section = self._normalize_markdown_formatting([section])[0]
+            sections[section_number] = section
+            recomputed["formatting"] = 1
+            refreshed.append("formatting")
+
+        if "citations" in dirty:
+            section["citations"] = self._link_section_citations(section, chapter.references or [])
+            recomputed["citations"] = 1
+            refreshed.append("citations")
+
+        async def refresh_images() -> int:
+            images = (chapter.stage_3_internal_research or {}).get("images", [])
+            slots = self._image_slots([section])
+
+            # Images stay unique across the chapter: skip those placed elsewhere
+            placed_elsewhere = {
+                image.get("image_id")
+                for other_slot in self._image_slots(others)
+                for image in other_slot["target"].get("images", [])
+            }
+            available = [image for image in images if self._image_id(image) not in placed_elsewhere]
+
+            if available:
+                await self._place_images(slots, available)
+            else:
+                for slot in slots:
+                    slot["target"]["images"] = []
+            return len(slots) if available else 0
+
+        async def refresh_fact_check() -> float:
+            internal_sources = (chapter.stage_3_internal_research or {}).get("sources", [])
+            external_sources = (chapter.stage_4_external_research or {}).get("sources", [])
+            all_sources = internal_sources + external_sources
+            content = section.get("content", "")
+            if not all_sources or not content:
+                return 0.0
+
+            title = section.get("title", f"Section {section_number + 1}")
+            result = await self.fact_check_service.fact_check_section(
+                section_content=content,
+                sources=self.fact_check_service.select_relevant_sources(title, content, all_sources),
+                chapter_title=chapter.title,
+                section_title=title,
+                source_pool=all_sources
+            )
+
+            result["section_index"] = section_number
+
+            # Replace this section's previous result, keeping section order
+            previous = (chapter.stage_10_fact_check or {}).get("section_results", [])
+            kept = [r for r in previous if r.get("section_index") != section_number]
+            position = next(
+                (idx for idx, r in enumerate(kept) if r.get("section_index", -1) > section_number),
+                len(kept)
+            )
+            section_results = kept[:position] + [result] + kept[position:]
+
+            self._store_fact_check(
+                chapter,
+                self.fact_check_service.aggregate_results(section_results, chapter.title),
+                len(all_sources)
+            )
+            return sum(r.get("ai_cost_usd", 0.0) for r in kept)
+
+        refreshes = {}
+        if "images" in dirty or "embedding" in dirty:
+            refreshes["images"] = refresh_images()
+        if "fact_check" in dirty:
+            refreshes["fact_check"] = refresh_fact_check()
+        if dirty:
+            refreshes["chapter_embedding"] = self.embedding_service.embed_chapter(chapter, sections)
+
+        chapter_embedding_refreshed = False
+        results = await asyncio.gather(*refreshes.values(), return_exceptions=True)
+        for name, result in zip(refreshes, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not refresh {name} for section {section_number}: {str(result)}")
+                if name == "chapter_embedding":
+                    self.embedding_service.clear_chapter_embedding(chapter.id)
+                continue
+            if name == "chapter_embedding":
+                chapter_embedding_refreshed = True
+            elif name == "images":
+                recomputed["images"] = 1
+                recomputed["embedding"] = result
+                refreshed.extend(["images", "embedding"])
+            else:
+                recomputed["fact_check"] = 1
+                fact_check_cost_avoided = result
+                refreshed.append("fact_check")
+
+        mark_clean(section, *refreshed)
+        chapter.sections = sections
+
+        full_pass = {
+            "formatting": len(sections),
+            "citations": len(sections),
+            "images": len(sections),
+            "embedding": len(self._image_slots(sections)),
+            "fact_check": sum(1 for s in sections if s.get("content"))
+        }
+        report = {
+            "dirty": dirty,
+            "artifacts": {
+                name: {
+                    "recomputed": recomputed[name],
+                    "full_pass": full_pass[name],
+                    "saved": max(0, full_pass[name] - recomputed[name])
+                }
+                for name in SECTION_ARTIFACTS
+            },
+            "fact_check_cost_avoided_usd": round(fact_check_cost_avoided, 6),
+            "chapter_embedding_refreshed": chapter_embedding_refreshed
+        }
+
+        logger.info(
+            f"Section {section_number} artifacts refreshed: {refreshed or 'none'}; "
+            f"saved {sum(a['saved'] for a in report['artifacts'].values())} artifact recomputations, "
+            f"${fact_check_cost_avoided:.4f} of fact-checking"
+        )
+
+        return report
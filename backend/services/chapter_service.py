@@ -236,6 +236,33 @@ class ChapterService:
 
         return new_chapter
 
+    async def resume_chapter(
+        self,
+        chapter_id: str,
+        user: User
+    ) -> Chapter:
+        """
+        Resume an interrupted or failed chapter generation in place
+
+        Completed stages are restored from their checkpoints; generation
+        continues from the first incomplete stage.
+
+        Args:
+            chapter_id: Chapter ID
+            user: User requesting the resume
+
+        Returns:
+            Generated Chapter
+
+        Raises:
+            HTTPException: If chapter not found
+        """
+        chapter = self.get_chapter(chapter_id)
+
+        logger.info(f"Resuming chapter {chapter_id} for user {user.email}")
+
+        return await self.orchestrator.resume_chapter(str(chapter.id))
+
     def delete_chapter(self, chapter_id: str) -> Dict[str, Any]:
         """
         Delete a chapter
@@ -532,6 +559,7 @@ class ChapterService:
             "new_content": result.get("new_content"),
             "version": chapter.version,
             "cost_usd": result.get("cost_usd"),
+            "saved_work": result.get("saved_work"),
             "updated_at": chapter.updated_at.isoformat()
         }
 
@@ -6,19 +6,75 @@ Part of Chapter-Level Vector Search (Phase 4)
 
 from celery import Task
 from typing import List, Tuple, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import func, text
 import uuid
 
 from backend.services.celery_app import celery_app
+from backend.config import settings
 from backend.database.connection import db
-from backend.database.models import PDFChapter, PDFChunk, PDFBook
+from backend.database.models import PDFChapter, PDFChunk, PDFBook, PDFChapterNeighbor
 from backend.services.ai_provider_service import AIProviderService
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
 
 
+def chapter_preference_score(chapter: PDFChapter) -> float:
+    """
+    Calculate preference score for duplicate ranking
+
+    Scoring:
+    - Source type: Standalone chapter (+10), Textbook chapter (+5), Research paper (+3)
+    - Word count: Up to +5 (longer = better)
+    - Quality score: Up to +5
+    - Recency: Up to +3
+    - Detection confidence: Up to +2
+
+    Args:
+        chapter: PDFChapter object
+
+    Returns:
+        Preference score (higher = preferred)
+    """
+    score = 0.0
+
+    # Source type scoring
+    if chapter.source_type == "standalone_chapter":
+        score += 10.0
+    elif chapter.source_type == "textbook_chapter":
+        score += 5.0
+    elif chapter.source_type == "research_paper":
+        score += 3.0
+
+    # Word count scoring (normalized to 5.0 max)
+    if chapter.word_count:
+        # Prefer longer chapters (more complete)
+        # 10k words = max score
+        score += min(5.0, (chapter.word_count / 10000) * 5.0)
+
+    # Quality score
+    if chapter.quality_score:
+        score += chapter.quality_score * 5.0
+
+    # Recency (if book has publication year)
+    if chapter.book and chapter.book.publication_year:
+        year = chapter.book.publication_year
+        # Boost recent publications (2020+ get full 3 points)
+        if year >= 2020:
+            score += 3.0
+        elif year >= 2010:
+            score += 2.0
+        elif year >= 2000:
+            score += 1.0
+
+    # Detection confidence
+    if chapter.detection_confidence:
+        score += chapter.detection_confidence * 2.0
+
+    return score
+
+
 class ChapterVectorSearchService:
     """
     Service for multi-level chapter vector search
@@ -255,6 +311,10 @@ class ChapterVectorSearchService:
         Find chapters similar to a given chapter using vector similarity
 
         This method is used by the chapter detail page to show related chapters.
+        Reads the materialized neighbor list (pdf_chapter_neighbors) in a single
+        indexed query; falls back to one live k-NN query for chapters whose
+        list has not been computed yet, or whose full list has fewer than
+        `limit` entries left once duplicates are dropped.
 
         Args:
             chapter_id: UUID of the source chapter
@@ -272,55 +332,414 @@ class ChapterVectorSearchService:
         """
         logger.info(f"Finding similar chapters for chapter_id={chapter_id}, limit={limit}")
 
-        # Get source chapter
-        source_chapter = self.db.query(PDFChapter).filter(
-            PDFChapter.id == chapter_id
-        ).first()
+        query = self.db.query(
+            PDFChapter,
+            PDFChapterNeighbor.cosine_similarity
+        ).join(
+            PDFChapterNeighbor,
+            PDFChapterNeighbor.neighbor_id == PDFChapter.id
+        ).filter(
+            PDFChapterNeighbor.chapter_id == chapter_id
+        ).options(
+            defer(PDFChapter.extracted_text),
+            defer(PDFChapter.embedding)
+        )
+
+        # The whole list (CHAPTER_NEIGHBORS_K rows) is read so duplicates are
+        # dropped before applying the limit
+        neighbors = query.order_by(PDFChapterNeighbor.rank).all()
+        rows = [
+            (chapter, cosine_similarity)
+            for chapter, cosine_similarity in neighbors
+            if not (exclude_duplicates and chapter.is_duplicate)
+        ]
+
+        # A full list may have more qualifying neighbors beyond its last rank
+        truncated = len(neighbors) >= settings.CHAPTER_NEIGHBORS_K
+        if not neighbors or (len(rows) < limit and truncated):
+            rows = self._live_similar_chapters(chapter_id, limit, exclude_duplicates)
+        rows = rows[:limit]
+
+        # Convert cosine similarity to the 0-1 score used by the API
+        # (cosine_distance range is 0-2, where 0 is identical)
+        results = []
+        for chapter, cosine_similarity in rows:
+            similarity = 1 - ((1 - cosine_similarity) / 2)
+
+            # Only include if similarity is above threshold (0.5 = 50%)
+            if similarity >= 0.5:
+                results.append((chapter, similarity))
+
+        logger.info(f"Found {len(results)} similar chapters for {chapter_id}")
+
+        return results
 
-        if not source_chapter:
-            logger.warning(f"Source chapter not found: {chapter_id}")
-            return []
+    def _live_similar_chapters(
+        self,
+        chapter_id: uuid.UUID,
+        limit: int,
+        exclude_duplicates: bool
+    ) -> List[Tuple[PDFChapter, float]]:
+        """
+        One k-NN query (HNSW) returning chapters with their cosine similarity
+        """
+        source_embedding = self.db.query(PDFChapter.embedding).filter(
+            PDFChapter.id == chapter_id
+        ).scalar_subquery()
 
-        if source_chapter.embedding is None:
-            logger.warning(f"Source chapter has no embedding: {chapter_id}")
-            return []
+        distance = PDFChapter.embedding.cosine_distance(source_embedding)
 
-        # Find similar chapters using cosine similarity
-        query = self.db.query(PDFChapter).filter(
+        query = self.db.query(PDFChapter, 1 - distance).filter(
             PDFChapter.id != chapter_id,  # Exclude source chapter
             PDFChapter.embedding.isnot(None)  # Only chapters with embeddings
+        ).options(
+            defer(PDFChapter.extracted_text),
+            defer(PDFChapter.embedding)
         )
 
-        # Filter out duplicates if requested
         if exclude_duplicates:
             query = query.filter(PDFChapter.is_duplicate == False)
 
-        # Calculate similarity and order by it
-        # cosine_distance returns 0 for identical, 2 for opposite
-        # We want similarity (closer to 0 = more similar)
-        similar_chapters = query.order_by(
-            PDFChapter.embedding.cosine_distance(source_chapter.embedding)
-        ).limit(limit).all()
+        return [
+            (chapter, float(similarity))
+            for chapter, similarity in query.order_by(distance).limit(limit).all()
+            if similarity is not None
+        ]
+
+    # ==================== Materialized Neighbor Lists ====================
+
+    _MATERIALIZE_NEIGHBORS_SQL = text("""
+        INSERT INTO pdf_chapter_neighbors (chapter_id, neighbor_id, rank, cosine_similarity, computed_at)
+        SELECT
+            a.id,
+            n.id,
+            ROW_NUMBER() OVER (PARTITION BY a.id ORDER BY n.similarity DESC),
+            n.similarity,
+            NOW()
+        FROM pdf_chapters a
+        CROSS JOIN LATERAL (
+            SELECT b.id, 1 - (b.embedding <=> a.embedding) AS similarity
+            FROM pdf_chapters b
+            WHERE b.id != a.id
+              AND b.embedding IS NOT NULL
+            ORDER BY b.embedding <=> a.embedding
+            LIMIT :k
+        ) n
+        WHERE a.id = ANY(CAST(:chapter_ids AS UUID[]))
+          AND a.embedding IS NOT NULL
+    """)
+
+    def _materialize_neighbor_lists(self, chapter_ids: List[str], k: int) -> None:
+        """
+        Replace the neighbor lists of the given chapters (caller commits)
 
-        # Calculate actual similarity scores for each chapter
-        results = []
-        for chapter in similar_chapters:
-            # Calculate distance using database function
-            distance = self.db.query(
-                PDFChapter.embedding.cosine_distance(source_chapter.embedding)
-            ).filter(PDFChapter.id == chapter.id).scalar()
+        One statement per call: k-NN per chapter via LATERAL join on the HNSW index.
+        """
+        if not chapter_ids:
+            return
 
-            # Convert distance to similarity score (0-1 range)
-            # cosine_distance range is 0-2, where 0 is identical
-            similarity = 1 - (distance / 2)
+        self.db.execute(
+            text("DELETE FROM pdf_chapter_neighbors WHERE chapter_id = ANY(CAST(:chapter_ids AS UUID[]))"),
+            {'chapter_ids': chapter_ids}
+        )
+        self.db.execute(self._MATERIALIZE_NEIGHBORS_SQL, {'chapter_ids': chapter_ids, 'k': k})
 
-            # Only include if similarity is above threshold (0.5 = 50%)
-            if similarity >= 0.5:
-                results.append((chapter, similarity))
+    def refresh_chapter_neighbors(
+        self,
+        chapter_id: uuid.UUID,
+        k: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Incrementally update materialized neighbor lists after a chapter's
+        embedding changed (or the chapter was added)
 
-        logger.info(f"Found {len(results)} similar chapters for {chapter_id}")
+        1. Recompute the chapter's own list
+        2. Recompute every list that contained the chapter (its similarity moved)
+        3. Insert the chapter into lists it now qualifies for, then re-rank/trim
 
-        return results
+        Args:
+            chapter_id: UUID of the changed chapter
+            k: Neighbor list size (default: settings.CHAPTER_NEIGHBORS_K)
+
+        Returns:
+            Dict with counts of lists touched
+        """
+        k = k or settings.CHAPTER_NEIGHBORS_K
+        chapter_key = str(chapter_id)
+
+        try:
+            previous_lists = [
+                str(row[0]) for row in self.db.execute(text("""
+                    SELECT chapter_id FROM pdf_chapter_neighbors WHERE neighbor_id = :chapter_id
+                """), {'chapter_id': chapter_key})
+            ]
+
+            self._materialize_neighbor_lists([chapter_key] + previous_lists, k)
+
+            # Lists (outside the ones just rebuilt) whose k-th entry is now beaten
+            qualifying = self.db.execute(text("""
+                WITH source AS (
+                    SELECT embedding FROM pdf_chapters WHERE id = :chapter_id
+                ),
+                lists AS (
+                    SELECT chapter_id, MIN(cosine_similarity) AS min_similarity, COUNT(*) AS size
+                    FROM pdf_chapter_neighbors
+                    GROUP BY chapter_id
+                )
+                SELECT c.id, 1 - (c.embedding <=> s.embedding) AS similarity
+                FROM pdf_chapters c
+                CROSS JOIN source s
+                JOIN lists l ON l.chapter_id = c.id
+                WHERE c.id != :chapter_id
+                  AND c.embedding IS NOT NULL
+                  AND s.embedding IS NOT NULL
+                  AND NOT (c.id = ANY(CAST(:rebuilt AS UUID[])))
+                  AND (l.size < :k OR 1 - (c.embedding <=> s.embedding) > l.min_similarity)
+            """), {
+                'chapter_id': chapter_key,
+                'rebuilt': previous_lists,
+                'k': k
+            }).fetchall()
+
+            if qualifying:
+                self.db.execute(text("""
+                    INSERT INTO pdf_chapter_neighbors (chapter_id, neighbor_id, rank, cosine_similarity, computed_at)
+                    VALUES (:owner_id, :chapter_id, :k + 1, :similarity, NOW())
+                    ON CONFLICT (chapter_id, neighbor_id)
+                    DO UPDATE SET cosine_similarity = EXCLUDED.cosine_similarity, computed_at = NOW()
+                """), [
+                    {'owner_id': str(row[0]), 'chapter_id': chapter_key, 'k': k, 'similarity': float(row[1])}
+                    for row in qualifying
+                ])
+                self._rerank_neighbor_lists([str(row[0]) for row in qualifying], k)
+
+            self.db.commit()
+
+            logger.info(
+                f"Refreshed neighbors for chapter {chapter_id}: "
+                f"{len(previous_lists)} lists rebuilt, {len(qualifying)} lists updated"
+            )
+
+            return {
+                "status": "success",
+                "chapter_id": chapter_key,
+                "lists_rebuilt": 1 + len(previous_lists),
+                "lists_updated": len(qualifying)
+            }
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to refresh chapter neighbors: {str(e)}", exc_info=True)
+            raise
+
+    def _rerank_neighbor_lists(self, chapter_ids: List[str], k: int) -> None:
+        """
+        Renumber ranks by similarity and drop entries beyond k (caller commits)
+        """
+        self.db.execute(text("""
+            WITH ranked AS (
+                SELECT chapter_id, neighbor_id,
+                       ROW_NUMBER() OVER (PARTITION BY chapter_id ORDER BY cosine_similarity DESC) AS new_rank
+                FROM pdf_chapter_neighbors
+                WHERE chapter_id = ANY(CAST(:chapter_ids AS UUID[]))
+            )
+            DELETE FROM pdf_chapter_neighbors n
+            USING ranked r
+            WHERE n.chapter_id = r.chapter_id
+              AND n.neighbor_id = r.neighbor_id
+              AND r.new_rank > :k
+        """), {'chapter_ids': chapter_ids, 'k': k})
+
+        self.db.execute(text("""
+            WITH ranked AS (
+                SELECT chapter_id, neighbor_id,
+                       ROW_NUMBER() OVER (PARTITION BY chapter_id ORDER BY cosine_similarity DESC) AS new_rank
+                FROM pdf_chapter_neighbors
+                WHERE chapter_id = ANY(CAST(:chapter_ids AS UUID[]))
+            )
+            UPDATE pdf_chapter_neighbors n
+            SET rank = r.new_rank
+            FROM ranked r
+            WHERE n.chapter_id = r.chapter_id
+              AND n.neighbor_id = r.neighbor_id
+        """), {'chapter_ids': chapter_ids})
+
+    def rebuild_chapter_neighbors(
+        self,
+        k: Optional[int] = None,
+        batch_size: int = 200
+    ) -> Dict[str, Any]:
+        """
+        Recompute every materialized neighbor list
+
+        Processes chapters in batches (one LATERAL k-NN statement per batch)
+        and commits per batch, so readers always see complete lists.
+
+        Args:
+            k: Neighbor list size (default: settings.CHAPTER_NEIGHBORS_K)
+            batch_size: Chapters per statement/commit
+
+        Returns:
+            Dict with number of chapters processed
+        """
+        k = k or settings.CHAPTER_NEIGHBORS_K
+
+        chapter_ids = [
+            str(row[0]) for row in self.db.query(PDFChapter.id).filter(
+                PDFChapter.embedding.isnot(None)
+            ).order_by(PDFChapter.id).all()
+        ]
+
+        for start in range(0, len(chapter_ids), batch_size):
+            self._materialize_neighbor_lists(chapter_ids[start:start + batch_size], k)
+            self.db.commit()
+
+        # Lists of chapters whose embedding was removed
+        self.db.execute(text("""
+            DELETE FROM pdf_chapter_neighbors n
+            USING pdf_chapters c
+            WHERE n.chapter_id = c.id AND c.embedding IS NULL
+        """))
+        self.db.commit()
+
+        logger.info(f"Rebuilt neighbor lists for {len(chapter_ids)} chapters (k={k})")
+
+        return {
+            "status": "success",
+            "chapters_processed": len(chapter_ids),
+            "k": k
+        }
+
+    _DUPLICATE_PAIRS_SQL = text("""
+        SELECT c.id, m.id
+        FROM pdf_chapters c
+        CROSS JOIN LATERAL (
+            SELECT o.id, o.embedding <=> c.embedding AS distance
+            FROM pdf_chapters o
+            WHERE o.id != c.id
+              AND o.embedding IS NOT NULL
+            ORDER BY o.embedding <=> c.embedding
+            LIMIT :candidates
+        ) m
+        WHERE c.book_id = ANY(CAST(:book_ids AS UUID[]))
+          AND c.embedding IS NOT NULL
+          AND c.duplicate_group_id IS NULL
+          AND 1 - m.distance > :threshold
+    """)
+
+    def deduplicate_chapters(
+        self,
+        book_ids: List[str],
+        threshold: Optional[float] = None,
+        candidates: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Group duplicate chapters of the given books in one set-based pass
+
+        A single statement finds, for every embedded and not yet grouped
+        chapter of the books, its nearest chapters above the threshold (HNSW
+        k-NN per chapter via LATERAL join). Matches are merged into connected
+        groups together with every current member of any existing group a
+        match belongs to; the highest preference score in each group is kept,
+        the rest are marked as its duplicates (mark-not-delete).
+
+        Args:
+            book_ids: Books whose new chapters are checked (against all chapters)
+            threshold: Cosine similarity for duplicates (default: settings.CHAPTER_DUPLICATE_THRESHOLD)
+            candidates: Nearest chapters checked per chapter (default: settings.CHAPTER_DUPLICATE_CANDIDATES)
+
+        Returns:
+            Dict with numbers of chapters checked, groups and duplicates
+        """
+        threshold = threshold if threshold is not None else settings.CHAPTER_DUPLICATE_THRESHOLD
+        candidates = candidates or settings.CHAPTER_DUPLICATE_CANDIDATES
+
+        try:
+            pairs = self.db.execute(self._DUPLICATE_PAIRS_SQL, {
+                'book_ids': [str(book_id) for book_id in book_ids],
+                'candidates': candidates,
+                'threshold': threshold
+            }).fetchall()
+
+            # Union-find over matched pairs
+            parent: Dict[uuid.UUID, uuid.UUID] = {}
+
+            def find(node):
+                parent.setdefault(node, node)
+                while parent[node] != node:
+                    parent[node] = parent[parent[node]]
+                    node = parent[node]
+                return node
+
+            for chapter_id, match_id in pairs:
+                parent[find(chapter_id)] = find(match_id)
+
+            chapters = {
+                chapter.id: chapter for chapter in self.db.query(PDFChapter).filter(
+                    PDFChapter.id.in_(list(parent))
+                ).all()
+            } if parent else {}
+
+            # A match may be any member of an existing group: pull in the whole
+            # group so its canonical is chosen (and every member repointed) once
+            existing_groups = {ch.duplicate_group_id for ch in chapters.values() if ch.duplicate_group_id}
+            if existing_groups:
+                group_anchor: Dict[uuid.UUID, uuid.UUID] = {}
+                for member in self.db.query(PDFChapter).filter(
+                    PDFChapter.duplicate_group_id.in_(list(existing_groups))
+                ).all():
+                    chapters.setdefault(member.id, member)
+                    anchor = group_anchor.setdefault(member.duplicate_group_id, member.id)
+                    parent[find(member.id)] = find(anchor)
+
+            components: Dict[uuid.UUID, List[uuid.UUID]] = {}
+            for node in list(parent):
+                components.setdefault(find(node), []).append(node)
+
+            duplicates = 0
+            for members in components.values():
+                versions = [chapters[m] for m in members if m in chapters]
+                if len(versions) < 2:
+                    continue
+
+                existing_groups = sorted(str(ch.duplicate_group_id) for ch in versions if ch.duplicate_group_id)
+                group_id = uuid.UUID(existing_groups[0]) if existing_groups else uuid.uuid4()
+
+                # Ties keep the group's current canonical
+                scored_versions = sorted(
+                    ((ch, chapter_preference_score(ch)) for ch in versions),
+                    key=lambda x: (x[1], bool(x[0].duplicate_group_id) and not x[0].is_duplicate),
+                    reverse=True
+                )
+                preferred_chapter = scored_versions[0][0]
+
+                for ch, score in scored_versions:
+                    ch.duplicate_group_id = group_id
+                    ch.preference_score = score
+                    ch.is_duplicate = ch.id != preferred_chapter.id
+                    ch.duplicate_of_id = None if ch.id == preferred_chapter.id else preferred_chapter.id
+                duplicates += len(versions) - 1
+
+            self.db.commit()
+
+            groups = sum(1 for members in components.values() if len(members) > 1)
+            logger.info(
+                f"Deduplicated chapters of {len(book_ids)} books: "
+                f"{len(pairs)} matching pairs, {groups} groups, {duplicates} duplicates"
+            )
+
+            return {
+                "status": "success",
+                "book_ids": [str(book_id) for book_id in book_ids],
+                "matching_pairs": len(pairs),
+                "duplicate_groups": groups,
+                "duplicates_marked": duplicates
+            }
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Chapter deduplication failed: {str(e)}", exc_info=True)
+            raise
 
 
 class DatabaseTask(Task):
@@ -341,6 +760,89 @@ class DatabaseTask(Task):
             self._db_session = None
 
 
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.chapter_vector_search_service.update_chapter_neighbors",
+    max_retries=3,
+    default_retry_delay=60
+)
+def update_chapter_neighbors(self, chapter_id: str) -> Dict[str, Any]:
+    """
+    Incrementally update materialized neighbor lists for a chapter
+    Queued after a chapter embedding is generated or replaced
+
+    Args:
+        chapter_id: UUID of PDFChapter
+
+    Returns:
+        Dict with counts of neighbor lists touched
+    """
+    try:
+        service = ChapterVectorSearchService(self.db_session)
+        return service.refresh_chapter_neighbors(uuid.UUID(chapter_id))
+
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+        raise
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.chapter_vector_search_service.rebuild_chapter_neighbors"
+)
+def rebuild_chapter_neighbors(self, k: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bulk rebuild of all materialized neighbor lists
+    Run after changing CHAPTER_NEIGHBORS_K or bulk embedding regeneration
+
+    Returns:
+        Dict with number of chapters processed
+    """
+    service = ChapterVectorSearchService(self.db_session)
+    return service.rebuild_chapter_neighbors(k=k)
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.chapter_vector_search_service.deduplicate_book_chapters",
+    max_retries=3,
+    default_retry_delay=60
+)
+def deduplicate_book_chapters(
+    self,
+    embedding_results: List[Dict[str, Any]],
+    book_ids: List[str]
+) -> Dict[str, Any]:
+    """
+    Set-based duplicate detection for newly ingested books
+    Body of the book ingestion chord: runs once every book's chapter
+    embeddings are written
+
+    Args:
+        embedding_results: Results of the embed_book_chapters header tasks
+        book_ids: UUIDs of the ingested books
+
+    Returns:
+        Dict with deduplication counts
+    """
+    logger.info(f"Deduplicating chapters of {len(book_ids)} books")
+
+    try:
+        service = ChapterVectorSearchService(self.db_session)
+        result = service.deduplicate_chapters(book_ids)
+        result["chapters_embedded"] = sum(r.get("chapters_embedded", 0) for r in embedding_results or [])
+        return result
+
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+        raise
+
+
 @celery_app.task(
     bind=True,
     base=DatabaseTask,
@@ -394,7 +896,7 @@ def check_for_duplicates(self, chapter_id: str) -> Dict[str, Any]:
             }
 
         # Find similar chapters (>95% similarity)
-        similarity_threshold = 0.95
+        similarity_threshold = settings.CHAPTER_DUPLICATE_THRESHOLD
 
         similar_chapters = self.db_session.query(PDFChapter).filter(
             PDFChapter.id != uuid.UUID(chapter_id),
@@ -417,7 +919,7 @@ def check_for_duplicates(self, chapter_id: str) -> Dict[str, Any]:
         all_versions = [chapter] + similar_chapters
 
         # Calculate preference scores for all versions
-        scored_versions = [(ch, self._calculate_preference_score(ch)) for ch in all_versions]
+        scored_versions = [(ch, chapter_preference_score(ch)) for ch in all_versions]
         scored_versions.sort(key=lambda x: x[1], reverse=True)
 
         # Mark duplicates
@@ -461,57 +963,3 @@ def check_for_duplicates(self, chapter_id: str) -> Dict[str, Any]:
             raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
 
         raise
-
-    def _calculate_preference_score(self, chapter: PDFChapter) -> float:
-        """
-        Calculate preference score for duplicate ranking
-
-        Scoring:
-        - Source type: Standalone chapter (+10), Textbook chapter (+5), Research paper (+3)
-        - Word count: Up to +5 (longer = better)
-        - Quality score: Up to +5
-        - Recency: Up to +3
-        - Detection confidence: Up to +2
-
-        Args:
-            chapter: PDFChapter object
-
-        Returns:
-            Preference score (higher = preferred)
-        """
-        score = 0.0
-
-        # Source type scoring
-        if chapter.source_type == "standalone_chapter":
-            score += 10.0
-        elif chapter.source_type == "textbook_chapter":
-            score += 5.0
-        elif chapter.source_type == "research_paper":
-            score += 3.0
-
-        # Word count scoring (normalized to 5.0 max)
-        if chapter.word_count:
-            # Prefer longer chapters (more complete)
-            # 10k words = max score
-            score += min(5.0, (chapter.word_count / 10000) * 5.0)
-
-        # Quality score
-        if chapter.quality_score:
-            score += chapter.quality_score * 5.0
-
-        # Recency (if book has publication year)
-        if chapter.book and chapter.book.publication_year:
-            year = chapter.book.publication_year
-            # Boost recent publications (2020+ get full 3 points)
-            if year >= 2020:
-                score += 3.0
-            elif year >= 2010:
-                score += 2.0
-            elif year >= 2000:
-                score += 1.0
-
-        # Detection confidence
-        if chapter.detection_confidence:
-            score += chapter.detection_confidence * 2.0
-
-        return score
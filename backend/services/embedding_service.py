@@ -3,15 +3,61 @@ Embedding Service for Vector Search
 Generates and manages vector embeddings for semantic search
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import re
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from sqlalchemy import insert, text, update
 from sqlalchemy.orm import Session
 
+from backend.config import settings
 from backend.services.ai_provider_service import AIProviderService, AITask
-from backend.database.models import PDF, Image, Chapter
+from backend.database.models import PDF, PDFChunk, Image, Chapter
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
 
+_WORD_PATTERN = re.compile(r"\S+")
+
+
+def aggregate_chunk_hits(
+    hits: List[Dict[str, Any]],
+    method: str = "max",
+    top_k: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Rank parent documents by the similarity of their matching chunks
+
+    Args:
+        hits: Chunk hits with parent_id, chunk_index, chunk_text and similarity
+        method: "max" scores a parent by its best chunk; "topk_sum" sums its
+            best `top_k` chunks (rewards documents that match in several places)
+        top_k: Chunks summed per parent for "topk_sum"
+
+    Returns:
+        Parents sorted by score, each with its best chunk and match count
+    """
+    by_parent: Dict[str, List[Dict[str, Any]]] = {}
+    for hit in hits:
+        by_parent.setdefault(hit["parent_id"], []).append(hit)
+
+    parents = []
+    for parent_id, parent_hits in by_parent.items():
+        parent_hits.sort(key=lambda h: h["similarity"], reverse=True)
+        if method == "topk_sum":
+            score = sum(h["similarity"] for h in parent_hits[:top_k])
+        else:
+            score = parent_hits[0]["similarity"]
+        parents.append({
+            "parent_id": parent_id,
+            "score": score,
+            "similarity": parent_hits[0]["similarity"],
+            "best_chunk": parent_hits[0],
+            "matched_chunks": len(parent_hits)
+        })
+
+    parents.sort(key=lambda p: p["score"], reverse=True)
+    return parents
+
 
 class EmbeddingService:
     """
@@ -24,9 +70,9 @@ class EmbeddingService:
     - Related content discovery
     """
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, ai_service: Optional[AIProviderService] = None):
         self.db = db_session
-        self.ai_service = AIProviderService()
+        self.ai_service = ai_service or AIProviderService()
 
     async def generate_embedding(self, text: str) -> List[float]:
         """
@@ -52,7 +98,10 @@ class EmbeddingService:
         overlap: int = 50
     ) -> Dict[str, Any]:
         """
-        Generate embeddings for a PDF document
+        Generate chunk embeddings for a PDF document
+
+        Every chunk of the extracted text is embedded (batched requests) and
+        stored as a PDFChunk, replacing any previous chunks of the PDF.
 
         Args:
             pdf_id: PDF document ID
@@ -73,23 +122,54 @@ class EmbeddingService:
             raise ValueError(f"PDF has no extracted text: {pdf_id}")
 
         # Chunk text
-        chunks = self._chunk_text(pdf.extracted_text, chunk_size, overlap)
-        logger.info(f"Created {len(chunks)} text chunks for PDF {pdf_id}")
+        spans = self._chunk_spans(pdf.extracted_text, chunk_size, overlap)
+        logger.info(f"Created {len(spans)} text chunks for PDF {pdf_id}")
 
-        # Generate embedding for full text (first 8k tokens)
-        truncated_text = self._truncate_to_tokens(pdf.extracted_text, 8000)
-        full_embedding = await self.generate_embedding(truncated_text)
+        # Replace previous chunks; rows are inserted one embedding batch at a time
+        self.db.query(PDFChunk).filter(PDFChunk.pdf_id == pdf.id).delete(synchronize_session=False)
 
-        # Store full-text embedding
-        pdf.embedding = full_embedding
+        batch_size = settings.PDF_CHUNK_EMBEDDING_BATCH_SIZE
+        total_cost = 0.0
+        dimensions = 0
+        try:
+            for batch_start in range(0, len(spans), batch_size):
+                batch = spans[batch_start:batch_start + batch_size]
+                texts = [pdf.extracted_text[start:end] for start, end, _ in batch]
+                result = await self.ai_service.generate_embeddings_batch(texts)
+                total_cost += result.get("cost_usd", 0.0)
+                dimensions = result.get("dimensions", dimensions)
+
+                self.db.execute(insert(PDFChunk), [
+                    {
+                        "pdf_id": pdf.id,
+                        "chunk_index": batch_start + offset,
+                        "chunk_text": chunk_text,
+                        "token_count": tokens,
+                        "start_char_offset": start,
+                        "end_char_offset": end,
+                        "embedding": embedding,
+                        "embedding_model": result.get("model", settings.OPENAI_EMBEDDING_MODEL)
+                    }
+                    for offset, ((start, end, tokens), chunk_text, embedding)
+                    in enumerate(zip(batch, texts, result["embeddings"]))
+                ])
+        except Exception:
+            self.db.rollback()
+            raise
+
+        pdf.embeddings_generated = True
         self.db.commit()
 
-        logger.info(f"Generated embeddings for PDF {pdf_id}")
+        logger.info(
+            f"Generated embeddings for PDF {pdf_id}: {len(spans)} chunks in "
+            f"{-(-len(spans) // batch_size)} requests, ${total_cost:.6f}"
+        )
 
         return {
             "pdf_id": pdf_id,
-            "full_embedding_dim": len(full_embedding),
-            "num_chunks": len(chunks),
+            "embedding_dim": dimensions,
+            "num_chunks": len(spans),
+            "cost_usd": total_cost,
             "status": "completed"
         }
 
@@ -130,6 +210,88 @@ class EmbeddingService:
             "status": "completed"
         }
 
+    async def generate_pdf_image_embeddings(
+        self,
+        pdf_id: str,
+        after_id: Optional[str] = None,
+        on_progress: Optional[Callable[[str, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Embed all analyzed, non-duplicate images of a PDF in batched requests
+
+        Images are taken in id order, PDF_IMAGE_EMBEDDING_BATCH_SIZE descriptions
+        per request with up to PDF_IMAGE_EMBEDDING_CONCURRENCY requests in
+        flight. Each window of concurrent requests is written with one bulk
+        UPDATE and committed before the next starts. A failed request is logged
+        and its images skipped, as a failed single-image embedding was before.
+
+        Args:
+            pdf_id: PDF document ID
+            after_id: Resume cursor: only images with a greater id are embedded
+            on_progress: Called with (last image id written, images embedded so far)
+                after each window is committed
+
+        Returns:
+            Dictionary with embedded/failed counts, requests and cost
+        """
+        query = self.db.query(Image.id, Image.ai_description).filter(
+            Image.pdf_id == pdf_id,
+            Image.ai_description.isnot(None),
+            Image.is_duplicate.is_(False)
+        )
+        if after_id:
+            query = query.filter(Image.id > after_id)
+        pending = query.order_by(Image.id).all()
+
+        batch_size = settings.PDF_IMAGE_EMBEDDING_BATCH_SIZE
+        window_size = batch_size * max(1, settings.PDF_IMAGE_EMBEDDING_CONCURRENCY)
+        embedded = failed = requests = 0
+        total_cost = 0.0
+
+        for window_start in range(0, len(pending), window_size):
+            window = pending[window_start:window_start + window_size]
+            batches = [window[i:i + batch_size] for i in range(0, len(window), batch_size)]
+            results = await asyncio.gather(
+                *(self.ai_service.generate_embeddings_batch([description for _, description in batch])
+                  for batch in batches),
+                return_exceptions=True
+            )
+            requests += len(batches)
+
+            rows = []
+            for batch, result in zip(batches, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Image embedding batch failed for PDF {pdf_id} ({len(batch)} images): {str(result)}")
+                    failed += len(batch)
+                    continue
+                total_cost += result.get("cost_usd", 0.0)
+                rows.extend(
+                    {"id": image_id, "embedding": embedding}
+                    for (image_id, _), embedding in zip(batch, result["embeddings"])
+                )
+
+            if rows:
+                self.db.execute(update(Image), rows)
+            self.db.commit()
+            embedded += len(rows)
+
+            if on_progress:
+                on_progress(str(window[-1][0]), embedded)
+
+        logger.info(
+            f"Embedded {embedded} images for PDF {pdf_id} in {requests} requests "
+            f"({failed} failed), ${total_cost:.6f}"
+        )
+
+        return {
+            "pdf_id": pdf_id,
+            "embedded_count": embedded,
+            "failed_count": failed,
+            "requests": requests,
+            "cost_usd": total_cost,
+            "status": "completed"
+        }
+
     async def generate_chapter_embeddings(
         self,
         chapter_id: str
@@ -153,15 +315,7 @@ class EmbeddingService:
         if not chapter.sections:
             raise ValueError(f"Chapter has no content: {chapter_id}")
 
-        # Build full chapter text
-        chapter_text = self._build_chapter_text(chapter)
-
-        # Generate embedding
-        truncated_text = self._truncate_to_tokens(chapter_text, 8000)
-        embedding = await self.generate_embedding(truncated_text)
-
-        # Store embedding
-        chapter.embedding = embedding
+        embedding = await self.embed_chapter(chapter)
         self.db.commit()
 
         logger.info(f"Generated embedding for chapter {chapter_id}")
@@ -172,6 +326,60 @@ class EmbeddingService:
             "status": "completed"
         }
 
+    async def embed_chapter(
+        self,
+        chapter: Chapter,
+        sections: Optional[List[Dict[str, Any]]] = None
+    ) -> List[float]:
+        """
+        Embed a chapter's text and store it as the chapter search vector
+
+        chapters.embedding is not mapped on the model, so it is written with
+        SQL. The caller commits.
+
+        Args:
+            chapter: Chapter object
+            sections: Sections to embed instead of chapter.sections
+
+        Returns:
+            Chapter embedding vector
+        """
+        chapter_text = self._truncate_to_tokens(self._build_chapter_text(chapter, sections), 8000)
+        result = await self.ai_service.generate_embedding(chapter_text)
+        embedding = result["embedding"]
+
+        self.db.execute(
+            text("""
+                UPDATE chapters
+                SET embedding = CAST(:embedding AS vector),
+                    embedding_generated_at = NOW(),
+                    embedding_model = :model
+                WHERE id = :chapter_id
+            """),
+            {
+                "embedding": str(list(embedding)),
+                "model": result.get("model", settings.OPENAI_EMBEDDING_MODEL),
+                "chapter_id": str(chapter.id)
+            }
+        )
+        return embedding
+
+    def clear_chapter_embedding(self, chapter_id: str) -> None:
+        """
+        Drop a chapter's search vector so it is picked up for re-embedding
+
+        Args:
+            chapter_id: Chapter ID
+        """
+        self.db.execute(
+            text("""
+                UPDATE chapters
+                SET embedding = NULL, embedding_generated_at = NULL
+                WHERE id = :chapter_id
+            """),
+            {"chapter_id": str(chapter_id)}
+        )
+
     def _chunk_text(
         self,
         text: str,
@@ -189,9 +397,28 @@ class EmbeddingService:
         Returns:
             List of text chunks
         """
+        return [text[start:end] for start, end, _ in self._chunk_spans(text, chunk_size, overlap)]
+
+    def _chunk_spans(
+        self,
+        text: str,
+        chunk_size: int = 512,
+        overlap: int = 50
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Character spans of overlapping word-window chunks
+
+        Args:
+            text: Input text
+            chunk_size: Approximate token size per chunk
+            overlap: Token overlap between chunks
+
+        Returns:
+            List of (start offset, end offset, approximate token count)
+        """
         # Simple word-based chunking (approximation of tokens)
-        words = text.split()
-        chunks = []
+        words = [(m.start(), m.end()) for m in _WORD_PATTERN.finditer(text)]
+        spans = []
 
         # Approximate 1 token = 0.75 words
         words_per_chunk = int(chunk_size * 0.75)
@@ -200,13 +427,13 @@ class EmbeddingService:
         i = 0
         while i < len(words):
             chunk_words = words[i:i + words_per_chunk]
-            chunks.append(" ".join(chunk_words))
+            spans.append((chunk_words[0][0], chunk_words[-1][1], int(len(chunk_words) / 0.75)))
             i += words_per_chunk - words_overlap
 
             if i >= len(words):
                 break
 
-        return chunks
+        return spans
 
     def _truncate_to_tokens(
         self,
@@ -232,23 +459,27 @@ class EmbeddingService:
 
         return " ".join(words[:max_words])
 
-    def _build_chapter_text(self, chapter: Chapter) -> str:
+    def _build_chapter_text(
+        self,
+        chapter: Chapter,
+        sections: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
         """
         Build full chapter text from sections
 
         Args:
             chapter: Chapter object
+            sections: Sections to use instead of chapter.sections
 
         Returns:
             Concatenated chapter text
         """
         parts = [f"Title: {chapter.title}"]
 
-        if chapter.sections:
-            for section in chapter.sections:
-                title = section.get("title", "")
-                content = section.get("content", "")
-                parts.append(f"\n\n## {title}\n\n{content}")
+        for section in (sections if sections is not None else chapter.sections) or []:
+            title = section.get("title", "")
+            content = section.get("content", "")
+            parts.append(f"\n\n## {title}\n\n{content}")
 
         return "\n".join(parts)
 
@@ -269,8 +500,8 @@ class EmbeddingService:
 
         # Get all PDFs without embeddings
         pdfs = self.db.query(PDF).filter(
-            PDF.embedding.is_(None),
-            PDF.extraction_status == "completed"
+            PDF.embeddings_generated.is_(False),
+            PDF.text_extracted.is_(True)
         ).all()
 
         logger.info(f"Found {len(pdfs)} PDFs without embeddings")
@@ -305,7 +536,7 @@ class EmbeddingService:
         min_similarity: float = 0.7
     ) -> List[Dict[str, Any]]:
         """
-        Find PDFs similar to query using vector search
+        Find PDFs similar to query using chunk-level vector search
 
         Args:
             query: Search query
@@ -313,52 +544,127 @@ class EmbeddingService:
             min_similarity: Minimum cosine similarity (0.0-1.0)
 
         Returns:
-            List of similar PDFs with similarity scores
+            List of similar PDFs with similarity scores and best matching passage
         """
         # Generate query embedding
         query_embedding = await self.generate_embedding(query)
 
-        # Vector similarity search using pgvector
-        # Note: This requires pgvector extension and proper indexing
-        from sqlalchemy import text
+        matches = self.search_pdfs_by_chunks(query_embedding, max_results, min_similarity)
+        pdfs_by_id = self.load_pdfs([m["parent_id"] for m in matches])
+
+        pdfs = []
+        for match in matches:
+            pdf = pdfs_by_id.get(match["parent_id"])
+            if not pdf:
+                continue
+            pdfs.append({
+                "id": match["parent_id"],
+                "title": pdf.title,
+                "authors": pdf.authors,
+                "year": pdf.publication_year,
+                "journal": pdf.journal,
+                "similarity": match["similarity"],
+                "score": match["score"],
+                "matched_chunks": match["matched_chunks"],
+                "best_chunk_index": match["best_chunk"]["chunk_index"],
+                "excerpt": match["best_chunk"]["chunk_text"][:300]
+            })
+
+        logger.info(f"Found {len(pdfs)} similar PDFs for query: '{query[:50]}...'")
+        return pdfs
+
+    def search_pdf_chunks(
+        self,
+        query_embedding: Optional[List[float]],
+        limit: int,
+        min_similarity: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest PDF chunks to a query embedding
+
+        The `pdf_id IS NOT NULL` predicate selects the partial HNSW index over
+        PDF chunks (migration 023), so chapter chunks never take candidate
+        slots of the scan.
+
+        Args:
+            query_embedding: Query vector (None returns no hits)
+            limit: Number of chunk hits to fetch
+            min_similarity: Minimum cosine similarity of a hit
+
+        Returns:
+            Chunk hits with parent_id (PDF ID), chunk_index, chunk_text and similarity
+        """
+        if not query_embedding:
+            return []
+
+        # Candidate list size of the HNSW scan; must cover the requested hits
+        ef_search = max(settings.PDF_CHUNK_HNSW_EF_SEARCH, limit)
+        self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
 
         sql = text("""
             SELECT
-                id,
-                title,
-                authors,
-                year,
-                journal,
-                1 - (embedding <=> :query_embedding) as similarity
-            FROM pdfs
-            WHERE embedding IS NOT NULL
-              AND 1 - (embedding <=> :query_embedding) >= :min_similarity
-            ORDER BY embedding <=> :query_embedding
-            LIMIT :max_results
+                pdf_id,
+                chunk_index,
+                chunk_text,
+                1 - (embedding <=> CAST(:query_embedding AS vector)) as similarity
+            FROM pdf_chunks
+            WHERE pdf_id IS NOT NULL
+              AND embedding IS NOT NULL
+            ORDER BY embedding <=> CAST(:query_embedding AS vector)
+            LIMIT :limit
         """)
 
         result = self.db.execute(
             sql,
             {
-                "query_embedding": query_embedding,
-                "min_similarity": min_similarity,
-                "max_results": max_results
+                "query_embedding": str(list(query_embedding)),
+                "limit": limit
             }
         )
 
-        pdfs = []
-        for row in result:
-            pdfs.append({
-                "id": str(row.id),
-                "title": row.title,
-                "authors": row.authors,
-                "year": row.year,
-                "journal": row.journal,
+        return [
+            {
+                "parent_id": str(row.pdf_id),
+                "chunk_index": row.chunk_index,
+                "chunk_text": row.chunk_text,
                 "similarity": float(row.similarity)
-            })
+            }
+            for row in result
+            if float(row.similarity) >= min_similarity
+        ]
 
-        logger.info(f"Found {len(pdfs)} similar PDFs for query: '{query[:50]}...'")
-        return pdfs
+    def search_pdfs_by_chunks(
+        self,
+        query_embedding: Optional[List[float]],
+        max_results: int,
+        min_similarity: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        PDFs ranked by their best matching chunks
+
+        Fetches PDF_CHUNK_CANDIDATES_PER_RESULT chunk hits per requested PDF
+        and aggregates them per PDF (PDF_CHUNK_AGGREGATION: max or topk_sum).
+
+        Returns:
+            Up to max_results aggregated matches (see aggregate_chunk_hits)
+        """
+        hits = self.search_pdf_chunks(
+            query_embedding,
+            limit=max_results * settings.PDF_CHUNK_CANDIDATES_PER_RESULT,
+            min_similarity=min_similarity
+        )
+        return aggregate_chunk_hits(
+            hits,
+            method=settings.PDF_CHUNK_AGGREGATION,
+            top_k=settings.PDF_CHUNK_AGGREGATION_TOP_K
+        )[:max_results]
+
+    def load_pdfs(self, pdf_ids: List[str]) -> Dict[str, PDF]:
+        """PDF rows by ID (one query)"""
+        if not pdf_ids:
+            return {}
+        pdfs = self.db.query(PDF).filter(PDF.id.in_(pdf_ids)).all()
+        return {str(pdf.id): pdf for pdf in pdfs}
 
     async def find_similar_images(
         self,
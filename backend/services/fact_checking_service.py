@@ -8,17 +8,62 @@ This service provides:
 - Categorization by claim type (anatomy, diagnosis, treatment, etc.)
 - Severity assessment for incorrect claims
 - Overall accuracy scoring
+- Bounded-concurrency chapter checking with per-section source subsets
+- Claim cache (normalized claim + source fingerprint) reused across
+  regenerations and versions
 """
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+from backend.config import settings
+from backend.config.redis import redis_manager
 from backend.services.ai_provider_service import AIProviderService, AITask
+from backend.services.section_work_queue import AdaptiveConcurrencyLimiter, SlidingWindowExecutor
 from backend.schemas.ai_schemas import FACT_CHECK_SCHEMA
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def normalize_claim(text: str) -> str:
+    """Lowercase, strip markup and punctuation, collapse whitespace"""
+    return _NON_WORD_RE.sub(" ", _TAG_RE.sub(" ", text or "").lower()).strip()
+
+
+def split_claim_sentences(content: str, min_words: int = 4) -> List[str]:
+    """
+    Split section content into candidate claim sentences (markup removed)
+
+    Sentences shorter than `min_words` (headings, fragments) are dropped.
+    """
+    plain = " ".join(_TAG_RE.sub(" ", content or "").split())
+    return [
+        sentence for sentence in _SENTENCE_RE.split(plain)
+        if len(sentence.split()) >= min_words
+    ]
+
+
+def source_fingerprint(sources: List[Dict[str, Any]]) -> str:
+    """
+    Order-independent fingerprint of the sources a claim was verified against
+    """
+    identities = sorted(
+        str(
+            source.get("pmid") or source.get("doi") or source.get("pdf_id")
+            or source.get("chapter_id") or source.get("url") or source.get("title", "")
+        )
+        for source in sources
+    )
+    return hashlib.sha256(json.dumps(identities).encode()).hexdigest()[:32]
+
 
 class FactCheckingService:
     """
@@ -32,31 +77,134 @@ class FactCheckingService:
     5. Providing actionable recommendations
     """
 
-    def __init__(self):
-        """Initialize fact-checking service"""
+    def __init__(self, cache=None):
+        """
+        Initialize fact-checking service
+
+        Args:
+            cache: Optional RedisManager-compatible cache (get/set/make_key)
+        """
         self.ai_service = AIProviderService()
+        self.cache = cache or redis_manager
+        self.cache_enabled = settings.FACT_CHECK_CLAIM_CACHE_ENABLED
 
     async def fact_check_section(
         self,
         section_content: str,
         sources: List[Dict[str, Any]],
         chapter_title: str,
-        section_title: str
+        section_title: str,
+        source_pool: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Fact-check a single section against available sources
 
+        Claims already verified against the same source pool are served from
+        the claim cache; only sentences without a cached verdict are sent to
+        the model. An unchanged section is served whole from the section cache.
+
         Args:
             section_content: The section text to verify
             sources: List of research sources for verification
             chapter_title: Title of the chapter for context
             section_title: Title of the section being checked
+            source_pool: Sources `sources` was selected from (default: sources).
+                Claim verdicts are keyed on the pool, since editing one
+                sentence can change which subset the section selects.
 
         Returns:
             Dictionary with fact-check results matching FACT_CHECK_SCHEMA
         """
         logger.info(f"Fact-checking section: {section_title}")
 
+        fingerprint = source_fingerprint(sources)
+        section_key = self._cache_key("section", normalize_claim(section_content), fingerprint)
+
+        cached_section = self._cache_get(section_key)
+        if cached_section is not None:
+            logger.info(f"Fact-check cache hit for section: {section_title}")
+            return {
+                **cached_section,
+                "section_title": section_title,
+                "ai_cost_usd": 0.0,
+                "cached_claims": len(cached_section["claims"]),
+                "new_claims": 0,
+                "from_cache": True
+            }
+
+        # Claim-level cache lookup per sentence
+        pool_fingerprint = fingerprint if source_pool is None else source_fingerprint(source_pool)
+        sentences = split_claim_sentences(section_content)
+        cached_claims: List[Dict[str, Any]] = []
+        pending: List[str] = []
+        for sentence in sentences:
+            claim_key = self._cache_key("claim", normalize_claim(sentence), pool_fingerprint)
+            hit = self._cache_get(claim_key)
+            if hit is None:
+                pending.append(sentence)
+            else:
+                cached_claims.extend(hit)
+
+        response = None
+        new_claims: List[Dict[str, Any]] = []
+        if pending or not sentences:
+            content_to_verify = "\n".join(pending) if sentences else section_content
+            response = await self._verify_content(
+                content_to_verify, sources, chapter_title, section_title
+            )
+            new_claims = response["data"]["claims"]
+            self._cache_claims(pending, new_claims, pool_fingerprint)
+
+        claims = cached_claims + new_claims
+        verified_count = sum(1 for c in claims if c["verified"])
+        unverified = [c for c in claims if not c["verified"]]
+
+        critical_issues = list(response["data"]["critical_issues"]) if response else []
+        critical_issues.extend(
+            f"Unverified critical claim: {c['claim']}"
+            for c in cached_claims
+            if not c["verified"] and c["severity_if_wrong"] == "critical"
+        )
+
+        fact_check_results = {
+            "claims": claims,
+            "overall_accuracy": verified_count / len(claims) if claims else 1.0,
+            "unverified_count": len(unverified),
+            "critical_issues": critical_issues,
+            "recommendations": response["data"]["recommendations"] if response else [],
+            # Metadata
+            "section_title": section_title,
+            "checked_at": datetime.utcnow().isoformat(),
+            "ai_model": response["model"] if response else None,
+            "ai_provider": response["provider"] if response else None,
+            "ai_cost_usd": response["cost_usd"] if response else 0.0,
+            "sources_used_count": len(sources),
+            "cached_claims": len(cached_claims),
+            "new_claims": len(new_claims),
+            "from_cache": response is None
+        }
+
+        self._cache_set(section_key, fact_check_results)
+
+        logger.info(
+            f"Fact-check complete: {verified_count}/{len(claims)} verified "
+            f"({len(cached_claims)} from cache), "
+            f"{len(critical_issues)} critical issues, "
+            f"accuracy: {fact_check_results['overall_accuracy']:.2f}"
+        )
+
+        return fact_check_results
+
+    async def _verify_content(
+        self,
+        content: str,
+        sources: List[Dict[str, Any]],
+        chapter_title: str,
+        section_title: str
+    ) -> Dict[str, Any]:
+        """
+        Single structured-output verification call for (part of) a section
+        """
         # Build source summary for AI
         source_summary = self._build_source_summary(sources)
 
@@ -69,7 +217,7 @@ class FactCheckingService:
         **Section**: {section_title}
 
         **Content to Verify**:
-        {section_content}
+        {content}
 
         **Available Research Sources**:
         {source_summary}
@@ -86,6 +234,7 @@ class FactCheckingService:
 
         **Important**:
         - Be rigorous and evidence-based
+        - Quote each claim verbatim as the complete sentence it appears in
         - If a claim cannot be verified with the sources, mark verified=false
         - Critical severity: Patient safety impact or fundamental medical errors
         - High severity: Significant clinical implications
@@ -97,37 +246,15 @@ class FactCheckingService:
 
         try:
             # Use structured outputs for guaranteed valid response
-            response = await self.ai_service.generate_text_with_schema(
+            return await self.ai_service.generate_text_with_schema(
                 prompt=prompt,
                 schema=FACT_CHECK_SCHEMA,
                 task=AITask.FACT_CHECKING,
                 max_tokens=3000,
-                temperature=0.2  # Low temperature for factual verification
-            )
-
-            fact_check_results = response["data"]
-
-            # Add metadata
-            fact_check_results["section_title"] = section_title
-            fact_check_results["checked_at"] = datetime.utcnow().isoformat()
-            fact_check_results["ai_model"] = response["model"]
-            fact_check_results["ai_provider"] = response["provider"]
-            fact_check_results["ai_cost_usd"] = response["cost_usd"]
-            fact_check_results["sources_used_count"] = len(sources)
-
-            # Log summary
-            verified_count = sum(1 for c in fact_check_results["claims"] if c["verified"])
-            total_claims = len(fact_check_results["claims"])
-            critical_count = len(fact_check_results["critical_issues"])
-
-            logger.info(
-                f"Fact-check complete: {verified_count}/{total_claims} verified, "
-                f"{critical_count} critical issues, "
-                f"accuracy: {fact_check_results['overall_accuracy']:.2f}"
+                temperature=0.2,  # Low temperature for factual verification
+                cache=True
             )
 
-            return fact_check_results
-
         except Exception as e:
             logger.error(f"Fact-checking failed: {str(e)}", exc_info=True)
             raise
@@ -141,6 +268,9 @@ class FactCheckingService:
         """
         Fact-check an entire chapter (all sections)
 
+        Sections are checked concurrently (FACT_CHECK_MAX_CONCURRENCY in
+        flight), each against its most relevant sources only.
+
         Args:
             sections: List of section dictionaries with 'title' and 'content'
             sources: List of research sources for verification
@@ -151,12 +281,7 @@ class FactCheckingService:
         """
         logger.info(f"Fact-checking entire chapter: {chapter_title} ({len(sections)} sections)")
 
-        section_results = []
-        total_cost = 0.0
-        all_claims = []
-        all_critical_issues = []
-
-        # Fact-check each section
+        to_check = []
         for idx, section in enumerate(sections):
             section_title = section.get("title", f"Section {idx + 1}")
             section_content = section.get("content", "")
@@ -165,22 +290,72 @@ class FactCheckingService:
                 logger.warning(f"Skipping empty section: {section_title}")
                 continue
 
-            try:
-                result = await self.fact_check_section(
-                    section_content=section_content,
-                    sources=sources,
-                    chapter_title=chapter_title,
-                    section_title=section_title
-                )
-
-                section_results.append(result)
-                total_cost += result.get("ai_cost_usd", 0.0)
-                all_claims.extend(result["claims"])
-                all_critical_issues.extend(result["critical_issues"])
-
-            except Exception as e:
-                logger.error(f"Failed to fact-check section {section_title}: {str(e)}")
+            to_check.append((idx, section_title, section_content))
+
+        async def check(idx: int, item: Tuple[int, str, str]) -> Dict[str, Any]:
+            section_index, section_title, section_content = item
+            result = await self.fact_check_section(
+                section_content=section_content,
+                sources=self.select_relevant_sources(section_title, section_content, sources),
+                chapter_title=chapter_title,
+                section_title=section_title,
+                source_pool=sources
+            )
+            # Titles may repeat; the index identifies the section on re-checks
+            return {**result, "section_index": section_index}
+
+        concurrency = settings.FACT_CHECK_MAX_CONCURRENCY
+        executor = SlidingWindowExecutor(
+            AdaptiveConcurrencyLimiter(initial=concurrency, maximum=concurrency),
+            max_attempts=2,
+            base_delay=settings.SECTION_GENERATION_RETRY_BASE_DELAY
+        )
+        results = await executor.run(to_check, check)
+
+        section_results = []
+        for (_, section_title, _), result in zip(to_check, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fact-check section {section_title}: {str(result)}")
                 continue
+            section_results.append(result)
+
+        aggregate_results = self.aggregate_results(section_results, chapter_title)
+
+        logger.info(
+            f"Chapter fact-check complete: {aggregate_results['verified_claims']}/"
+            f"{aggregate_results['total_claims']} verified "
+            f"({aggregate_results['overall_accuracy']:.1%} accuracy), "
+            f"{aggregate_results['claims_from_cache']} claims from cache, "
+            f"${aggregate_results['total_cost_usd']:.4f}"
+        )
+
+        return aggregate_results
+
+    def aggregate_results(
+        self,
+        section_results: List[Dict[str, Any]],
+        chapter_title: str
+    ) -> Dict[str, Any]:
+        """
+        Chapter-level fact-check results from per-section results
+
+        Also used to re-aggregate after a single section was re-checked.
+
+        Args:
+            section_results: fact_check_section results
+            chapter_title: Title of the chapter
+
+        Returns:
+            Aggregated fact-check results for entire chapter
+        """
+        total_cost = 0.0
+        all_claims = []
+        all_critical_issues = []
+
+        for result in section_results:
+            total_cost += result.get("ai_cost_usd", 0.0)
+            all_claims.extend(result["claims"])
+            all_critical_issues.extend(result["critical_issues"])
 
         # Calculate aggregate metrics
         total_claims = len(all_claims)
@@ -211,14 +386,11 @@ class FactCheckingService:
             "all_critical_issues": all_critical_issues,
             "section_results": section_results,
             "total_cost_usd": total_cost,
+            "claims_from_cache": sum(r.get("cached_claims", 0) for r in section_results),
+            "sections_from_cache": sum(1 for r in section_results if r.get("from_cache")),
             "checked_at": datetime.utcnow().isoformat()
         }
 
-        logger.info(
-            f"Chapter fact-check complete: {verified_claims}/{total_claims} verified "
-            f"({overall_accuracy:.1%} accuracy), ${total_cost:.4f}"
-        )
-
         return aggregate_results
 
     async def verify_single_claim(
@@ -276,7 +448,8 @@ class FactCheckingService:
                 schema=FACT_CHECK_SCHEMA,
                 task=AITask.FACT_CHECKING,
                 max_tokens=800,
-                temperature=0.2
+                temperature=0.2,
+                cache=True
             )
 
             result = response["data"]
@@ -294,6 +467,99 @@ class FactCheckingService:
             logger.error(f"Single claim verification failed: {str(e)}", exc_info=True)
             raise
 
+    # ==================== Source Selection ====================
+
+    def select_relevant_sources(
+        self,
+        section_title: str,
+        section_content: str,
+        sources: List[Dict[str, Any]],
+        max_sources: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Most relevant sources for a section by term overlap
+
+        Scores each source's title/abstract/preview against the section text;
+        ties keep the incoming (already ranked) order.
+
+        Args:
+            section_title: Section title
+            section_content: Section text
+            sources: Candidate sources
+            max_sources: Subset size (default: settings.FACT_CHECK_SOURCES_PER_SECTION)
+
+        Returns:
+            Up to max_sources sources, best first
+        """
+        max_sources = max_sources or settings.FACT_CHECK_SOURCES_PER_SECTION
+        if len(sources) <= max_sources:
+            return list(sources)
+
+        section_terms = {
+            term for term in normalize_claim(f"{section_title} {section_content}").split()
+            if len(term) > 3
+        }
+
+        def score(source: Dict[str, Any]) -> int:
+            text = " ".join(
+                str(source.get(field) or "")
+                for field in ("title", "abstract", "content_preview", "journal")
+            )
+            return len(section_terms.intersection(normalize_claim(text).split()))
+
+        ranked = sorted(enumerate(sources), key=lambda item: (-score(item[1]), item[0]))
+        return [source for _, source in ranked[:max_sources]]
+
+    # ==================== Claim Cache ====================
+
+    def _cache_key(self, kind: str, normalized_text: str, fingerprint: str) -> str:
+        digest = hashlib.sha256(normalized_text.encode()).hexdigest()
+        return self.cache.make_key("fact_check", kind, fingerprint, digest)
+
+    def _cache_get(self, key: str) -> Optional[Any]:
+        if not self.cache_enabled:
+            return None
+        return self.cache.get(key)
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        if self.cache_enabled:
+            self.cache.set(key, value, ttl=settings.FACT_CHECK_CLAIM_CACHE_TTL_SECONDS)
+
+    def _cache_claims(
+        self,
+        sentences: List[str],
+        claims: List[Dict[str, Any]],
+        fingerprint: str
+    ) -> None:
+        """
+        Cache verified claims under the sentence they quote
+
+        Sentences without a claim are cached as claim-free only when every
+        returned claim could be matched to a sentence (i.e. the model quoted
+        verbatim); otherwise only matched sentences are cached.
+        """
+        if not self.cache_enabled or not sentences:
+            return
+
+        normalized_sentences = [normalize_claim(sentence) for sentence in sentences]
+        by_sentence: Dict[int, List[Dict[str, Any]]] = {}
+        unmatched = 0
+
+        for claim in claims:
+            normalized = normalize_claim(claim["claim"])
+            match = next(
+                (i for i, sentence in enumerate(normalized_sentences) if normalized and normalized in sentence),
+                None
+            )
+            if match is None:
+                unmatched += 1
+            else:
+                by_sentence.setdefault(match, []).append(claim)
+
+        for i, sentence in enumerate(normalized_sentences):
+            if i in by_sentence or unmatched == 0:
+                self._cache_set(self._cache_key("claim", sentence, fingerprint), by_sentence.get(i, []))
+
     def _build_source_summary(
         self,
         sources: List[Dict[str, Any]],
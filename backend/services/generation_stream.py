@@ -0,0 +1,282 @@
+"""
+Generation Stream
+Per-chapter token channels from AI provider streams to WebSocket clients
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from backend.config import settings
+from backend.config.redis import redis_manager
+from backend.utils import get_logger
+from backend.utils.events import EventType, WebSocketEvent
+
+logger = get_logger(__name__)
+
+Sender = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Checkpoint writes leave the event loop; one thread keeps them in order
+_checkpoint_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-checkpoint")
+
+# Checkpoint hash fields: "seq" and one "section:<stream_id>" per section
+_SECTION_FIELD = "section:"
+
+
+class ChapterStream:
+    """
+    Backpressured token channel for one chapter's section generation
+
+    Producers (section generators) publish text deltas; one delivery task
+    forwards them to the chapter's WebSocket room in order. The queue between
+    them is bounded, so a slow room delays the producers (and, through the
+    provider stream's bounded buffer, the provider read) instead of growing
+    memory. A producer waits at most GENERATION_STREAM_SEND_TIMEOUT_SECONDS;
+    events that still don't fit are dropped from live delivery only.
+
+    Every event carries a chapter-wide sequence number `seq`, and token events
+    also carry the character `offset` of the delta within its section. A
+    client that dropped (or saw a seq gap) reconnects with the last seq it
+    applied and receives the missed events from the replay buffer, or a
+    snapshot of every section's text so far when the gap is older than the
+    buffer. Partial section text is checkpointed to Redis every
+    GENERATION_STREAM_CHECKPOINT_CHARS characters so resume also works from
+    other API processes: one hash field per section, and only the sections
+    that changed since the previous checkpoint are written (by a writer
+    thread, so the event loop never waits on Redis).
+    """
+
+    NAMESPACE = "chapter_stream"
+
+    def __init__(
+        self,
+        chapter_id: str,
+        sender: Optional[Sender] = None,
+        redis_client=None,
+        buffer_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        replay_size: Optional[int] = None,
+        checkpoint_chars: Optional[int] = None
+    ):
+        self.chapter_id = chapter_id
+        self.redis = redis_client or redis_manager
+        self._sender = sender or self._send_to_room
+        self.send_timeout = (
+            settings.GENERATION_STREAM_SEND_TIMEOUT_SECONDS if send_timeout is None else send_timeout
+        )
+        self.checkpoint_chars = checkpoint_chars or settings.GENERATION_STREAM_CHECKPOINT_CHARS
+
+        self.seq = 0
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.recent: deque = deque(maxlen=replay_size or settings.GENERATION_STREAM_REPLAY_EVENTS)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or settings.GENERATION_STREAM_BUFFER_SIZE)
+
+        self.dropped = 0
+        self.delivered = 0
+        self.checkpoints = 0
+        self._unsaved_chars = 0
+        self._dirty: Set[str] = set()
+        self._checkpoint_reset = True  # First write replaces an earlier run's checkpoint
+        self._checkpoint_write: Optional[Future] = None
+        self._started_at: Dict[str, float] = {}
+        self._ttft: Dict[str, float] = {}
+        self._pump: Optional[asyncio.Task] = None
+
+    # ==================== Producer API ====================
+
+    async def start_section(self, stream_id: str, title: str = "") -> None:
+        """
+        Begin (or restart, on retry) streaming a section
+
+        Clients discard any text they hold for the section.
+        """
+        self.sections[stream_id] = {"title": title, "text": "", "complete": False}
+        self._dirty.add(stream_id)
+        self._started_at[stream_id] = time.perf_counter()
+        self._ttft.pop(stream_id, None)
+        await self._publish(EventType.SECTION_STREAM_STARTED, {"stream_id": stream_id, "title": title})
+
+    async def publish(self, stream_id: str, delta: str) -> None:
+        """Publish a text delta for a started section"""
+        if not delta:
+            return
+
+        section = self.sections[stream_id]
+        offset = len(section["text"])
+        section["text"] += delta
+        self._dirty.add(stream_id)
+
+        if stream_id not in self._ttft and stream_id in self._started_at:
+            self._ttft[stream_id] = time.perf_counter() - self._started_at[stream_id]
+
+        await self._publish(EventType.SECTION_TOKEN, {"stream_id": stream_id, "offset": offset, "delta": delta})
+
+        self._unsaved_chars += len(delta)
+        if self._unsaved_chars >= self.checkpoint_chars:
+            self.checkpoint()
+
+    async def complete_section(self, stream_id: str) -> None:
+        """Mark a section finished (its full text is in the checkpoint)"""
+        section = self.sections[stream_id]
+        section["complete"] = True
+        self._dirty.add(stream_id)
+        await self._publish(
+            EventType.SECTION_STREAM_COMPLETED,
+            {"stream_id": stream_id, "length": len(section["text"])}
+        )
+        self.checkpoint()
+
+    async def close(self) -> None:
+        """Deliver queued events, stop the delivery task and write a final checkpoint"""
+        if self._pump is not None:
+            await self.queue.put(None)
+            await self._pump
+            self._pump = None
+        self.checkpoint()
+        await self.checkpoint_written()
+
+    # ==================== Resume ====================
+
+    def replay(self, after_seq: int) -> List[Dict[str, Any]]:
+        """
+        Events a client that last applied `after_seq` needs to catch up
+
+        Returns the missed events when they are all still buffered, otherwise
+        a single snapshot event (with the seq it reflects) to rebuild from.
+        """
+        if after_seq >= self.seq:
+            return []
+        if self.recent and self.recent[0]["data"]["seq"] <= after_seq + 1:
+            return [event for event in self.recent if event["data"]["seq"] > after_seq]
+        return [self.snapshot()]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return snapshot_event(self.chapter_id, self.seq, self.sections)
+
+    def checkpoint(self) -> None:
+        """Queue a write of the sections changed since the last checkpoint, with the current seq"""
+        self._unsaved_chars = 0
+        self.checkpoints += 1
+        # Section dicts are copied (their text strings are shared, not copied)
+        changed = {stream_id: dict(self.sections[stream_id]) for stream_id in self._dirty}
+        self._dirty.clear()
+        reset, self._checkpoint_reset = self._checkpoint_reset, False
+        self._checkpoint_write = _checkpoint_writer.submit(self._write_checkpoint, self.seq, changed, reset)
+
+    async def checkpoint_written(self) -> None:
+        """Wait until every queued checkpoint is in Redis (writes run in order)"""
+        if self._checkpoint_write is not None:
+            await asyncio.wrap_future(self._checkpoint_write)
+
+    def _write_checkpoint(self, seq: int, changed: Dict[str, Dict[str, Any]], reset: bool) -> None:
+        key = checkpoint_key(self.redis, self.chapter_id)
+        if reset:
+            self.redis.delete(key)
+        fields = {f"{_SECTION_FIELD}{stream_id}": section for stream_id, section in changed.items()}
+        fields["seq"] = seq
+        self.redis.hset_many(key, fields, ttl=settings.GENERATION_STREAM_CHECKPOINT_TTL_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        ttft = list(self._ttft.values())
+        return {
+            "seq": self.seq,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "checkpoints": self.checkpoints,
+            "queued": self.queue.qsize(),
+            "first_token_ms": {k: round(v * 1000, 1) for k, v in self._ttft.items()},
+            "avg_first_token_ms": round(sum(ttft) / len(ttft) * 1000, 1) if ttft else None
+        }
+
+    # ==================== Delivery ====================
+
+    async def _publish(self, event_type: EventType, data: Dict[str, Any]) -> None:
+        self.seq += 1
+        event = WebSocketEvent.create(event_type, {"chapter_id": self.chapter_id, "seq": self.seq, **data})
+        self.recent.append(event)
+
+        if self._pump is None:
+            self._pump = asyncio.create_task(self._deliver())
+
+        try:
+            await asyncio.wait_for(self.queue.put(event), timeout=self.send_timeout)
+        except asyncio.TimeoutError:
+            # Client(s) too slow: they will see a seq gap and resume
+            self.dropped += 1
+
+    async def _deliver(self) -> None:
+        while True:
+            event = await self.queue.get()
+            if event is None:
+                return
+            try:
+                await self._sender(event)
+                self.delivered += 1
+            except Exception as e:
+                logger.warning(f"Stream delivery failed for chapter {self.chapter_id}: {str(e)}")
+
+    async def _send_to_room(self, event: Dict[str, Any]) -> None:
+        from backend.services.websocket_manager import manager
+
+        await manager.send_to_room(event, f"chapter:{self.chapter_id}")
+
+
+def checkpoint_key(redis_client, chapter_id: str) -> str:
+    return redis_client.make_key(chapter_id, namespace=ChapterStream.NAMESPACE)
+
+
+def snapshot_event(chapter_id: str, seq: int, sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Full text of every streamed section as of `seq`"""
+    return WebSocketEvent.create(
+        EventType.SECTION_STREAM_SNAPSHOT,
+        {"chapter_id": chapter_id, "seq": seq, "sections": {k: dict(v) for k, v in sections.items()}}
+    )
+
+
+class GenerationStreamRegistry:
+    """
+    Live chapter streams in this process
+
+    Resume requests for chapters streamed by another process (or after the
+    stream closed) are served from the Redis checkpoint.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client or redis_manager
+        self._streams: Dict[str, ChapterStream] = {}
+
+    def open(self, chapter_id: str, **kwargs) -> ChapterStream:
+        stream = ChapterStream(chapter_id, redis_client=self.redis, **kwargs)
+        self._streams[chapter_id] = stream
+        return stream
+
+    def get(self, chapter_id: str) -> Optional[ChapterStream]:
+        return self._streams.get(chapter_id)
+
+    async def close(self, chapter_id: str) -> None:
+        stream = self._streams.pop(chapter_id, None)
+        if stream is not None:
+            await stream.close()
+            logger.info(f"Section stream closed for chapter {chapter_id}: {stream.stats()}")
+
+    def replay(self, chapter_id: str, after_seq: int) -> List[Dict[str, Any]]:
+        """Catch-up events for a client resuming after `after_seq`"""
+        stream = self._streams.get(chapter_id)
+        if stream is not None:
+            return stream.replay(after_seq)
+
+        checkpoint = self.redis.hgetall(checkpoint_key(self.redis, chapter_id))
+        if not checkpoint or checkpoint.get("seq", 0) <= after_seq:
+            return []
+        sections = {
+            field[len(_SECTION_FIELD):]: section
+            for field, section in checkpoint.items()
+            if field.startswith(_SECTION_FIELD)
+        }
+        return [snapshot_event(chapter_id, checkpoint["seq"], sections)]
+
+
+# Global registry of chapter generation streams
+generation_streams = GenerationStreamRegistry()
@@ -4,12 +4,13 @@ Analyzes medical images extracted from PDFs using Claude's vision capabilities
 """
 
 from typing import List, Dict, Any, Optional
-import base64
 from pathlib import Path
 from PIL import Image
 import io
 
 from backend.services.ai_provider_service import AIProviderService, AITask
+from backend.services.llm_scheduler import RequestPriority, set_request_priority
+from backend.services.vision_payload import vision_payload_cache
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
@@ -35,6 +36,9 @@ class ImageAnalysisService:
         """
         Encode image to base64 for API transmission
 
+        The image is downscaled/re-encoded for vision providers (see
+        vision_payload) and the prepared payload is cached by content hash.
+
         Args:
             image_path: Path to image file
 
@@ -42,8 +46,7 @@ class ImageAnalysisService:
             Base64 encoded image string
         """
         try:
-            with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode("utf-8")
+            return vision_payload_cache.prepare(image_path).image_base64
         except Exception as e:
             logger.error(f"Failed to encode image {image_path}: {str(e)}")
             raise
@@ -95,20 +98,23 @@ class ImageAnalysisService:
         prompt = self._build_analysis_prompt(context)
 
         try:
-            # Encode image
-            image_base64 = self._encode_image(image_path)
-
-            # Get image format for correct media type
-            image_format = image_info.get("format", "PNG").upper()
+            # Downscaled, size-bounded payload (cached by content hash)
+            payload = vision_payload_cache.prepare(image_path)
+            logger.debug(
+                f"Vision payload for {image_path}: {payload.sent_bytes} of {payload.original_bytes} bytes "
+                f"({payload.bytes_saved} saved)"
+            )
 
             # Call Vision API with fallback (Claude → OpenAI → Google)
             result = await self.ai_service.generate_vision_analysis_with_fallback(
-                image_base64=image_base64,
+                image_base64=payload.image_base64,
                 prompt=prompt,
                 task=AITask.IMAGE_ANALYSIS,
-                image_format=image_format,
+                image_format=payload.image_format,
                 image_id=context.get("image_id") if context else None,
-                chapter_id=context.get("chapter_id") if context else None
+                chapter_id=context.get("chapter_id") if context else None,
+                cache=True,
+                original_image_bytes=payload.original_bytes
             )
 
             analysis = self._parse_analysis_result(result["text"])
@@ -119,6 +125,8 @@ class ImageAnalysisService:
                 "image_info": image_info,
                 "analysis": analysis,
                 "confidence_score": analysis.get("confidence", 0.0),
+                "payload_bytes_sent": payload.sent_bytes,
+                "payload_bytes_saved": payload.bytes_saved,
                 "provider": result["provider"],
                 "cost_usd": result["cost_usd"],
                 "tokens_used": result["tokens_used"]
@@ -287,6 +295,8 @@ class ImageAnalysisService:
         semaphore = asyncio.Semaphore(max_concurrent)
 
         async def analyze_with_semaphore(path: str):
+            # Runs as its own task (gather): queue behind interactive requests
+            set_request_priority(RequestPriority.BATCH)
             async with semaphore:
                 return await self.analyze_image(path, context)
 
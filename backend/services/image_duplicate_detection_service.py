@@ -3,10 +3,12 @@ Image Duplicate Detection Service
 Detects duplicate and near-duplicate images using embedding similarity
 """
 
-from typing import List, Dict, Any, Optional, Tuple, Set
-from sqlalchemy import func, and_
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Set
+from sqlalchemy import func, and_, text, update
 from sqlalchemy.orm import Session
 from datetime import datetime
+import uuid
 import numpy as np
 
 from backend.database.models import Image
@@ -15,6 +17,48 @@ from backend.utils import get_logger
 logger = get_logger(__name__)
 
 
+@dataclass
+class ImageRecord:
+    """Lightweight projection of an Image row used for clustering"""
+    id: uuid.UUID
+    file_path: str
+    page_number: int
+    quality_score: Optional[float]
+    confidence_score: Optional[float]
+    file_size_bytes: Optional[int]
+
+
+class UnionFind:
+    """Disjoint-set forest over 0..n-1 (path halving, union by size)"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def groups(self) -> List[List[int]]:
+        """Members of every set with 2+ elements"""
+        members: Dict[int, List[int]] = {}
+        for x in range(len(self.parent)):
+            members.setdefault(self.find(x), []).append(x)
+        return [group for group in members.values() if len(group) >= 2]
+
+
 class ImageDuplicateDetectionService:
     """
     Service for detecting duplicate and near-duplicate images using vector embeddings
@@ -25,8 +69,22 @@ class ImageDuplicateDetectionService:
     - Batch duplicate detection across entire dataset
     - Smart deduplication strategies (keep best quality)
     - Duplicate reporting and statistics
+
+    Embeddings are streamed into one contiguous float32 matrix and
+    L2-normalized once; neighbors come from blocked matrix multiplication
+    (strategy="matrix") or the pgvector HNSW index (strategy="knn"), and
+    groups are formed with union-find.
     """
 
+    # Rows per block for matrix strategy
+    BLOCK_SIZE = 1024
+    # Byte budget for one block's similarity slab; columns are tiled to fit
+    BLOCK_BYTES = 64 * 1024 * 1024
+    # Rows fetched per round-trip while streaming embeddings
+    FETCH_BATCH_SIZE = 5000
+    # Rows per bulk UPDATE when marking duplicates
+    MARK_BATCH_SIZE = 1000
+
     def __init__(self, db_session: Session):
         self.db = db_session
 
@@ -34,7 +92,9 @@ class ImageDuplicateDetectionService:
         self,
         pdf_id: Optional[str] = None,
         similarity_threshold: float = 0.95,
-        mark_duplicates: bool = True
+        mark_duplicates: bool = True,
+        strategy: str = "matrix",
+        knn_k: int = 10
     ) -> Dict[str, Any]:
         """
         Detect duplicate images across dataset
@@ -43,38 +103,39 @@ class ImageDuplicateDetectionService:
             pdf_id: Optional PDF ID to limit scope
             similarity_threshold: Similarity threshold for duplicates (0.95 = 95%)
             mark_duplicates: Whether to mark duplicates in database
+            strategy: "matrix" (exact, blocked matmul in-process) or
+                "knn" (approximate, k nearest neighbors per image via HNSW index)
+            knn_k: Neighbors per image for the knn strategy
 
         Returns:
             Detection results with duplicate groups and statistics
         """
-        logger.info(f"Starting duplicate detection (threshold: {similarity_threshold})")
+        logger.info(f"Starting duplicate detection (threshold: {similarity_threshold}, strategy: {strategy})")
 
-        # Get images with embeddings
-        query = self.db.query(Image).filter(
-            Image.embedding.isnot(None)
-        )
+        if strategy == "knn":
+            records = self._load_image_records(pdf_id)
+            matrix = None
+        else:
+            records, matrix = self._load_embedding_matrix(pdf_id)
 
-        if pdf_id:
-            query = query.filter(Image.pdf_id == pdf_id)
-
-        images = query.all()
-
-        if len(images) < 2:
+        if len(records) < 2:
             logger.warning("Not enough images for duplicate detection")
             return {
-                'total_images': len(images),
+                'total_images': len(records),
                 'duplicate_groups': [],
                 'total_duplicates': 0,
                 'status': 'insufficient_data'
             }
 
-        logger.info(f"Analyzing {len(images)} images for duplicates...")
+        logger.info(f"Analyzing {len(records)} images for duplicates...")
+
+        if strategy == "knn":
+            pairs = self._knn_similar_pairs(records, similarity_threshold, pdf_id, knn_k)
+        else:
+            pairs = self._matrix_similar_pairs(matrix, similarity_threshold)
 
         # Find duplicate groups
-        duplicate_groups = self._find_duplicate_groups(
-            images,
-            similarity_threshold
-        )
+        duplicate_groups = self._find_duplicate_groups(records, pairs)
 
         # Statistics
         total_duplicates = sum(len(group) - 1 for group in duplicate_groups)
@@ -86,16 +147,13 @@ class ImageDuplicateDetectionService:
             logger.info(f"Marked {marked_count} images as duplicates")
 
         result = {
-            'total_images': len(images),
+            'total_images': len(records),
             'duplicate_groups': len(duplicate_groups),
             'total_duplicates': total_duplicates,
-            'duplicate_rate_pct': round(total_duplicates / len(images) * 100, 1),
+            'duplicate_rate_pct': round(total_duplicates / len(records) * 100, 1),
             'space_potentially_saved_mb': space_saved,
             'similarity_threshold': similarity_threshold,
-            'groups': [
-                self._format_duplicate_group(group)
-                for group in duplicate_groups[:10]  # Limit to first 10 groups
-            ],
+            'groups': self._format_top_groups(duplicate_groups[:10]),  # Limit to first 10 groups
             'status': 'complete'
         }
 
@@ -106,53 +164,164 @@ class ImageDuplicateDetectionService:
 
         return result
 
-    def _find_duplicate_groups(
+    def _scoped_columns_query(self, pdf_id: Optional[str], *columns):
+        query = self.db.query(*columns).filter(Image.embedding.isnot(None))
+        if pdf_id:
+            query = query.filter(Image.pdf_id == pdf_id)
+        return query.order_by(Image.id)
+
+    def _record_columns(self) -> Tuple:
+        return (
+            Image.id,
+            Image.file_path,
+            Image.page_number,
+            Image.quality_score,
+            Image.confidence_score,
+            Image.file_size_bytes,
+        )
+
+    def _load_image_records(self, pdf_id: Optional[str]) -> List[ImageRecord]:
+        """Load clustering metadata only (no embeddings)"""
+        query = self._scoped_columns_query(pdf_id, *self._record_columns())
+        return [ImageRecord(*row) for row in query.yield_per(self.FETCH_BATCH_SIZE)]
+
+    def _load_embedding_matrix(
         self,
-        images: List[Image],
+        pdf_id: Optional[str]
+    ) -> Tuple[List[ImageRecord], np.ndarray]:
+        """
+        Stream embeddings into a contiguous, L2-normalized float32 matrix
+
+        Only the columns needed for clustering are selected, so no ORM
+        objects (or descriptions, OCR text, etc.) are materialized.
+        """
+        expected = self._scoped_columns_query(pdf_id, Image.id).count()
+        records: List[ImageRecord] = []
+        matrix: Optional[np.ndarray] = None
+
+        query = self._scoped_columns_query(pdf_id, *self._record_columns(), Image.embedding)
+        for row in query.yield_per(self.FETCH_BATCH_SIZE):
+            vector = np.asarray(row[-1], dtype=np.float32)
+            if matrix is None:
+                matrix = np.empty((max(expected, 1), vector.shape[0]), dtype=np.float32)
+            elif len(records) == matrix.shape[0]:
+                # Rows added since count(); grow geometrically
+                matrix = np.resize(matrix, (matrix.shape[0] * 2, matrix.shape[1]))
+
+            matrix[len(records)] = vector
+            records.append(ImageRecord(*row[:-1]))
+
+        if matrix is None:
+            return records, np.empty((0, 0), dtype=np.float32)
+
+        matrix = matrix[:len(records)]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        return records, matrix
+
+    def _matrix_similar_pairs(
+        self,
+        matrix: np.ndarray,
         similarity_threshold: float
-    ) -> List[List[Image]]:
+    ) -> Iterator[Tuple[int, int]]:
         """
-        Find groups of duplicate images using embedding similarity
+        Yield index pairs (i < j) with cosine similarity >= threshold
 
-        Uses greedy clustering: for each unprocessed image, find all similar images
+        Computes the upper triangle of matrix @ matrix.T one tile at a time:
+        BLOCK_SIZE rows against as many columns as fit in BLOCK_BYTES, so
+        peak memory stays bounded however many images there are.
         """
-        processed = set()
-        duplicate_groups = []
+        n = matrix.shape[0]
+        tile_columns = max(1, self.BLOCK_BYTES // (self.BLOCK_SIZE * matrix.dtype.itemsize))
+        for start in range(0, n, self.BLOCK_SIZE):
+            block = matrix[start:min(start + self.BLOCK_SIZE, n)]
+            for column_start in range(start, n, tile_columns):
+                similarities = block @ matrix[column_start:column_start + tile_columns].T
+
+                rows, cols = np.nonzero(similarities >= similarity_threshold)
+                rows += start
+                cols += column_start
+                # Keep strictly-upper pairs only
+                keep = cols > rows
+                for i, j in zip(rows[keep], cols[keep]):
+                    yield int(i), int(j)
+
+    def _knn_similar_pairs(
+        self,
+        records: List[ImageRecord],
+        similarity_threshold: float,
+        pdf_id: Optional[str],
+        knn_k: int
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Yield index pairs using k-NN lookups against the pgvector HNSW index
 
-        for i, image1 in enumerate(images):
-            if image1.id in processed:
-                continue
-
-            # Find similar images
-            group = [image1]
-            processed.add(image1.id)
-
-            for j in range(i + 1, len(images)):
-                image2 = images[j]
-
-                if image2.id in processed:
-                    continue
-
-                # Calculate similarity
-                similarity = self._calculate_similarity(image1, image2)
-
-                if similarity >= similarity_threshold:
-                    group.append(image2)
-                    processed.add(image2.id)
-
-            # Only keep groups with 2+ images
-            if len(group) >= 2:
-                # Sort by quality (best first)
-                group.sort(
-                    key=lambda img: (
-                        img.quality_score or 0,
-                        img.confidence_score or 0,
-                        -img.file_size_bytes  # Larger file (less compressed) is better
-                    ),
-                    reverse=True
-                )
-                duplicate_groups.append(group)
+        Each batch of images is resolved in one query with a LATERAL join;
+        vectors never leave the database.
+        """
+        position = {record.id: index for index, record in enumerate(records)}
+        ids = [str(record.id) for record in records]
+
+        query = text("""
+            SELECT a.id, n.id
+            FROM images a
+            CROSS JOIN LATERAL (
+                SELECT b.id, b.embedding
+                FROM images b
+                WHERE b.embedding IS NOT NULL
+                  AND b.id != a.id
+                  AND (CAST(:pdf_id AS UUID) IS NULL OR b.pdf_id = CAST(:pdf_id AS UUID))
+                ORDER BY b.embedding <=> a.embedding
+                LIMIT :k
+            ) n
+            WHERE a.id = ANY(CAST(:ids AS UUID[]))
+              AND 1 - (a.embedding <=> n.embedding) >= :threshold
+        """)
+
+        for start in range(0, len(ids), self.FETCH_BATCH_SIZE):
+            result = self.db.execute(query, {
+                'ids': ids[start:start + self.FETCH_BATCH_SIZE],
+                'pdf_id': pdf_id,
+                'k': knn_k,
+                'threshold': similarity_threshold
+            })
+            for source_id, neighbor_id in result:
+                i, j = position.get(source_id), position.get(neighbor_id)
+                if i is not None and j is not None:
+                    yield (i, j) if i < j else (j, i)
+
+    def _find_duplicate_groups(
+        self,
+        records: List[ImageRecord],
+        pairs
+    ) -> List[List[ImageRecord]]:
+        """
+        Cluster similar pairs into duplicate groups with union-find
 
+        Groups are transitive (A~B and B~C puts A, B, C together) and each
+        group is ordered best-quality first.
+        """
+        union_find = UnionFind(len(records))
+        for i, j in pairs:
+            union_find.union(i, j)
+
+        duplicate_groups = []
+        for members in union_find.groups():
+            group = [records[i] for i in members]
+            # Sort by quality (best first)
+            group.sort(
+                key=lambda img: (
+                    img.quality_score or 0,
+                    img.confidence_score or 0,
+                    img.file_size_bytes or 0  # Larger file (less compressed) is better
+                ),
+                reverse=True
+            )
+            duplicate_groups.append(group)
+
+        duplicate_groups.sort(key=len, reverse=True)
         return duplicate_groups
 
     def _calculate_similarity(self, image1: Image, image2: Image) -> float:
@@ -172,7 +341,7 @@ class ImageDuplicateDetectionService:
 
         return float(max(0.0, min(1.0, similarity)))
 
-    def _calculate_space_saved(self, duplicate_groups: List[List[Image]]) -> float:
+    def _calculate_space_saved(self, duplicate_groups: List[List[ImageRecord]]) -> float:
         """
         Calculate potential space savings from removing duplicates
 
@@ -187,24 +356,86 @@ class ImageDuplicateDetectionService:
 
         return round(total_bytes / (1024 * 1024), 2)
 
-    def _mark_duplicates(self, duplicate_groups: List[List[Image]]) -> int:
+    def _mark_duplicates(self, duplicate_groups: List[List[ImageRecord]]) -> int:
         """
         Mark duplicate images in database
 
-        First image in each group is kept as original, others marked as duplicates
+        First image in each group is kept as original, others marked as duplicates.
+        Written with batched UPDATE-by-primary-key statements.
         """
-        marked_count = 0
+        updates = [
+            {'id': duplicate.id, 'is_duplicate': True, 'duplicate_of_id': group[0].id}
+            for group in duplicate_groups
+            for duplicate in group[1:]
+        ]
 
-        for group in duplicate_groups:
-            original = group[0]  # Best quality image
+        for start in range(0, len(updates), self.MARK_BATCH_SIZE):
+            self.db.execute(update(Image), updates[start:start + self.MARK_BATCH_SIZE])
 
-            for duplicate in group[1:]:
-                duplicate.is_duplicate = True
-                duplicate.duplicate_of_id = original.id
-                marked_count += 1
+        self.db.commit()
+        return len(updates)
+
+    def inherit_canonical_results(self, pdf_id: str) -> int:
+        """
+        Copy analysis and embedding from canonical images to their duplicates
+
+        Perceptual duplicates are linked at extraction time and skipped by
+        vision analysis and embedding; this fills them in once their
+        canonical images are done. Duplicates whose canonical has no
+        analysis yet are left untouched.
+
+        Args:
+            pdf_id: PDF whose duplicates should be filled in
 
+        Returns:
+            Number of images updated
+        """
+        result = self.db.execute(
+            text("""
+                UPDATE images AS dup
+                SET ai_description = canonical.ai_description,
+                    image_type = canonical.image_type,
+                    anatomical_structures = canonical.anatomical_structures,
+                    clinical_context = canonical.clinical_context,
+                    quality_score = canonical.quality_score,
+                    confidence_score = canonical.confidence_score,
+                    ocr_text = canonical.ocr_text,
+                    contains_text = canonical.contains_text,
+                    embedding = canonical.embedding
+                FROM images AS canonical
+                WHERE dup.duplicate_of_id = canonical.id
+                  AND dup.pdf_id = :pdf_id
+                  AND dup.is_duplicate = TRUE
+                  AND dup.ai_description IS NULL
+                  AND canonical.ai_description IS NOT NULL
+            """),
+            {"pdf_id": pdf_id}
+        )
         self.db.commit()
-        return marked_count
+
+        updated = result.rowcount or 0
+        logger.info(f"Duplicates of PDF {pdf_id} inherited canonical analysis: {updated} images")
+        return updated
+
+    def _format_top_groups(self, duplicate_groups: List[List[ImageRecord]]) -> List[Dict[str, Any]]:
+        """
+        Load full rows for the reported groups only and format them
+        """
+        ids = [record.id for group in duplicate_groups for record in group]
+        if not ids:
+            return []
+
+        images = {
+            image.id: image
+            for image in self.db.query(Image).filter(Image.id.in_(ids)).all()
+        }
+
+        formatted = []
+        for group in duplicate_groups:
+            loaded = [images[record.id] for record in group if record.id in images]
+            if len(loaded) >= 2:
+                formatted.append(self._format_duplicate_group(loaded))
+        return formatted
 
     def _format_duplicate_group(self, group: List[Image]) -> Dict[str, Any]:
         """
@@ -0,0 +1,285 @@
+"""
+Batched PDF image extraction
+Decodes, writes and thumbnails a PDF's images in a worker pool and returns
+rows for a single bulk insert
+
+The calling process only walks the page image lists: it skips repeated
+image objects, images too small to be figures (icons, rules, bullets) and
+byte-identical copies (hash of the raw, still-compressed stream) before any
+pixels are decoded. The remaining xrefs are sent to the pool in small
+batches while later pages are still being scanned. The pool is billiard's
+(Celery's multiprocessing fork), which unlike multiprocessing may be started
+from the daemonic prefork children extract_images_task runs in. PyMuPDF
+documents cannot cross process boundaries (nor be shared between threads),
+so each worker opens the PDF itself, extracts its images, writes the files
+and builds thumbnails from the in-memory bytes
+(JPEGs are decoded at reduced scale via draft mode), so nothing is read back
+from disk. The same decode yields the perceptual hashes (pHash/dHash) used
+to link near-duplicate figures to a canonical image. Files are stored by
+content hash: a figure already stored by another PDF (e.g. an earlier
+edition) is not written again and its thumbnail is reused.
+"""
+
+import hashlib
+import io
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+from billiard.pool import ApplyResult, Pool
+from PIL import Image as PILImage
+
+from backend.config import settings
+from backend.services.perceptual_hash import image_hashes, to_signed
+from backend.services.storage_service import StorageService
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Images handed to a worker per task: amortizes opening the PDF in the worker
+EXTRACTION_BATCH_SIZE = 8
+
+
+class ImageExtractionStats:
+    """Counters for one extraction run"""
+
+    def __init__(self):
+        self.total_images = 0
+        self.extracted = 0
+        self.skipped_small = 0
+        self.skipped_duplicate = 0
+        self.failed = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+def _thumbnail_and_hashes(
+    image_bytes: bytes,
+    thumbnail_path: Optional[str],
+    size: Tuple[int, int]
+) -> Tuple[bool, Optional[int], Optional[int]]:
+    """Decode once: write the thumbnail (if requested) and compute (phash, dhash)"""
+    try:
+        with PILImage.open(io.BytesIO(image_bytes)) as img:
+            # JPEG: decode at the smallest scale that still covers the thumbnail
+            img.draft('RGB', size)
+            phash_value, dhash_value = (to_signed(h) for h in image_hashes(img))
+            if not thumbnail_path:
+                return False, phash_value, dhash_value
+
+            if img.mode in ('RGBA', 'LA', 'P'):
+                if img.mode == 'P':
+                    img = img.convert('RGBA')
+                background = PILImage.new('RGB', img.size, (255, 255, 255))
+                background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+                img = background
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            img.thumbnail(size, PILImage.Resampling.LANCZOS)
+            img.save(thumbnail_path, 'JPEG', quality=85, optimize=True)
+        return True, phash_value, dhash_value
+    except Exception as e:
+        logger.warning(f"Failed to create thumbnail/hashes for {thumbnail_path or 'image'}: {str(e)}")
+        return False, None, None
+
+
+def extract_image_batch(
+    file_path: str,
+    jobs: List[Dict[str, Any]],
+    image_dir: str,
+    thumbnail_dir: Optional[str],
+    thumbnail_size: Tuple[int, int]
+) -> List[Dict[str, Any]]:
+    """
+    Extract and store a batch of a PDF's images (runs in the worker pool)
+
+    Args:
+        file_path: Path to the PDF
+        jobs: Dicts with xref, image_id, page_number, image_index_on_page
+        image_dir: Image storage root (content-addressed)
+        thumbnail_dir: Thumbnail storage root (None to skip thumbnails)
+        thumbnail_size: Thumbnail bounding box
+
+    Returns:
+        One image row per job; failed jobs have an "error" key instead
+    """
+    results = []
+    doc = fitz.open(file_path)
+    try:
+        for job in jobs:
+            image_path = None
+            written = False
+            try:
+                base_image = doc.extract_image(job["xref"])
+                if not base_image:
+                    raise ValueError("no image data")
+
+                image_bytes = base_image["image"]
+                image_format = base_image["ext"]
+                content_sha256 = hashlib.sha256(image_bytes).hexdigest()
+                image_path = StorageService.content_path(
+                    image_dir, content_sha256, StorageService.image_extension(image_format)
+                )
+                written = StorageService.write_content(image_bytes, image_path)
+
+                thumbnail_path = None
+                existing_thumbnail = False
+                if thumbnail_dir:
+                    thumbnail_path = StorageService.content_path(thumbnail_dir, content_sha256, "_thumb.jpg")
+                    existing_thumbnail = thumbnail_path.exists()
+                thumbnail_written, phash_value, dhash_value = _thumbnail_and_hashes(
+                    image_bytes, None if existing_thumbnail else thumbnail_path, thumbnail_size
+                )
+                if not (thumbnail_written or existing_thumbnail):
+                    thumbnail_path = None
+
+                results.append({
+                    "id": uuid.UUID(job["image_id"]),
+                    "page_number": job["page_number"],
+                    "image_index_on_page": job["image_index_on_page"],
+                    "file_path": str(image_path),
+                    "thumbnail_path": str(thumbnail_path) if thumbnail_path else None,
+                    "content_sha256": content_sha256,
+                    "width": base_image.get("width", 0),
+                    "height": base_image.get("height", 0),
+                    "format": image_format.upper(),
+                    "file_size_bytes": len(image_bytes),
+                    "phash": phash_value,
+                    "dhash": dhash_value
+                })
+            except Exception as e:
+                # Files already stored by other images are shared: only remove our own write
+                if written and image_path.exists():
+                    image_path.unlink()
+                results.append({**job, "error": str(e)})
+    finally:
+        doc.close()
+    return results
+
+
+def _iter_extraction_jobs(doc: fitz.Document, stats: ImageExtractionStats) -> Iterator[Dict[str, Any]]:
+    """Images worth storing, in page order; nothing is decoded here"""
+    min_dimension = settings.PDF_IMAGE_MIN_DIMENSION
+    min_bytes = settings.PDF_IMAGE_MIN_BYTES
+    seen_xrefs = set()
+    seen_hashes = set()
+
+    for page_num in range(len(doc)):
+        image_list = doc[page_num].get_images(full=True)
+        stats.total_images += len(image_list)
+
+        for img_index, img in enumerate(image_list):
+            xref, width, height = img[0], img[2], img[3]
+
+            # Same image object placed again (logos, repeated figures)
+            if xref in seen_xrefs:
+                stats.skipped_duplicate += 1
+                continue
+            seen_xrefs.add(xref)
+
+            if width < min_dimension or height < min_dimension:
+                stats.skipped_small += 1
+                continue
+
+            raw = doc.xref_stream_raw(xref) or b""
+            if len(raw) < min_bytes:
+                stats.skipped_small += 1
+                continue
+
+            # Identical copy embedded as a separate object
+            digest = hashlib.sha256(raw).digest()
+            if digest in seen_hashes:
+                stats.skipped_duplicate += 1
+                continue
+            seen_hashes.add(digest)
+
+            yield {
+                "xref": xref,
+                "image_id": str(uuid.uuid4()),
+                "page_number": page_num + 1,  # 1-indexed
+                "image_index_on_page": img_index
+            }
+
+
+def _batches(jobs: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def extract_pdf_images(
+    file_path: str,
+    storage: StorageService,
+    workers: Optional[int] = None,
+    create_thumbnails: bool = True
+) -> Tuple[List[Dict[str, Any]], ImageExtractionStats]:
+    """
+    Extract a PDF's images to storage
+
+    Args:
+        file_path: Path to the PDF
+        storage: Storage service (decides file locations)
+        workers: Process pool size (PDF_IMAGE_EXTRACTION_WORKERS; 0 extracts inline)
+        create_thumbnails: Whether to create thumbnails
+
+    Returns:
+        (image rows without pdf_id, stats); rows are in page order
+    """
+    workers = settings.PDF_IMAGE_EXTRACTION_WORKERS if workers is None else workers
+
+    batch_args = (
+        str(storage.image_storage_path),
+        str(storage.thumbnail_storage_path) if create_thumbnails else None,
+        (settings.PDF_THUMBNAIL_SIZE, settings.PDF_THUMBNAIL_SIZE)
+    )
+
+    stats = ImageExtractionStats()
+    rows: List[Dict[str, Any]] = []
+    pending: Deque[ApplyResult] = deque()
+
+    def collect(results: List[Dict[str, Any]]) -> None:
+        for result in results:
+            if "error" in result:
+                logger.warning(
+                    f"Failed to extract image {result['image_index_on_page']} "
+                    f"from page {result['page_number']}: {result['error']}"
+                )
+                stats.failed += 1
+            else:
+                rows.append(result)
+                stats.extracted += 1
+
+    pool = Pool(processes=workers) if workers > 0 else None
+    doc = fitz.open(file_path)
+    try:
+        for batch in _batches(_iter_extraction_jobs(doc, stats), EXTRACTION_BATCH_SIZE):
+            if pool is None:
+                collect(extract_image_batch(file_path, batch, *batch_args))
+                continue
+
+            # Bounded window keeps memory flat while workers run behind the scan
+            pending.append(pool.apply_async(extract_image_batch, (file_path, batch, *batch_args)))
+            if len(pending) >= workers * 2:
+                collect(pending.popleft().get())
+
+        while pending:
+            collect(pending.popleft().get())
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+        raise
+    finally:
+        doc.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return rows, stats
@@ -0,0 +1,84 @@
+"""
+Image Placement - Global assignment of images to chapter sections
+Scores every (section, image) pair in one matrix and assigns images jointly
+
+Used by ChapterOrchestrator stage 7:
+- Section and image embeddings are compared in a single matrix product
+- Assignment is global: the best remaining pair is placed first, so an image
+  goes to the section it fits best instead of the first section that asks
+- No image is placed twice; every section (slot) has its own image cap
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def cosine_similarity_matrix(rows: Sequence[Sequence[float]], columns: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Pairwise cosine similarity (len(rows) x len(columns))
+
+    Zero vectors score 0 against everything.
+    """
+    a = np.asarray(rows, dtype=np.float32)
+    b = np.asarray(columns, dtype=np.float32)
+    if a.size == 0 or b.size == 0:
+        return np.zeros((len(rows), len(columns)), dtype=np.float32)
+
+    a_norm = np.linalg.norm(a, axis=1, keepdims=True)
+    b_norm = np.linalg.norm(b, axis=1, keepdims=True)
+    a = np.divide(a, a_norm, out=np.zeros_like(a), where=a_norm > 0)
+    b = np.divide(b, b_norm, out=np.zeros_like(b), where=b_norm > 0)
+    return a @ b.T
+
+
+def assign_images(
+    scores: np.ndarray,
+    capacities: Sequence[int],
+    min_score: float = 0.0
+) -> List[List[Tuple[int, float]]]:
+    """
+    Greedy global assignment of images (columns) to slots (rows)
+
+    Pairs are taken in descending score order; a pair is accepted when the
+    image is still unplaced, the slot is below its capacity and the score
+    exceeds `min_score`.
+
+    Args:
+        scores: (slots x images) relevance matrix
+        capacities: Maximum images per slot
+        min_score: Pairs scoring at or below this are never assigned
+
+    Returns:
+        Per slot, the assigned (image index, score) pairs, best first
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    n_slots = scores.shape[0] if scores.ndim == 2 else 0
+    assignments: List[List[Tuple[int, float]]] = [[] for _ in range(n_slots)]
+    if scores.size == 0:
+        return assignments
+
+    remaining = [max(0, int(c)) for c in capacities]
+    open_slots = sum(1 for c in remaining if c > 0)
+    used_images = np.zeros(scores.shape[1], dtype=bool)
+
+    # Stable sort keeps slot/image order among equal scores
+    for flat_index in np.argsort(-scores, axis=None, kind="stable"):
+        slot, image = divmod(int(flat_index), scores.shape[1])
+        score = float(scores[slot, image])
+        if score <= min_score or open_slots == 0:
+            break
+        if used_images[image] or remaining[slot] == 0:
+            continue
+
+        assignments[slot].append((image, score))
+        used_images[image] = True
+        remaining[slot] -= 1
+        if remaining[slot] == 0:
+            open_slots -= 1
+
+    return assignments
@@ -0,0 +1,227 @@
+"""
+LLM Response Cache
+Caches deterministic LLM responses so identical requests skip the provider call
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from backend.config import settings
+from backend.config.redis import redis_manager
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def _digest(value: Any) -> str:
+    """SHA-256 of a value; bytes are hashed raw, everything else as canonical JSON"""
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Redis-backed cache for LLM responses
+
+    Opt-in per call site: only requests whose output is a pure function of
+    their input (extraction, verification, captions, low-temperature planning)
+    should pass `cache=True` to the AI provider service.
+
+    Entries are keyed by (provider, model, prompt hash, schema hash, parameters).
+    Each entry keeps the original cost and latency so hits can be reported as
+    avoided spend in the provider metrics.
+
+    Size controls:
+    - LLM_RESPONSE_CACHE_TTL_SECONDS: expiry of every entry
+    - LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES: larger responses are not cached
+    - LLM_RESPONSE_CACHE_MAX_ENTRIES: oldest entries are evicted past this count
+    """
+
+    NAMESPACE = "llm_cache"
+
+    def __init__(self, redis_client=None, metrics_service=None):
+        self.redis = redis_client or redis_manager
+        self._metrics_service = metrics_service
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LLM_RESPONSE_CACHE_ENABLED
+
+    def make_key(
+        self,
+        provider: str,
+        model: str,
+        prompt: Any,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        image_bytes: Optional[bytes] = None
+    ) -> str:
+        """
+        Build the cache key for a request
+
+        Args:
+            provider: Provider name (claude, gpt4, gemini)
+            model: Model identifier the provider is configured with
+            prompt: User prompt (string or message list)
+            system_prompt: Optional system prompt
+            schema: Optional structured-output schema
+            params: Sampling parameters (temperature, max_tokens, ...)
+            image_bytes: Optional image payload for vision requests
+
+        Returns:
+            Namespaced Redis key
+        """
+        prompt_hash = _digest({
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "image": _digest(image_bytes) if image_bytes is not None else None
+        })
+        schema_hash = _digest(schema) if schema is not None else None
+        request_hash = _digest({
+            "provider": provider,
+            "model": model,
+            "prompt": prompt_hash,
+            "schema": schema_hash,
+            "params": params or {}
+        })
+        return self.redis.make_key(request_hash, namespace=self.NAMESPACE)
+
+    def get(self, key: str, task_type: str = "unknown") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        A hit is recorded in provider metrics with the avoided cost and latency.
+
+        Returns:
+            The cached result with cache_hit=True and cost_usd=0, or None
+        """
+        if not self.enabled:
+            return None
+
+        start = time.perf_counter()
+        entry = self.redis.get(key)
+        if not entry or "result" not in entry:
+            self.misses += 1
+            return None
+
+        lookup_ms = int((time.perf_counter() - start) * 1000)
+        self.hits += 1
+
+        result = dict(entry["result"])
+        cost_avoided = float(result.get("cost_usd") or 0.0)
+        latency_avoided = max(int(entry.get("latency_ms") or 0) - lookup_ms, 0)
+
+        self._record_hit(result, task_type, lookup_ms, cost_avoided, latency_avoided)
+        logger.debug(
+            f"LLM cache hit ({task_type}): avoided ${cost_avoided:.4f}, {latency_avoided}ms"
+        )
+
+        result.update({
+            "cache_hit": True,
+            "cost_usd": 0.0,
+            "cost_avoided_usd": cost_avoided,
+            "latency_avoided_ms": latency_avoided,
+            "queue_delay_ms": 0
+        })
+        return result
+
+    def set(self, key: str, result: Dict[str, Any], latency_ms: int) -> bool:
+        """
+        Store a provider response
+
+        Args:
+            key: Key from make_key
+            result: Provider result dict (must be JSON-serializable)
+            latency_ms: Wall time of the provider call, reported as avoided on hits
+
+        Returns:
+            True if the response was cached
+        """
+        if not self.enabled:
+            return False
+
+        entry = {"result": result, "latency_ms": latency_ms, "stored_at": time.time()}
+        try:
+            size = len(json.dumps(entry, default=str))
+        except (TypeError, ValueError):
+            return False
+
+        if size > settings.LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            logger.debug(f"LLM cache skip: {size} bytes exceeds entry limit")
+            return False
+
+        if not self.redis.set(key, entry, ttl=settings.LLM_RESPONSE_CACHE_TTL_SECONDS):
+            return False
+
+        self._track(key, entry["stored_at"])
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": self.redis.zcard(self._index_key())
+        }
+
+    # ==================== Helpers ====================
+
+    def _index_key(self) -> str:
+        return self.redis.make_key("index", namespace=self.NAMESPACE)
+
+    def _track(self, key: str, stored_at: float):
+        """Index the entry by insertion time and evict the oldest past the entry limit"""
+        index = self._index_key()
+        self.redis.zadd(index, {key: stored_at})
+
+        excess = self.redis.zcard(index) - settings.LLM_RESPONSE_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = self.redis.zrange(index, 0, excess - 1)
+            if evicted:
+                self.redis.delete(*evicted)
+                self.redis.zrem(index, *evicted)
+                logger.debug(f"LLM cache evicted {len(evicted)} oldest entries")
+
+    def _record_hit(
+        self,
+        result: Dict[str, Any],
+        task_type: str,
+        lookup_ms: int,
+        cost_avoided: float,
+        latency_avoided: int
+    ):
+        metrics_service = self._metrics_service
+        if metrics_service is None:
+            try:
+                from backend.services.provider_metrics_service import provider_metrics_service
+                metrics_service = self._metrics_service = provider_metrics_service
+            except Exception as e:
+                logger.debug(f"Provider metrics unavailable for cache hit: {str(e)}")
+                return
+
+        try:
+            metrics_service.record_cache_hit(
+                provider=result.get("provider", "unknown"),
+                model=result.get("model", "unknown"),
+                task_type=task_type,
+                lookup_time_ms=lookup_ms,
+                cost_avoided_usd=cost_avoided,
+                latency_avoided_ms=latency_avoided,
+                total_tokens=result.get("tokens_used")
+            )
+        except Exception as e:
+            logger.debug(f"Failed to record cache hit metric: {str(e)}")
+
+
+# Global LLM response cache instance
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,545 @@
+"""
+LLM Request Scheduler - Process-wide admission control for AI provider calls
+Admits requests against per-provider request (RPM) and token (TPM) budgets
+
+Used by AIProviderService around every provider call:
+- Budgets are token buckets shared by API and Celery processes through Redis
+  (one atomic Lua script); an in-process bucket is used when Redis is down
+- Within a process, queued interactive requests are admitted before batch
+  requests; across processes, batch work cannot drain the last
+  LLM_SCHEDULER_INTERACTIVE_RESERVE of a bucket
+- Token estimates are settled against actual usage after each call
+- Queueing delay is tracked per provider and priority (see `stats`)
+
+Celery tasks run with BATCH priority (set in celery_app); everything else is
+INTERACTIVE unless wrapped in `request_priority(RequestPriority.BATCH)`.
+Synchronous SDK calls outside AIProviderService (title extraction, OCR) are
+admitted through `admit_blocking`.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from backend.config import settings
+from backend.config.redis import redis_manager
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Admission priority (lower is served first)"""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "llm_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+def get_request_priority() -> RequestPriority:
+    """Priority of LLM requests made from the current context"""
+    return _request_priority.get()
+
+
+def set_request_priority(priority: RequestPriority) -> None:
+    """Set the priority for LLM requests made from the current context"""
+    _request_priority.set(priority)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """
+    Run a block (and the asyncio tasks it creates) at the given priority
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def estimate_tokens(*texts: Optional[str], max_tokens: int = 0) -> int:
+    """Rough request size: ~4 characters per prompt token plus the completion allowance"""
+    return sum(len(text) for text in texts if text) // 4 + max_tokens
+
+
+class SchedulerTimeoutError(Exception):
+    """Raised when a request cannot be admitted within the maximum wait"""
+    pass
+
+
+@dataclass
+class ProviderLimits:
+    """Request and token budget of one provider"""
+    requests_per_minute: int
+    tokens_per_minute: int
+    burst_seconds: float = 10.0
+
+    @property
+    def request_capacity(self) -> float:
+        return max(1.0, self.requests_per_minute * self.burst_seconds / 60)
+
+    @property
+    def token_capacity(self) -> float:
+        return max(1.0, self.tokens_per_minute * self.burst_seconds / 60)
+
+
+@dataclass
+class Admission:
+    """An admitted request; settle it with the actual token usage"""
+    provider: str
+    priority: RequestPriority
+    estimated_tokens: int
+    queue_delay: float = 0.0
+    settled: bool = False
+
+    @property
+    def queue_delay_ms(self) -> int:
+        return int(self.queue_delay * 1000)
+
+
+@dataclass
+class _DelayStats:
+    admitted: int = 0
+    timeouts: int = 0
+    total_delay: float = 0.0
+    max_delay: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+    def record(self, delay: float) -> None:
+        self.admitted += 1
+        self.total_delay += delay
+        self.max_delay = max(self.max_delay, delay)
+        self.recent.append(delay)
+
+    def to_dict(self) -> Dict[str, Any]:
+        recent = sorted(self.recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "admitted": self.admitted,
+            "timeouts": self.timeouts,
+            "avg_queue_delay_ms": round(self.total_delay / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "p95_queue_delay_ms": round(p95 * 1000, 1),
+            "max_queue_delay_ms": round(self.max_delay * 1000, 1)
+        }
+
+
+# ==================== Budgets ====================
+
+class LocalTokenBucket:
+    """
+    In-process request and token buckets for one provider
+
+    Buckets refill continuously at the per-minute rate up to a burst capacity.
+    A request needs one request token and its estimated tokens; `reserve`
+    (fraction of capacity) must remain in both buckets afterwards.
+    """
+
+    def __init__(self, limits: ProviderLimits, clock=time.monotonic):
+        self.limits = limits
+        self.clock = clock
+        self.requests = limits.request_capacity
+        self.tokens = limits.token_capacity
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = max(0.0, now - self.updated_at)
+        self.updated_at = now
+        self.requests = min(
+            self.limits.request_capacity,
+            self.requests + elapsed * self.limits.requests_per_minute / 60
+        )
+        self.tokens = min(
+            self.limits.token_capacity,
+            self.tokens + elapsed * self.limits.tokens_per_minute / 60
+        )
+
+    def try_acquire(self, tokens: int, reserve: float = 0.0) -> Tuple[bool, float]:
+        """
+        Returns:
+            (admitted, seconds until the request would fit)
+        """
+        self._refill()
+        request_floor = min(self.limits.request_capacity * reserve, self.limits.request_capacity - 1)
+        token_floor = self.limits.token_capacity * reserve
+        cost = min(tokens, self.limits.token_capacity - token_floor)
+
+        wait = 0.0
+        if self.requests - 1 < request_floor:
+            wait = max(wait, (request_floor + 1 - self.requests) * 60 / self.limits.requests_per_minute)
+        if self.tokens - cost < token_floor:
+            wait = max(wait, (token_floor + cost - self.tokens) * 60 / self.limits.tokens_per_minute)
+
+        if wait == 0.0:
+            self.requests -= 1
+            self.tokens -= cost
+            return True, 0.0
+        return False, wait
+
+    def adjust(self, tokens: float) -> None:
+        """Refund (positive) or charge (negative) tokens after settling"""
+        self._refill()
+        self.tokens = min(self.limits.token_capacity, self.tokens + tokens)
+
+    def drain(self) -> None:
+        """Empty the request bucket (provider reported throttling)"""
+        self._refill()
+        self.requests = 0.0
+
+
+# KEYS[1] bucket hash; ARGV: now, rpm, tpm, request capacity, token capacity, cost, reserve
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rpm = tonumber(ARGV[2])
+local tpm = tonumber(ARGV[3])
+local request_capacity = tonumber(ARGV[4])
+local token_capacity = tonumber(ARGV[5])
+local reserve = tonumber(ARGV[7])
+
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'ts')
+local requests = tonumber(state[1]) or request_capacity
+local tokens = tonumber(state[2]) or token_capacity
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+requests = math.min(request_capacity, requests + elapsed * rpm / 60)
+tokens = math.min(token_capacity, tokens + elapsed * tpm / 60)
+
+local request_floor = math.min(request_capacity * reserve, request_capacity - 1)
+local token_floor = token_capacity * reserve
+local cost = math.min(tonumber(ARGV[6]), token_capacity - token_floor)
+
+local wait = 0
+if requests - 1 < request_floor then
+    wait = math.max(wait, (request_floor + 1 - requests) * 60 / rpm)
+end
+if tokens - cost < token_floor then
+    wait = math.max(wait, (token_floor + cost - tokens) * 60 / tpm)
+end
+if wait == 0 then
+    requests = requests - 1
+    tokens = tokens - cost
+end
+
+redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+return {wait == 0 and 1 or 0, tostring(wait)}
+"""
+
+_ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HINCRBYFLOAT', KEYS[1], ARGV[1], ARGV[2])
+end
+return 1
+"""
+
+# KEYS[1] bucket hash; ARGV: now, tpm, token capacity
+# Refill tokens up to now, then empty the request bucket (never below zero:
+# concurrent 429s drain it once, not once each)
+_DRAIN_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local token_capacity = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or token_capacity
+local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+tokens = math.min(token_capacity, tokens + elapsed * tpm / 60)
+
+redis.call('HSET', KEYS[1], 'requests', 0, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+return 1
+"""
+
+
+class RedisTokenBucket:
+    """
+    Request and token buckets shared by all processes through Redis
+
+    Same semantics as LocalTokenBucket; falls back to a local bucket while
+    Redis is unavailable (retried every REDIS_RETRY_SECONDS).
+    """
+
+    REDIS_RETRY_SECONDS = 30.0
+
+    def __init__(self, provider: str, limits: ProviderLimits, redis_client=None):
+        self.limits = limits
+        self.redis = redis_client or redis_manager
+        self.key = self.redis.make_key("llm_scheduler", provider, namespace="ai")
+        self.fallback = LocalTokenBucket(limits)
+        self._acquire = None
+        self._adjust = None
+        self._drain = None
+        self._redis_down_until = 0.0
+
+    def _scripts(self):
+        if time.monotonic() < self._redis_down_until:
+            raise ConnectionError("Redis marked unavailable")
+        if self._acquire is None:
+            client = self.redis.get_client()
+            self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+            self._adjust = client.register_script(_ADJUST_SCRIPT)
+            self._drain = client.register_script(_DRAIN_SCRIPT)
+        return self._acquire, self._adjust
+
+    def try_acquire(self, tokens: int, reserve: float = 0.0) -> Tuple[bool, float]:
+        try:
+            acquire, _ = self._scripts()
+            admitted, wait = acquire(keys=[self.key], args=[
+                time.time(),
+                self.limits.requests_per_minute,
+                self.limits.tokens_per_minute,
+                self.limits.request_capacity,
+                self.limits.token_capacity,
+                tokens,
+                reserve
+            ])
+            return bool(int(admitted)), float(wait)
+        except Exception as e:
+            if time.monotonic() >= self._redis_down_until:
+                logger.warning(f"LLM scheduler Redis budget unavailable, using local budget: {str(e)}")
+                self._redis_down_until = time.monotonic() + self.REDIS_RETRY_SECONDS
+            return self.fallback.try_acquire(tokens, reserve)
+
+    def adjust(self, tokens: float) -> None:
+        try:
+            _, adjust = self._scripts()
+            adjust(keys=[self.key], args=["tokens", tokens])
+        except Exception:
+            self.fallback.adjust(tokens)
+
+    def drain(self) -> None:
+        try:
+            self._scripts()
+            self._drain(keys=[self.key], args=[
+                time.time(),
+                self.limits.tokens_per_minute,
+                self.limits.token_capacity
+            ])
+        except Exception:
+            self.fallback.drain()
+
+
+# ==================== Scheduler ====================
+
+class _ProviderQueue:
+    """Priority-ordered waiters for one provider on one event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.condition = asyncio.Condition()
+        self.waiters: List[Tuple[int, int]] = []
+
+
+class LLMScheduler:
+    """
+    Admission control for AI provider requests
+
+    Usage:
+        async with llm_scheduler.admit("claude", estimate_tokens(prompt, max_tokens=4000)) as admission:
+            result = await call_provider()
+            llm_scheduler.settle(admission, result["tokens_used"])
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ProviderLimits]] = None,
+        distributed: Optional[bool] = None,
+        redis_client=None,
+        max_wait: Optional[float] = None,
+        interactive_reserve: Optional[float] = None
+    ):
+        """
+        Args:
+            limits: Per-provider limits (default: LLM_SCHEDULER_<PROVIDER>_RPM/TPM settings)
+            distributed: Share budgets through Redis (default: LLM_SCHEDULER_DISTRIBUTED)
+            redis_client: RedisManager-compatible client
+            max_wait: Seconds a request may queue before SchedulerTimeoutError
+            interactive_reserve: Fraction of each bucket batch requests cannot use
+        """
+        self._limits = limits
+        self.distributed = settings.LLM_SCHEDULER_DISTRIBUTED if distributed is None else distributed
+        self.redis = redis_client or redis_manager
+        self.max_wait = settings.LLM_SCHEDULER_MAX_WAIT_SECONDS if max_wait is None else max_wait
+        self.interactive_reserve = (
+            settings.LLM_SCHEDULER_INTERACTIVE_RESERVE if interactive_reserve is None else interactive_reserve
+        )
+
+        self._buckets: Dict[str, Any] = {}
+        self._queues: Dict[str, _ProviderQueue] = {}
+        self._sequence = itertools.count()
+        self._delays: Dict[Tuple[str, RequestPriority], _DelayStats] = {}
+        self._rate_limited: Dict[str, int] = {}
+
+    def limits_for(self, provider: str) -> Optional[ProviderLimits]:
+        """Configured limits for a provider (None = unmanaged)"""
+        if self._limits is not None:
+            return self._limits.get(provider)
+
+        rpm = getattr(settings, f"LLM_SCHEDULER_{provider.upper()}_RPM", None)
+        tpm = getattr(settings, f"LLM_SCHEDULER_{provider.upper()}_TPM", None)
+        if not rpm or not tpm:
+            return None
+        return ProviderLimits(rpm, tpm, settings.LLM_SCHEDULER_BURST_SECONDS)
+
+    def _bucket(self, provider: str, limits: ProviderLimits):
+        if provider not in self._buckets:
+            self._buckets[provider] = (
+                RedisTokenBucket(provider, limits, self.redis) if self.distributed
+                else LocalTokenBucket(limits)
+            )
+        return self._buckets[provider]
+
+    def _queue(self, provider: str) -> _ProviderQueue:
+        # asyncio primitives are bound to one loop; Celery tasks each run their own
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(provider)
+        if queue is None or queue.loop is not loop:
+            queue = self._queues[provider] = _ProviderQueue(loop)
+        return queue
+
+    def _delay_stats(self, provider: str, priority: RequestPriority) -> _DelayStats:
+        return self._delays.setdefault((provider, priority), _DelayStats())
+
+    async def acquire(
+        self,
+        provider: str,
+        estimated_tokens: int,
+        priority: Optional[RequestPriority] = None
+    ) -> Admission:
+        """
+        Wait until the provider's budget admits the request
+
+        Raises:
+            SchedulerTimeoutError: Not admitted within max_wait seconds
+        """
+        priority = get_request_priority() if priority is None else priority
+        admission = Admission(provider, priority, estimated_tokens)
+
+        limits = self.limits_for(provider)
+        if not settings.LLM_SCHEDULER_ENABLED or limits is None:
+            return admission
+
+        bucket = self._bucket(provider, limits)
+        reserve = self.interactive_reserve if priority == RequestPriority.BATCH else 0.0
+        queue = self._queue(provider)
+        ticket = (int(priority), next(self._sequence))
+        started = time.monotonic()
+
+        async with queue.condition:
+            heapq.heappush(queue.waiters, ticket)
+            queue.condition.notify_all()
+            try:
+                while True:
+                    # Only the highest-priority, oldest waiter draws from the budget
+                    await queue.condition.wait_for(lambda: queue.waiters[0] == ticket)
+                    admitted, wait = bucket.try_acquire(estimated_tokens, reserve)
+                    if admitted:
+                        break
+
+                    if time.monotonic() - started + wait > self.max_wait:
+                        self._delay_stats(provider, priority).timeouts += 1
+                        raise SchedulerTimeoutError(
+                            f"{provider} budget did not admit request within {self.max_wait:.0f}s"
+                        )
+
+                    # Woken early if a higher-priority request arrives
+                    try:
+                        await asyncio.wait_for(queue.condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                queue.waiters.remove(ticket)
+                heapq.heapify(queue.waiters)
+                queue.condition.notify_all()
+
+        admission.queue_delay = time.monotonic() - started
+        self._delay_stats(provider, priority).record(admission.queue_delay)
+        if admission.queue_delay > 5:
+            logger.warning(
+                f"LLM request to {provider} ({priority.name.lower()}) queued "
+                f"{admission.queue_delay:.1f}s for budget"
+            )
+        return admission
+
+    def settle(self, admission: Admission, actual_tokens: Optional[int]) -> None:
+        """Correct the token budget once actual usage is known"""
+        if admission.settled or actual_tokens is None:
+            return
+        admission.settled = True
+
+        limits = self.limits_for(admission.provider)
+        if not settings.LLM_SCHEDULER_ENABLED or limits is None:
+            return
+        difference = admission.estimated_tokens - actual_tokens
+        if difference:
+            self._bucket(admission.provider, limits).adjust(difference)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        provider: str,
+        estimated_tokens: int,
+        priority: Optional[RequestPriority] = None
+    ):
+        """Context-manager form of `acquire`; yields the Admission"""
+        admission = await self.acquire(provider, estimated_tokens, priority)
+        yield admission
+
+    @contextmanager
+    def admit_blocking(
+        self,
+        provider: str,
+        estimated_tokens: int,
+        priority: Optional[RequestPriority] = None
+    ) -> Iterator[Admission]:
+        """
+        Blocking form of `admit` for synchronous SDK calls (Celery task code)
+
+        Waits on a private event loop, so it must not be called from a thread
+        that is running one; async callers use `admit`.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("admit_blocking() called from a running event loop; use admit()")
+
+        admission = asyncio.run(self.acquire(provider, estimated_tokens, priority))
+        yield admission
+
+    def record_rate_limited(self, provider: str) -> None:
+        """Provider returned 429 anyway: pause new admissions briefly"""
+        self._rate_limited[provider] = self._rate_limited.get(provider, 0) + 1
+        limits = self.limits_for(provider)
+        if settings.LLM_SCHEDULER_ENABLED and limits is not None:
+            self._bucket(provider, limits).drain()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queueing delay and admission counts per provider and priority"""
+        providers: Dict[str, Any] = {}
+        for (provider, priority), delay_stats in sorted(self._delays.items()):
+            entry = providers.setdefault(provider, {"rate_limited": self._rate_limited.get(provider, 0)})
+            entry[priority.name.lower()] = delay_stats.to_dict()
+            queue = self._queues.get(provider)
+            entry["queued"] = len(queue.waiters) if queue else 0
+
+        return {
+            "enabled": settings.LLM_SCHEDULER_ENABLED,
+            "distributed": self.distributed,
+            "providers": providers
+        }
+
+
+# Global scheduler shared by every AIProviderService in the process
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,219 @@
+"""
+MinHash / Locality-Sensitive Hashing primitives
+Near-duplicate candidate generation for long texts in near-linear time
+
+Shingles are hashed word k-grams, signatures are `num_perm` MinHash values
+and LSH splits each signature into `bands` x `rows` so that documents sharing
+any band hash become candidate pairs. Candidates must still be verified with
+an exact measure (see `jaccard`) - LSH only decides what is worth comparing.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Mersenne prime larger than any 32-bit shingle hash
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def shingle(text: str, k: int = 5) -> Set[int]:
+    """
+    Convert text into a set of hashed word k-shingles
+
+    Hashing uses CRC32 so the values are stable across processes
+    (Python's built-in hash() is salted per interpreter).
+
+    Args:
+        text: Raw text
+        k: Number of words per shingle
+
+    Returns:
+        Set of 32-bit shingle hashes
+    """
+    if not text:
+        return set()
+
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return set()
+
+    if len(tokens) < k:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+
+    return {
+        zlib.crc32(" ".join(tokens[i:i + k]).encode("utf-8"))
+        for i in range(len(tokens) - k + 1)
+    }
+
+
+def jaccard(shingles_a: Set[int], shingles_b: Set[int]) -> float:
+    """Exact Jaccard similarity of two shingle sets"""
+    if not shingles_a or not shingles_b:
+        return 0.0
+    intersection = len(shingles_a & shingles_b)
+    return intersection / (len(shingles_a) + len(shingles_b) - intersection)
+
+
+class MinHasher:
+    """
+    Computes fixed-size MinHash signatures from shingle sets
+
+    The permutation parameters are derived from `seed`, so signatures built
+    with the same (num_perm, seed) are comparable across runs and workers.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        self.seed = seed
+
+        rng = np.random.RandomState(seed)
+        # a < 2^31 keeps a * h < 2^63 for 32-bit h, so no uint64 overflow
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, shingles: Iterable[int]) -> np.ndarray:
+        """
+        Compute MinHash signature for a shingle set
+
+        Returns:
+            uint32 array of length num_perm (all max values for an empty set)
+        """
+        values = np.fromiter(shingles, dtype=np.uint64)
+        if values.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+
+        # (num_perm, n_shingles) universal hashes, min over shingles
+        hashed = (np.outer(self._a, values) + self._b[:, None]) % _MERSENNE_PRIME
+        return np.bitwise_and(hashed, _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    def signature_from_text(self, text: str, k: int = 5) -> np.ndarray:
+        """Shingle text and compute its signature"""
+        return self.signature(shingle(text, k))
+
+    @staticmethod
+    def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two signatures"""
+        return float(np.mean(sig_a == sig_b))
+
+    @staticmethod
+    def to_bytes(signature: np.ndarray) -> bytes:
+        """Serialize signature for storage (BYTEA)"""
+        return signature.astype("<u4").tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> np.ndarray:
+        """Deserialize signature produced by to_bytes()"""
+        return np.frombuffer(bytes(data), dtype="<u4").astype(np.uint32)
+
+
+def band_hashes(signature: np.ndarray, bands: int, rows: int) -> List[int]:
+    """
+    Hash each LSH band of a signature to a signed 64-bit bucket key
+
+    Signed values fit PostgreSQL BIGINT columns directly.
+    """
+    if len(signature) < bands * rows:
+        raise ValueError(
+            f"Signature length {len(signature)} is smaller than bands*rows ({bands * rows})"
+        )
+
+    data = signature.astype("<u4")
+    keys = []
+    for band in range(bands):
+        chunk = data[band * rows:(band + 1) * rows].tobytes()
+        # Band index is mixed in so equal rows in different bands never collide
+        high = zlib.crc32(chunk, band)
+        low = zlib.adler32(chunk, band + 1)
+        key = (high << 32) | low
+        if key >= 1 << 63:
+            key -= 1 << 64
+        keys.append(key)
+    return keys
+
+
+def lsh_threshold(bands: int, rows: int) -> float:
+    """Approximate Jaccard at which candidate probability crosses 50%"""
+    return (1.0 / bands) ** (1.0 / rows)
+
+
+class LSHIndex:
+    """
+    In-memory banded LSH index over MinHash signatures
+
+    Supports incremental add/remove; `candidate_pairs` and `query` only touch
+    documents that share at least one bucket, so the cost is proportional to
+    the number of documents plus the number of colliding pairs.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        self._buckets: Dict[Tuple[int, int], Set[Hashable]] = defaultdict(set)
+        self._keys: Dict[Hashable, List[int]] = {}
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        """Insert or replace a document signature"""
+        if key in self._keys:
+            self.remove(key)
+
+        hashes = band_hashes(signature, self.bands, self.rows)
+        for band, bucket in enumerate(hashes):
+            self._buckets[(band, bucket)].add(key)
+
+        self._keys[key] = hashes
+        self._signatures[key] = signature
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a document (no-op if absent)"""
+        hashes = self._keys.pop(key, None)
+        self._signatures.pop(key, None)
+        if hashes is None:
+            return
+
+        for band, bucket in enumerate(hashes):
+            members = self._buckets.get((band, bucket))
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._buckets[(band, bucket)]
+
+    def get_signature(self, key: Hashable) -> Optional[np.ndarray]:
+        return self._signatures.get(key)
+
+    def query(self, signature: np.ndarray, exclude: Optional[Hashable] = None) -> Set[Hashable]:
+        """Return keys sharing at least one band bucket with the signature"""
+        candidates: Set[Hashable] = set()
+        for band, bucket in enumerate(band_hashes(signature, self.bands, self.rows)):
+            candidates.update(self._buckets.get((band, bucket), ()))
+        candidates.discard(exclude)
+        return candidates
+
+    def candidate_pairs(self) -> Set[Tuple[Hashable, Hashable]]:
+        """All unordered key pairs that collide in at least one band"""
+        pairs: Set[Tuple[Hashable, Hashable]] = set()
+        for members in self._buckets.values():
+            if len(members) < 2:
+                continue
+            ordered = sorted(members, key=str)
+            for i, key_a in enumerate(ordered):
+                for key_b in ordered[i + 1:]:
+                    pairs.add((key_a, key_b))
+        return pairs
@@ -6,14 +6,19 @@ Uses PyMuPDF (fitz) for high-quality extraction with layout preservation
 import fitz  # PyMuPDF
 import io
 import re
+import uuid
 from pathlib import Path
 from typing import Optional, List, Dict, Any, BinaryIO
 from datetime import datetime
+from sqlalchemy import func, insert, inspect as sa_inspect, literal, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, UploadFile
 
-from backend.database.models import PDF, Image
+from backend.database.models import PDF, Image, PDFChunk
+from backend.services.blob_store import BlobStore
 from backend.services.storage_service import StorageService
+from backend.services.image_extraction import extract_pdf_images
+from backend.services.perceptual_hash import PerceptualDuplicateIndex, to_unsigned
 from backend.config import settings
 from backend.utils import get_logger
 
@@ -29,6 +34,7 @@ class PDFService:
     - Metadata extraction (title, authors, DOI, etc.)
     - Text extraction with layout preservation
     - Image extraction with position and metadata
+    - Reuse of results of identical (same SHA-256) PDFs
     - Progress tracking in database
     """
 
@@ -95,6 +101,7 @@ class PDFService:
             filename=file.filename,
             file_path=storage_result["file_path"],
             file_size_bytes=storage_result["file_size_bytes"],
+            content_sha256=storage_result["content_sha256"],
             total_pages=metadata.get("page_count", 0),
             title=metadata.get("title"),
             authors=metadata.get("authors"),
@@ -109,10 +116,16 @@ class PDFService:
         )
 
         self.db.add(pdf)
+        BlobStore(self.db).add_references("pdf", [
+            (pdf.content_sha256, pdf.file_path, pdf.file_size_bytes)
+        ])
         self.db.commit()
         self.db.refresh(pdf)
 
-        logger.info(f"PDF uploaded: {pdf.filename} (ID: {pdf.id}, Size: {file_size_mb:.2f}MB)")
+        logger.info(
+            f"PDF uploaded: {pdf.filename} (ID: {pdf.id}, Size: {file_size_mb:.2f}MB"
+            + (", identical file already stored)" if storage_result["already_stored"] else ")")
+        )
 
         # Extract immediately if requested
         if extract_immediately:
@@ -326,68 +339,26 @@ class PDFService:
         self.db.commit()
 
         try:
-            doc = fitz.open(pdf.file_path)
-
-            total_images = 0
-            successful_extractions = 0
-
-            # Extract images page by page
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-
-                # Get image list from page
-                image_list = page.get_images(full=True)
-
-                for img_index, img in enumerate(image_list):
-                    try:
-                        xref = img[0]  # Image reference number
-                        base_image = doc.extract_image(xref)
-
-                        if not base_image:
-                            continue
-
-                        image_bytes = base_image["image"]
-                        image_format = base_image["ext"]  # png, jpeg, etc.
-                        width = base_image.get("width", 0)
-                        height = base_image.get("height", 0)
-
-                        # Save image to storage
-                        storage_result = self.storage.save_image(
-                            image_bytes,
-                            image_format,
-                            create_thumbnail=True
-                        )
-
-                        # Create Image record
-                        image_record = Image(
-                            pdf_id=pdf.id,
-                            page_number=page_num + 1,  # 1-indexed
-                            image_index_on_page=img_index,
-                            file_path=storage_result["image_path"],
-                            thumbnail_path=storage_result["thumbnail_path"],
-                            width=width,
-                            height=height,
-                            format=image_format.upper(),
-                            file_size_bytes=storage_result["file_size_bytes"],
-                            # AI analysis will be done in Phase 4
-                            ai_description=None,
-                            image_type=None,
-                            quality_score=None,
-                            is_duplicate=False
-                        )
-
-                        self.db.add(image_record)
-                        successful_extractions += 1
-
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to extract image {img_index} from page {page_num + 1}: {str(e)}"
-                        )
-                        continue
-
-                total_images += len(image_list)
-
-            doc.close()
+            # Files and thumbnails are written by a worker pool; small and
+            # repeated images are skipped before decoding
+            rows, stats = extract_pdf_images(pdf.file_path, self.storage)
+            total_images = stats.total_images
+            successful_extractions = stats.extracted
+
+            # Near-duplicates of analyzed/earlier figures skip vision analysis and embedding
+            perceptual_duplicates = self._link_perceptual_duplicates(rows)
+
+            # One bulk INSERT for all image rows (AI analysis is done later in the pipeline)
+            if rows:
+                self.db.execute(insert(Image), [
+                    {**row, "pdf_id": pdf.id, "contains_text": False}
+                    for row in rows
+                ])
+                # Image files are shared by content: each row references its blob
+                BlobStore(self.db).add_references("image", [
+                    (row["content_sha256"], row["file_path"], row["file_size_bytes"])
+                    for row in rows
+                ])
 
             # Update PDF record
             pdf.images_extracted = True
@@ -399,13 +370,21 @@ class PDFService:
 
             logger.info(
                 f"Images extracted from PDF {pdf.id}: "
-                f"{successful_extractions}/{total_images} successful"
+                f"{successful_extractions}/{total_images} stored "
+                f"({stats.skipped_small} too small, {stats.skipped_duplicate} repeated, {stats.failed} failed); "
+                f"{perceptual_duplicates} near-duplicates will reuse canonical analysis"
             )
 
             return {
                 "pdf_id": str(pdf.id),
                 "total_images": total_images,
                 "successful_extractions": successful_extractions,
+                "skipped_small": stats.skipped_small,
+                "skipped_duplicate": stats.skipped_duplicate,
+                "failed": stats.failed,
+                "perceptual_duplicates": perceptual_duplicates,
+                # Each near-duplicate saves a vision analysis and an embedding call
+                "api_calls_avoided": perceptual_duplicates * 2,
                 "status": "completed"
             }
 
@@ -418,6 +397,176 @@ class PDFService:
                 detail=f"Image extraction failed: {str(e)}"
             )
 
+    def _link_perceptual_duplicates(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Mark extracted images that are perceptual near-duplicates
+
+        Canonical candidates are images already analyzed (any PDF) plus the
+        earlier images of this extraction, looked up through a BK-tree on
+        pHash and confirmed with dHash. Duplicates get is_duplicate and
+        duplicate_of_id set on their row.
+
+        Args:
+            rows: Extracted image rows in page order (modified in place)
+
+        Returns:
+            Number of rows marked as duplicates
+        """
+        for row in rows:
+            row["is_duplicate"] = False
+            row["duplicate_of_id"] = None
+
+        if not settings.PDF_IMAGE_PERCEPTUAL_DEDUP or not rows:
+            return 0
+
+        index = PerceptualDuplicateIndex(
+            settings.PDF_IMAGE_PHASH_MAX_DISTANCE,
+            settings.PDF_IMAGE_DHASH_MAX_DISTANCE
+        )
+        index.add_all(
+            (image_id, to_unsigned(phash), to_unsigned(dhash))
+            for image_id, phash, dhash in self.db.query(Image.id, Image.phash, Image.dhash).filter(
+                Image.phash.isnot(None),
+                Image.dhash.isnot(None),
+                Image.is_duplicate.is_(False),
+                Image.ai_description.isnot(None)
+            )
+        )
+
+        duplicates = 0
+        for row in rows:
+            if row.get("phash") is None or row.get("dhash") is None:
+                continue
+            phash, dhash = to_unsigned(row["phash"]), to_unsigned(row["dhash"])
+            match = index.find(phash, dhash)
+            if match:
+                row["is_duplicate"] = True
+                row["duplicate_of_id"] = match["image_id"]
+                duplicates += 1
+            else:
+                index.add(row["id"], phash, dhash)
+
+        return duplicates
+
+    def find_processed_copy(self, pdf: PDF, completed_only: bool = True) -> Optional[PDF]:
+        """
+        Another PDF record with identical content whose results can be reused
+
+        Args:
+            pdf: PDF record (needs content_sha256)
+            completed_only: Require a fully processed copy; otherwise a copy
+                with extracted images is enough
+
+        Returns:
+            The earliest matching PDF, or None
+        """
+        if not pdf.content_sha256:
+            return None
+
+        query = self.db.query(PDF).filter(
+            PDF.content_sha256 == pdf.content_sha256,
+            PDF.id != pdf.id
+        )
+        if completed_only:
+            query = query.filter(PDF.indexing_status == "completed")
+        else:
+            query = query.filter(PDF.images_extracted.is_(True))
+        return query.order_by(PDF.uploaded_at).first()
+
+    def reuse_processed_pdf(self, pdf: PDF, source: PDF) -> Dict[str, Any]:
+        """
+        Copy the results of an identical PDF instead of processing it again
+
+        Copies extracted text and citations, whole-PDF chunks with their
+        embeddings (one INSERT ... SELECT) and image rows with their analysis
+        and embeddings. Image files are shared blobs, so copied rows only take
+        references. Near-duplicate links inside the source are remapped to the
+        copied rows.
+
+        Args:
+            pdf: PDF record to fill in
+            source: Processed PDF with the same content_sha256
+
+        Returns:
+            Dictionary with copied chunk and image counts
+        """
+        copied_chunks = 0
+        copied_images = 0
+
+        if source.text_extracted:
+            pdf.extracted_text = source.extracted_text
+            pdf.citations = source.citations
+            pdf.total_pages = source.total_pages or pdf.total_pages
+            pdf.text_extracted = True
+
+        if source.embeddings_generated:
+            chunk_columns = [
+                column for column in PDFChunk.__table__.columns
+                if column.name not in ("id", "pdf_id", "created_at", "updated_at")
+            ]
+            result = self.db.execute(insert(PDFChunk).from_select(
+                ["id", "pdf_id", "created_at", "updated_at", *(column.name for column in chunk_columns)],
+                select(
+                    func.uuid_generate_v4(),
+                    literal(pdf.id, PDFChunk.pdf_id.type),
+                    func.now(),
+                    func.now(),
+                    *chunk_columns
+                ).where(PDFChunk.pdf_id == source.id)
+            ))
+            copied_chunks = result.rowcount
+            pdf.embeddings_generated = True
+
+        if source.images_extracted:
+            rows = self._copy_image_rows(source, pdf)
+            copied_images = len(rows)
+            pdf.images_extracted = True
+
+        pdf.indexing_status = "completed" if source.indexing_status == "completed" else "images_extracted"
+        pdf.indexed_at = datetime.utcnow()
+        self.db.commit()
+
+        logger.info(
+            f"PDF {pdf.id} reuses results of identical PDF {source.id}: "
+            f"{copied_chunks} chunks, {copied_images} images copied"
+        )
+
+        return {
+            "pdf_id": str(pdf.id),
+            "source_pdf_id": str(source.id),
+            "copied_chunks": copied_chunks,
+            "copied_images": copied_images,
+            "status": "reused"
+        }
+
+    def _copy_image_rows(self, source: PDF, pdf: PDF) -> List[Dict[str, Any]]:
+        """Insert copies of the source's image rows for pdf (one bulk INSERT)"""
+        columns = [
+            attr.key for attr in sa_inspect(Image).column_attrs
+            if attr.key not in ("id", "pdf_id", "created_at", "updated_at")
+        ]
+        images = self.db.query(Image).filter(Image.pdf_id == source.id).order_by(
+            Image.page_number, Image.image_index_on_page
+        ).all()
+
+        # Canonical rows precede their duplicates (page order), so links stay valid mid-insert
+        new_ids = {image.id: uuid.uuid4() for image in images}
+        rows = []
+        for image in images:
+            row = {key: getattr(image, key) for key in columns}
+            row["id"] = new_ids[image.id]
+            row["pdf_id"] = pdf.id
+            row["duplicate_of_id"] = new_ids.get(image.duplicate_of_id, image.duplicate_of_id)
+            rows.append(row)
+
+        if rows:
+            self.db.execute(insert(Image), rows)
+            BlobStore(self.db).add_references("image", [
+                (row["content_sha256"], row["file_path"], row["file_size_bytes"])
+                for row in rows
+            ])
+        return rows
+
     def get_pdf(self, pdf_id: str) -> PDF:
         """
         Get PDF by ID
@@ -481,31 +630,54 @@ class PDFService:
         if not pdf:
             raise HTTPException(status_code=404, detail="PDF not found")
 
-        # Delete associated images
-        images = self.db.query(Image).filter(Image.pdf_id == pdf_id).all()
+        deleted_images = self.delete_pdf_records(pdf)
+        self.db.commit()
+
+        logger.info(f"PDF deleted: {pdf_id} ({deleted_images} images)")
+
+        return {
+            "pdf_id": pdf_id,
+            "deleted_images": deleted_images,
+            "status": "deleted"
+        }
+
+    def delete_pdf_records(self, pdf: PDF) -> int:
+        """
+        Delete a PDF record and its images, releasing their stored files
+
+        Content-addressed files are released (garbage collection deletes
+        them once unreferenced); older files are deleted directly. The
+        caller commits.
+
+        Args:
+            pdf: PDF record
+
+        Returns:
+            Number of images deleted
+        """
+        images = self.db.query(Image).filter(Image.pdf_id == pdf.id).all()
         deleted_images = 0
+        released = []
 
         for image in images:
-            # Delete image files from storage
-            self.storage.delete_image(image.file_path, image.thumbnail_path)
+            if image.content_sha256:
+                # Shared file: release the reference (garbage collection deletes it)
+                released.append(image.content_sha256)
+            else:
+                self.storage.delete_image(image.file_path, image.thumbnail_path)
             # Delete image record
             self.db.delete(image)
             deleted_images += 1
 
-        # Delete PDF file from storage
-        self.storage.delete_pdf(pdf.file_path)
+        if pdf.content_sha256:
+            released.append(pdf.content_sha256)
+        else:
+            self.storage.delete_pdf(pdf.file_path)
 
         # Delete PDF record
+        BlobStore(self.db).release(released)
         self.db.delete(pdf)
-        self.db.commit()
-
-        logger.info(f"PDF deleted: {pdf_id} ({deleted_images} images)")
-
-        return {
-            "pdf_id": pdf_id,
-            "deleted_images": deleted_images,
-            "status": "deleted"
-        }
+        return deleted_images
 
     def get_pdf_images(self, pdf_id: str) -> List[Image]:
         """
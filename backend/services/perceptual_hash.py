@@ -0,0 +1,179 @@
+"""
+Perceptual image hashing primitives
+Near-duplicate image lookup by Hamming distance between 64-bit hashes
+
+dHash compares neighbouring pixels of a 9x8 grayscale thumbnail (gradients);
+pHash thresholds the low-frequency 8x8 block of a 32x32 DCT at its median
+(coarse structure). Both survive re-encoding, rescaling and small tone
+changes, so the same figure embedded at a different resolution or JPEG
+quality hashes within a few bits. Requiring both hashes to agree keeps
+false matches between merely similar-looking images rare.
+
+A BK-tree indexes hashes by Hamming distance so a radius query visits only
+a small part of the tree instead of comparing against every stored hash.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+HASH_BITS = 64
+
+
+def _grayscale(img: Image.Image, size: Tuple[int, int]) -> np.ndarray:
+    if img.mode in ("RGBA", "LA", "P"):
+        # Transparent areas on white, as they are displayed
+        img = img.convert("RGBA")
+        background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    return np.asarray(img.convert("L").resize(size, Image.Resampling.LANCZOS), dtype=np.float64)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def dhash(img: Image.Image) -> int:
+    """64-bit difference hash (horizontal gradients of a 9x8 thumbnail)"""
+    pixels = _grayscale(img, (9, 8))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    matrix = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2)
+    return matrix * np.sqrt(2 / n)
+
+
+_DCT_32 = _dct_matrix(32)
+
+
+def phash(img: Image.Image) -> int:
+    """64-bit DCT hash (low 8x8 frequencies of a 32x32 thumbnail vs. their median)"""
+    pixels = _grayscale(img, (32, 32))
+    low = (_DCT_32 @ pixels @ _DCT_32.T)[:8, :8]
+    # The DC term only reflects overall brightness; leave it out of the median
+    return _bits_to_int(low > np.median(low.flatten()[1:]))
+
+
+def image_hashes(img: Image.Image) -> Tuple[int, int]:
+    """(phash, dhash) of an image"""
+    return phash(img), dhash(img)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits"""
+    return bin(a ^ b).count("1")
+
+
+def to_signed(value: int) -> int:
+    """Unsigned 64-bit hash -> signed (PostgreSQL BIGINT)"""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value: int) -> int:
+    """Signed BIGINT -> unsigned 64-bit hash"""
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over 64-bit hashes (Hamming metric)
+
+    Each node keeps children keyed by their distance to it; by the triangle
+    inequality a query within `radius` only needs the children whose key is
+    within `radius` of the query's distance to the node.
+    """
+
+    def __init__(self):
+        # node: [hash, payloads, {distance: child}]
+        self._root: Optional[list] = None
+        self.size = 0
+
+    def add(self, value: int, payload: Any = None) -> None:
+        """Insert a hash (payloads of equal hashes are kept together)"""
+        self.size += 1
+        if self._root is None:
+            self._root = [value, [payload], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(payload)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [payload], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, int, Any]]:
+        """
+        All stored hashes within `radius` bits of `value`
+
+        Returns:
+            (distance, hash, payload) tuples, closest first
+        """
+        if self._root is None:
+            return []
+
+        matches = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                matches.extend((distance, node[0], payload) for payload in node[1])
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class PerceptualDuplicateIndex:
+    """
+    Canonical image lookup by (pHash, dHash)
+
+    pHash drives the BK-tree; a candidate is a duplicate only if its dHash
+    is also within `dhash_radius`.
+    """
+
+    def __init__(self, phash_radius: int, dhash_radius: int):
+        self.phash_radius = phash_radius
+        self.dhash_radius = dhash_radius
+        self.tree = BKTree()
+
+    def add(self, image_id: Any, phash_value: int, dhash_value: int) -> None:
+        self.tree.add(phash_value, (image_id, dhash_value))
+
+    def add_all(self, entries: Iterable[Tuple[Any, int, int]]) -> None:
+        for image_id, phash_value, dhash_value in entries:
+            self.add(image_id, phash_value, dhash_value)
+
+    def find(self, phash_value: int, dhash_value: int) -> Optional[Dict[str, Any]]:
+        """
+        Closest indexed image matching both hashes
+
+        Returns:
+            dict with image_id, phash_distance and dhash_distance, or None
+        """
+        for distance, _, (image_id, candidate_dhash) in self.tree.search(phash_value, self.phash_radius):
+            dhash_distance = hamming(dhash_value, candidate_dhash)
+            if dhash_distance <= self.dhash_radius:
+                return {"image_id": image_id, "phash_distance": distance, "dhash_distance": dhash_distance}
+        return None
+
+    def __len__(self) -> int:
+        return len(self.tree)
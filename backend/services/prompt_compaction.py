@@ -0,0 +1,303 @@
+"""
+Prompt Compaction - Pack research sources into a section prompt's token budget
+Replaces raw source dictionaries in generation prompts with ranked passages
+
+Sources allocated to a section are split into passages (sentence windows of
+their abstract / preview / excerpt text). Near-identical passages - the same
+abstract returned by several searches, overlapping chapter previews - are
+kept once. The remaining passages are ranked by embedding similarity to the
+section outline (keyword overlap when embeddings are unavailable) and packed
+greedily, most relevant first, until the per-call token budget is reached.
+Each source that contributes a passage gets one compact citation header.
+
+Token counts come from a local tokenizer (tiktoken, when installed) so
+budgets are enforced before the provider call, not discovered from its
+usage report.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.config import settings
+from backend.services.image_placement import cosine_similarity_matrix
+from backend.services.minhash_lsh import jaccard, shingle
+from backend.utils import get_logger
+from backend.utils.tokenizer import count_tokens
+
+logger = get_logger(__name__)
+
+# Source fields holding passage text, in order of preference
+TEXT_FIELDS = ("abstract", "content_preview", "excerpt", "snippet", "summary", "content", "text")
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+_TOKEN_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass
+class Passage:
+    """A packable slice of one source's text"""
+    source_idx: int
+    position: int
+    text: str
+    tokens: int
+
+
+@dataclass
+class CompactedSources:
+    """Result of packing sources for one prompt"""
+    text: str
+    tokens: int
+    raw_tokens: int
+    budget: int
+    passages_used: int
+    passages_total: int
+    duplicates_dropped: int
+    sources_used: List[int]
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.raw_tokens - self.tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": self.tokens,
+            "raw_tokens": self.raw_tokens,
+            "tokens_saved": self.tokens_saved,
+            "budget": self.budget,
+            "passages_used": self.passages_used,
+            "passages_total": self.passages_total,
+            "duplicates_dropped": self.duplicates_dropped,
+            "sources_used": len(self.sources_used)
+        }
+
+
+def source_header(number: int, source: Dict[str, Any]) -> str:
+    """One-line citation header: [S1] Authors (Year). Title. Venue. DOI/PMID"""
+    authors = source.get("authors") or []
+    if isinstance(authors, str):
+        authors = [authors]
+    author_text = ", ".join(str(a) for a in authors[:2])
+    if len(authors) > 2:
+        author_text += " et al."
+
+    year = source.get("year") or source.get("publication_year")
+    venue = source.get("journal") or source.get("book_title")
+    identifier = (
+        f"doi:{source['doi']}" if source.get("doi")
+        else f"PMID:{source['pmid']}" if source.get("pmid")
+        else None
+    )
+
+    parts = [f"{author_text or 'Unknown'} ({year or 'n.d.'})", source.get("title") or "Untitled", venue, identifier]
+    return f"[S{number}] " + ". ".join(str(p) for p in parts if p)
+
+
+def split_passages(source_idx: int, source: Dict[str, Any], max_tokens: int) -> List[Passage]:
+    """Split a source's text fields into sentence windows of at most `max_tokens`"""
+    passages = []
+    seen_fields = set()
+    for field in TEXT_FIELDS:
+        value = source.get(field)
+        if not isinstance(value, str) or not value.strip() or value in seen_fields:
+            continue
+        seen_fields.add(value)
+
+        window: List[str] = []
+        window_tokens = 0
+        for sentence in _SENTENCE_PATTERN.split(" ".join(value.split())):
+            sentence_tokens = count_tokens(sentence)
+            if window and window_tokens + sentence_tokens > max_tokens:
+                passages.append(Passage(source_idx, len(passages), " ".join(window), window_tokens))
+                window, window_tokens = [], 0
+            if sentence_tokens > max_tokens:
+                # A single overlong sentence is cut at a word boundary
+                words = sentence.split()
+                while words and count_tokens(" ".join(words)) > max_tokens:
+                    words = words[:int(len(words) * 0.8)]
+                sentence = " ".join(words)
+                sentence_tokens = count_tokens(sentence)
+            window.append(sentence)
+            window_tokens += sentence_tokens
+        if window:
+            passages.append(Passage(source_idx, len(passages), " ".join(window), count_tokens(" ".join(window))))
+    return passages
+
+
+class SourceCompactor:
+    """
+    Packs section sources to a token budget
+
+    One compactor is shared by all sections of a chapter: passage and
+    outline embeddings are cached on it, and `prepare` embeds everything the
+    chapter will need in one batched request.
+
+    Args:
+        ai_service: AIProviderService (generate_embeddings_batch); None for
+            keyword-overlap ranking only
+    """
+
+    def __init__(self, ai_service=None):
+        self.ai_service = ai_service
+        self._vectors: Dict[str, Sequence[float]] = {}
+        self._embeddings_available = ai_service is not None
+        self.totals = {"calls": 0, "raw_tokens": 0, "tokens": 0, "tokens_saved": 0}
+
+    async def prepare(self, outlines: List[str], sources: List[Dict[str, Any]]) -> None:
+        """Embed all outlines and source passages up front, in batched requests"""
+        passages = [
+            p.text
+            for idx, source in enumerate(sources)
+            for p in split_passages(idx, source, settings.PROMPT_PASSAGE_MAX_TOKENS)
+        ]
+        await self._embed(list(outlines) + passages)
+
+    async def pack(
+        self,
+        outline: str,
+        sources: List[Dict[str, Any]],
+        budget: int,
+        label: str = ""
+    ) -> CompactedSources:
+        """
+        Most relevant, de-duplicated source passages within `budget` tokens
+
+        Args:
+            outline: Section title, key points and hints to rank against
+            sources: Sources allocated to the section (in allocation order)
+            budget: Token budget for the rendered source block
+            label: Name used in the savings log line
+
+        Returns:
+            CompactedSources with the rendered block and token accounting
+        """
+        raw_tokens = count_tokens(json.dumps(sources, indent=2))
+
+        candidates = [
+            passage
+            for idx, source in enumerate(sources)
+            for passage in split_passages(idx, source, settings.PROMPT_PASSAGE_MAX_TOKENS)
+        ]
+        passages = self._dedupe(candidates)
+        scores = await self._relevance(outline, passages)
+
+        headers: Dict[int, str] = {}
+        chosen: List[Passage] = []
+        used = 0
+        for order in np.argsort(-scores, kind="stable"):
+            passage = passages[int(order)]
+            cost = passage.tokens + 1  # newline
+            if passage.source_idx not in headers:
+                header = source_header(len(headers) + 1, sources[passage.source_idx])
+                cost += count_tokens(header) + 2  # blank line + newline
+            if used + cost > budget:
+                continue
+            if passage.source_idx not in headers:
+                headers[passage.source_idx] = header
+            chosen.append(passage)
+            used += cost
+
+        # Separator tokens were estimated; drop least relevant passages if the rendered block is over
+        text = self._render(headers, chosen)
+        while chosen and count_tokens(text) > budget:
+            dropped = chosen.pop()
+            if not any(p.source_idx == dropped.source_idx for p in chosen):
+                headers.pop(dropped.source_idx)
+            text = self._render(headers, chosen)
+
+        result = CompactedSources(
+            text=text,
+            tokens=count_tokens(text),
+            raw_tokens=raw_tokens,
+            budget=budget,
+            passages_used=len(chosen),
+            passages_total=len(candidates),
+            duplicates_dropped=len(candidates) - len(passages),
+            sources_used=sorted(headers)
+        )
+
+        self.totals["calls"] += 1
+        self.totals["raw_tokens"] += result.raw_tokens
+        self.totals["tokens"] += result.tokens
+        self.totals["tokens_saved"] += result.tokens_saved
+
+        logger.info(
+            f"Source compaction{' for ' + label if label else ''}: {result.raw_tokens} -> {result.tokens} tokens "
+            f"({result.tokens_saved} saved, budget {budget}), {result.passages_used}/{result.passages_total} "
+            f"passages, {result.duplicates_dropped} near-duplicates dropped"
+        )
+        return result
+
+    # ==================== Internals ====================
+
+    @staticmethod
+    def _dedupe(passages: List[Passage]) -> List[Passage]:
+        """Keep the first of each group of near-identical passages"""
+        kept: List[Passage] = []
+        kept_shingles = []
+        for passage in passages:
+            shingles = shingle(passage.text, k=3)
+            if any(jaccard(shingles, other) >= settings.PROMPT_PASSAGE_DEDUP_JACCARD for other in kept_shingles):
+                continue
+            kept.append(passage)
+            kept_shingles.append(shingles)
+        return kept
+
+    async def _relevance(self, outline: str, passages: List[Passage]) -> np.ndarray:
+        if not passages:
+            return np.zeros(0, dtype=np.float32)
+
+        texts = [outline] + [p.text for p in passages]
+        await self._embed(texts)
+        if self._embeddings_available and all(text in self._vectors for text in texts):
+            return cosine_similarity_matrix(
+                [self._vectors[outline]],
+                [self._vectors[p.text] for p in passages]
+            )[0]
+
+        # Keyword overlap with the outline, normalized by passage length
+        outline_terms = {t for t in _TOKEN_PIECE_PATTERN.findall(outline.lower()) if len(t) > 3}
+        scores = np.zeros(len(passages), dtype=np.float32)
+        for idx, passage in enumerate(passages):
+            terms = [t for t in _TOKEN_PIECE_PATTERN.findall(passage.text.lower()) if len(t) > 3]
+            if terms:
+                scores[idx] = sum(t in outline_terms for t in terms) / math.sqrt(len(terms))
+        return scores
+
+    async def _embed(self, texts: List[str]) -> None:
+        missing = list(dict.fromkeys(t for t in texts if t and t not in self._vectors))
+        if not missing or not self._embeddings_available:
+            return
+        batch_size = settings.PROMPT_PASSAGE_EMBEDDING_BATCH_SIZE
+        try:
+            for batch_start in range(0, len(missing), batch_size):
+                batch = missing[batch_start:batch_start + batch_size]
+                response = await self.ai_service.generate_embeddings_batch(batch)
+                self._vectors.update(zip(batch, response["embeddings"]))
+        except Exception as e:
+            logger.warning(f"Passage embeddings unavailable, ranking by keyword overlap: {str(e)}")
+            self._embeddings_available = False
+
+    @staticmethod
+    def _render(headers: Dict[int, str], chosen: List[Passage]) -> str:
+        by_source: Dict[int, List[Passage]] = {}
+        for passage in chosen:
+            by_source.setdefault(passage.source_idx, []).append(passage)
+
+        blocks = []
+        for source_idx, header in headers.items():
+            lines = [header] + [p.text for p in sorted(by_source[source_idx], key=lambda p: p.position)]
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+
+def section_outline(section_plan: Dict[str, Any], parent_title: Optional[str] = None) -> str:
+    """Text a section's sources are ranked against"""
+    parts = [parent_title, section_plan.get("title"), section_plan.get("description")]
+    parts.extend(p for p in section_plan.get("key_points", []) if isinstance(p, str))
+    parts.append(section_plan.get("source_allocation"))
+    return "\n".join(str(p) for p in parts if p)
@@ -52,7 +52,12 @@ class ProviderMetricsService:
         error_message: Optional[str] = None,
         was_fallback: bool = False,
         original_provider: Optional[str] = None,
-        fallback_reason: Optional[str] = None
+        fallback_reason: Optional[str] = None,
+        cache_hit: bool = False,
+        cost_avoided_usd: Optional[float] = None,
+        latency_avoided_ms: Optional[int] = None,
+        payload_bytes_original: Optional[int] = None,
+        payload_bytes_sent: Optional[int] = None
     ) -> str:
         """
         Record an AI provider metric
@@ -88,7 +93,12 @@ class ProviderMetricsService:
                 error_message=error_message,
                 was_fallback=was_fallback,
                 original_provider=original_provider,
-                fallback_reason=fallback_reason
+                fallback_reason=fallback_reason,
+                cache_hit=cache_hit,
+                cost_avoided_usd=cost_avoided_usd,
+                latency_avoided_ms=latency_avoided_ms,
+                payload_bytes_original=payload_bytes_original,
+                payload_bytes_sent=payload_bytes_sent
             )
 
             self.db.add(metric)
@@ -106,6 +116,122 @@ class ProviderMetricsService:
             self.db.rollback()
             raise
 
+    def record_cache_hit(
+        self,
+        provider: str,
+        model: str,
+        task_type: str,
+        lookup_time_ms: int,
+        cost_avoided_usd: float,
+        latency_avoided_ms: Optional[int] = None,
+        total_tokens: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Record a response served from the LLM response cache
+
+        Cache hits are excluded from the provider comparison/success/error
+        aggregates (no provider was called); see get_cache_savings.
+
+        Returns:
+            Metric ID, or None if recording failed
+        """
+        try:
+            return self.record_metric(
+                provider=provider,
+                model=model,
+                task_type=task_type,
+                success=True,
+                response_time_ms=lookup_time_ms,
+                total_tokens=total_tokens,
+                cost_usd=0.0,
+                cache_hit=True,
+                cost_avoided_usd=cost_avoided_usd,
+                latency_avoided_ms=latency_avoided_ms
+            )
+        except Exception:
+            # A metrics failure must never fail the cached request
+            return None
+
+    def get_cache_savings(
+        self,
+        days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Get LLM response cache hits and avoided cost/latency per task type
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of cache savings statistics
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        results = self.db.query(
+            AIProviderMetric.task_type,
+            func.count().label('cache_hits'),
+            func.sum(AIProviderMetric.cost_avoided_usd).label('cost_avoided_usd'),
+            func.sum(AIProviderMetric.latency_avoided_ms).label('latency_avoided_ms'),
+            func.sum(AIProviderMetric.total_tokens).label('tokens_avoided')
+        ).filter(
+            AIProviderMetric.request_timestamp >= cutoff,
+            AIProviderMetric.cache_hit == True
+        ).group_by(
+            AIProviderMetric.task_type
+        ).all()
+
+        return [
+            {
+                'task_type': row.task_type,
+                'cache_hits': row.cache_hits,
+                'cost_avoided_usd': float(row.cost_avoided_usd or 0),
+                'latency_avoided_seconds': round((row.latency_avoided_ms or 0) / 1000, 1),
+                'tokens_avoided': int(row.tokens_avoided or 0)
+            }
+            for row in results
+        ]
+
+    def get_payload_savings(
+        self,
+        days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Get vision payload bytes before/after preparation per provider
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            List of payload size statistics
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        results = self.db.query(
+            AIProviderMetric.provider,
+            func.count().label('requests'),
+            func.sum(AIProviderMetric.payload_bytes_original).label('bytes_original'),
+            func.sum(AIProviderMetric.payload_bytes_sent).label('bytes_sent')
+        ).filter(
+            AIProviderMetric.request_timestamp >= cutoff,
+            AIProviderMetric.payload_bytes_sent.isnot(None)
+        ).group_by(
+            AIProviderMetric.provider
+        ).all()
+
+        savings = []
+        for row in results:
+            original = int(row.bytes_original or 0)
+            sent = int(row.bytes_sent or 0)
+            savings.append({
+                'provider': row.provider,
+                'requests': row.requests,
+                'bytes_original': original,
+                'bytes_sent': sent,
+                'bytes_saved': original - sent,
+                'reduction_percent': round((1 - sent / original) * 100, 1) if original else 0.0
+            })
+        return savings
+
     def get_provider_comparison(
         self,
         task_type: Optional[str] = None,
@@ -135,7 +261,8 @@ class ProviderMetricsService:
             func.sum(AIProviderMetric.cost_usd).label('total_cost_usd'),
             func.sum(func.cast(AIProviderMetric.json_parse_success, Integer)).label('json_parse_successes')
         ).filter(
-            AIProviderMetric.request_timestamp >= cutoff
+            AIProviderMetric.request_timestamp >= cutoff,
+            AIProviderMetric.cache_hit.isnot(True)
         )
 
         if task_type:
@@ -190,6 +317,7 @@ class ProviderMetricsService:
         query = self.db.query(AIProviderMetric).filter(
             and_(
                 AIProviderMetric.request_timestamp >= cutoff,
+                AIProviderMetric.cache_hit.isnot(True),
                 AIProviderMetric.quality_score.isnot(None),
                 AIProviderMetric.success == True
             )
@@ -259,6 +387,7 @@ class ProviderMetricsService:
         ).filter(
             and_(
                 AIProviderMetric.request_timestamp >= cutoff,
+                AIProviderMetric.cache_hit.isnot(True),
                 AIProviderMetric.success == True,
                 AIProviderMetric.quality_score.isnot(None),
                 AIProviderMetric.cost_usd > 0
@@ -310,7 +439,8 @@ class ProviderMetricsService:
             func.sum(func.cast(AIProviderMetric.success, Integer)).label('successful_requests'),
             func.count(AIProviderMetric.error_type).label('total_errors')
         ).filter(
-            AIProviderMetric.request_timestamp >= cutoff
+            AIProviderMetric.request_timestamp >= cutoff,
+            AIProviderMetric.cache_hit.isnot(True)
         ).group_by(
             AIProviderMetric.provider
         ).all()
@@ -357,6 +487,7 @@ class ProviderMetricsService:
         ).filter(
             and_(
                 AIProviderMetric.request_timestamp >= cutoff,
+                AIProviderMetric.cache_hit.isnot(True),
                 AIProviderMetric.error_type.isnot(None)
             )
         )
@@ -396,12 +527,14 @@ class ProviderMetricsService:
         cutoff = datetime.utcnow() - timedelta(days=days)
 
         total_requests = self.db.query(func.count(AIProviderMetric.id)).filter(
-            AIProviderMetric.request_timestamp >= cutoff
+            AIProviderMetric.request_timestamp >= cutoff,
+            AIProviderMetric.cache_hit.isnot(True)
         ).scalar()
 
         fallback_requests = self.db.query(func.count(AIProviderMetric.id)).filter(
             and_(
                 AIProviderMetric.request_timestamp >= cutoff,
+                AIProviderMetric.cache_hit.isnot(True),
                 AIProviderMetric.was_fallback == True
             )
         ).scalar()
@@ -415,6 +548,7 @@ class ProviderMetricsService:
         ).filter(
             and_(
                 AIProviderMetric.request_timestamp >= cutoff,
+                AIProviderMetric.cache_hit.isnot(True),
                 AIProviderMetric.was_fallback == True
             )
         ).group_by(
@@ -11,14 +11,15 @@ import asyncio
 import hashlib
 import httpx
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from backend.database.models import PDF, Image, Chapter
+from backend.database.models import Image, Chapter
 from backend.services.ai_provider_service import AIProviderService
 from backend.services.cache_service import CacheService
 from backend.services.chapter_vector_search_service import ChapterVectorSearchService
+from backend.services.embedding_service import aggregate_chunk_hits
 from backend.config import settings
 from backend.utils import get_logger
 
@@ -132,150 +133,214 @@ class ResearchService:
         min_relevance: float = 0.7
     ) -> List[Dict[str, Any]]:
         """
-        Execute multiple internal research queries in parallel
+        Execute multiple internal research queries as one batched retrieval
 
-        Phase 2 Enhancement: Parallel execution provides 60-70% speedup
-        Performance: 5 queries × 2s = 10s (sequential) → 3s (parallel)
-
-        Optimization: Fetches PDFs once and shares across all queries to reduce
-        database connection pool contention.
+        All query embeddings come from a single embedding request. Scoring is
+        pushed into the database: one statement returns the vector top-k PDF
+        chunks for every query (ranked per PDF), a second the top-k textbook
+        chunks (collapsed to their chapters). Only the columns needed for the source dicts are projected;
+        extracted text is never loaded.
 
         Args:
-            queries: List of search queries to execute in parallel
+            queries: List of search queries
             max_results_per_query: Maximum results per individual query
-            min_relevance: Minimum relevance score threshold
+            min_relevance: Minimum cosine similarity (0-1)
 
         Returns:
             Combined list of all research results from all queries
         """
-        logger.info(f"Parallel internal research: {len(queries)} queries")
-
-        # Optimization: Fetch PDFs once to avoid redundant database queries
-        # This reduces connection pool usage from N queries to 1 query
-        pdfs = await asyncio.to_thread(
-            lambda: self.db.query(PDF).filter(
-                PDF.text_extracted == True
-            ).all()
-        )
+        if not queries:
+            return []
 
-        # Create tasks for parallel execution using pre-fetched PDFs
-        tasks = [
-            self._process_query_with_pdfs(query, pdfs, max_results_per_query, min_relevance)
-            for query in queries
-        ]
+        logger.info(f"Batched internal research: {len(queries)} queries")
+
+        try:
+            embedding_result = await self.ai_service.generate_embeddings_batch(queries)
+        except Exception as e:
+            logger.error(f"Query embedding failed: {str(e)}", exc_info=True)
+            return []
 
-        # Execute all queries concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        vectors = [self._vector_literal(embedding) for embedding in embedding_result["embeddings"]]
 
-        # Flatten results and handle exceptions
-        all_sources = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning(f"Query '{queries[i]}' failed: {result}")
+        try:
+            # Runs on the event loop thread: the session is shared with
+            # concurrently scheduled orchestrator stages and is not thread-safe
+            pdf_rows, chunk_rows = self._fetch_internal_candidates(
+                vectors,
+                max_results_per_query,
+                min_relevance
+            )
+        except Exception as e:
+            logger.error(f"Batched internal retrieval failed: {str(e)}", exc_info=True)
+            return []
+
+        per_query: Dict[int, List[Dict[str, Any]]] = {i: [] for i in range(len(queries))}
+
+        for row in pdf_rows:
+            per_query[row.query_index - 1].append({
+                "pdf_id": str(row.id),
+                "title": row.title or row.filename,
+                "authors": row.authors or [],
+                "year": row.publication_year,
+                "journal": row.journal,
+                "doi": row.doi,
+                "pmid": row.pmid,
+                "relevance_score": float(row.similarity),
+                "total_pages": row.total_pages,
+                "total_words": row.total_words,
+                "file_path": row.file_path,
+                "content_preview": row.chunk_preview or ""
+            })
+
+        # Best chunk per chapter, per query
+        seen_chapters = set()
+        for row in chunk_rows:
+            key = (row.query_index, row.chapter_id)
+            if key in seen_chapters:
                 continue
-            all_sources.extend(result)
+            seen_chapters.add(key)
+            per_query[row.query_index - 1].append({
+                "chapter_id": str(row.chapter_id),
+                "title": row.chapter_title,
+                "book_title": row.book_title or "Standalone Chapter",
+                "authors": row.book_authors or [],
+                "year": row.publication_year,
+                "relevance_score": float(row.similarity),
+                "content_preview": row.chunk_preview or "",
+                "preceding_heading": row.preceding_heading,
+                "source_type": row.source_type
+            })
 
-        logger.info(f"Parallel research completed: {len(all_sources)} total sources from {len(queries)} queries")
+        all_sources = []
+        for results in per_query.values():
+            results.sort(key=lambda x: x["relevance_score"], reverse=True)
+            all_sources.extend(results[:max_results_per_query])
 
-        return all_sources
+        logger.info(
+            f"Batched research completed: {len(all_sources)} total sources from {len(queries)} queries"
+        )
 
-    def _calculate_text_relevance(self, query: str, pdf: PDF) -> float:
-        """
-        Calculate simple text-based relevance score
+        return all_sources
 
-        Args:
-            query: Search query
-            pdf: PDF object
+    @staticmethod
+    def _vector_literal(embedding: List[float]) -> str:
+        """pgvector text literal for a query embedding"""
+        return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
 
-        Returns:
-            Relevance score (0-1)
-        """
-        query_lower = query.lower()
-        query_terms = set(query_lower.split())
-
-        score = 0.0
-        max_score = 0.0
-
-        # Title matching (weight: 0.4)
-        if pdf.title:
-            title_lower = pdf.title.lower()
-            title_terms = set(title_lower.split())
-            title_overlap = len(query_terms & title_terms) / len(query_terms) if query_terms else 0
-            score += title_overlap * 0.4
-        max_score += 0.4
-
-        # Authors matching (weight: 0.2)
-        if pdf.authors:
-            authors_text = " ".join(pdf.authors).lower()
-            if any(term in authors_text for term in query_terms):
-                score += 0.2
-        max_score += 0.2
-
-        # Journal matching (weight: 0.2)
-        if pdf.journal:
-            journal_lower = pdf.journal.lower()
-            if any(term in journal_lower for term in query_terms):
-                score += 0.2
-        max_score += 0.2
-
-        # Filename matching (weight: 0.2)
-        filename_lower = pdf.filename.lower()
-        if any(term in filename_lower for term in query_terms):
-            score += 0.2
-        max_score += 0.2
-
-        return score / max_score if max_score > 0 else 0.0
-
-    async def _process_query_with_pdfs(
+    def _fetch_internal_candidates(
         self,
-        query: str,
-        pdfs: List[PDF],
-        max_results: int,
+        vectors: List[str],
+        limit: int,
         min_relevance: float
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[List[Any], List[Any]]:
         """
-        Process a single query with pre-fetched PDFs (for parallel optimization)
-
-        This avoids redundant database queries when processing multiple queries.
+        Vector top-k for every query vector in two statements (PDF chunks,
+        chapter chunks)
 
-        Args:
-            query: Search query
-            pdfs: Pre-fetched list of PDF objects
-            max_results: Maximum number of results
-            min_relevance: Minimum relevance score threshold
+        The LATERAL subqueries order by distance with a LIMIT so each one is
+        served by the partial HNSW index of its parent type; the relevance
+        threshold is applied outside. PDF chunk hits are ranked per PDF the
+        way EmbeddingService.search_pdfs_by_chunks ranks them.
 
         Returns:
-            List of relevant PDFs with metadata and relevance scores
+            (best chunk row of each of the top `limit` PDFs per query, chapter chunk rows)
         """
-        # Generate query embedding
-        embedding_result = await self.ai_service.generate_embedding(query)
-        query_embedding = embedding_result["embedding"]
-
-        results = []
-
-        for pdf in pdfs[:max_results]:
-            # Calculate relevance using text matching
-            relevance = self._calculate_text_relevance(query, pdf)
-
-            if relevance >= min_relevance:
-                results.append({
-                    "pdf_id": str(pdf.id),
-                    "title": pdf.title or pdf.filename,
-                    "authors": pdf.authors or [],
-                    "year": pdf.publication_year,
-                    "journal": pdf.journal,
-                    "doi": pdf.doi,
-                    "pmid": pdf.pmid,
-                    "relevance_score": relevance,
-                    "total_pages": pdf.total_pages,
-                    "total_words": pdf.total_words,
-                    "file_path": pdf.file_path
-                })
+        pdf_chunk_limit = limit * settings.PDF_CHUNK_CANDIDATES_PER_RESULT
+        # Candidate list size of the HNSW scans; must cover the requested hits
+        ef_search = max(settings.PDF_CHUNK_HNSW_EF_SEARCH, pdf_chunk_limit, limit * 3)
+        self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+
+        pdf_chunk_rows = self.db.execute(text("""
+            WITH q AS (
+                SELECT ord AS query_index, CAST(vec AS vector) AS embedding
+                FROM unnest(CAST(:vectors AS text[])) WITH ORDINALITY AS t(vec, ord)
+            )
+            SELECT
+                q.query_index,
+                k.chunk_index,
+                k.chunk_preview,
+                k.similarity,
+                p.id, p.filename, p.title, p.authors, p.publication_year, p.journal,
+                p.doi, p.pmid, p.total_pages, p.total_words, p.file_path
+            FROM q
+            CROSS JOIN LATERAL (
+                SELECT
+                    pdf_id,
+                    chunk_index,
+                    LEFT(chunk_text, 500) AS chunk_preview,
+                    1 - (embedding <=> q.embedding) AS similarity
+                FROM pdf_chunks
+                WHERE pdf_id IS NOT NULL
+                  AND embedding IS NOT NULL
+                ORDER BY embedding <=> q.embedding
+                LIMIT :pdf_chunk_limit
+            ) k
+            JOIN pdfs p ON p.id = k.pdf_id
+            WHERE k.similarity >= :min_relevance
+        """), {
+            "vectors": vectors,
+            "pdf_chunk_limit": pdf_chunk_limit,
+            "min_relevance": min_relevance
+        }).fetchall()
+
+        hits_per_query: Dict[int, List[Dict[str, Any]]] = {}
+        for row in pdf_chunk_rows:
+            hits_per_query.setdefault(row.query_index, []).append({
+                "parent_id": str(row.id),
+                "chunk_index": row.chunk_index,
+                "chunk_text": row.chunk_preview,
+                "similarity": float(row.similarity),
+                "row": row
+            })
 
-        # Sort by relevance
-        results.sort(key=lambda x: x["relevance_score"], reverse=True)
+        pdf_rows = [
+            match["best_chunk"]["row"]
+            for hits in hits_per_query.values()
+            for match in aggregate_chunk_hits(
+                hits,
+                method=settings.PDF_CHUNK_AGGREGATION,
+                top_k=settings.PDF_CHUNK_AGGREGATION_TOP_K
+            )[:limit]
+        ]
 
-        return results
+        # Over-fetch chunks: several may belong to the same chapter
+        chunk_rows = self.db.execute(text("""
+            WITH q AS (
+                SELECT ord AS query_index, CAST(vec AS vector) AS embedding
+                FROM unnest(CAST(:vectors AS text[])) WITH ORDINALITY AS t(vec, ord)
+            )
+            SELECT
+                q.query_index,
+                k.chapter_id,
+                k.similarity,
+                k.chunk_preview,
+                k.preceding_heading,
+                c.chapter_title,
+                c.source_type,
+                b.title AS book_title,
+                b.authors AS book_authors,
+                b.publication_year
+            FROM q
+            CROSS JOIN LATERAL (
+                SELECT
+                    chapter_id,
+                    LEFT(chunk_text, 500) AS chunk_preview,
+                    preceding_heading,
+                    1 - (embedding <=> q.embedding) AS similarity
+                FROM pdf_chunks
+                WHERE chapter_id IS NOT NULL
+                  AND embedding IS NOT NULL
+                ORDER BY embedding <=> q.embedding
+                LIMIT :chunk_limit
+            ) k
+            JOIN pdf_chapters c ON c.id = k.chapter_id
+            LEFT JOIN pdf_books b ON b.id = c.book_id
+            WHERE k.similarity >= :min_relevance
+              AND c.is_duplicate = FALSE
+            ORDER BY q.query_index, k.similarity DESC
+        """), {"vectors": vectors, "chunk_limit": limit * 3, "min_relevance": min_relevance}).fetchall()
+
+        return pdf_rows, chunk_rows
 
     def _generate_pubmed_cache_key(
         self,
@@ -910,12 +975,11 @@ class ResearchService:
         # For now, return images from indexed PDFs
         # In production, use vector similarity on image embeddings
 
-        # Wrap synchronous DB query in thread pool to avoid blocking event loop
-        images = await asyncio.to_thread(
-            lambda: self.db.query(Image).filter(
-                Image.ai_description.isnot(None)
-            ).limit(max_results).all()
-        )
+        # Runs on the event loop thread: the session is shared with
+        # concurrently scheduled orchestrator stages and is not thread-safe
+        images = self.db.query(Image).filter(
+            Image.ai_description.isnot(None)
+        ).limit(max_results).all()
 
         results = []
         for img in images:
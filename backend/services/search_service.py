@@ -350,48 +350,30 @@ class SearchService:
         max_results: int
     ) -> List[Dict[str, Any]]:
         """
-        Semantic search in PDFs using vector similarity
+        Semantic search in PDFs using chunk-level vector similarity
         """
-        # Build SQL query for vector similarity
-        sql = text("""
-            SELECT
-                id,
-                title,
-                authors,
-                year,
-                journal,
-                extracted_text,
-                created_at,
-                1 - (embedding <=> :query_embedding) as similarity
-            FROM pdfs
-            WHERE embedding IS NOT NULL
-              AND extraction_status = 'completed'
-              AND 1 - (embedding <=> :query_embedding) >= :min_similarity
-            ORDER BY embedding <=> :query_embedding
-            LIMIT :max_results
-        """)
-
-        result = self.db.execute(
-            sql,
-            {
-                "query_embedding": query_embedding,
-                "min_similarity": 0.6,  # Minimum similarity threshold
-                "max_results": max_results
-            }
+        matches = self.embedding_service.search_pdfs_by_chunks(
+            query_embedding,
+            max_results,
+            min_similarity=0.6  # Minimum similarity threshold
         )
+        pdfs_by_id = self.embedding_service.load_pdfs([m["parent_id"] for m in matches])
 
         results = []
-        for row in result:
+        for match in matches:
+            pdf = pdfs_by_id.get(match["parent_id"])
+            if not pdf:
+                continue
             results.append({
-                "id": str(row.id),
+                "id": match["parent_id"],
                 "type": "pdf",
-                "title": row.title,
-                "authors": row.authors,
-                "year": row.year,
-                "journal": row.journal,
-                "created_at": row.created_at.isoformat() if row.created_at else None,
-                "similarity": float(row.similarity),
-                "excerpt": self._extract_excerpt_first_n(row.extracted_text, 200)
+                "title": pdf.title,
+                "authors": pdf.authors,
+                "year": pdf.publication_year,
+                "journal": pdf.journal,
+                "created_at": pdf.created_at.isoformat() if pdf.created_at else None,
+                "similarity": match["similarity"],
+                "excerpt": self._extract_excerpt_first_n(match["best_chunk"]["chunk_text"], 200)
             })
 
         return results
@@ -594,7 +576,7 @@ class SearchService:
 
         Args:
             content_id: ID of content item
-            content_type: "chapter" or "pdf"
+            content_type: "chapter", "pdf" or "pdf_chapter"
             max_results: Maximum number of related items
 
         Returns:
@@ -602,6 +584,10 @@ class SearchService:
         """
         logger.info(f"Finding related content for {content_type}:{content_id}")
 
+        # Textbook chapters read their precomputed neighbor list
+        if content_type == "pdf_chapter":
+            return await self._find_related_pdf_chapters(content_id, max_results)
+
         # Get source embedding
         if content_type == "chapter":
             source = self.db.query(Chapter).filter(Chapter.id == content_id).first()
@@ -667,6 +653,47 @@ class SearchService:
 
         return related
 
+    async def _find_related_pdf_chapters(
+        self,
+        chapter_id: str,
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """Find related textbook chapters from the materialized neighbor table"""
+        sql = text("""
+            SELECT
+                c.id,
+                c.chapter_title,
+                c.book_id,
+                c.word_count,
+                n.cosine_similarity as similarity
+            FROM pdf_chapter_neighbors n
+            JOIN pdf_chapters c ON c.id = n.neighbor_id
+            WHERE n.chapter_id = :chapter_id
+            ORDER BY n.rank
+            LIMIT :max_results
+        """)
+
+        result = self.db.execute(
+            sql,
+            {
+                "chapter_id": chapter_id,
+                "max_results": max_results
+            }
+        )
+
+        related = []
+        for row in result:
+            related.append({
+                "id": str(row.id),
+                "type": "pdf_chapter",
+                "title": row.chapter_title,
+                "book_id": str(row.book_id) if row.book_id else None,
+                "word_count": row.word_count,
+                "similarity": float(row.similarity)
+            })
+
+        return related
+
     async def _find_related_pdfs(
         self,
         embedding: List[float],
@@ -0,0 +1,54 @@
+"""
+Section Artifacts - Dirty tracking for per-section derived artifacts
+Records which version of a section each downstream artifact was computed from
+
+Stages 7-11 derive artifacts from each section's text: placed images (and
+the section embeddings used to place them), linked citations, fact-check
+claims and normalized formatting. When an artifact is computed for a section
+the section's current fingerprint is stored under
+section["artifact_fingerprints"][artifact]. After a section is regenerated
+or edited, only the artifacts whose stored fingerprint no longer matches
+need recomputing - for that section alone.
+
+The fingerprint ignores whitespace so the formatting stage's normalization
+does not dirty artifacts computed before it.
+"""
+
+from typing import Any, Dict, List
+
+from backend.services.stage_checkpoint import content_hash
+
+# Per-section artifacts, in the order they are refreshed
+SECTION_ARTIFACTS = ("formatting", "citations", "images", "embedding", "fact_check")
+
+
+def _text(value: Any) -> str:
+    return " ".join(str(value or "").split())
+
+
+def section_fingerprint(section: Dict[str, Any]) -> str:
+    """Hash of a section's title and text, including its subsections"""
+    return content_hash({
+        "title": _text(section.get("title")),
+        "content": _text(section.get("content")),
+        "subsections": [
+            {"title": _text(sub.get("title")), "content": _text(sub.get("content"))}
+            for sub in section.get("subsections") or []
+        ]
+    })
+
+
+def mark_clean(section: Dict[str, Any], *artifacts: str) -> None:
+    """Record that artifacts were computed from the section's current text"""
+    fingerprint = section_fingerprint(section)
+    fingerprints = dict(section.get("artifact_fingerprints") or {})
+    for artifact in artifacts:
+        fingerprints[artifact] = fingerprint
+    section["artifact_fingerprints"] = fingerprints
+
+
+def dirty_artifacts(section: Dict[str, Any]) -> List[str]:
+    """Artifacts computed from an older version of the section (or never)"""
+    fingerprint = section_fingerprint(section)
+    fingerprints = section.get("artifact_fingerprints") or {}
+    return [artifact for artifact in SECTION_ARTIFACTS if fingerprints.get(artifact) != fingerprint]
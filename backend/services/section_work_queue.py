@@ -0,0 +1,184 @@
+"""
+Sliding-Window Work Queue - Bounded concurrent execution with adaptive limits
+Keeps N jobs in flight at all times instead of awaiting fixed-size batches
+
+Used by ChapterOrchestrator for section generation:
+- A finished job frees its slot immediately (no batch barrier)
+- Results are returned in input order
+- Failed jobs are retried with exponential backoff (slot released while waiting)
+- The concurrency limit adapts (AIMD) to provider latency and 429 responses
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an exception signals provider throttling
+
+    Provider SDK errors carry status_code=429; AIProviderService collapses
+    provider failures into a generic exception, so the message is checked too
+    (an open circuit breaker is treated as throttling as well).
+    """
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "circuit breaker" in message
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit that grows additively while the provider is healthy and
+    shrinks multiplicatively on throttling or latency above target (AIMD)
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 10,
+        latency_target: float = 45.0,
+        decrease_factor: float = 0.5
+    ):
+        """
+        Args:
+            initial: Starting number of concurrent jobs
+            minimum: Lower bound on the limit
+            maximum: Upper bound on the limit
+            latency_target: Per-job latency (seconds) above which the limit shrinks
+            decrease_factor: Multiplier applied to the limit on a 429
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self.peak_in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self._condition = asyncio.Condition()
+
+    @property
+    def slots(self) -> int:
+        return max(self.minimum, int(self.limit))
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.slots)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self, latency: float) -> None:
+        self.successes += 1
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+        if latency > self.latency_target:
+            self.limit = max(self.minimum, self.limit * 0.9)
+        else:
+            # Additive increase: about +1 per window of successful jobs
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def record_rate_limit(self) -> None:
+        self.rate_limited += 1
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "final_limit": self.slots,
+            "peak_in_flight": self.peak_in_flight,
+            "successes": self.successes,
+            "rate_limited": self.rate_limited,
+            "latency_ewma_s": round(self.latency_ewma, 3) if self.latency_ewma is not None else None
+        }
+
+
+class SlidingWindowExecutor:
+    """
+    Runs one async job per item with at most `limiter.slots` in flight
+
+    Job results (or the final exception, like gather(return_exceptions=True))
+    are returned in item order. `on_complete(index, result)` is awaited as
+    each job finishes, in completion order.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        max_attempts: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 30.0
+    ):
+        self.limiter = limiter
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given (0-indexed) failed attempt"""
+        delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        return delay * random.uniform(0.5, 1.5)
+
+    async def run(
+        self,
+        items: Sequence[Any],
+        job: Callable[[int, Any], Awaitable[Any]],
+        on_complete: Optional[Callable[[int, Any], Awaitable[None]]] = None
+    ) -> List[Any]:
+        results: List[Any] = [None] * len(items)
+
+        async def run_item(index: int, item: Any) -> None:
+            results[index] = await self._run_with_retry(index, item, job)
+            if on_complete:
+                await on_complete(index, results[index])
+
+        await asyncio.gather(*(run_item(index, item) for index, item in enumerate(items)))
+        return results
+
+    async def _run_with_retry(
+        self,
+        index: int,
+        item: Any,
+        job: Callable[[int, Any], Awaitable[Any]]
+    ) -> Any:
+        for attempt in range(self.max_attempts):
+            await self.limiter.acquire()
+            started = time.perf_counter()
+            try:
+                result = await job(index, item)
+            except Exception as e:
+                error = e
+            else:
+                self.limiter.record_success(time.perf_counter() - started)
+                return result
+            finally:
+                await self.limiter.release()
+
+            if is_rate_limit_error(error):
+                self.limiter.record_rate_limit()
+
+            if attempt == self.max_attempts - 1:
+                return error
+
+            delay = self.backoff_delay(attempt)
+            self.retries += 1
+            logger.warning(
+                f"Job {index + 1} attempt {attempt + 1}/{self.max_attempts} failed: {str(error)[:200]}. "
+                f"Retrying in {delay:.1f}s (concurrency limit {self.limiter.slots})"
+            )
+            await asyncio.sleep(delay)
@@ -4,13 +4,17 @@ Handles content similarity detection, duplicate finding, and plagiarism checking
 """
 
 from typing import Dict, List, Optional, Any, Tuple
+from collections import defaultdict
 from datetime import datetime, timedelta
+import json
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func
 import numpy as np
 from difflib import SequenceMatcher
 import re
 
+from backend.config import settings
+from backend.services.minhash_lsh import MinHasher, band_hashes, jaccard, shingle
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
@@ -31,6 +35,13 @@ class SimilarityService:
 
     def __init__(self, db: Session):
         self.db = db
+        self.minhasher = MinHasher(
+            num_perm=settings.MINHASH_NUM_PERM,
+            seed=settings.MINHASH_SEED
+        )
+        self.lsh_bands = settings.MINHASH_LSH_BANDS
+        self.lsh_rows = settings.MINHASH_NUM_PERM // settings.MINHASH_LSH_BANDS
+        self.shingle_size = settings.MINHASH_SHINGLE_SIZE
 
     # ==================== Main Similarity Methods ====================
 
@@ -88,50 +99,76 @@ class SimilarityService:
         """
         Detect duplicate or near-duplicate content
 
+        Uses MinHash-LSH buckets to generate candidate pairs, then verifies
+        each candidate with exact shingle Jaccard similarity against the
+        Jaccard-scale MINHASH_DUPLICATE_JACCARD / MINHASH_NEAR_DUPLICATE_JACCARD
+        thresholds. Signatures for new or changed content are (re)computed
+        first, so cost grows with the amount of new content plus the number
+        of candidate pairs.
+
         Args:
             content_type: Type of content to check (chapter, pdf)
             strict: If True, use strict matching; if False, find near-duplicates
-            batch_size: Number of items to process at once
+            batch_size: Number of items to (re)index / fetch per query
 
         Returns:
             List of duplicate groups with similarity scores
         """
         try:
-            threshold = 0.95 if strict else 0.80
+            exact_threshold = settings.MINHASH_DUPLICATE_JACCARD
+            threshold = exact_threshold if strict else settings.MINHASH_NEAR_DUPLICATE_JACCARD
 
-            # Get all content items
-            content_items = self._get_all_content(content_type, batch_size)
+            self.refresh_signatures(content_type, batch_size=batch_size)
 
-            duplicate_groups = []
+            candidate_pairs = self._get_lsh_candidate_pairs(content_type)
+            if not candidate_pairs:
+                logger.info(f"Found 0 duplicate groups for {content_type}")
+                return []
+
+            candidate_ids = sorted({cid for pair in candidate_pairs for cid in pair})
+            contents = self._get_contents_by_ids(content_type, candidate_ids, batch_size)
 
-            # Check each pair for similarity
-            for i, item1 in enumerate(content_items):
-                for item2 in content_items[i+1:]:
-                    similarity = self.calculate_similarity(
-                        content_type_a=content_type,
-                        content_id_a=item1['id'],
-                        content_type_b=content_type,
-                        content_id_b=item2['id'],
-                        method='hybrid'
+            shingle_cache: Dict[str, set] = {}
+
+            def shingles_for(content_id: str) -> set:
+                if content_id not in shingle_cache:
+                    shingle_cache[content_id] = shingle(
+                        contents[content_id].get('text') or '', self.shingle_size
                     )
+                return shingle_cache[content_id]
+
+            duplicate_groups = []
+
+            for id_a, id_b in candidate_pairs:
+                if id_a not in contents or id_b not in contents:
+                    continue
+
+                similarity = jaccard(shingles_for(id_a), shingles_for(id_b))
+
+                if similarity >= threshold:
+                    item1 = contents[id_a]
+                    item2 = contents[id_b]
+                    duplicate_groups.append({
+                        'content_a': {
+                            'id': item1['id'],
+                            'title': item1['title'],
+                            'created_at': item1['created_at']
+                        },
+                        'content_b': {
+                            'id': item2['id'],
+                            'title': item2['title'],
+                            'created_at': item2['created_at']
+                        },
+                        'similarity_score': similarity,
+                        'is_exact_duplicate': similarity >= exact_threshold
+                    })
+
+            duplicate_groups.sort(key=lambda x: x['similarity_score'], reverse=True)
 
-                    if similarity and similarity >= threshold:
-                        duplicate_groups.append({
-                            'content_a': {
-                                'id': item1['id'],
-                                'title': item1['title'],
-                                'created_at': item1['created_at']
-                            },
-                            'content_b': {
-                                'id': item2['id'],
-                                'title': item2['title'],
-                                'created_at': item2['created_at']
-                            },
-                            'similarity_score': similarity,
-                            'is_exact_duplicate': similarity >= 0.95
-                        })
-
-            logger.info(f"Found {len(duplicate_groups)} duplicate groups for {content_type}")
+            logger.info(
+                f"Found {len(duplicate_groups)} duplicate groups for {content_type} "
+                f"({len(candidate_pairs)} LSH candidate pairs verified)"
+            )
             return duplicate_groups
 
         except Exception as e:
@@ -163,7 +200,8 @@ class SimilarityService:
             # Check cache first
             cached = self._get_cached_similarity(
                 content_type_a, content_id_a,
-                content_type_b, content_id_b
+                content_type_b, content_id_b,
+                method
             )
             if cached is not None:
                 return cached
@@ -212,6 +250,79 @@ class SimilarityService:
             logger.error(f"Similarity calculation failed: {str(e)}", exc_info=True)
             return None
 
+    def calculate_similarities_batch(
+        self,
+        pairs: List[Tuple[str, str, str, str]],
+        method: str = 'vector',
+        use_cache: bool = True
+    ) -> Dict[Tuple[str, str, str, str], Optional[float]]:
+        """
+        Calculate similarity for many content pairs at once
+
+        Embeddings (and texts for text/hybrid) are fetched with one bulk
+        query per content type, scores are computed in NumPy, and new
+        scores are written back to the cache in a single statement.
+
+        Args:
+            pairs: (content_type_a, content_id_a, content_type_b, content_id_b) tuples
+            method: Similarity method (vector, text, hybrid)
+            use_cache: Read cached scores and cache newly computed ones
+
+        Returns:
+            Dict mapping each input pair to its score (None if unavailable)
+        """
+        results: Dict[Tuple[str, str, str, str], Optional[float]] = {}
+        if not pairs:
+            return results
+
+        if method not in ('vector', 'text', 'hybrid'):
+            logger.warning(f"Unknown method: {method}")
+            return {pair: None for pair in pairs}
+
+        try:
+            pending = list(dict.fromkeys(pairs))
+
+            if use_cache:
+                cached = self._get_cached_similarities(pending, method)
+                results.update(cached)
+                pending = [pair for pair in pending if pair not in cached]
+
+            if not pending:
+                return results
+
+            vector_scores = (
+                self._vector_similarities(pending) if method in ('vector', 'hybrid') else {}
+            )
+            text_scores = (
+                self._text_similarities(pending) if method in ('text', 'hybrid') else {}
+            )
+
+            to_cache = []
+            for pair in pending:
+                vector_sim = vector_scores.get(pair)
+                text_sim = text_scores.get(pair)
+
+                if method == 'hybrid' and vector_sim is not None and text_sim is not None:
+                    # Weighted average: 70% vector, 30% text
+                    similarity = vector_sim * 0.7 + text_sim * 0.3
+                elif method == 'text':
+                    similarity = text_sim
+                else:
+                    similarity = vector_sim if vector_sim is not None else text_sim
+
+                results[pair] = similarity
+                if similarity is not None:
+                    to_cache.append((*pair, similarity))
+
+            if use_cache and to_cache:
+                self._cache_similarities(to_cache, method)
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Batch similarity calculation failed: {str(e)}", exc_info=True)
+            return {pair: results.get(pair) for pair in pairs}
+
     # ==================== Vector-Based Similarity ====================
 
     def _find_similar_by_vector(
@@ -246,15 +357,26 @@ class SimilarityService:
                 'threshold': threshold
             })
 
+            rows = [(row[0], str(row[1]), float(row[2])) for row in result]
+
+            # Resolve details with one query per content type
+            ids_by_type: Dict[str, List[str]] = defaultdict(list)
+            for similar_type, similar_id, _ in rows:
+                ids_by_type[similar_type].append(similar_id)
+            details_by_type = {
+                similar_type: self._get_contents_details(similar_type, ids)
+                for similar_type, ids in ids_by_type.items()
+            }
+
             similar = []
-            for row in result:
-                details = self._get_content_details(row[0], str(row[1]))
+            for similar_type, similar_id, score in rows:
+                details = details_by_type[similar_type].get(similar_id)
                 if details:
                     similar.append({
-                        'id': str(row[1]),
-                        'type': row[0],
+                        'id': similar_id,
+                        'type': similar_type,
                         'title': details['title'],
-                        'similarity_score': float(row[2]),
+                        'similarity_score': score,
                         'method': 'vector',
                         'created_at': details.get('created_at')
                     })
@@ -275,30 +397,110 @@ class SimilarityService:
         """
         Calculate cosine similarity between vector embeddings
         """
+        pair = (content_type_a, content_id_a, content_type_b, content_id_b)
+        return self._vector_similarities([pair]).get(pair)
+
+    def _vector_similarities(
+        self,
+        pairs: List[Tuple[str, str, str, str]]
+    ) -> Dict[Tuple[str, str, str, str], float]:
+        """
+        Cosine similarity for many pairs from one bulk embedding fetch per type
+
+        Pairs with a missing embedding are omitted from the result.
+        """
         try:
-            # Get embeddings for both content items
-            embedding_a = self._get_content_embedding(content_type_a, content_id_a)
-            embedding_b = self._get_content_embedding(content_type_b, content_id_b)
+            embeddings = self._get_embeddings_for_pairs(pairs)
 
-            if embedding_a is None or embedding_b is None:
-                return None
+            scorable = [
+                pair for pair in pairs
+                if (pair[0], pair[1]) in embeddings and (pair[2], pair[3]) in embeddings
+            ]
+            if not scorable:
+                return {}
 
-            # Calculate cosine similarity using PostgreSQL vector operations
-            query = text("""
-                SELECT 1 - (:embedding_a::vector <=> :embedding_b::vector) as similarity
-            """)
+            matrix_a = np.stack([embeddings[(p[0], p[1])] for p in scorable])
+            matrix_b = np.stack([embeddings[(p[2], p[3])] for p in scorable])
 
-            result = self.db.execute(query, {
-                'embedding_a': str(embedding_a),
-                'embedding_b': str(embedding_b)
-            })
+            # Embeddings are L2-normalized on load, so row-wise dot = cosine
+            similarities = np.einsum('ij,ij->i', matrix_a, matrix_b)
 
-            row = result.fetchone()
-            return float(row[0]) if row else None
+            return {
+                pair: float(score)
+                for pair, score in zip(scorable, similarities)
+            }
 
         except Exception as e:
             logger.error(f"Vector similarity calculation failed: {str(e)}", exc_info=True)
-            return None
+            return {}
+
+    def _get_embeddings_for_pairs(
+        self,
+        pairs: List[Tuple[str, str, str, str]]
+    ) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Fetch and L2-normalize all embeddings referenced by the pairs
+        """
+        ids_by_type: Dict[str, set] = defaultdict(set)
+        for type_a, id_a, type_b, id_b in pairs:
+            ids_by_type[type_a].add(id_a)
+            ids_by_type[type_b].add(id_b)
+
+        embeddings = {}
+        for content_type, ids in ids_by_type.items():
+            for content_id, vector in self._get_content_embeddings(content_type, list(ids)).items():
+                norm = np.linalg.norm(vector)
+                if norm > 0:
+                    embeddings[(content_type, content_id)] = vector / norm
+        return embeddings
+
+    def _get_content_embeddings(
+        self,
+        content_type: str,
+        content_ids: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get vector embeddings for many content items in one query
+        """
+        try:
+            if content_type == 'chapter':
+                query = text("""
+                    SELECT DISTINCT ON (chapter_id) chapter_id, embedding
+                    FROM chapter_embeddings
+                    WHERE chapter_id = ANY(CAST(:content_ids AS UUID[]))
+                """)
+            elif content_type == 'pdf':
+                query = text("""
+                    SELECT DISTINCT ON (pdf_id) pdf_id, embedding
+                    FROM pdf_embeddings
+                    WHERE pdf_id = ANY(CAST(:content_ids AS UUID[]))
+                """)
+            else:
+                return {}
+
+            result = self.db.execute(query, {'content_ids': list(content_ids)})
+
+            embeddings = {}
+            for row in result:
+                if row[1] is not None:
+                    embeddings[str(row[0])] = self._parse_embedding(row[1])
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"Failed to get embeddings: {str(e)}", exc_info=True)
+            return {}
+
+    @staticmethod
+    def _parse_embedding(value: Any) -> np.ndarray:
+        """
+        Convert a pgvector value to float32 array
+
+        Raw text() queries return the '[0.1,0.2,...]' literal unless the
+        pgvector adapter is registered on the connection.
+        """
+        if isinstance(value, str):
+            return np.asarray(json.loads(value), dtype=np.float32)
+        return np.asarray(value, dtype=np.float32)
 
     def _get_content_embedding(
         self,
@@ -350,7 +552,10 @@ class SimilarityService:
         limit: int
     ) -> List[Dict[str, Any]]:
         """
-        Find similar content using text comparison (Levenshtein, n-grams)
+        Find similar content using text comparison
+
+        Candidates come from the LSH buckets of the source signature and are
+        verified with exact shingle Jaccard similarity.
         """
         try:
             # Get source content text
@@ -358,20 +563,31 @@ class SimilarityService:
             if not source_text:
                 return []
 
-            # Get all other content for comparison
-            all_content = self._get_all_content(content_type, limit * 3)
+            source_shingles = shingle(source_text, self.shingle_size)
+            signature = self.minhasher.signature(source_shingles)
 
-            similar = []
-            for content in all_content:
-                if content['id'] == content_id:
-                    continue
+            # Keep the store current for the source item itself
+            if not self._has_signature(content_type, content_id):
+                self._store_signature(content_type, content_id, signature, len(source_shingles))
+                self.db.commit()
+
+            candidate_ids = self._get_lsh_candidates(
+                content_type,
+                band_hashes(signature, self.lsh_bands, self.lsh_rows),
+                exclude_id=content_id
+            )
+            if not candidate_ids:
+                return []
+
+            contents = self._get_contents_by_ids(content_type, candidate_ids)
 
+            similar = []
+            for content in contents.values():
                 target_text = content.get('text', '')
                 if not target_text:
                     continue
 
-                # Calculate text similarity
-                similarity = self._text_similarity_score(source_text, target_text)
+                similarity = jaccard(source_shingles, shingle(target_text, self.shingle_size))
 
                 if similarity >= threshold:
                     similar.append({
@@ -399,7 +615,10 @@ class SimilarityService:
         content_id_b: str
     ) -> Optional[float]:
         """
-        Calculate text similarity using multiple methods
+        Shingle Jaccard similarity of two items
+
+        Same metric as _text_similarities and the LSH text search, so a
+        cached 'text' score does not depend on which path computed it.
         """
         try:
             text_a = self._get_content_text(content_type_a, content_id_a)
@@ -408,12 +627,36 @@ class SimilarityService:
             if not text_a or not text_b:
                 return None
 
-            return self._text_similarity_score(text_a, text_b)
+            return jaccard(shingle(text_a, self.shingle_size), shingle(text_b, self.shingle_size))
 
         except Exception as e:
             logger.error(f"Text similarity calculation failed: {str(e)}", exc_info=True)
             return None
 
+    def _text_similarities(
+        self,
+        pairs: List[Tuple[str, str, str, str]]
+    ) -> Dict[Tuple[str, str, str, str], float]:
+        """
+        Shingle Jaccard similarity for many pairs from one bulk text fetch per type
+        """
+        ids_by_type: Dict[str, set] = defaultdict(set)
+        for type_a, id_a, type_b, id_b in pairs:
+            ids_by_type[type_a].add(id_a)
+            ids_by_type[type_b].add(id_b)
+
+        shingles = {}
+        for content_type, ids in ids_by_type.items():
+            for content_id, content in self._get_contents_by_ids(content_type, list(ids)).items():
+                if content.get('text'):
+                    shingles[(content_type, content_id)] = shingle(content['text'], self.shingle_size)
+
+        return {
+            pair: jaccard(shingles[(pair[0], pair[1])], shingles[(pair[2], pair[3])])
+            for pair in pairs
+            if (pair[0], pair[1]) in shingles and (pair[2], pair[3]) in shingles
+        }
+
     def _text_similarity_score(
         self,
         text1: str,
@@ -502,6 +745,248 @@ class SimilarityService:
         text = re.sub(r'[^\w\s]', '', text)
         return text.strip()
 
+    # ==================== MinHash-LSH Signature Store ====================
+
+    def index_content(
+        self,
+        content_type: str,
+        content_id: str,
+        content_text: Optional[str] = None
+    ) -> bool:
+        """
+        Compute and store the MinHash signature and LSH buckets for one item
+
+        Call when content is created or its text changes. Safe to call
+        repeatedly; existing rows are replaced.
+
+        Args:
+            content_type: Type of content (chapter, pdf)
+            content_id: Content ID
+            content_text: Text to index (fetched from the DB if omitted)
+
+        Returns:
+            True if the signature was stored
+        """
+        try:
+            if content_text is None:
+                content_text = self._get_content_text(content_type, content_id)
+            if not content_text:
+                return False
+
+            shingles = shingle(content_text, self.shingle_size)
+            self._store_signature(
+                content_type, content_id,
+                self.minhasher.signature(shingles), len(shingles)
+            )
+            self.db.commit()
+            return True
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to index content signature: {str(e)}", exc_info=True)
+            return False
+
+    def refresh_signatures(
+        self,
+        content_type: str,
+        batch_size: int = 100
+    ) -> int:
+        """
+        Bring the signature store up to date for a content type
+
+        Only items without a signature, indexed with other signature
+        parameters (num_perm, shingle_size, LSH bands, seed), or modified
+        since they were indexed are shingled. Signatures of deleted items are pruned.
+
+        Returns:
+            Number of items (re)indexed
+        """
+        source = self._signature_source(content_type)
+        if source is None:
+            return 0
+        table, text_column = source
+
+        try:
+            self.db.execute(text(f"""
+                DELETE FROM content_minhash_signatures s
+                WHERE s.content_type = :content_type
+                  AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.id = s.content_id)
+            """), {'content_type': content_type})
+
+            result = self.db.execute(text(f"""
+                SELECT t.id
+                FROM {table} t
+                LEFT JOIN content_minhash_signatures s
+                    ON s.content_type = :content_type AND s.content_id = t.id
+                WHERE t.{text_column} IS NOT NULL
+                  AND (
+                      s.content_id IS NULL
+                      OR s.num_perm != :num_perm
+                      OR s.shingle_size != :shingle_size
+                      OR s.lsh_bands IS DISTINCT FROM :lsh_bands
+                      OR s.seed IS DISTINCT FROM :seed
+                      OR t.updated_at > s.indexed_at
+                  )
+            """), {'content_type': content_type, **self._signature_params()})
+            stale_ids = [str(row[0]) for row in result]
+
+            indexed = 0
+            for start in range(0, len(stale_ids), batch_size):
+                batch_ids = stale_ids[start:start + batch_size]
+                contents = self._get_contents_by_ids(content_type, batch_ids, batch_size)
+
+                for content_id, content in contents.items():
+                    shingles = shingle(content.get('text') or '', self.shingle_size)
+                    self._store_signature(
+                        content_type, content_id,
+                        self.minhasher.signature(shingles), len(shingles)
+                    )
+                    indexed += 1
+
+                self.db.commit()
+
+            if indexed:
+                logger.info(f"Indexed MinHash signatures for {indexed} {content_type} items")
+            return indexed
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to refresh signatures: {str(e)}", exc_info=True)
+            return 0
+
+    def _signature_source(self, content_type: str) -> Optional[Tuple[str, str]]:
+        """Source table and text column for a content type"""
+        if content_type == 'chapter':
+            return 'chapters', 'content'
+        if content_type == 'pdf':
+            return 'pdfs', 'extracted_text'
+        return None
+
+    def _signature_params(self) -> Dict[str, int]:
+        """Parameters a stored signature (and its buckets) was built with"""
+        return {
+            'num_perm': self.minhasher.num_perm,
+            'shingle_size': self.shingle_size,
+            'lsh_bands': self.lsh_bands,
+            'seed': self.minhasher.seed
+        }
+
+    def _has_signature(self, content_type: str, content_id: str) -> bool:
+        """
+        Whether a current signature is stored: built with the current
+        parameters and indexed no earlier than the content's last update
+        """
+        source = self._signature_source(content_type)
+        if source is None:
+            return False
+        table, _ = source
+
+        result = self.db.execute(text(f"""
+            SELECT 1
+            FROM content_minhash_signatures s
+            JOIN {table} t ON t.id = s.content_id
+            WHERE s.content_type = :content_type AND s.content_id = :content_id
+              AND s.num_perm = :num_perm AND s.shingle_size = :shingle_size
+              AND s.lsh_bands = :lsh_bands AND s.seed = :seed
+              AND (t.updated_at IS NULL OR t.updated_at <= s.indexed_at)
+        """), {'content_type': content_type, 'content_id': content_id, **self._signature_params()})
+        return result.fetchone() is not None
+
+    def _store_signature(
+        self,
+        content_type: str,
+        content_id: str,
+        signature: np.ndarray,
+        shingle_count: int
+    ) -> None:
+        """
+        Upsert a signature and replace its LSH bucket rows (caller commits)
+        """
+        self.db.execute(text("""
+            INSERT INTO content_minhash_signatures (
+                content_type, content_id, signature,
+                num_perm, shingle_size, lsh_bands, seed, shingle_count, indexed_at
+            )
+            VALUES (
+                :content_type, :content_id, :signature,
+                :num_perm, :shingle_size, :lsh_bands, :seed, :shingle_count, NOW()
+            )
+            ON CONFLICT (content_type, content_id)
+            DO UPDATE SET
+                signature = EXCLUDED.signature,
+                num_perm = EXCLUDED.num_perm,
+                shingle_size = EXCLUDED.shingle_size,
+                lsh_bands = EXCLUDED.lsh_bands,
+                seed = EXCLUDED.seed,
+                shingle_count = EXCLUDED.shingle_count,
+                indexed_at = NOW()
+        """), {
+            'content_type': content_type,
+            'content_id': content_id,
+            'signature': MinHasher.to_bytes(signature),
+            'shingle_count': shingle_count,
+            **self._signature_params()
+        })
+
+        self.db.execute(text("""
+            DELETE FROM content_lsh_buckets
+            WHERE content_type = :content_type AND content_id = :content_id
+        """), {'content_type': content_type, 'content_id': content_id})
+
+        self.db.execute(text("""
+            INSERT INTO content_lsh_buckets (content_type, content_id, band_index, bucket_hash)
+            VALUES (:content_type, :content_id, :band_index, :bucket_hash)
+        """), [
+            {
+                'content_type': content_type,
+                'content_id': content_id,
+                'band_index': band,
+                'bucket_hash': bucket
+            }
+            for band, bucket in enumerate(band_hashes(signature, self.lsh_bands, self.lsh_rows))
+        ])
+
+    def _get_lsh_candidates(
+        self,
+        content_type: str,
+        bucket_hashes: List[int],
+        exclude_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        Content IDs sharing at least one band bucket with the given hashes
+        """
+        result = self.db.execute(text("""
+            SELECT DISTINCT b.content_id
+            FROM content_lsh_buckets b
+            JOIN unnest(CAST(:band_indexes AS SMALLINT[]), CAST(:bucket_hashes AS BIGINT[]))
+                AS q(band_index, bucket_hash)
+                ON b.band_index = q.band_index AND b.bucket_hash = q.bucket_hash
+            WHERE b.content_type = :content_type
+        """), {
+            'content_type': content_type,
+            'band_indexes': list(range(len(bucket_hashes))),
+            'bucket_hashes': bucket_hashes
+        })
+
+        return [str(row[0]) for row in result if str(row[0]) != exclude_id]
+
+    def _get_lsh_candidate_pairs(self, content_type: str) -> List[Tuple[str, str]]:
+        """
+        All unordered pairs of items colliding in at least one LSH band
+        """
+        result = self.db.execute(text("""
+            SELECT DISTINCT a.content_id, b.content_id
+            FROM content_lsh_buckets a
+            JOIN content_lsh_buckets b
+                ON a.content_type = b.content_type
+               AND a.band_index = b.band_index
+               AND a.bucket_hash = b.bucket_hash
+               AND a.content_id < b.content_id
+            WHERE a.content_type = :content_type
+        """), {'content_type': content_type})
+
+        return [(str(row[0]), str(row[1])) for row in result]
+
     # ==================== Helper Methods ====================
 
     def _get_content_text(
@@ -577,6 +1062,45 @@ class SimilarityService:
             logger.error(f"Failed to get content details: {str(e)}", exc_info=True)
             return None
 
+    def _get_contents_details(
+        self,
+        content_type: str,
+        content_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get content metadata for many items in one query, keyed by ID
+        """
+        try:
+            if content_type == 'chapter':
+                query = text("""
+                    SELECT id, title, created_at
+                    FROM chapters
+                    WHERE id = ANY(CAST(:content_ids AS UUID[]))
+                """)
+            elif content_type == 'pdf':
+                query = text("""
+                    SELECT id, title, upload_date as created_at
+                    FROM pdfs
+                    WHERE id = ANY(CAST(:content_ids AS UUID[]))
+                """)
+            else:
+                return {}
+
+            result = self.db.execute(query, {'content_ids': list(content_ids)})
+
+            return {
+                str(row[0]): {
+                    'id': str(row[0]),
+                    'title': row[1],
+                    'created_at': row[2].isoformat() if row[2] else None
+                }
+                for row in result
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to get content details: {str(e)}", exc_info=True)
+            return {}
+
     def _get_all_content(
         self,
         content_type: str,
@@ -620,6 +1144,50 @@ class SimilarityService:
             logger.error(f"Failed to get all content: {str(e)}", exc_info=True)
             return []
 
+    def _get_contents_by_ids(
+        self,
+        content_type: str,
+        content_ids: List[str],
+        batch_size: int = 500
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get text and metadata for many content items, keyed by ID
+        """
+        try:
+            if content_type == 'chapter':
+                query = text("""
+                    SELECT id, title, content as text, created_at
+                    FROM chapters
+                    WHERE id = ANY(CAST(:content_ids AS UUID[]))
+                """)
+            elif content_type == 'pdf':
+                query = text("""
+                    SELECT id, title, extracted_text as text, upload_date as created_at
+                    FROM pdfs
+                    WHERE id = ANY(CAST(:content_ids AS UUID[]))
+                """)
+            else:
+                return {}
+
+            contents = {}
+            for start in range(0, len(content_ids), batch_size):
+                result = self.db.execute(query, {
+                    'content_ids': list(content_ids[start:start + batch_size])
+                })
+                for row in result:
+                    contents[str(row[0])] = {
+                        'id': str(row[0]),
+                        'title': row[1],
+                        'text': row[2],
+                        'created_at': row[3].isoformat() if row[3] else None
+                    }
+
+            return contents
+
+        except Exception as e:
+            logger.error(f"Failed to get content by ids: {str(e)}", exc_info=True)
+            return {}
+
     def _merge_similarity_results(
         self,
         results: List[Dict[str, Any]],
@@ -660,10 +1228,11 @@ class SimilarityService:
         content_type_a: str,
         content_id_a: str,
         content_type_b: str,
-        content_id_b: str
+        content_id_b: str,
+        method: str
     ) -> Optional[float]:
         """
-        Get cached similarity score
+        Get cached similarity score computed with `method`
         """
         try:
             query = text("""
@@ -676,6 +1245,7 @@ class SimilarityService:
                     (content_type_a = :type_b AND content_id_a = :id_b
                      AND content_type_b = :type_a AND content_id_b = :id_a)
                 )
+                AND similarity_method = :method
                 AND (expires_at IS NULL OR expires_at > NOW())
                 LIMIT 1
             """)
@@ -684,7 +1254,8 @@ class SimilarityService:
                 'type_a': content_type_a,
                 'id_a': content_id_a,
                 'type_b': content_type_b,
-                'id_b': content_id_b
+                'id_b': content_id_b,
+                'method': method
             })
 
             row = result.fetchone()
@@ -694,6 +1265,40 @@ class SimilarityService:
             logger.error(f"Failed to get cached similarity: {str(e)}", exc_info=True)
             return None
 
+    def _get_cached_similarities(
+        self,
+        pairs: List[Tuple[str, str, str, str]],
+        method: str
+    ) -> Dict[Tuple[str, str, str, str], float]:
+        """
+        Get cached similarity scores computed with `method` for many pairs in one query
+
+        Matches cache rows in either orientation, like _get_cached_similarity.
+        """
+        try:
+            ids = sorted({pair[1] for pair in pairs} | {pair[3] for pair in pairs})
+
+            result = self.db.execute(text("""
+                SELECT content_type_a, content_id_a, content_type_b, content_id_b, similarity_score
+                FROM similarity_cache
+                WHERE content_id_a = ANY(CAST(:ids AS UUID[]))
+                  AND content_id_b = ANY(CAST(:ids AS UUID[]))
+                  AND similarity_method = :method
+                  AND (expires_at IS NULL OR expires_at > NOW())
+            """), {'ids': ids, 'method': method})
+
+            cached = {}
+            for row in result:
+                key = (row[0], str(row[1]), row[2], str(row[3]))
+                cached[key] = float(row[4])
+                cached[(key[2], key[3], key[0], key[1])] = float(row[4])
+
+            return {pair: cached[pair] for pair in pairs if pair in cached}
+
+        except Exception as e:
+            logger.error(f"Failed to get cached similarities: {str(e)}", exc_info=True)
+            return {}
+
     def _cache_similarity(
         self,
         content_type_a: str,
@@ -706,6 +1311,23 @@ class SimilarityService:
         """
         Cache similarity calculation result
         """
+        self._cache_similarities(
+            [(content_type_a, content_id_a, content_type_b, content_id_b, similarity_score)],
+            method
+        )
+
+    def _cache_similarities(
+        self,
+        scores: List[Tuple[str, str, str, str, float]],
+        method: str
+    ) -> None:
+        """
+        Cache many similarity results in one statement
+
+        Args:
+            scores: (type_a, id_a, type_b, id_b, score) tuples
+            method: Similarity method used
+        """
         try:
             expires_at = datetime.now() + timedelta(days=7)
 
@@ -722,19 +1344,23 @@ class SimilarityService:
                 ON CONFLICT (content_type_a, content_id_a, content_type_b, content_id_b)
                 DO UPDATE SET
                     similarity_score = EXCLUDED.similarity_score,
+                    similarity_method = EXCLUDED.similarity_method,
                     calculated_at = NOW(),
                     expires_at = EXCLUDED.expires_at
             """)
 
-            self.db.execute(query, {
-                'type_a': content_type_a,
-                'id_a': content_id_a,
-                'type_b': content_type_b,
-                'id_b': content_id_b,
-                'score': similarity_score,
-                'method': method,
-                'expires_at': expires_at
-            })
+            self.db.execute(query, [
+                {
+                    'type_a': type_a,
+                    'id_a': id_a,
+                    'type_b': type_b,
+                    'id_b': id_b,
+                    'score': score,
+                    'method': method,
+                    'expires_at': expires_at
+                }
+                for type_a, id_a, type_b, id_b, score in scores
+            ])
 
             self.db.commit()
 
@@ -0,0 +1,111 @@
+"""
+Stage Checkpoints - Resume multi-stage pipelines at the first incomplete stage
+Wraps a StageGraph so completed stages are restored from TaskCheckpoint instead of re-run
+
+Each completed stage is checkpointed with:
+- inputs_hash: hash of the stage name, its initial inputs and the output
+  hashes of the stages it depends on
+- outputs / outputs_hash: the state the stage produced (captured by the caller)
+
+On a restarted run a stage is reused only if its checkpoint's inputs_hash
+matches the one computed from the current run, so a dependency that re-ran
+and produced different outputs invalidates everything downstream of it,
+while a re-run that reproduced the same outputs does not.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.services.stage_scheduler import Stage, StageGraph
+from backend.services.task_checkpoint import TaskCheckpoint
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_hash(value: Any) -> str:
+    """SHA-256 of a JSON-serializable value (key order independent)"""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class StageCheckpointer:
+    """
+    Makes every stage of a StageGraph idempotent across restarts
+
+    Args:
+        checkpoint: TaskCheckpoint for the pipeline run (e.g. one chapter)
+        initial_inputs: Values of the graph's initial artifacts
+        capture: Returns the JSON-serializable outputs of a finished stage
+        restore: Re-applies a stage's checkpointed outputs
+    """
+
+    def __init__(
+        self,
+        checkpoint: TaskCheckpoint,
+        initial_inputs: Dict[str, Any],
+        capture: Callable[[str], Dict[str, Any]],
+        restore: Callable[[str, Dict[str, Any]], None]
+    ):
+        self.checkpoint = checkpoint
+        self.initial_inputs = initial_inputs
+        self.capture = capture
+        self.restore = restore
+        self.output_hashes: Dict[str, str] = {}
+        self.reused: List[str] = []
+        self.executed: List[str] = []
+
+    def wrap(self, graph: StageGraph) -> StageGraph:
+        """Same graph with every stage run through the checkpoint"""
+        return StageGraph(
+            [
+                Stage(
+                    stage.name,
+                    self._checkpointed(stage, graph.dependencies[stage.name]),
+                    inputs=stage.inputs,
+                    outputs=stage.outputs,
+                    on_start=stage.on_start
+                )
+                for stage in graph.stages.values()
+            ],
+            initial=self.initial_inputs.keys()
+        )
+
+    def inputs_hash(self, stage: Stage, dependencies) -> str:
+        return content_hash({
+            "stage": stage.name,
+            "initial": {k: self.initial_inputs[k] for k in stage.inputs if k in self.initial_inputs},
+            "dependencies": {dep: self.output_hashes[dep] for dep in sorted(dependencies)}
+        })
+
+    def _checkpointed(self, stage: Stage, dependencies) -> Callable:
+        async def run() -> None:
+            inputs_hash = self.inputs_hash(stage, dependencies)
+
+            saved = self._completed(stage.name)
+            if saved is not None and saved.get("inputs_hash") == inputs_hash:
+                self.restore(stage.name, saved.get("outputs", {}))
+                self.output_hashes[stage.name] = saved["outputs_hash"]
+                self.reused.append(stage.name)
+                logger.info(f"Checkpoint hit: {stage.name} restored without re-running")
+                return
+
+            await stage.run()
+
+            outputs = self.capture(stage.name)
+            outputs_hash = content_hash(outputs)
+            self.output_hashes[stage.name] = outputs_hash
+            self.executed.append(stage.name)
+            self.checkpoint.mark_step_complete(
+                stage.name,
+                metadata={"inputs_hash": inputs_hash, "outputs_hash": outputs_hash, "outputs": outputs}
+            )
+
+        return run
+
+    def _completed(self, name: str) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint.is_step_complete(name):
+            return None
+        saved = self.checkpoint.get_step_metadata(name)
+        return saved if saved and "outputs_hash" in saved else None
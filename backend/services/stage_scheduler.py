@@ -0,0 +1,227 @@
+"""
+Stage Scheduler - Dependency-graph execution for multi-stage pipelines
+Runs every stage as soon as the artifacts it reads have been produced
+
+Used by ChapterOrchestrator: stages declare the chapter artifacts they read
+(inputs) and write (outputs); independent stages (e.g. internal and external
+research) run concurrently on the event loop. Per-stage timings and the
+critical path are reported so the slowest dependency chain is visible.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Stage:
+    """A pipeline stage with declared data dependencies"""
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    on_start: Optional[Callable[[], Awaitable[None]]] = None
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock offsets (seconds from pipeline start) of one stage run"""
+    name: str
+    started_at: float
+    finished_at: float
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+class StageGraph:
+    """
+    Validated DAG of stages
+
+    A stage depends on the stage that produces each of its inputs. Inputs
+    listed in `initial` are available before any stage runs.
+    """
+
+    def __init__(self, stages: Iterable[Stage], initial: Iterable[str] = ()):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+
+        producers: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Artifact '{output}' produced by both {producers[output]} and {stage.name}"
+                    )
+                producers[output] = stage.name
+
+        available = set(initial)
+        self.dependencies: Dict[str, Set[str]] = {}
+        for stage in self.stages.values():
+            deps = set()
+            for artifact in stage.inputs:
+                if artifact in available:
+                    continue
+                if artifact not in producers:
+                    raise ValueError(f"Stage {stage.name} reads '{artifact}' which no stage produces")
+                deps.add(producers[artifact])
+            self.dependencies[stage.name] = deps
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm; keeps declaration order among ready stages"""
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        order = []
+        while remaining:
+            ready = [name for name in self.stages if name in remaining and not remaining[name]]
+            if not ready:
+                raise ValueError(f"Dependency cycle between stages: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+
+def critical_path(graph: StageGraph, timings: Dict[str, StageTiming]) -> Tuple[List[str], float]:
+    """
+    Longest duration-weighted dependency chain through the executed stages
+
+    Returns:
+        (stage names from first to last, summed duration in seconds)
+    """
+    best: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+
+    for name in graph.order:
+        if name not in timings:
+            continue
+        parent = max(
+            (dep for dep in graph.dependencies[name] if dep in best),
+            key=lambda dep: best[dep],
+            default=None
+        )
+        best[name] = timings[name].duration + (best[parent] if parent else 0.0)
+        previous[name] = parent
+
+    if not best:
+        return [], 0.0
+
+    node: Optional[str] = max(best, key=lambda name: best[name])
+    total = best[node]
+    path = []
+    while node:
+        path.append(node)
+        node = previous[node]
+
+    return list(reversed(path)), total
+
+
+class StageScheduler:
+    """
+    Executes a StageGraph, starting each stage once its dependencies finish
+
+    The first stage failure cancels all running stages and is re-raised.
+    """
+
+    def __init__(self, graph: StageGraph):
+        self.graph = graph
+        self.timings: Dict[str, StageTiming] = {}
+        self.failed_stage: Optional[str] = None
+        self._origin = 0.0
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run all stages
+
+        Returns:
+            Timing report (see `report`)
+        """
+        self._origin = time.perf_counter()
+        done: Set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+
+        while len(done) < len(self.graph.stages):
+            started = set(running.values()) | done
+            for name in self.graph.order:
+                if name not in started and self.graph.dependencies[name] <= done:
+                    running[asyncio.create_task(self._run_stage(name))] = name
+
+            try:
+                finished, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                # Pipeline killed: don't leave its stages running detached
+                await self._cancel(running)
+                raise
+
+            for task in finished:
+                name = running.pop(task)
+                error = task.exception()
+                if error is not None:
+                    self.failed_stage = name
+                    await self._cancel(running)
+                    raise error
+                done.add(name)
+
+        return self.report()
+
+    async def _run_stage(self, name: str) -> None:
+        stage = self.graph.stages[name]
+        if stage.on_start:
+            await stage.on_start()
+
+        started_at = time.perf_counter() - self._origin
+        try:
+            await stage.run()
+        finally:
+            self.timings[name] = StageTiming(
+                name=name,
+                started_at=started_at,
+                finished_at=time.perf_counter() - self._origin,
+                depends_on=sorted(self.graph.dependencies[name])
+            )
+
+    @staticmethod
+    async def _cancel(running: Dict[asyncio.Task, str]) -> None:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running.keys(), return_exceptions=True)
+        running.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Per-stage timings, wall time and critical path (JSON-serializable)
+        """
+        path, path_seconds = critical_path(self.graph, self.timings)
+        wall_time = max((t.finished_at for t in self.timings.values()), default=0.0)
+        stage_time = sum(t.duration for t in self.timings.values())
+
+        return {
+            "stages": {
+                name: {
+                    "started_at_s": round(timing.started_at, 4),
+                    "finished_at_s": round(timing.finished_at, 4),
+                    "duration_s": round(timing.duration, 4),
+                    "depends_on": timing.depends_on
+                }
+                for name, timing in sorted(self.timings.items(), key=lambda item: item[1].started_at)
+            },
+            "wall_time_s": round(wall_time, 4),
+            "sum_stage_time_s": round(stage_time, 4),
+            "critical_path": path,
+            "critical_path_s": round(path_seconds, 4),
+            "failed_stage": self.failed_stage
+        }
@@ -1,15 +1,20 @@
 """
 Storage service for managing file uploads and storage
 Handles PDF files, extracted images, and thumbnails
+
+Files are content-addressed: the path is derived from the SHA-256 of the
+content, so identical uploads and identical figures are stored once and
+shared by every record that references them (reference counts are kept in
+storage_blobs, see BlobStore).
 """
 
+import hashlib
 import os
 import shutil
+import tempfile
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, BinaryIO
 from PIL import Image
-import uuid
 
 from backend.config import settings
 from backend.utils import get_logger
@@ -22,9 +27,13 @@ class StorageService:
     Handles file storage operations for PDFs and images
 
     Directory structure:
-    - storage/pdfs/YYYY/MM/DD/{uuid}.pdf
-    - storage/images/YYYY/MM/DD/{uuid}.{ext}
-    - storage/thumbnails/YYYY/MM/DD/{uuid}_thumb.{ext}
+    - storage/pdfs/ab/cd/{sha256}.pdf
+    - storage/images/ab/cd/{sha256}.{ext}
+    - storage/thumbnails/ab/cd/{sha256}_thumb.jpg
+    - storage/uploads/ (upload bodies being streamed, before they are stored)
+
+    Files stored before content addressing remain under YYYY/MM/DD/{uuid}
+    and are deleted directly (delete_pdf/delete_image).
     """
 
     def __init__(self):
@@ -33,85 +42,156 @@ class StorageService:
         self.pdf_storage_path = self.base_storage_path / "pdfs"
         self.image_storage_path = self.base_storage_path / "images"
         self.thumbnail_storage_path = self.base_storage_path / "thumbnails"
+        self.upload_staging_path = self.base_storage_path / "uploads"
 
         # Create base directories if they don't exist
         self._ensure_directories()
 
     def _ensure_directories(self) -> None:
         """Create storage directories if they don't exist"""
-        for path in [self.pdf_storage_path, self.image_storage_path, self.thumbnail_storage_path]:
+        for path in [self.pdf_storage_path, self.image_storage_path, self.thumbnail_storage_path, self.upload_staging_path]:
             path.mkdir(parents=True, exist_ok=True)
             logger.debug(f"Ensured directory exists: {path}")
 
-    def _get_date_path(self, base_path: Path) -> Path:
+    @staticmethod
+    def content_path(base_path: Path, sha256: str, suffix: str) -> Path:
         """
-        Get date-based subdirectory path (YYYY/MM/DD)
+        Content-addressed path (ab/cd/{sha256}{suffix}), directories created
 
         Args:
-            base_path: Base storage path
+            base_path: Storage root for the file kind
+            sha256: Hex SHA-256 of the content
+            suffix: Extension or name suffix (e.g. ".pdf", "_thumb.jpg")
 
         Returns:
-            Path with date subdirectories
+            Path of the file
         """
-        now = datetime.utcnow()
-        date_path = base_path / str(now.year) / f"{now.month:02d}" / f"{now.day:02d}"
-        date_path.mkdir(parents=True, exist_ok=True)
-        return date_path
+        directory = Path(base_path) / sha256[:2] / sha256[2:4]
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"{sha256}{suffix}"
+
+    @staticmethod
+    def commit_file(temp_path: str, final_path: Path) -> bool:
+        """
+        Move a fully written file to its content-addressed path
+
+        If the content is already stored the temporary file is dropped and the
+        stored copy's mtime is refreshed, which keeps garbage collection from
+        deleting it while the new reference is being recorded.
 
-    def save_pdf(self, file_content: BinaryIO, filename: str, pdf_id: Optional[uuid.UUID] = None) -> dict:
+        Args:
+            temp_path: Written file (same filesystem for an atomic rename)
+            final_path: Content-addressed destination
+
+        Returns:
+            True if the file was stored, False if it already existed
+        """
+        if final_path.exists():
+            os.unlink(temp_path)
+            os.utime(final_path)
+            return False
+        shutil.move(temp_path, final_path)
+        return True
+
+    @staticmethod
+    def write_content(content: bytes, final_path: Path) -> bool:
+        """
+        Write bytes to a content-addressed path unless already stored
+
+        Written to a temporary name first, so concurrent writers of the same
+        content never expose a partial file.
+
+        Returns:
+            True if the file was written, False if it already existed
+        """
+        if final_path.exists():
+            os.utime(final_path)
+            return False
+        fd, temp_path = tempfile.mkstemp(suffix=".part", dir=final_path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, final_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return True
+
+    def save_pdf(self, file_content: BinaryIO, filename: str) -> dict:
         """
         Save uploaded PDF file to storage
 
         Args:
             file_content: File content as binary stream
             filename: Original filename
-            pdf_id: Optional PDF ID (generates new UUID if not provided)
 
         Returns:
-            dict with file_path, file_size_bytes, storage_id
+            dict with file_path, file_size_bytes, content_sha256,
+            original_filename and already_stored
         """
-        # Generate storage ID if not provided
-        storage_id = pdf_id or uuid.uuid4()
-
-        # Get date-based directory
-        date_path = self._get_date_path(self.pdf_storage_path)
-
-        # Create file path with UUID
         file_extension = Path(filename).suffix.lower()
         if file_extension != '.pdf':
             raise ValueError(f"Invalid file extension: {file_extension}. Must be .pdf")
 
-        file_path = date_path / f"{storage_id}.pdf"
-
-        # Save file
+        # Hash while writing to staging, then move into place by content
+        digest = hashlib.sha256()
+        fd, staged_path = tempfile.mkstemp(suffix=".pdf.part", dir=self.upload_staging_path)
         try:
-            with open(file_path, 'wb') as f:
-                shutil.copyfileobj(file_content, f)
-
-            # Get file size
-            file_size = os.path.getsize(file_path)
-
-            logger.info(f"PDF saved: {file_path} ({file_size} bytes)")
-
-            return {
-                "file_path": str(file_path),
-                "file_size_bytes": file_size,
-                "storage_id": str(storage_id),
-                "original_filename": filename
-            }
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: file_content.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+            return self.store_staged_pdf(staged_path, filename, digest.hexdigest())
 
         except Exception as e:
             logger.error(f"Failed to save PDF: {str(e)}", exc_info=True)
             # Clean up partial file if it exists
-            if file_path.exists():
-                file_path.unlink()
+            if os.path.exists(staged_path):
+                os.unlink(staged_path)
             raise
 
+    def store_staged_pdf(self, staged_path: str, filename: str, content_sha256: str) -> dict:
+        """
+        Move a streamed upload from the staging directory into PDF storage
+
+        Same filesystem, so the file is renamed rather than copied; an
+        identical file already in storage is reused and the upload dropped.
+
+        Args:
+            staged_path: Path of the fully written upload
+            filename: Original filename
+            content_sha256: Hex SHA-256 of the upload
+
+        Returns:
+            dict with file_path, file_size_bytes, content_sha256,
+            original_filename and already_stored
+        """
+        file_extension = Path(filename).suffix.lower()
+        if file_extension != '.pdf':
+            raise ValueError(f"Invalid file extension: {file_extension}. Must be .pdf")
+
+        file_path = self.content_path(self.pdf_storage_path, content_sha256, ".pdf")
+        stored = self.commit_file(staged_path, file_path)
+
+        file_size = os.path.getsize(file_path)
+        if stored:
+            logger.info(f"PDF stored: {file_path} ({file_size} bytes)")
+        else:
+            logger.info(f"PDF already stored, upload deduplicated: {file_path}")
+
+        return {
+            "file_path": str(file_path),
+            "file_size_bytes": file_size,
+            "content_sha256": content_sha256,
+            "original_filename": filename,
+            "already_stored": not stored
+        }
+
     def save_image(
         self,
         image_content: bytes,
         image_format: str,
-        image_id: Optional[uuid.UUID] = None,
         create_thumbnail: bool = True,
         thumbnail_size: tuple = (300, 300)
     ) -> dict:
@@ -121,64 +201,66 @@ class StorageService:
         Args:
             image_content: Image content as bytes
             image_format: Image format (PNG, JPEG, etc.)
-            image_id: Optional image ID (generates new UUID if not provided)
             create_thumbnail: Whether to create thumbnail
             thumbnail_size: Thumbnail dimensions (width, height)
 
         Returns:
-            dict with image_path, thumbnail_path, file_size_bytes, storage_id
+            dict with image_path, thumbnail_path, file_size_bytes, content_sha256
         """
-        # Generate storage ID if not provided
-        storage_id = image_id or uuid.uuid4()
-
-        # Get date-based directory
-        date_path = self._get_date_path(self.image_storage_path)
-
-        # Determine file extension
-        extension = f".{image_format.lower()}"
-        if extension not in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-            extension = '.png'  # Default to PNG
-
-        image_path = date_path / f"{storage_id}{extension}"
+        content_sha256 = hashlib.sha256(image_content).hexdigest()
+        image_path = self.content_path(
+            self.image_storage_path, content_sha256, self.image_extension(image_format)
+        )
 
         # Save image
         try:
-            with open(image_path, 'wb') as f:
-                f.write(image_content)
-
-            file_size = os.path.getsize(image_path)
+            if self.write_content(image_content, image_path):
+                logger.info(f"Image saved: {image_path} ({len(image_content)} bytes)")
 
             result = {
                 "image_path": str(image_path),
-                "file_size_bytes": file_size,
-                "storage_id": str(storage_id),
+                "file_size_bytes": len(image_content),
+                "content_sha256": content_sha256,
                 "thumbnail_path": None
             }
 
-            # Create thumbnail if requested
+            # Create thumbnail if requested (once per content)
             if create_thumbnail:
-                thumbnail_path = self._create_thumbnail(
-                    image_path,
-                    storage_id,
-                    thumbnail_size
-                )
+                thumbnail_path = self.thumbnail_path(content_sha256)
+                if not thumbnail_path.exists():
+                    thumbnail_path = self._create_thumbnail(image_path, thumbnail_path, thumbnail_size)
                 result["thumbnail_path"] = str(thumbnail_path) if thumbnail_path else None
 
-            logger.info(f"Image saved: {image_path} ({file_size} bytes)")
-
             return result
 
         except Exception as e:
             logger.error(f"Failed to save image: {str(e)}", exc_info=True)
-            # Clean up partial files
-            if image_path.exists():
-                image_path.unlink()
             raise
 
+    def thumbnail_path(self, content_sha256: str) -> Path:
+        """Thumbnail location of a stored image (derived from the image hash)"""
+        return self.content_path(self.thumbnail_storage_path, content_sha256, "_thumb.jpg")
+
+    @staticmethod
+    def image_extension(image_format: str) -> str:
+        """
+        File extension for a stored image
+
+        Args:
+            image_format: Image format (PNG, JPEG, etc.)
+
+        Returns:
+            Extension including the dot (PNG for unknown formats)
+        """
+        extension = f".{image_format.lower()}"
+        if extension not in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
+            extension = '.png'  # Default to PNG
+        return extension
+
     def _create_thumbnail(
         self,
         image_path: Path,
-        storage_id: uuid.UUID,
+        thumbnail_path: Path,
         size: tuple
     ) -> Optional[Path]:
         """
@@ -186,16 +268,13 @@ class StorageService:
 
         Args:
             image_path: Path to original image
-            storage_id: Storage ID for naming
+            thumbnail_path: Where to write the thumbnail
             size: Thumbnail size (width, height)
 
         Returns:
             Path to thumbnail or None if creation failed
         """
         try:
-            # Get date-based directory for thumbnails
-            date_path = self._get_date_path(self.thumbnail_storage_path)
-
             # Open image and create thumbnail
             with Image.open(image_path) as img:
                 # Convert to RGB if necessary (for PNG with transparency)
@@ -210,7 +289,6 @@ class StorageService:
                 img.thumbnail(size, Image.Resampling.LANCZOS)
 
                 # Save thumbnail
-                thumbnail_path = date_path / f"{storage_id}_thumb.jpg"
                 img.save(thumbnail_path, 'JPEG', quality=85, optimize=True)
 
                 logger.debug(f"Thumbnail created: {thumbnail_path}")
@@ -282,6 +360,32 @@ class StorageService:
 
         return success
 
+    def delete_blob(self, kind: str, file_path: str, content_sha256: str) -> bool:
+        """
+        Delete a content-addressed file (and an image's thumbnail)
+
+        Only called by garbage collection once no record references the blob;
+        records release their reference through BlobStore instead.
+
+        Args:
+            kind: Blob kind (pdf or image)
+            file_path: Stored file path
+            content_sha256: Blob hash
+
+        Returns:
+            True if deleted (or already gone), False on error
+        """
+        try:
+            Path(file_path).unlink(missing_ok=True)
+            if kind == "image":
+                (self.thumbnail_storage_path / content_sha256[:2] / content_sha256[2:4]
+                 / f"{content_sha256}_thumb.jpg").unlink(missing_ok=True)
+            logger.debug(f"Blob deleted: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete blob {file_path}: {str(e)}", exc_info=True)
+            return False
+
     def get_storage_stats(self) -> dict:
         """
         Get storage statistics
@@ -0,0 +1,77 @@
+"""
+Storage Maintenance Celery Tasks
+Garbage collection of content-addressed files no record references
+"""
+
+from celery import Task
+from typing import Dict, Any, Optional
+
+from backend.config import settings
+from backend.services.celery_app import celery_app
+from backend.database.connection import db
+from backend.services.blob_store import BlobStore
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class DatabaseTask(Task):
+    """
+    Base task class that provides database session management
+
+    Ensures proper session cleanup after task execution
+    """
+    _db_session = None
+
+    @property
+    def db_session(self):
+        if self._db_session is None:
+            self._db_session = db.get_session()
+        return self._db_session
+
+    def after_return(self, *args, **kwargs):
+        if self._db_session is not None:
+            self._db_session.close()
+            self._db_session = None
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.storage_tasks.collect_orphaned_blobs"
+)
+def collect_orphaned_blobs(self, grace_hours: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Delete stored PDFs/images that no record has referenced for the grace period
+
+    Runs batches of BlobStore.collect_garbage (one transaction each) until a
+    batch comes back short or deletes nothing. Scheduled by celery beat.
+
+    Args:
+        grace_hours: Override STORAGE_BLOB_GC_GRACE_HOURS
+
+    Returns:
+        Totals over all batches
+    """
+    store = BlobStore(self.db_session)
+    batch_size = settings.STORAGE_BLOB_GC_BATCH_SIZE
+    totals = {"examined": 0, "deleted": 0, "bytes_freed": 0, "repaired": 0, "skipped_recent": 0, "failed": 0}
+
+    try:
+        while True:
+            stats = store.collect_garbage(grace_hours=grace_hours, limit=batch_size)
+            for key, value in stats.items():
+                totals[key] += value
+            if stats["examined"] < batch_size or stats["deleted"] == 0:
+                break
+
+    except Exception as e:
+        logger.error(f"Blob garbage collection failed: {str(e)}", exc_info=True)
+        self.db_session.rollback()
+        raise
+
+    logger.info(
+        f"Orphaned blob collection complete: {totals['deleted']} deleted, "
+        f"{totals['bytes_freed'] / (1024 * 1024):.1f}MB freed"
+    )
+    return {"status": "success", **totals}
@@ -0,0 +1,205 @@
+"""
+Streaming Chunker - Single-pass, structure-aware text chunking
+Yields embedding chunks lazily with exact character offsets
+
+The text is walked once, paragraph by paragraph (sentence by sentence for
+paragraphs longer than a chunk, word by word for sentences longer than a
+chunk, as in tables, lists and OCR text without sentence punctuation).
+Each unit is token-counted once with the local tokenizer and its offsets
+come from the scan itself, so chunking is linear in the text length.
+Heading lines are detected while scanning and recorded on the chunks they
+open or fall inside.
+
+Chunks are yielded as soon as they are complete, so callers can start
+embedding the first chunks while the rest of a long chapter is still being
+chunked.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.utils.tokenizer import count_tokens
+
+# Lines that are all caps or start with a (roman) number
+HEADING_PATTERN = re.compile(r'^([A-Z][A-Z\s]+|[\dIVX]+\.?\s+[^\n]+)$')
+
+_PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n\s*')
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+_OVERLAP_START = re.compile(r'(?:[.!?]\s+|\n[ \t]*\n\s*)')
+_WORD_START = re.compile(r'\s+')
+_WORD = re.compile(r'\S+')
+
+# (start offset, end offset, tokens, heading)
+Unit = Tuple[int, int, int, Optional[str]]
+
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _paragraph_spans(text: str) -> Iterator[Tuple[int, int]]:
+    position = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        yield _strip_span(text, position, match.start())
+        position = match.end()
+    yield _strip_span(text, position, len(text))
+
+
+def _heading(paragraph: str) -> Optional[str]:
+    for line in paragraph.split('\n'):
+        line = line.strip()
+        if line and HEADING_PATTERN.match(line):
+            return line
+    return None
+
+
+def _word_spans(text: str, start: int, end: int, chunk_size: int) -> Iterator[Tuple[int, int, int]]:
+    """Runs of whole words within chunk_size (words longer than a chunk are cut)"""
+    run_start: Optional[int] = None
+    run_end = start
+    run_tokens = 0
+    for match in _WORD.finditer(text, start, end):
+        word_tokens = count_tokens(text[run_end:match.end()])
+        if run_start is not None and run_tokens + word_tokens > chunk_size:
+            yield run_start, run_end, count_tokens(text[run_start:run_end])
+            run_start, run_tokens = None, 0
+            word_tokens = count_tokens(match.group())
+        if word_tokens > chunk_size:
+            # A single "word" over the limit (e.g. an OCR run without spaces)
+            piece_start = match.start()
+            while piece_start < match.end():
+                piece_end = min(match.end(), piece_start + chunk_size * 4)
+                while (count_tokens(text[piece_start:piece_end]) > chunk_size
+                       and piece_end - piece_start > 1):
+                    piece_end = piece_start + (piece_end - piece_start) // 2
+                yield piece_start, piece_end, count_tokens(text[piece_start:piece_end])
+                piece_start = piece_end
+            run_end = match.end()
+            continue
+        if run_start is None:
+            run_start = match.start()
+        run_end = match.end()
+        run_tokens += word_tokens
+    if run_start is not None:
+        yield run_start, run_end, count_tokens(text[run_start:run_end])
+
+
+def _units(text: str, chunk_size: int) -> Iterator[Unit]:
+    """Paragraphs, or the sentences (or word runs) of paragraphs longer than a chunk"""
+    for start, end in _paragraph_spans(text):
+        if start == end:
+            continue
+        paragraph = text[start:end]
+        heading = _heading(paragraph)
+        tokens = count_tokens(paragraph)
+        if tokens <= chunk_size:
+            yield start, end, tokens, heading
+            continue
+
+        sentence_start = start
+        sentence_spans = []
+        for match in _SENTENCE_BREAK.finditer(paragraph):
+            sentence_spans.append((sentence_start, start + match.start()))
+            sentence_start = start + match.end()
+        if sentence_start < end:
+            sentence_spans.append((sentence_start, end))
+
+        for sentence_start, sentence_end in sentence_spans:
+            tokens = count_tokens(text[sentence_start:sentence_end])
+            if tokens <= chunk_size:
+                yield sentence_start, sentence_end, tokens, heading
+                heading = None
+                continue
+            runs = _word_spans(text, sentence_start, sentence_end, chunk_size)
+            for run_start, run_end, run_tokens in runs:
+                yield run_start, run_end, run_tokens, heading
+                heading = None
+
+
+def _overlap_start(text: str, chunk_start: int, chunk_end: int, overlap: int, respect_boundaries: bool) -> int:
+    """Start of the chunk's trailing overlap (chunk_end when there is none)"""
+    if overlap <= 0:
+        return chunk_end
+
+    # Only the tail can be in the overlap: tokens are rarely longer than 8 characters
+    window_start = max(chunk_start + 1, chunk_end - overlap * 8)
+    pattern = _OVERLAP_START if respect_boundaries else _WORD_START
+    starts = [m.end() for m in pattern.finditer(text, window_start, chunk_end) if m.end() < chunk_end]
+
+    # Whole sentences (or words) from the end while they fit the overlap budget
+    best, total, previous = chunk_end, 0, chunk_end
+    for start in reversed(starts):
+        total += count_tokens(text[start:previous])
+        if total > overlap:
+            break
+        best, previous = start, start
+    return best
+
+
+def iter_chunks(
+    text: str,
+    chunk_size: int = 1024,
+    overlap: int = 128,
+    respect_boundaries: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily chunk text into token-sized, overlapping chunks
+
+    Args:
+        text: Input text to chunk
+        chunk_size: Maximum chunk size in tokens (local tokenizer); sentences
+            longer than this are split at word boundaries
+        overlap: Tokens repeated from the end of the previous chunk
+        respect_boundaries: Start overlaps at sentence/paragraph boundaries
+            (word boundaries when False)
+
+    Yields:
+        Chunk dictionaries with text, token_count, start_offset, end_offset,
+        preceding_heading and contains_headings
+    """
+    chunk_start: Optional[int] = None
+    chunk_end = 0
+    chunk_tokens = 0
+    has_new_content = False
+    current_heading: Optional[str] = None
+    chunk_heading: Optional[str] = None
+    contains_headings: List[str] = []
+
+    def make_chunk() -> Dict[str, Any]:
+        return {
+            'text': text[chunk_start:chunk_end],
+            'token_count': chunk_tokens,
+            'start_offset': chunk_start,
+            'end_offset': chunk_end,
+            'preceding_heading': chunk_heading,
+            'contains_headings': list(contains_headings) or None
+        }
+
+    for unit_start, unit_end, tokens, heading in _units(text, chunk_size):
+        if has_new_content and chunk_tokens + tokens > chunk_size:
+            yield make_chunk()
+
+            chunk_start = _overlap_start(text, chunk_start, chunk_end, overlap, respect_boundaries)
+            chunk_tokens = count_tokens(text[chunk_start:chunk_end]) if chunk_start < chunk_end else 0
+            if chunk_start == chunk_end or chunk_tokens + tokens > chunk_size:
+                chunk_start, chunk_tokens = None, 0
+            chunk_heading = current_heading
+            contains_headings = []
+            has_new_content = False
+
+        if heading:
+            current_heading = heading
+            contains_headings.append(heading)
+        if chunk_start is None:
+            chunk_start = unit_start
+            chunk_heading = current_heading
+        chunk_end = unit_end
+        chunk_tokens += tokens
+        has_new_content = True
+
+    if has_new_content:
+        yield make_chunk()
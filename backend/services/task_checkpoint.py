@@ -271,11 +271,8 @@ class TaskCheckpoint:
             metadata: Metadata about the entire task
         """
         try:
-            self.redis.set(
-                self._metadata_key,
-                json.dumps(metadata),
-                ex=self.ttl
-            )
+            # RedisManager serializes the value itself
+            self.redis.set(self._metadata_key, metadata, ttl=self.ttl)
 
         except Exception as e:
             logger.error(f"Failed to set metadata: {str(e)}")
@@ -292,7 +289,9 @@ class TaskCheckpoint:
             if metadata:
                 if isinstance(metadata, bytes):
                     metadata = metadata.decode('utf-8')
-                return json.loads(metadata)
+                if isinstance(metadata, str):
+                    metadata = json.loads(metadata)
+                return metadata
             return None
 
         except Exception as e:
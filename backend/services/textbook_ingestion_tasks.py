@@ -0,0 +1,240 @@
+"""
+Textbook Ingestion Celery Tasks
+Worker half of textbook uploads: classification, chapter detection and
+extraction, then queueing of the image, embedding and title pipelines
+
+The upload request streams the file to storage, records a Task row and
+returns its id (the Celery task id); progress is written to that row and
+read through GET /textbooks/upload-jobs/{job_id}.
+
+Content already ingested is not processed again: an existing book with the
+same SHA-256 is returned as the job result, and a book whose file was
+already processed as a PDF copies that PDF's images instead of extracting
+them.
+"""
+
+from celery import Task
+from typing import Dict, Any, Optional
+import re
+import uuid as uuid_module
+
+from backend.services.celery_app import celery_app
+from backend.database.connection import db
+from backend.database.models import PDF, PDFBook
+from backend.services.blob_store import BlobStore
+from backend.services.task_service import TaskService
+from backend.services.textbook_processor import TextbookProcessorService
+from backend.services.upload_ingestion import find_ingested_book, release_inflight_upload
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Titles that should be replaced by AI title extraction
+_PLACEHOLDER_TITLES = {"Untitled Book - Please Edit", "Untitled Book", "Unknown"}
+_UUID_TITLE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+
+class DatabaseTask(Task):
+    """
+    Base task class that provides database session management
+
+    Ensures proper session cleanup after task execution
+    """
+    _db_session = None
+
+    @property
+    def db_session(self):
+        if self._db_session is None:
+            self._db_session = db.get_session()
+        return self._db_session
+
+    def after_return(self, *args, **kwargs):
+        if self._db_session is not None:
+            self._db_session.close()
+            self._db_session = None
+
+
+def queue_book_pipelines(
+    session,
+    book: PDFBook,
+    file_path: str,
+    original_filename: str,
+    file_size_bytes: int
+) -> Dict[str, Any]:
+    """
+    Queue the background pipelines of a freshly extracted book
+
+    - Image extraction/analysis (through a pdfs record linked to the book),
+      or a copy of the images of an identical, already processed PDF
+    - Chapter embeddings followed by duplicate detection (one chord)
+    - AI title extraction when the title is a UUID or placeholder
+
+    Args:
+        session: Database session
+        book: The book created by TextbookProcessorService.process_pdf
+        file_path: Stored PDF path
+        original_filename: Filename as uploaded
+        file_size_bytes: File size
+
+    Returns:
+        Dict with pdf_id and chapters queued for embedding
+    """
+    from backend.services.background_tasks import extract_images_task
+    from backend.services.chapter_embedding_service import build_book_ingestion_workflow
+    from backend.services.pdf_service import PDFService
+    from backend.services.title_extraction_tasks import extract_title_from_cover
+
+    book_id = str(book.id)
+    pdf_id = None
+
+    # Create pdfs table entry to enable image extraction pipeline
+    try:
+        pdf_record = PDF(
+            id=uuid_module.uuid4(),
+            file_path=file_path,
+            filename=original_filename,
+            file_size_bytes=file_size_bytes,
+            content_sha256=book.content_sha256,
+            indexing_status="pending",  # Valid status: will transition to extracting_images
+            text_extracted=True  # Text already extracted by textbook processor
+        )
+        session.add(pdf_record)
+        BlobStore(session).add_references("pdf", [(book.content_sha256, file_path, file_size_bytes)])
+        session.flush()
+
+        # Link book to pdf record (enables image lookup)
+        book.pdf_id = pdf_record.id
+        session.commit()
+        pdf_id = str(pdf_record.id)
+
+        pdf_service = PDFService(session)
+        source = pdf_service.find_processed_copy(pdf_record, completed_only=False)
+        if source:
+            pdf_service.reuse_processed_pdf(pdf_record, source)
+            logger.info(f"Reused images of identical PDF {source.id} for PDF {pdf_id} (book: {book.title})")
+        else:
+            extract_images_task.delay(pdf_id)
+            logger.info(f"Queued image extraction pipeline for PDF {pdf_id} (book: {book.title})")
+
+    except Exception as e:
+        session.rollback()
+        # Book and chapters are already created, images can be extracted later
+        logger.error(f"Failed to queue image extraction for book {book_id}: {str(e)}", exc_info=True)
+
+    # One task embeds every chapter, then duplicate detection runs once over the book
+    chapters_queued = 0
+    try:
+        build_book_ingestion_workflow([book_id]).apply_async()
+        chapters_queued = book.total_chapters or 0
+    except Exception as e:
+        logger.error(f"Failed to queue chapter ingestion workflow for book {book_id}: {str(e)}")
+
+    title = book.title or ""
+    if _UUID_TITLE.match(title.lower()) or title in _PLACEHOLDER_TITLES or title == original_filename:
+        try:
+            extract_title_from_cover.delay(book_id, auto_apply_threshold=0.8)
+            logger.info(f"Auto-queued title extraction for book {book_id} (current title: '{title}')")
+        except Exception as e:
+            logger.error(f"Failed to queue title extraction for book {book_id}: {str(e)}")
+
+    return {"pdf_id": pdf_id, "embedding_tasks_queued": chapters_queued}
+
+
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="backend.services.textbook_ingestion_tasks.ingest_textbook_upload",
+    acks_late=True
+)
+def ingest_textbook_upload(
+    self,
+    file_path: str,
+    original_filename: str,
+    content_sha256: str,
+    file_size_bytes: int,
+    uploaded_by: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Classify a stored upload, extract its chapters and queue its pipelines
+
+    Progress (0-100) and the final result are recorded on the Task row whose
+    task_id is this task's id.
+
+    Args:
+        file_path: Stored PDF path
+        original_filename: Filename as uploaded
+        content_sha256: SHA-256 of the file (stored on the book)
+        file_size_bytes: File size
+        uploaded_by: UUID of the uploading user
+
+    Returns:
+        Dict with book_id, chapters_created, pdf_type, total_pages and embedding_tasks_queued
+    """
+    job_id = self.request.id
+    tasks = TaskService(self.db_session)
+    logger.info(f"Ingesting upload {original_filename} (job {job_id})")
+
+    def progress(percent: int, step: str) -> None:
+        # Chapter extraction takes the bulk of the job: 5-85%
+        try:
+            tasks.update_task_status(job_id, "processing", progress=5 + percent * 80 // 100)
+        except Exception as e:
+            logger.warning(f"Failed to record progress for job {job_id} ({step}): {str(e)}")
+
+    try:
+        tasks.update_task_status(job_id, "processing", progress=1, current_step=1)
+
+        # Identical content ingested since the upload was accepted (e.g. Redis unavailable)
+        existing = find_ingested_book(self.db_session, content_sha256)
+        if existing:
+            summary = {
+                "book_id": str(existing.id),
+                "chapters_created": existing.total_chapters or 0,
+                "pdf_type": (existing.book_metadata or {}).get("pdf_type"),
+                "total_pages": existing.total_pages,
+                "pdf_id": str(existing.pdf_id) if existing.pdf_id else None,
+                "embedding_tasks_queued": 0,
+                "reused": True
+            }
+            tasks.update_task_status(job_id, "completed", progress=100, current_step=3, result=summary)
+            logger.info(f"Upload job {job_id}: content already ingested as book {existing.id}")
+            return summary
+
+        processor = TextbookProcessorService(self.db_session)
+        result = processor.process_pdf(
+            file_path=file_path,
+            uploaded_by=uuid_module.UUID(uploaded_by) if uploaded_by else None,
+            original_filename=original_filename,
+            content_sha256=content_sha256,
+            progress_callback=progress
+        )
+        book_id = result["book_id"]
+
+        tasks.update_task_status(job_id, "processing", progress=90, current_step=2)
+        book = self.db_session.query(PDFBook).filter(PDFBook.id == uuid_module.UUID(book_id)).first()
+        queued = queue_book_pipelines(self.db_session, book, file_path, original_filename, file_size_bytes)
+
+        summary = {
+            "book_id": book_id,
+            "chapters_created": result["chapters_created"],
+            "pdf_type": result["pdf_type"],
+            "total_pages": result["total_pages"],
+            "pdf_id": queued["pdf_id"],
+            "embedding_tasks_queued": queued["embedding_tasks_queued"]
+        }
+        tasks.update_task_status(job_id, "completed", progress=100, current_step=3, result=summary)
+
+        logger.info(f"Upload job {job_id} complete: book {book_id}, {result['chapters_created']} chapters")
+        return summary
+
+    except Exception as e:
+        logger.error(f"Upload job {job_id} failed: {str(e)}", exc_info=True)
+        self.db_session.rollback()
+        try:
+            tasks.update_task_status(job_id, "failed", error=str(e))
+        except Exception as status_error:
+            logger.error(f"Failed to record failure of job {job_id}: {str(status_error)}")
+        raise
+
+    finally:
+        release_inflight_upload(content_sha256)
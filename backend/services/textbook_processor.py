@@ -10,13 +10,17 @@ import hashlib
 import base64
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
 import uuid
 
 from openai import OpenAI
 from backend.database.models import PDFBook, PDFChapter
+from backend.services.ai_provider_service import VISION_IMAGE_TOKEN_ESTIMATE
+from backend.services.blob_store import BlobStore
+from backend.services.llm_scheduler import RequestPriority, estimate_tokens, llm_scheduler
+from backend.services.section_work_queue import is_rate_limit_error
 from backend.config import settings
 from backend.utils import get_logger
 
@@ -532,30 +536,38 @@ RULES:
 
 OUTPUT FORMAT: Plain text only (no markdown, no formatting markers)"""
 
-            # Call GPT-4 Vision API
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",  # GPT-4 Omni with vision
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": ocr_prompt
-                            },
+            # Call GPT-4 Vision API (shared gpt4 budget; ingestion is background work)
+            estimated_tokens = VISION_IMAGE_TOKEN_ESTIMATE + estimate_tokens(ocr_prompt, max_tokens=4096)
+            with llm_scheduler.admit_blocking("gpt4", estimated_tokens, RequestPriority.BATCH) as admission:
+                try:
+                    response = self.openai_client.chat.completions.create(
+                        model="gpt-4o",  # GPT-4 Omni with vision
+                        messages=[
                             {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_base64}",
-                                    "detail": "high"  # High detail for better OCR accuracy
-                                }
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "text",
+                                        "text": ocr_prompt
+                                    },
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"data:image/png;base64,{image_base64}",
+                                            "detail": "high"  # High detail for better OCR accuracy
+                                        }
+                                    }
+                                ]
                             }
-                        ]
-                    }
-                ],
-                max_tokens=4096,  # Allow up to 4K tokens for dense pages
-                temperature=0.0  # Deterministic for consistency
-            )
+                        ],
+                        max_tokens=4096,  # Allow up to 4K tokens for dense pages
+                        temperature=0.0  # Deterministic for consistency
+                    )
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        llm_scheduler.record_rate_limited("gpt4")
+                    raise
+            llm_scheduler.settle(admission, response.usage.total_tokens if response.usage else None)
 
             # Extract text from response
             extracted_text = response.choices[0].message.content.strip()
@@ -752,7 +764,9 @@ OUTPUT FORMAT: Plain text only (no markdown, no formatting markers)"""
         self,
         file_path: str,
         uploaded_by: Optional[uuid.UUID] = None,
-        original_filename: Optional[str] = None
+        original_filename: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, str], None]] = None
     ) -> Dict[str, Any]:
         """
         MAIN ENTRY POINT: Process PDF and extract all chapters
@@ -769,12 +783,20 @@ OUTPUT FORMAT: Plain text only (no markdown, no formatting markers)"""
             file_path: Path to uploaded PDF file
             uploaded_by: UUID of user who uploaded
             original_filename: Original filename from upload (used as fallback for title)
+            content_sha256: SHA-256 of the file content (upload dedup; the book
+                references the stored blob)
+            progress_callback: Called with (percent 0-100, step name) as processing advances
 
         Returns:
             Dict with book_id, chapters_created, and status
         """
+        def report(percent: int, step: str) -> None:
+            if progress_callback:
+                progress_callback(percent, step)
+
         try:
             logger.info(f"Processing PDF: {file_path}")
+            report(0, "classification")
 
             # Step 1: Classify PDF
             pdf_type = self.classify_pdf(file_path)
@@ -800,6 +822,7 @@ OUTPUT FORMAT: Plain text only (no markdown, no formatting markers)"""
                 total_pages=total_pages,
                 file_path=file_path,
                 file_size_bytes=file_size,
+                content_sha256=content_sha256,
                 uploaded_by=uploaded_by,
                 processing_status='processing',
                 book_metadata={
@@ -810,19 +833,22 @@ OUTPUT FORMAT: Plain text only (no markdown, no formatting markers)"""
             )
 
             self.db.add(book)
+            BlobStore(self.db).add_references("pdf", [(content_sha256, file_path, file_size)])
             self.db.commit()
             self.db.refresh(book)
 
             logger.info(f"Created PDFBook record: {book.id}")
 
             # Step 4: Detect chapters
+            report(10, "chapter_detection")
             chapters = self.detect_chapters(file_path)
             logger.info(f"Detected {len(chapters)} chapters")
 
             # Step 5: Extract and save each chapter
             chapters_created = 0
 
-            for chapter_info in chapters:
+            for index, chapter_info in enumerate(chapters):
+                report(20 + 75 * index // max(1, len(chapters)), "chapter_extraction")
                 try:
                     # Extract chapter content
                     chapter_data = self.extract_chapter(
@@ -869,6 +895,7 @@ OUTPUT FORMAT: Plain text only (no markdown, no formatting markers)"""
 
             # Commit all chapters
             self.db.commit()
+            report(95, "chapter_extraction")
 
             # Update book record
             book.total_chapters = chapters_created
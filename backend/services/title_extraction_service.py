@@ -15,6 +15,9 @@ import uuid as uuid_module
 
 from openai import OpenAI
 from backend.config import settings
+from backend.services.ai_provider_service import VISION_IMAGE_TOKEN_ESTIMATE
+from backend.services.llm_scheduler import RequestPriority, estimate_tokens, llm_scheduler
+from backend.services.section_work_queue import is_rate_limit_error
 from backend.utils import get_logger
 
 logger = get_logger(__name__)
@@ -237,36 +240,21 @@ If no clear title visible, return:
 
         Raises:
             Exception: If API call fails
+            SchedulerTimeoutError: The shared gpt4 budget did not admit the request in time
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self.SYSTEM_PROMPT
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": self.USER_PROMPT
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{image_base64}",
-                                    "detail": "high"  # Use high detail for better accuracy
-                                }
-                            }
-                        ]
-                    }
-                ],
-                response_format={"type": "json_object"},  # Force JSON response
-                max_tokens=500,
-                temperature=0.3  # Low temperature for consistency
+            estimated_tokens = VISION_IMAGE_TOKEN_ESTIMATE + estimate_tokens(
+                self.SYSTEM_PROMPT, self.USER_PROMPT, max_tokens=500
             )
+            # Same budget as every other GPT-4o call; title extraction is background work
+            with llm_scheduler.admit_blocking("gpt4", estimated_tokens, RequestPriority.BATCH) as admission:
+                try:
+                    response = self._create_completion(image_base64)
+                except Exception as e:
+                    if is_rate_limit_error(e):
+                        llm_scheduler.record_rate_limited("gpt4")
+                    raise
+            llm_scheduler.settle(admission, response.usage.total_tokens if response.usage else None)
 
             # Parse JSON response
             content = response.choices[0].message.content
@@ -284,6 +272,37 @@ If no clear title visible, return:
             logger.error(f"GPT-4 Vision API call failed: {str(e)}", exc_info=True)
             raise
 
+    def _create_completion(self, image_base64: str):
+        """GPT-4 Vision request for one rendered cover page"""
+        return self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": self.USER_PROMPT
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/png;base64,{image_base64}",
+                                "detail": "high"  # Use high detail for better accuracy
+                            }
+                        }
+                    ]
+                }
+            ],
+            response_format={"type": "json_object"},  # Force JSON response
+            max_tokens=500,
+            temperature=0.3  # Low temperature for consistency
+        )
+
     def _clean_title(self, title: str) -> str:
         """
         Clean and normalize extracted title
@@ -0,0 +1,150 @@
+"""
+Streamed Upload Ingestion
+Request-side half of textbook uploads: stream the body to disk, hash it and
+find copies of the same file that are already ingested or being ingested
+
+Upload bodies are read in UPLOAD_CHUNK_SIZE_BYTES chunks and written to the
+storage staging directory while a SHA-256 is computed, so memory use per
+upload stays at one chunk regardless of file size. Classification and
+chapter extraction run in a worker (textbook_ingestion_tasks); the request
+only returns a job id.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.config.redis import redis_manager
+from backend.database.models import PDFBook
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+_PDF_MAGIC = b"%PDF-"
+
+
+class UploadRejectedError(ValueError):
+    """Upload body is not an acceptable PDF"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class StreamedUpload:
+    """An upload body written to the staging directory"""
+
+    path: str
+    sha256: str
+    size_bytes: int
+    original_filename: str
+
+
+async def stream_upload_to_disk(
+    upload: UploadFile,
+    directory: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> StreamedUpload:
+    """
+    Write an upload to a staging file in chunks while hashing it
+
+    Args:
+        upload: Incoming file
+        directory: Staging directory (same filesystem as PDF storage)
+        max_bytes: Size limit (default: MAX_UPLOAD_SIZE_MB)
+        chunk_size: Read size (default: UPLOAD_CHUNK_SIZE_BYTES)
+
+    Returns:
+        StreamedUpload with path, hex SHA-256 and size
+
+    Raises:
+        UploadRejectedError: Not a PDF (400) or over the size limit (413);
+            the partial file is removed
+    """
+    max_bytes = max_bytes or settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE_BYTES
+
+    if not (upload.filename or "").lower().endswith(".pdf"):
+        raise UploadRejectedError("Only PDF files are supported")
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix=".pdf.part", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                if size == 0 and not chunk.startswith(_PDF_MAGIC):
+                    raise UploadRejectedError("File is not a valid PDF")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejectedError(
+                        f"File exceeds the {max_bytes // (1024 * 1024)}MB upload limit", status_code=413
+                    )
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+
+        if size == 0:
+            raise UploadRejectedError("Uploaded file is empty")
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    logger.debug(f"Streamed upload {upload.filename}: {size} bytes -> {path}")
+    return StreamedUpload(path=path, sha256=digest.hexdigest(), size_bytes=size, original_filename=upload.filename)
+
+
+def find_ingested_book(db: Session, sha256: str) -> Optional[PDFBook]:
+    """Book already created from identical content (failed ingestions excluded)"""
+    return db.query(PDFBook).filter(
+        PDFBook.content_sha256 == sha256,
+        PDFBook.processing_status != "failed"
+    ).order_by(PDFBook.uploaded_at).first()
+
+
+def _inflight_key(sha256: str) -> str:
+    return redis_manager.make_key("upload", "inflight", sha256)
+
+
+def claim_inflight_upload(sha256: str, job_id: str) -> Optional[str]:
+    """
+    Register an ingestion job for content, unless one is already running
+
+    Args:
+        sha256: Content hash
+        job_id: Job that would ingest it
+
+    Returns:
+        None if claimed for job_id, otherwise the id of the job already ingesting it
+    """
+    try:
+        client = redis_manager.get_client()
+        if client.set(_inflight_key(sha256), job_id, nx=True, ex=settings.UPLOAD_INFLIGHT_TTL_SECONDS):
+            return None
+        existing = client.get(_inflight_key(sha256))
+        if isinstance(existing, bytes):
+            existing = existing.decode("utf-8")
+        return existing or None
+    except Exception as e:
+        # Without Redis only completed books are deduplicated
+        logger.warning(f"In-flight upload check unavailable: {str(e)}")
+        return None
+
+
+def release_inflight_upload(sha256: str) -> None:
+    """Drop the in-flight registration once the job finished (either way)"""
+    try:
+        redis_manager.delete(_inflight_key(sha256))
+    except Exception as e:
+        logger.warning(f"Failed to release in-flight upload {sha256}: {str(e)}")
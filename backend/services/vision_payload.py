@@ -0,0 +1,226 @@
+"""
+Vision Payload Preparation
+Downscales and re-encodes images to what vision providers actually use
+
+Vision models look at images at a bounded resolution (Claude resizes
+anything beyond ~1568px on the long edge / ~1.15 megapixels before the
+model sees it), so sending a 6000px scan costs upload time and payload
+limit headroom without adding detail. Images are resized to that effective
+resolution and re-encoded within a byte budget: JPEG for photographs and
+scans, PNG for line art and diagrams with few colours, whichever is smaller.
+Images that already fit are sent untouched.
+
+Prepared payloads are cached in-process by content hash, so retries,
+provider fallbacks and repeated analyses of the same image do not re-read
+or re-encode it.
+"""
+
+import base64
+import hashlib
+import io
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image
+
+from backend.config import settings
+from backend.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Formats every vision provider accepts as-is
+_SENDABLE_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+
+# Progressively cheaper encodings tried until the payload fits the budget
+_JPEG_QUALITIES = (85, 75, 60)
+
+
+@dataclass(frozen=True)
+class VisionPayload:
+    """Image bytes ready for a vision request"""
+
+    image_base64: str
+    image_format: str
+    content_hash: str
+    original_bytes: int
+    sent_bytes: int
+    width: int
+    height: int
+    resized: bool
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.sent_bytes
+
+
+def target_size(width: int, height: int, max_edge: int, max_pixels: int) -> tuple:
+    """Largest size within the long-edge and pixel-count limits (aspect ratio kept)"""
+    scale = min(1.0, max_edge / max(width, height), math.sqrt(max_pixels / (width * height)))
+    # The epsilon keeps float error from flooring 1568 down to 1567
+    return max(1, math.floor(width * scale + 1e-6)), max(1, math.floor(height * scale + 1e-6))
+
+
+def _encode(img: Image.Image, image_format: str, quality: int = 85) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "JPEG":
+        img.save(buffer, "JPEG", quality=quality, optimize=True)
+    else:
+        img.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """RGB (transparent areas on white) or L, the modes JPEG can hold"""
+    if img.mode in ("RGB", "L"):
+        return img
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    return img.convert("RGB")
+
+
+def _reencode(img: Image.Image, max_bytes: int) -> tuple:
+    """(bytes, format) of the smallest encoding tried, stopping once within budget"""
+    flat = _flatten(img)
+    candidates = []
+
+    # Line art/diagrams: few colours compress far better losslessly
+    if img.getcolors(256) is not None:
+        candidates.append((_encode(img if img.mode in ("RGB", "L", "P") else flat, "PNG"), "PNG"))
+        if len(candidates[0][0]) <= max_bytes:
+            return candidates[0]
+
+    for quality in _JPEG_QUALITIES:
+        data = _encode(flat, "JPEG", quality)
+        candidates.append((data, "JPEG"))
+        if len(data) <= max_bytes:
+            break
+    return min(candidates, key=lambda c: len(c[0]))
+
+
+def prepare_image_bytes(
+    data: bytes,
+    max_edge: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> VisionPayload:
+    """
+    Downscale/re-encode image bytes for a vision request (uncached)
+
+    Args:
+        data: Original image file content
+        max_edge: Long-edge limit in pixels (VISION_MAX_LONG_EDGE)
+        max_pixels: Pixel-count limit (VISION_MAX_PIXELS)
+        max_bytes: Encoded size budget (VISION_PAYLOAD_MAX_BYTES)
+
+    Returns:
+        VisionPayload (the original bytes when they already fit)
+    """
+    max_edge = max_edge or settings.VISION_MAX_LONG_EDGE
+    max_pixels = max_pixels or settings.VISION_MAX_PIXELS
+    max_bytes = max_bytes or settings.VISION_PAYLOAD_MAX_BYTES
+    content_hash = hashlib.sha256(data).hexdigest()
+
+    with Image.open(io.BytesIO(data)) as img:
+        source_format = (img.format or "PNG").upper()
+        width, height = img.size
+        new_size = target_size(width, height, max_edge, max_pixels)
+
+        if new_size == (width, height) and len(data) <= max_bytes and source_format in _SENDABLE_FORMATS:
+            encoded, image_format = data, source_format
+        else:
+            # JPEG sources decode straight to (about) the target scale
+            img.draft("RGB", new_size)
+            img = img.convert("RGBA") if img.mode == "P" and "transparency" in img.info else img
+            if img.size != new_size:
+                img = img.resize(new_size, Image.Resampling.LANCZOS)
+            encoded, image_format = _reencode(img, max_bytes)
+
+            # Still over budget at the lowest quality: shrink until it fits
+            while len(encoded) > max_bytes and min(new_size) > 64:
+                new_size = (int(new_size[0] * 0.75), int(new_size[1] * 0.75))
+                encoded, image_format = _reencode(img.resize(new_size, Image.Resampling.LANCZOS), max_bytes)
+
+            # Re-encoding a small, already efficient file can make it bigger
+            if len(encoded) >= len(data) and new_size == (width, height) and source_format in _SENDABLE_FORMATS:
+                encoded, image_format = data, source_format
+
+    return VisionPayload(
+        image_base64=base64.b64encode(encoded).decode("utf-8"),
+        image_format=image_format,
+        content_hash=content_hash,
+        original_bytes=len(data),
+        sent_bytes=len(encoded),
+        width=new_size[0],
+        height=new_size[1],
+        resized=new_size != (width, height)
+    )
+
+
+class VisionPayloadCache:
+    """
+    Prepared payloads by content hash (LRU, in-process)
+
+    Keyed by the hash of the original file content plus the limits, so a
+    changed setting never serves a payload prepared under the old limits.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else settings.VISION_PAYLOAD_CACHE_SIZE
+        self._entries: "OrderedDict[str, VisionPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, image_path: str) -> VisionPayload:
+        """
+        Prepared payload for an image file
+
+        Args:
+            image_path: Path to image file
+
+        Returns:
+            VisionPayload (cached when the same content was prepared before)
+        """
+        with open(image_path, "rb") as f:
+            data = f.read()
+        key = "{}:{}:{}:{}".format(
+            hashlib.sha256(data).hexdigest(),
+            settings.VISION_MAX_LONG_EDGE,
+            settings.VISION_MAX_PIXELS,
+            settings.VISION_PAYLOAD_MAX_BYTES
+        )
+
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+
+        payload = prepare_image_bytes(data)
+        logger.debug(
+            f"Vision payload for {image_path}: {payload.original_bytes} -> {payload.sent_bytes} bytes "
+            f"({payload.image_format}, {payload.width}x{payload.height})"
+        )
+
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = payload
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global prepared-payload cache
+vision_payload_cache = VisionPayloadCache()
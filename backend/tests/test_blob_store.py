@@ -0,0 +1,250 @@
+"""
+Tests for content-addressed storage
+Tests deduplicated file storage, reference counting, garbage collection of
+orphaned blobs and reuse of an identical PDF's processing results
+"""
+
+import hashlib
+import io
+import os
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image as PILImage
+
+from backend.database.models import Image
+from backend.services.blob_store import BlobStore
+from backend.services.pdf_service import PDFService
+from backend.services.storage_service import StorageService
+
+
+@pytest.fixture
+def storage(tmp_path):
+    with patch("backend.services.storage_service.settings") as settings:
+        settings.STORAGE_BASE_PATH = str(tmp_path / "storage")
+        yield StorageService()
+
+
+class TestContentAddressedStorage:
+    """Test suite for StorageService content addressing"""
+
+    def test_identical_pdfs_stored_once(self, storage):
+        content = b"%PDF-1.7\n" + os.urandom(4096)
+
+        first = storage.save_pdf(io.BytesIO(content), "edition-1.pdf")
+        second = storage.save_pdf(io.BytesIO(content), "copy.pdf")
+
+        assert first["content_sha256"] == second["content_sha256"] == hashlib.sha256(content).hexdigest()
+        assert first["file_path"] == second["file_path"]
+        assert (first["already_stored"], second["already_stored"]) == (False, True)
+        assert [p.name for p in storage.pdf_storage_path.rglob("*.pdf")] == [f"{first['content_sha256']}.pdf"]
+        assert os.listdir(storage.upload_staging_path) == []
+
+    def test_identical_images_share_file_and_thumbnail(self, storage):
+        buffer = io.BytesIO()
+        PILImage.effect_noise((200, 150), 50).convert("RGB").save(buffer, format="PNG")
+
+        first = storage.save_image(buffer.getvalue(), "png")
+        second = storage.save_image(buffer.getvalue(), "png")
+
+        assert first == second
+        assert os.path.exists(first["thumbnail_path"])
+
+        assert storage.delete_blob("image", first["image_path"], first["content_sha256"])
+        assert not os.path.exists(first["image_path"])
+        assert not os.path.exists(first["thumbnail_path"])
+
+
+class TestReferenceCounts:
+    """Test suite for BlobStore reference statements"""
+
+    def test_references_aggregated_per_blob(self):
+        db = MagicMock()
+
+        taken = BlobStore(db).add_references("image", [
+            ("bbb", "/images/b.png", 20),
+            ("aaa", "/images/a.png", 10),
+            ("bbb", "/images/b.png", 20),
+            (None, "/images/legacy.png", 5),
+        ])
+
+        assert taken == 3
+        db.execute.assert_called_once()
+        params = db.execute.call_args.args[1]
+        assert params == {
+            "kind": "image",
+            "shas": ["aaa", "bbb"],
+            "paths": ["/images/a.png", "/images/b.png"],
+            "sizes": [10, 20],
+            "refs": [1, 2]
+        }
+
+    def test_register_takes_no_reference(self):
+        db = MagicMock()
+
+        BlobStore(db).register("pdf", [("aaa", "/pdfs/a.pdf", 10)])
+
+        assert db.execute.call_args.args[1]["refs"] == [0]
+
+    def test_release(self):
+        db = MagicMock()
+        store = BlobStore(db)
+
+        assert store.release(["aaa", None, "aaa", "bbb"]) == 3
+        assert db.execute.call_args.args[1] == {"shas": ["aaa", "bbb"], "refs": [2, 1]}
+
+        db.reset_mock()
+        assert store.release([None]) == 0
+        db.execute.assert_not_called()
+
+
+class TestCollectGarbage:
+    """Test suite for orphaned blob collection"""
+
+    def blob(self, storage, name, age_hours, kind="pdf"):
+        sha256 = hashlib.sha256(name.encode()).hexdigest()
+        path = storage.content_path(storage.pdf_storage_path, sha256, ".pdf")
+        path.write_bytes(b"%PDF-" + name.encode())
+        stamp = time.time() - age_hours * 3600
+        os.utime(path, (stamp, stamp))
+        return SimpleNamespace(
+            sha256=sha256, kind=kind, file_path=str(path), size_bytes=100,
+            ref_count=0, released_at="old"
+        )
+
+    def test_deletes_only_unreferenced_old_files(self, storage):
+        orphan = self.blob(storage, "orphan", 48)
+        drifted = self.blob(storage, "drifted", 48)
+        restored = self.blob(storage, "restored", 1)
+        missing = self.blob(storage, "missing", 48)
+        os.unlink(missing.file_path)
+
+        db = MagicMock()
+        query = db.query.return_value.filter.return_value.order_by.return_value.limit.return_value
+        query.with_for_update.return_value.all.return_value = [orphan, drifted, restored, missing]
+
+        store = BlobStore(db, storage)
+        with patch.object(BlobStore, "count_references", return_value={drifted.sha256: 2}):
+            stats = store.collect_garbage(grace_hours=24, limit=10)
+
+        query.with_for_update.assert_called_once_with(skip_locked=True)
+        assert stats == {
+            "examined": 4, "deleted": 2, "bytes_freed": 200,
+            "repaired": 1, "skipped_recent": 1, "failed": 0
+        }
+        assert not os.path.exists(orphan.file_path)
+        assert os.path.exists(drifted.file_path) and drifted.ref_count == 2
+        assert os.path.exists(restored.file_path) and restored.released_at != "old"
+        assert [c.args[0] for c in db.delete.call_args_list] == [orphan, missing]
+        db.commit.assert_called_once()
+
+
+class TestReuseProcessedPDF:
+    """Test suite for copying the results of an identical PDF"""
+
+    def test_copies_text_chunks_and_images(self):
+        source_id, pdf_id, library_image = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        canonical = Image(
+            id=uuid.uuid4(), pdf_id=source_id, page_number=1, image_index_on_page=0,
+            file_path="/images/aa/bb/a.png", file_size_bytes=10, content_sha256="a" * 64,
+            ai_description="Axial MRI", embedding=[0.1] * 4, is_duplicate=False, duplicate_of_id=None
+        )
+        repeat = Image(
+            id=uuid.uuid4(), pdf_id=source_id, page_number=3, image_index_on_page=0,
+            file_path="/images/cc/dd/c.png", file_size_bytes=12, content_sha256="c" * 64,
+            is_duplicate=True, duplicate_of_id=canonical.id
+        )
+        from_library = Image(
+            id=uuid.uuid4(), pdf_id=source_id, page_number=4, image_index_on_page=0,
+            file_path="/images/ee/ff/e.png", file_size_bytes=14, content_sha256="e" * 64,
+            is_duplicate=True, duplicate_of_id=library_image
+        )
+        source = SimpleNamespace(
+            id=source_id, text_extracted=True, embeddings_generated=True, images_extracted=True,
+            extracted_text="full text", citations=[{"doi": "10.1/x"}], total_pages=12,
+            indexing_status="completed"
+        )
+        pdf = SimpleNamespace(id=pdf_id, total_pages=None)
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
+            canonical, repeat, from_library
+        ]
+        db.execute.return_value.rowcount = 5
+
+        with patch("backend.services.pdf_service.StorageService"):
+            result = PDFService(db).reuse_processed_pdf(pdf, source)
+
+        assert (result["copied_chunks"], result["copied_images"]) == (5, 3)
+        assert (pdf.extracted_text, pdf.total_pages, pdf.indexing_status) == ("full text", 12, "completed")
+        assert pdf.text_extracted and pdf.embeddings_generated and pdf.images_extracted
+
+        chunk_copy, image_insert, image_refs = db.execute.call_args_list
+        assert "INSERT INTO pdf_chunks" in str(chunk_copy.args[0])
+
+        rows = image_insert.args[1]
+        assert all(r["pdf_id"] == pdf_id for r in rows)
+        assert {r["id"] for r in rows}.isdisjoint({canonical.id, repeat.id, from_library.id})
+        assert rows[0]["ai_description"] == "Axial MRI" and rows[0]["embedding"] == [0.1] * 4
+        # Links inside the source point at the copies; links to other PDFs are kept
+        assert rows[1]["duplicate_of_id"] == rows[0]["id"]
+        assert rows[2]["duplicate_of_id"] == library_image
+
+        assert image_refs.args[1]["refs"] == [1, 1, 1]
+        db.commit.assert_called_once()
+
+    def test_no_hash_no_copy(self):
+        db = MagicMock()
+        with patch("backend.services.pdf_service.StorageService"):
+            assert PDFService(db).find_processed_copy(SimpleNamespace(id=uuid.uuid4(), content_sha256=None)) is None
+        db.query.assert_not_called()
+
+
+class TestDeleteBook:
+    """Test suite for releasing a book's linked PDF record and images"""
+
+    @pytest.mark.asyncio
+    async def test_linked_pdf_and_images_released_with_book(self):
+        from backend.api.textbook_routes import delete_book
+        from backend.database.models import PDF, PDFBook, PDFChapter, PDFChunk
+
+        book_id, pdf_id = uuid.uuid4(), uuid.uuid4()
+        book = SimpleNamespace(
+            id=book_id, pdf_id=pdf_id, file_path="/pdfs/aa/bb/b.pdf", content_sha256="b" * 64
+        )
+        pdf = SimpleNamespace(id=pdf_id, file_path=book.file_path, content_sha256="b" * 64)
+        images = [
+            SimpleNamespace(file_path="/images/aa/bb/a.png", thumbnail_path=None,
+                            content_sha256="a" * 64),
+            SimpleNamespace(file_path="/images/old.png", thumbnail_path="/thumbs/old.png",
+                            content_sha256=None),
+        ]
+
+        queries = {model: MagicMock() for model in (PDFBook, PDFChapter, PDFChunk, PDF, Image)}
+        queries[PDFBook].filter.return_value.first.return_value = book
+        queries[PDFChapter].filter.return_value.count.return_value = 2
+        queries[PDF].filter.return_value.first.return_value = pdf
+        queries[Image].filter.return_value.all.return_value = images
+        db = MagicMock()
+        db.query.side_effect = lambda model: queries.get(model, MagicMock())
+
+        with patch("backend.services.pdf_service.StorageService") as pdf_storage, \
+                patch("backend.api.textbook_routes.StorageService") as route_storage:
+            result = await delete_book(str(book_id), current_user=MagicMock(), db=db)
+
+        assert result["images_deleted"] == 2
+        released = [c.args[1] for c in db.execute.call_args_list]
+        assert released == [
+            {"shas": ["b" * 64], "refs": [1]},
+            {"shas": ["a" * 64, "b" * 64], "refs": [1, 1]},
+        ]
+        deleted = [c.args[0] for c in db.delete.call_args_list]
+        assert deleted == [book, *images, pdf]
+        pdf_storage.return_value.delete_image.assert_called_once_with(
+            "/images/old.png", "/thumbs/old.png"
+        )
+        route_storage.return_value.delete_pdf.assert_not_called()
+        db.commit.assert_called_once()
@@ -0,0 +1,167 @@
+"""
+Tests for the book ingestion workflow
+Tests one embedding task per book, batched requests, chord ordering
+(dedup after embeddings) and the set-based duplicate pass
+"""
+
+import contextvars
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from celery import chord
+
+from backend.services import chapter_embedding_service, chapter_vector_search_service
+from backend.services.chapter_embedding_service import build_book_ingestion_workflow
+from backend.services.chapter_vector_search_service import ChapterVectorSearchService
+
+TASKS = "backend.services."
+
+
+class TestWorkflowShape:
+    """Test suite for the chord built per upload"""
+
+    def test_one_header_task_per_book_then_dedup(self):
+        book_ids = [str(uuid.uuid4()) for _ in range(3)]
+
+        workflow = build_book_ingestion_workflow(book_ids)
+
+        assert isinstance(workflow, chord)
+        header = list(workflow.tasks)
+        assert [t.task for t in header] == [TASKS + "chapter_embedding_service.embed_book_chapters"] * 3
+        assert [t.args for t in header] == [(b,) for b in book_ids]
+        assert all(t.immutable for t in header)
+        assert workflow.body.task == TASKS + "chapter_vector_search_service.deduplicate_book_chapters"
+        assert workflow.body.kwargs == {"book_ids": book_ids}
+
+
+class TestBookIngestionRun:
+    """Test suite for running the workflow (eager) on a 60-chapter book"""
+
+    def test_embeddings_written_before_single_dedup_pass(self):
+        book_id = str(uuid.uuid4())
+        chapters = [(uuid.uuid4(), f"chapter text {i}", 5000 if i < 2 else 1000) for i in range(60)]
+        events = []
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.order_by.return_value.all.return_value = chapters
+        db.execute.side_effect = lambda statement, rows=None: events.append(("write", len(rows)))
+        db.commit.side_effect = lambda: events.append(("commit",))
+
+        async def embed_batch(texts):
+            events.append(("request", len(texts)))
+            return {"embeddings": [[0.1]] * len(texts), "model": "m", "tokens_used": 10, "cost_usd": 0.001}
+
+        def dedup(self, book_ids):
+            events.append(("dedup", tuple(book_ids)))
+            return {"status": "success", "book_ids": book_ids, "duplicates_marked": 0}
+
+        with patch.object(chapter_embedding_service.DatabaseTask, "db_session", db), \
+                patch.object(chapter_vector_search_service.DatabaseTask, "db_session", db), \
+                patch.object(chapter_embedding_service, "AIProviderService") as provider, \
+                patch.object(chapter_embedding_service.settings, "CHAPTER_EMBEDDING_BATCH_SIZE", 16), \
+                patch.object(chapter_embedding_service.generate_chunk_embeddings, "delay") as chunk_delay, \
+                patch.object(chapter_vector_search_service, "AIProviderService"), \
+                patch.object(ChapterVectorSearchService, "refresh_chapter_neighbors") as refresh, \
+                patch.object(ChapterVectorSearchService, "deduplicate_chapters", dedup), \
+                patch("celery.app.task.Task.apply_async") as apply_async:
+            provider.return_value.generate_embeddings_batch = embed_batch
+            # Own context: task_prerun sets worker-only state (LLM request priority)
+            result = contextvars.copy_context().run(lambda: build_book_ingestion_workflow([book_id]).apply().get())
+
+        # 60 chapters: 4 batched requests, one bulk write, one commit, then dedup once
+        assert events == [
+            ("request", 16), ("request", 16), ("request", 16), ("request", 12),
+            ("write", 60),
+            ("commit",),
+            ("dedup", (book_id,))
+        ]
+        assert result["chapters_embedded"] == 60
+        provider.assert_called_once()
+
+        # No per-chapter broker tasks besides chunking the long chapters
+        assert refresh.call_count == 60
+        assert chunk_delay.call_count == 2
+        apply_async.assert_not_called()
+
+
+class TestDeduplicateChapters:
+    """Test suite for the set-based duplicate pass"""
+
+    def chapter(self, chapter_id, source_type, group_id=None):
+        return SimpleNamespace(
+            id=chapter_id, source_type=source_type, word_count=5000, quality_score=None,
+            book=None, detection_confidence=None, duplicate_group_id=group_id,
+            is_duplicate=False, duplicate_of_id=None, preference_score=0.0
+        )
+
+    @pytest.fixture
+    def service(self):
+        with patch("backend.services.chapter_vector_search_service.AIProviderService"):
+            return ChapterVectorSearchService(MagicMock())
+
+    def test_pairs_grouped_and_preferred_kept(self, service):
+        a, b, c, d, e = (uuid.uuid4() for _ in range(5))
+        existing_group = uuid.uuid4()
+        chapters = [
+            self.chapter(a, "textbook_chapter"),
+            self.chapter(b, "textbook_chapter"),
+            self.chapter(c, "standalone_chapter", group_id=existing_group),
+            self.chapter(d, "textbook_chapter"),
+            self.chapter(e, "research_paper"),
+        ]
+        # a-b-c chained (one group), d-e a separate pair, reported in both directions
+        service.db.execute.return_value.fetchall.return_value = [(a, b), (b, c), (c, b), (d, e)]
+        # Matched chapters, then the current members of c's group
+        service.db.query.return_value.filter.return_value.all.side_effect = [chapters, [chapters[2]]]
+
+        result = service.deduplicate_chapters(["book-1"], threshold=0.95, candidates=20)
+
+        assert service.db.execute.call_count == 1
+        params = service.db.execute.call_args.args[1]
+        assert params == {"book_ids": ["book-1"], "candidates": 20, "threshold": 0.95}
+        assert (result["duplicate_groups"], result["duplicates_marked"]) == (2, 3)
+
+        by_id = {ch.id: ch for ch in chapters}
+        # Standalone chapter preferred; the group it already belonged to is reused
+        assert {by_id[x].duplicate_group_id for x in (a, b, c)} == {existing_group}
+        assert not by_id[c].is_duplicate and by_id[c].duplicate_of_id is None
+        assert by_id[a].duplicate_of_id == by_id[b].duplicate_of_id == c
+        assert by_id[e].duplicate_of_id == d and not by_id[d].is_duplicate
+        service.db.commit.assert_called_once()
+
+    # Equal score: the existing canonical stays; higher score: the new chapter takes over
+    @pytest.mark.parametrize("new_type,canonical", [("textbook_chapter", "p"), ("standalone_chapter", "n")])
+    def test_match_with_non_canonical_member_joins_whole_group(self, service, new_type, canonical):
+        group = uuid.uuid4()
+        ids = {name: uuid.uuid4() for name in "pbsn"}
+        p = self.chapter(ids["p"], "textbook_chapter", group_id=group)
+        b = self.chapter(ids["b"], "research_paper", group_id=group)
+        s = self.chapter(ids["s"], "research_paper", group_id=group)
+        b.is_duplicate = s.is_duplicate = True
+        b.duplicate_of_id = s.duplicate_of_id = p.id
+        n = self.chapter(ids["n"], new_type)
+        by_name = {"p": p, "b": b, "s": s, "n": n}
+
+        # The new chapter only matched b, a duplicate in the existing group
+        service.db.execute.return_value.fetchall.return_value = [(n.id, b.id)]
+        service.db.query.return_value.filter.return_value.all.side_effect = [[n, b], [p, b, s]]
+
+        result = service.deduplicate_chapters(["book-1"])
+
+        assert (result["duplicate_groups"], result["duplicates_marked"]) == (1, 3)
+        assert {ch.duplicate_group_id for ch in by_name.values()} == {group}
+        # Exactly one canonical; every other member points at it
+        assert [name for name, ch in by_name.items() if not ch.is_duplicate] == [canonical]
+        assert all(
+            ch.duplicate_of_id == ids[canonical] for name, ch in by_name.items() if name != canonical
+        )
+
+    def test_no_matches(self, service):
+        service.db.execute.return_value.fetchall.return_value = []
+
+        result = service.deduplicate_chapters(["book-1"])
+
+        assert result["duplicates_marked"] == 0
+        service.db.query.assert_not_called()
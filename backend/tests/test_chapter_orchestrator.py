@@ -0,0 +1,309 @@
+"""
+Tests for Chapter Orchestrator
+Tests section generation scheduling, progress reporting, image placement and
+incremental section regeneration
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from backend.services.chapter_orchestrator import ChapterOrchestrator
+
+
+@pytest.fixture
+def orchestrator():
+    with patch("backend.services.chapter_orchestrator.AIProviderService"), \
+            patch("backend.services.chapter_orchestrator.ResearchService"), \
+            patch("backend.services.chapter_orchestrator.DeduplicationService"), \
+            patch("backend.services.chapter_orchestrator.FactCheckingService"):
+        return ChapterOrchestrator(Mock())
+
+
+@pytest.fixture
+def chapter():
+    chapter = Mock()
+    chapter.id = "chapter-1"
+    chapter.title = "Glioblastoma"
+    return chapter
+
+
+@pytest.fixture
+def emitter():
+    with patch("backend.services.chapter_orchestrator.emitter") as mock_emitter:
+        mock_emitter.emit_section_generated = AsyncMock()
+        mock_emitter.emit_chapter_progress = AsyncMock()
+        yield mock_emitter
+
+
+class TestParallelSectionGeneration:
+    """Test suite for sliding-window section generation"""
+
+    @pytest.mark.asyncio
+    async def test_ordered_output_with_placeholder_and_progress(self, orchestrator, chapter, emitter):
+        plan = [{"title": f"Section {i}"} for i in range(4)]
+
+        async def generate(chapter, section_plan, section_idx, all_sources):
+            await asyncio.sleep(0.01 * (4 - section_idx))
+            if section_idx == 2:
+                raise ValueError("schema mismatch")
+            return {"section_num": section_idx + 1, "title": section_plan["title"], "content": "x"}, 0.5
+
+        with patch.object(orchestrator, "_generate_single_section", side_effect=generate), \
+                patch("backend.services.chapter_orchestrator.settings") as mock_settings:
+            mock_settings.SECTION_GENERATION_BATCH_SIZE = 2
+            mock_settings.SECTION_GENERATION_MIN_CONCURRENCY = 1
+            mock_settings.SECTION_GENERATION_MAX_CONCURRENCY = 2
+            mock_settings.SECTION_GENERATION_LATENCY_TARGET_SECONDS = 60
+            mock_settings.SECTION_GENERATION_MAX_ATTEMPTS = 1
+            mock_settings.SECTION_GENERATION_RETRY_BASE_DELAY = 0
+
+            sections, cost = await orchestrator._generate_sections_parallel(chapter, plan, [])
+
+        assert [s["section_num"] for s in sections] == [1, 2, 3, 4]
+        assert sections[2]["generation_error"] == "schema mismatch"
+        assert cost == 1.5
+        assert emitter.emit_section_generated.await_count == 4
+        messages = [call.args[3] for call in emitter.emit_chapter_progress.await_args_list]
+        assert messages[-1] == "Generated 4/4 sections"
+
+
+class TestImageIntegration:
+    """Test suite for batched stage 7 image placement"""
+
+    @pytest.mark.asyncio
+    async def test_global_placement_with_concurrent_captions(self, orchestrator, chapter):
+        chapter.stage_3_internal_research = {"images": [
+            {"image_id": "img-a", "file_path": "a.png", "caption": "Axial MRI of glioma"},
+            {"image_id": "img-b", "file_path": "b.png", "caption": "Pterional approach"},
+        ]}
+        chapter.sections = [
+            {"title": "Imaging", "content": "MRI findings", "subsections": [
+                {"title": "Perfusion", "content": "rCBV"}
+            ]},
+            {"title": "Surgery", "content": "Approach selection"},
+        ]
+        # Slots: Imaging, Imaging - Perfusion, Surgery
+        scores = np.array([
+            [0.9, 0.2],
+            [0.8, 0.1],
+            [0.3, 0.7],
+        ])
+        in_flight = 0
+        peak = 0
+
+        async def caption(image, section_title, section_context):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"{image['caption']} ({section_title})"
+
+        with patch.object(orchestrator, "_image_placement_scores", AsyncMock(return_value=(scores, 0.3))), \
+                patch.object(orchestrator, "_cached_image_caption", side_effect=caption):
+            await orchestrator._stage_7_image_integration(chapter)
+
+        imaging, surgery = chapter.sections
+        assert [i["image_id"] for i in imaging["images"]] == ["img-a"]
+        assert imaging["subsections"][0]["images"] == []
+        assert surgery["images"][0]["caption"] == "Pterional approach (Surgery)"
+        assert surgery["images"][0]["relevance_score"] == pytest.approx(0.7)
+        assert peak == 2
+
+    def test_keyword_scores_fallback(self, orchestrator):
+        slots = [
+            {"match_title": "Diagnostic imaging", "content": "contrast enhancement on MRI",
+             "section_type": "diagnostic_evaluation"},
+            {"match_title": "Resection", "content": "surgical corridor", "section_type": "surgical_technique"},
+        ]
+        images = [{"caption": "MRI with contrast enhancement"}, {"caption": "Surgical corridor exposure"}]
+
+        scores = orchestrator._keyword_image_scores(slots, images)
+
+        assert scores.shape == (2, 2)
+        assert scores[0, 0] > scores[0, 1]
+        assert scores[1, 1] > scores[1, 0]
+
+
+class TestStageGraph:
+    """Test suite for the stage dependency graph"""
+
+    @pytest.mark.asyncio
+    async def test_fact_check_fingerprints_survive_formatting(self, orchestrator, chapter, emitter):
+        from backend.services.section_artifacts import dirty_artifacts
+        from backend.services.stage_scheduler import StageScheduler
+
+        chapter.references = []
+        chapter.stage_3_internal_research = {"sources": [{"title": "Temozolomide trial"}]}
+        chapter.stage_4_external_research = {"sources": []}
+        chapter.sections = [
+            {"title": "Imaging", "content": "MRI findings"},
+            {"title": "Treatment", "content": "Temozolomide improves survival"},
+        ]
+
+        async def fact_check_chapter(**kwargs):
+            # Slower than formatting, so the two would interleave if run concurrently
+            await asyncio.sleep(0.05)
+            return {
+                "overall_accuracy": 1.0, "critical_issues_count": 0,
+                "verified_claims": 2, "total_claims": 2, "total_cost_usd": 0.01
+            }
+
+        checker = orchestrator.fact_check_service
+        checker.fact_check_chapter = AsyncMock(side_effect=fact_check_chapter)
+        orchestrator._store_fact_check = Mock()
+        real_stages = ("_stage_10_fact_checking", "_stage_11_formatting")
+        stubs = [
+            patch.object(orchestrator, name, AsyncMock())
+            for name in dir(orchestrator)
+            if name.startswith("_stage_") and name[7].isdigit() and name not in real_stages
+        ]
+        for stub in stubs:
+            stub.start()
+        try:
+            await StageScheduler(orchestrator._build_stage_graph(chapter, "Glioblastoma")).run()
+        finally:
+            for stub in stubs:
+                stub.stop()
+
+        assert all("fact_check" in s["artifact_fingerprints"] for s in chapter.sections)
+        assert all("fact_check" not in dirty_artifacts(s) for s in chapter.sections)
+
+
+class TestIncrementalSectionRegeneration:
+    """Test suite for dirty-tracked artifact refresh after section regeneration"""
+
+    @pytest.fixture
+    def regen_chapter(self, chapter):
+        from backend.services.section_artifacts import mark_clean
+
+        chapter.references = [{"ref_num": 1, "authors": ["Stupp R"], "year": 2005}]
+        chapter.stage_3_internal_research = {
+            "sources": [{"title": "Temozolomide trial"}],
+            "images": [{"image_id": "img-a", "caption": "MRI"}, {"image_id": "img-b", "caption": "Resection"}]
+        }
+        chapter.stage_4_external_research = {"sources": []}
+        chapter.stage_5_synthesis_metadata = {"outline": []}
+        chapter.sections = [
+            {"title": "Imaging", "content": "MRI findings", "images": [{"image_id": "img-a"}]},
+            {"title": "Treatment", "content": "Old text", "images": []},
+            {"title": "Prognosis", "content": "Survival data", "images": []},
+        ]
+        for section in chapter.sections:
+            mark_clean(section, "formatting", "citations", "images", "embedding", "fact_check")
+        chapter.stage_10_fact_check = {"section_results": [
+            {"section_title": s["title"], "section_index": idx,
+             "claims": [], "critical_issues": [], "ai_cost_usd": 0.02}
+            for idx, s in enumerate(chapter.sections)
+        ]}
+        return chapter
+
+    @pytest.fixture
+    def regen(self, orchestrator):
+        from backend.services.fact_checking_service import FactCheckingService
+
+        checker = FactCheckingService.__new__(FactCheckingService)
+        orchestrator.fact_check_service.aggregate_results = checker.aggregate_results
+        orchestrator.fact_check_service.get_verification_summary = checker.get_verification_summary
+        orchestrator.fact_check_service.select_relevant_sources = lambda title, content, sources: sources
+        orchestrator.fact_check_service.fact_check_section = AsyncMock(return_value={
+            "section_title": "Treatment",
+            "claims": [{"claim": "TMZ improves survival", "verified": True, "severity_if_wrong": "high"}],
+            "critical_issues": [],
+            "ai_cost_usd": 0.03
+        })
+        orchestrator.ai_service.generate_text = AsyncMock(
+            return_value={"text": "Temozolomide improves survival [Stupp, 2005].", "cost_usd": 0.08}
+        )
+        orchestrator.ai_service.generate_embedding = AsyncMock(
+            return_value={"embedding": [0.1, 0.2], "model": "text-embedding-3-small"}
+        )
+        orchestrator._image_placement_scores = AsyncMock(return_value=(np.array([[0.9]]), 0.3))
+        orchestrator._cached_image_caption = AsyncMock(return_value="Resection cavity")
+
+        with patch("backend.services.chapter_orchestrator.emitter") as mock_emitter:
+            mock_emitter.emit_section_regenerated = AsyncMock()
+            yield orchestrator
+
+    @pytest.mark.asyncio
+    async def test_only_regenerated_section_is_recomputed(self, regen, regen_chapter):
+        result = await regen.regenerate_section(regen_chapter, 1)
+
+        imaging, treatment, prognosis = regen_chapter.sections
+        # Images: only the regenerated section is scored, against images not placed elsewhere
+        slots, available = regen._image_placement_scores.await_args.args
+        assert [slot["match_title"] for slot in slots] == ["Treatment"]
+        assert [image["image_id"] for image in available] == ["img-b"]
+        assert treatment["images"][0]["image_id"] == "img-b"
+        assert imaging["images"] == [{"image_id": "img-a"}]
+
+        # Citations and fact-check for this section only, totals re-aggregated
+        assert treatment["citations"] == [{"marker": "Stupp, 2005", "ref_num": 1}]
+        regen.fact_check_service.fact_check_section.assert_awaited_once()
+        section_results = regen_chapter.stage_10_fact_check["section_results"]
+        assert [r["section_title"] for r in section_results] == ["Imaging", "Treatment", "Prognosis"]
+        assert regen_chapter.stage_10_fact_check["total_claims"] == 1
+
+        saved = result["saved_work"]["artifacts"]
+        assert saved["fact_check"] == {"recomputed": 1, "full_pass": 3, "saved": 2}
+        assert saved["embedding"] == {"recomputed": 1, "full_pass": 3, "saved": 2}
+        assert result["saved_work"]["fact_check_cost_avoided_usd"] == pytest.approx(0.04)
+
+        # The chapter search vector is rebuilt from the new section text
+        embedded_text = regen.ai_service.generate_embedding.await_args.args[0]
+        assert "Temozolomide improves survival" in embedded_text
+        assert "Old text" not in embedded_text
+        sql, params = regen.db.execute.call_args.args
+        assert "UPDATE chapters" in str(sql)
+        assert params["chapter_id"] == "chapter-1"
+        assert result["saved_work"]["chapter_embedding_refreshed"] is True
+
+    @pytest.mark.asyncio
+    async def test_duplicate_section_titles_keep_their_own_fact_check(self, regen, regen_chapter):
+        regen_chapter.sections[2]["title"] = "Treatment"
+        for idx, r in enumerate(regen_chapter.stage_10_fact_check["section_results"]):
+            r["section_title"] = regen_chapter.sections[idx]["title"]
+
+        await regen.regenerate_section(regen_chapter, 2)
+
+        section_results = regen_chapter.stage_10_fact_check["section_results"]
+        assert [r["section_index"] for r in section_results] == [0, 1, 2]
+        assert section_results[1]["claims"] == []
+        assert len(section_results[2]["claims"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_chapter_embedding_is_cleared(self, regen, regen_chapter):
+        regen.ai_service.generate_embedding.side_effect = RuntimeError("provider down")
+
+        result = await regen.regenerate_section(regen_chapter, 1)
+
+        sql, params = regen.db.execute.call_args.args
+        assert "SET embedding = NULL" in str(sql)
+        assert params == {"chapter_id": "chapter-1"}
+        assert result["saved_work"]["chapter_embedding_refreshed"] is False
+
+    @pytest.mark.asyncio
+    async def test_unchanged_content_recomputes_nothing(self, regen, regen_chapter):
+        await regen.regenerate_section(regen_chapter, 1)
+        regen.fact_check_service.fact_check_section.reset_mock()
+        regen._image_placement_scores.reset_mock()
+
+        result = await regen.regenerate_section(regen_chapter, 1)
+
+        assert result["saved_work"]["dirty"] == []
+        regen.fact_check_service.fact_check_section.assert_not_awaited()
+        regen._image_placement_scores.assert_not_awaited()
+
+    def test_fingerprint_ignores_formatting_whitespace(self):
+        from backend.services.section_artifacts import dirty_artifacts, mark_clean
+
+        section = {"title": "Intro", "content": "Text [Smith, 2020]"}
+        mark_clean(section, "images")
+        section["content"] = "Text  [Smith, 2020]\n"
+
+        assert "images" not in dirty_artifacts(section)
+        section["content"] = "Different text"
+        assert "images" in dirty_artifacts(section)
@@ -0,0 +1,126 @@
+"""
+Tests for Chapter Vector Search Service
+Tests materialized related-chapter reads and incremental neighbor refresh
+"""
+
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.services.chapter_vector_search_service import ChapterVectorSearchService
+
+
+def _chapter(title="Chapter", is_duplicate=False):
+    chapter = Mock()
+    chapter.id = uuid.uuid4()
+    chapter.chapter_title = title
+    chapter.is_duplicate = is_duplicate
+    return chapter
+
+
+def _query(rows):
+    """Chainable query mock returning rows from .all()"""
+    query = Mock()
+    for method in ("join", "filter", "options", "order_by", "limit"):
+        getattr(query, method).return_value = query
+    query.all.return_value = rows
+    return query
+
+
+@pytest.fixture
+def service():
+    with patch("backend.services.chapter_vector_search_service.AIProviderService"):
+        return ChapterVectorSearchService(Mock())
+
+
+class TestFindSimilarChapters:
+    """Test suite for find_similar_chapters"""
+
+    def test_reads_materialized_list_in_one_query(self, service):
+        close, far = _chapter("Close"), _chapter("Far")
+        service.db.query.return_value = _query([(close, 0.9), (far, -0.2)])
+
+        results = service.find_similar_chapters(uuid.uuid4(), limit=5)
+
+        # cosine 0.9 -> 0.95 score; cosine -0.2 -> 0.4 is below the 0.5 cutoff
+        assert results == [(close, pytest.approx(0.95))]
+        assert service.db.query.call_count == 1
+
+    def test_falls_back_to_live_knn_when_list_missing(self, service):
+        chapter = _chapter()
+        service.db.query.return_value = _query([])
+
+        with patch.object(
+            service, "_live_similar_chapters", return_value=[(chapter, 1.0)]
+        ) as live:
+            results = service.find_similar_chapters(uuid.uuid4(), limit=3, exclude_duplicates=False)
+
+        live.assert_called_once()
+        assert results == [(chapter, 1.0)]
+
+    def test_duplicates_dropped_before_limit(self, service):
+        first, duplicate, second = _chapter("A"), _chapter("Dup", is_duplicate=True), _chapter("B")
+        service.db.query.return_value = _query([(first, 0.9), (duplicate, 0.9), (second, 0.8)])
+
+        with patch.object(service, "_live_similar_chapters") as live:
+            results = service.find_similar_chapters(uuid.uuid4(), limit=2)
+
+        live.assert_not_called()
+        assert [chapter for chapter, _ in results] == [first, second]
+
+    def test_full_list_short_after_duplicates_falls_back_to_live_knn(self, service):
+        chapters = [_chapter(is_duplicate=True), _chapter(is_duplicate=True), _chapter()]
+        service.db.query.return_value = _query([(chapter, 0.9) for chapter in chapters])
+        beyond_list = [(_chapter(), 0.8) for _ in range(2)]
+
+        with patch("backend.services.chapter_vector_search_service.settings") as mock_settings, \
+                patch.object(service, "_live_similar_chapters", return_value=beyond_list) as live:
+            mock_settings.CHAPTER_NEIGHBORS_K = 3
+            results = service.find_similar_chapters(uuid.uuid4(), limit=2)
+
+        live.assert_called_once()
+        assert live.call_args.args[1:] == (2, True)
+        assert len(results) == 2
+
+
+class TestRefreshChapterNeighbors:
+    """Test suite for incremental neighbor maintenance"""
+
+    def test_rebuilds_affected_lists_and_inserts_into_qualifying(self, service):
+        chapter_id = uuid.uuid4()
+        previous_owner = uuid.uuid4()
+        new_owner = uuid.uuid4()
+        executed = []
+
+        def execute(statement, params=None):
+            sql = str(statement)
+            executed.append((sql, params))
+            result = Mock()
+            if sql.strip().startswith("SELECT chapter_id FROM pdf_chapter_neighbors"):
+                result.__iter__ = Mock(return_value=iter([(previous_owner,)]))
+            elif "WITH source AS" in sql:
+                result.fetchall.return_value = [(new_owner, 0.8)]
+            return result
+
+        service.db.execute.side_effect = execute
+
+        summary = service.refresh_chapter_neighbors(chapter_id, k=10)
+
+        assert summary["lists_rebuilt"] == 2
+        assert summary["lists_updated"] == 1
+
+        materialize = [p for sql, p in executed if "CROSS JOIN LATERAL" in sql]
+        assert materialize == [{"chapter_ids": [str(chapter_id), str(previous_owner)], "k": 10}]
+
+        inserts = [p for sql, p in executed if "VALUES (:owner_id" in sql]
+        assert inserts[0][0]["owner_id"] == str(new_owner)
+        service.db.commit.assert_called_once()
+
+    def test_rolls_back_on_error(self, service):
+        service.db.execute.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            service.refresh_chapter_neighbors(uuid.uuid4(), k=10)
+
+        service.db.rollback.assert_called_once()
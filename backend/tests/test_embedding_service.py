@@ -0,0 +1,184 @@
+"""
+Tests for Embedding Service
+Tests chunk-level PDF ingestion (batched embedding, bulk insert), batched
+image embeddings and parent-document aggregation of chunk search hits
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.services.embedding_service import EmbeddingService, aggregate_chunk_hits
+
+
+@pytest.fixture
+def mock_db():
+    return MagicMock()
+
+
+@pytest.fixture
+def service(mock_db):
+    with patch("backend.services.embedding_service.AIProviderService"):
+        service = EmbeddingService(mock_db)
+    service.ai_service.generate_embeddings_batch = AsyncMock(
+        side_effect=lambda texts: {
+            "embeddings": [[float(len(t)), 0.0] for t in texts],
+            "dimensions": 2,
+            "model": "text-embedding-3-large",
+            "cost_usd": 0.001
+        }
+    )
+    return service
+
+
+def hit(parent_id, chunk_index, similarity):
+    return {"parent_id": parent_id, "chunk_index": chunk_index, "chunk_text": f"{parent_id}-{chunk_index}", "similarity": similarity}
+
+
+class TestChunkAggregation:
+    """Test suite for ranking parent documents from chunk hits"""
+
+    HITS = [hit("a", 0, 0.90), hit("b", 3, 0.85), hit("b", 7, 0.84), hit("b", 9, 0.80), hit("a", 1, 0.40)]
+
+    def test_max_ranks_by_best_chunk(self):
+        parents = aggregate_chunk_hits(self.HITS, method="max")
+
+        assert [p["parent_id"] for p in parents] == ["a", "b"]
+        assert parents[0]["best_chunk"]["chunk_index"] == 0
+        assert parents[1]["matched_chunks"] == 3
+
+    def test_topk_sum_rewards_repeated_matches(self):
+        parents = aggregate_chunk_hits(self.HITS, method="topk_sum", top_k=3)
+
+        assert [p["parent_id"] for p in parents] == ["b", "a"]
+        assert parents[0]["score"] == pytest.approx(0.85 + 0.84 + 0.80)
+        assert parents[0]["similarity"] == 0.85
+
+    def test_search_fetches_candidates_per_result(self, service, mock_db):
+        rows = [
+            SimpleNamespace(pdf_id=h["parent_id"], chunk_index=h["chunk_index"], chunk_text=h["chunk_text"], similarity=h["similarity"])
+            for h in self.HITS
+        ]
+        mock_db.execute.side_effect = [MagicMock(), rows]
+
+        with patch("backend.services.embedding_service.settings") as settings:
+            settings.PDF_CHUNK_HNSW_EF_SEARCH = 100
+            settings.PDF_CHUNK_CANDIDATES_PER_RESULT = 10
+            settings.PDF_CHUNK_AGGREGATION = "max"
+            settings.PDF_CHUNK_AGGREGATION_TOP_K = 3
+            matches = service.search_pdfs_by_chunks([0.1, 0.2], max_results=1, min_similarity=0.5)
+
+        assert [m["parent_id"] for m in matches] == ["a"]
+        assert mock_db.execute.call_args.args[1]["limit"] == 10
+
+    def test_search_without_query_embedding(self, service, mock_db):
+        assert service.search_pdfs_by_chunks(None, max_results=5) == []
+        mock_db.execute.assert_not_called()
+
+
+class TestPDFChunkIngestion:
+    """Test suite for chunk-level PDF embeddings"""
+
+    @pytest.fixture
+    def pdf(self, mock_db):
+        words = [f"w{i}" for i in range(5000)]
+        words[4500:4503] = ["planted", "deep", "passage"]
+        pdf = SimpleNamespace(id=uuid.uuid4(), extracted_text="  ".join(words), embeddings_generated=False)
+        mock_db.query.return_value.filter.return_value.first.return_value = pdf
+        return pdf
+
+    @pytest.mark.asyncio
+    async def test_every_chunk_embedded_in_batches(self, service, mock_db, pdf):
+        with patch("backend.services.embedding_service.settings") as settings:
+            settings.PDF_CHUNK_EMBEDDING_BATCH_SIZE = 4
+            settings.OPENAI_EMBEDDING_MODEL = "text-embedding-3-large"
+            result = await service.generate_pdf_embeddings(str(pdf.id), chunk_size=512, overlap=50)
+
+        rows = [row for call in mock_db.execute.call_args_list for row in call.args[1]]
+        assert result["num_chunks"] == len(rows) == 15  # 5000 words, 384-word windows advancing 347 words
+        assert service.ai_service.generate_embeddings_batch.await_count == 4
+        assert [r["chunk_index"] for r in rows] == list(range(15))
+        assert all(r["pdf_id"] == pdf.id and r["embedding"] for r in rows)
+        assert any("planted  deep  passage" in r["chunk_text"] for r in rows)
+
+        # Offsets point back into the extracted text
+        for r in rows:
+            assert pdf.extracted_text[r["start_char_offset"]:r["end_char_offset"]] == r["chunk_text"]
+
+        # Previous chunks replaced in the same transaction
+        mock_db.query.return_value.filter.return_value.delete.assert_called_once()
+        mock_db.commit.assert_called_once()
+        assert pdf.embeddings_generated is True
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_rolls_back(self, service, mock_db, pdf):
+        service.ai_service.generate_embeddings_batch = AsyncMock(side_effect=RuntimeError("rate limited"))
+
+        with pytest.raises(RuntimeError):
+            await service.generate_pdf_embeddings(str(pdf.id))
+
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+        assert pdf.embeddings_generated is False
+
+
+class TestPDFImageEmbeddings:
+    """Test suite for batched image description embeddings"""
+
+    @pytest.fixture
+    def images(self, mock_db):
+        images = sorted((uuid.uuid4(), f"MRI showing structure {i}") for i in range(10))
+        query = mock_db.query.return_value.filter.return_value
+        query.order_by.return_value.all.return_value = images
+        query.filter.return_value.order_by.return_value.all.return_value = images[6:]
+        return images
+
+    def settings(self, batch_size, concurrency):
+        return patch.multiple(
+            "backend.services.embedding_service.settings",
+            PDF_IMAGE_EMBEDDING_BATCH_SIZE=batch_size,
+            PDF_IMAGE_EMBEDDING_CONCURRENCY=concurrency
+        )
+
+    @pytest.mark.asyncio
+    async def test_batched_requests_one_update_per_window(self, service, mock_db, images):
+        progress = []
+
+        with self.settings(batch_size=3, concurrency=2):
+            result = await service.generate_pdf_image_embeddings("pdf-1", on_progress=lambda *a: progress.append(a))
+
+        assert service.ai_service.generate_embeddings_batch.await_count == result["requests"] == 4
+        # Windows of 2 x 3 images: 6 + 4
+        assert mock_db.execute.call_count == mock_db.commit.call_count == 2
+        rows = [row for call in mock_db.execute.call_args_list for row in call.args[1]]
+        assert [r["id"] for r in rows] == [image_id for image_id, _ in images]
+        assert rows[0]["embedding"] == [float(len(images[0][1])), 0.0]
+        assert progress == [(str(images[5][0]), 6), (str(images[9][0]), 10)]
+        assert result["embedded_count"] == 10 and result["failed_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_cursor(self, service, mock_db, images):
+        with self.settings(batch_size=8, concurrency=4):
+            result = await service.generate_pdf_image_embeddings("pdf-1", after_id=str(images[5][0]))
+
+        assert result["embedded_count"] == 4
+        assert [r["id"] for r in mock_db.execute.call_args.args[1]] == [image_id for image_id, _ in images[6:]]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_skipped(self, service, mock_db, images):
+        calls = []
+
+        async def flaky(texts):
+            calls.append(texts)
+            if len(calls) == 2:
+                raise RuntimeError("rate limited")
+            return {"embeddings": [[1.0] for _ in texts], "cost_usd": 0.0}
+
+        service.ai_service.generate_embeddings_batch = flaky
+        with self.settings(batch_size=4, concurrency=4):
+            result = await service.generate_pdf_image_embeddings("pdf-1")
+
+        assert (result["embedded_count"], result["failed_count"]) == (6, 4)
+        assert len(mock_db.execute.call_args.args[1]) == 6
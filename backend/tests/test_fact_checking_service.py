@@ -0,0 +1,258 @@
+"""
+Tests for Fact-Checking Service
+Tests concurrent chapter checking, per-section source selection and the claim cache
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.services.fact_checking_service import (
+    FactCheckingService,
+    normalize_claim,
+    source_fingerprint,
+    split_claim_sentences,
+)
+
+
+class FakeCache:
+    """Dict-backed stand-in for RedisManager get/set/make_key"""
+
+    def __init__(self):
+        self.store = {}
+
+    def make_key(self, *parts, namespace="app"):
+        return ":".join([namespace] + [str(p) for p in parts])
+
+    def get(self, key, default=None):
+        return json.loads(self.store[key]) if key in self.store else default
+
+    def set(self, key, value, ttl=None):
+        self.store[key] = json.dumps(value)
+        return True
+
+
+def _claim(text, verified=True, severity="low"):
+    return {
+        "claim": text,
+        "verified": verified,
+        "confidence": 0.9,
+        "source_pmid": None,
+        "source_context": None,
+        "category": "anatomy",
+        "severity_if_wrong": severity,
+        "notes": None
+    }
+
+
+def _response(claims):
+    return {
+        "data": {
+            "claims": claims,
+            "overall_accuracy": 1.0,
+            "unverified_count": 0,
+            "critical_issues": [],
+            "recommendations": []
+        },
+        "model": "gpt-4o",
+        "provider": "openai",
+        "cost_usd": 0.01
+    }
+
+
+@pytest.fixture
+def cache():
+    return FakeCache()
+
+
+@pytest.fixture
+def service(cache):
+    with patch("backend.services.fact_checking_service.AIProviderService"):
+        service = FactCheckingService(cache=cache)
+    service.ai_service.generate_text_with_schema = AsyncMock()
+    return service
+
+
+SOURCES = [{"pmid": "1", "title": "Glioma survival"}, {"pmid": "2", "title": "Meningioma resection"}]
+
+
+class TestHelpers:
+    """Test suite for normalization and fingerprinting"""
+
+    def test_normalize_claim_ignores_markup_case_and_punctuation(self):
+        assert normalize_claim("<p>The MCA supplies   the lateral cortex.</p>") == \
+            normalize_claim("the mca supplies the lateral cortex")
+
+    def test_split_claim_sentences_drops_fragments(self):
+        sentences = split_claim_sentences("<h2>Anatomy</h2><p>The MCA supplies the lateral cortex. Short one. "
+                                          "The ACA supplies the medial frontal lobe!</p>")
+        assert sentences == [
+            "Anatomy The MCA supplies the lateral cortex.",
+            "The ACA supplies the medial frontal lobe!"
+        ]
+
+    def test_source_fingerprint_is_order_independent(self):
+        assert source_fingerprint(SOURCES) == source_fingerprint(list(reversed(SOURCES)))
+        assert source_fingerprint(SOURCES) != source_fingerprint(SOURCES[:1])
+
+
+class TestClaimCache:
+    """Test suite for claim-level result caching"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_section_is_not_reverified(self, service):
+        content = "The MCA supplies the lateral cortex. The ACA supplies the medial frontal lobe."
+        service.ai_service.generate_text_with_schema.return_value = _response([
+            _claim("The MCA supplies the lateral cortex."),
+            _claim("The ACA supplies the medial frontal lobe.", verified=False)
+        ])
+
+        first = await service.fact_check_section(content, SOURCES, "Vascular", "Anatomy")
+        second = await service.fact_check_section(content, SOURCES, "Vascular", "Anatomy")
+
+        assert service.ai_service.generate_text_with_schema.await_count == 1
+        assert first["from_cache"] is False
+        assert second["from_cache"] is True
+        assert second["claims"] == first["claims"]
+        assert second["ai_cost_usd"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_only_changed_sentences_are_sent(self, service):
+        service.ai_service.generate_text_with_schema.return_value = _response([
+            _claim("The MCA supplies the lateral cortex."),
+            _claim("The ACA supplies the medial frontal lobe.", verified=False, severity="critical")
+        ])
+        await service.fact_check_section(
+            "The MCA supplies the lateral cortex. The ACA supplies the medial frontal lobe.",
+            SOURCES, "Vascular", "Anatomy"
+        )
+
+        service.ai_service.generate_text_with_schema.return_value = _response([
+            _claim("The PCA supplies the occipital lobe.")
+        ])
+        result = await service.fact_check_section(
+            "The MCA supplies the lateral cortex. The ACA supplies the medial frontal lobe. "
+            "The PCA supplies the occipital lobe.",
+            SOURCES, "Vascular", "Anatomy"
+        )
+
+        prompt = service.ai_service.generate_text_with_schema.await_args.kwargs["prompt"]
+        assert "The PCA supplies the occipital lobe." in prompt
+        assert "The MCA supplies the lateral cortex." not in prompt
+        assert result["cached_claims"] == 2
+        assert result["new_claims"] == 1
+        assert result["unverified_count"] == 1
+        assert result["overall_accuracy"] == pytest.approx(2 / 3)
+        assert any("ACA" in issue for issue in result["critical_issues"])
+
+    @pytest.mark.asyncio
+    async def test_different_sources_miss_the_cache(self, service):
+        content = "The MCA supplies the lateral cortex."
+        service.ai_service.generate_text_with_schema.return_value = _response([_claim(content)])
+
+        await service.fact_check_section(content, SOURCES, "Vascular", "Anatomy")
+        await service.fact_check_section(content, SOURCES[:1], "Vascular", "Anatomy")
+
+        assert service.ai_service.generate_text_with_schema.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_edit_that_reselects_sources_keeps_other_claims_cached(self, service):
+        pool = [
+            {"pmid": "1", "title": "Middle cerebral artery territory"},
+            {"pmid": "2", "title": "Posterior cerebral artery occipital supply"}
+        ]
+        unchanged = "The MCA supplies the lateral cortex."
+        before = f"{unchanged} The middle cerebral artery is large."
+        after = f"{unchanged} The posterior cerebral artery supplies occipital cortex."
+        subsets = [service.select_relevant_sources("Anatomy", text, pool, max_sources=1)
+                   for text in (before, after)]
+        assert subsets[0] != subsets[1]
+
+        service.ai_service.generate_text_with_schema.return_value = _response([
+            _claim(unchanged), _claim("The middle cerebral artery is large.")
+        ])
+        await service.fact_check_section(
+            before, subsets[0], "Vascular", "Anatomy", source_pool=pool
+        )
+
+        service.ai_service.generate_text_with_schema.return_value = _response([
+            _claim("The posterior cerebral artery supplies occipital cortex.")
+        ])
+        result = await service.fact_check_section(
+            after, subsets[1], "Vascular", "Anatomy", source_pool=pool
+        )
+
+        prompt = service.ai_service.generate_text_with_schema.await_args.kwargs["prompt"]
+        assert unchanged not in prompt
+        assert result["cached_claims"] == 1
+        assert result["new_claims"] == 1
+
+    @pytest.mark.asyncio
+    async def test_paraphrased_claims_do_not_cache_claim_free_sentences(self, service, cache):
+        service.ai_service.generate_text_with_schema.return_value = _response([
+            _claim("MCA territory is lateral")
+        ])
+        await service.fact_check_section(
+            "The MCA supplies the lateral cortex. The ACA supplies the medial frontal lobe.",
+            SOURCES, "Vascular", "Anatomy"
+        )
+
+        claim_keys = [key for key in cache.store if ":claim:" in key]
+        assert claim_keys == []
+
+
+class TestChapterFactCheck:
+    """Test suite for concurrent chapter fact-checking"""
+
+    @pytest.mark.asyncio
+    async def test_sections_checked_concurrently_in_order(self, service):
+        in_flight = 0
+        peak = 0
+
+        async def check(section_content, sources, chapter_title, section_title, source_pool):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if section_title == "S2":
+                raise ValueError("provider down")
+            return {
+                "section_title": section_title,
+                "claims": [_claim(section_content)],
+                "critical_issues": [],
+                "ai_cost_usd": 0.01,
+                "cached_claims": 0
+            }
+
+        sections = [{"title": f"S{i}", "content": f"Content {i}"} for i in range(6)]
+        sections.append({"title": "Empty", "content": ""})
+
+        with patch.object(service, "fact_check_section", side_effect=check), \
+                patch("backend.services.fact_checking_service.settings") as mock_settings:
+            mock_settings.FACT_CHECK_MAX_CONCURRENCY = 3
+            mock_settings.FACT_CHECK_SOURCES_PER_SECTION = 8
+            mock_settings.SECTION_GENERATION_RETRY_BASE_DELAY = 0
+            result = await service.fact_check_chapter(sections, SOURCES, "Vascular")
+
+        assert peak == 3
+        assert [r["section_title"] for r in result["section_results"]] == ["S0", "S1", "S3", "S4", "S5"]
+        assert [r["section_index"] for r in result["section_results"]] == [0, 1, 3, 4, 5]
+        assert result["sections_checked"] == 5
+        assert result["total_claims"] == 5
+
+    def test_select_relevant_sources(self, service):
+        sources = [
+            {"pmid": str(i), "title": f"Unrelated topic {i}", "abstract": "cardiology"} for i in range(10)
+        ]
+        sources[7]["abstract"] = "Glioblastoma temozolomide survival outcomes"
+        sources[3]["title"] = "Temozolomide dosing"
+
+        selected = service.select_relevant_sources(
+            "Chemotherapy", "Temozolomide improves glioblastoma survival.", sources, max_sources=3
+        )
+
+        assert [s["pmid"] for s in selected] == ["7", "3", "0"]
+        assert service.select_relevant_sources("x", "y", sources[:2], max_sources=3) == sources[:2]
@@ -0,0 +1,360 @@
+"""
+Tests for Section Token Streaming
+Tests the per-chapter stream (ordering, backpressure, resume, checkpoints),
+provider stream fallback and the orchestrator's streamed section path
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from backend.services.generation_stream import ChapterStream, GenerationStreamRegistry
+
+
+class FakeRedis:
+    """In-memory stand-in for redis_manager (JSON round-trip like the real one)"""
+
+    def __init__(self):
+        self.values = {}
+
+    def make_key(self, *parts, namespace="app"):
+        return ":".join([namespace, *parts])
+
+    def get(self, key, deserialize="json", default=None):
+        raw = self.values.get(key)
+        return json.loads(raw) if raw is not None else default
+
+    def set(self, key, value, ttl=None, serialize="json"):
+        self.values[key] = json.dumps(value)
+        return True
+
+    def delete(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def hset_many(self, name, mapping, ttl=None, serialize="json"):
+        self.values.setdefault(name, {}).update({k: json.dumps(v) for k, v in mapping.items()})
+        self.writes = getattr(self, "writes", []) + [sorted(mapping)]
+        return True
+
+    def hgetall(self, name, deserialize="json"):
+        return {k: json.loads(v) for k, v in self.values.get(name, {}).items()}
+
+
+class Client:
+    """Fake WebSocket room that applies stream events like a browser client"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.events = []
+        self.sections = {}
+        self.seq = 0
+
+    async def send(self, event):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.apply(event)
+
+    def apply(self, event):
+        self.events.append(event)
+        data = event["data"]
+        if data["seq"] <= self.seq:
+            return
+        if event["event"] == "section_stream_snapshot":
+            self.sections = {k: v["text"] for k, v in data["sections"].items()}
+        elif event["event"] == "section_stream_started":
+            self.sections[data["stream_id"]] = ""
+        elif event["event"] == "section_token":
+            assert len(self.sections[data["stream_id"]]) == data["offset"]
+            self.sections[data["stream_id"]] += data["delta"]
+        self.seq = data["seq"]
+
+
+def _stream(client, **kwargs):
+    kwargs.setdefault("buffer_size", 8)
+    kwargs.setdefault("send_timeout", 5.0)
+    kwargs.setdefault("replay_size", 100)
+    kwargs.setdefault("checkpoint_chars", 1000)
+    return ChapterStream("ch-1", sender=client.send, redis_client=FakeRedis(), **kwargs)
+
+
+async def _stream_section(stream, stream_id, tokens):
+    await stream.start_section(stream_id, f"Section {stream_id}")
+    for token in tokens:
+        await stream.publish(stream_id, token)
+    await stream.complete_section(stream_id)
+
+
+class TestChapterStream:
+    """Test suite for the per-chapter channel"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sections_delivered_in_seq_order(self):
+        client = Client()
+        stream = _stream(client)
+
+        await asyncio.gather(
+            _stream_section(stream, "1", ["Alpha ", "beta ", "gamma"]),
+            _stream_section(stream, "2", ["One ", "two"]),
+        )
+        await stream.close()
+
+        assert [e["data"]["seq"] for e in client.events] == list(range(1, stream.seq + 1))
+        assert client.sections == {"1": "Alpha beta gamma", "2": "One two"}
+        assert stream.stats()["dropped"] == 0
+        assert set(stream.stats()["first_token_ms"]) == {"1", "2"}
+
+    @pytest.mark.asyncio
+    async def test_slow_client_applies_backpressure(self):
+        client = Client(delay=0.01)
+        stream = _stream(client, buffer_size=4)
+        max_queued = 0
+
+        await stream.start_section("1")
+        for i in range(20):
+            await stream.publish("1", f"t{i} ")
+            max_queued = max(max_queued, stream.queue.qsize())
+        await stream.close()
+
+        # Producer was held to the buffer size and nothing was lost
+        assert max_queued <= 4
+        assert stream.dropped == 0
+        assert client.sections["1"] == "".join(f"t{i} " for i in range(20))
+
+    @pytest.mark.asyncio
+    async def test_dropped_events_recovered_by_resume(self):
+        client = Client(delay=0.05)
+        stream = _stream(client, buffer_size=1, send_timeout=0.001)
+
+        await _stream_section(stream, "1", [f"t{i} " for i in range(10)])
+        await stream.close()
+
+        assert stream.dropped > 0
+        assert client.sections["1"] != "".join(f"t{i} " for i in range(10))
+
+        # Client reconnects with the last seq it applied
+        resumed = Client()
+        resumed.sections = dict(client.sections)
+        resumed.seq = client.seq
+        for event in stream.replay(client.seq):
+            resumed.apply(event)
+
+        assert resumed.sections["1"] == "".join(f"t{i} " for i in range(10))
+
+    @pytest.mark.asyncio
+    async def test_resume_beyond_replay_buffer_sends_snapshot(self):
+        client = Client()
+        stream = _stream(client, replay_size=3)
+
+        await _stream_section(stream, "1", ["a", "b", "c", "d", "e"])
+        await stream.close()
+
+        events = stream.replay(1)
+        assert [e["event"] for e in events] == ["section_stream_snapshot"]
+        assert events[0]["data"]["sections"]["1"]["text"] == "abcde"
+        assert stream.replay(stream.seq) == []
+
+    @pytest.mark.asyncio
+    async def test_retried_section_restarts(self):
+        client = Client()
+        stream = _stream(client)
+
+        await stream.start_section("1")
+        await stream.publish("1", "partial from failed attempt")
+        await _stream_section(stream, "1", ["final"])
+        await stream.close()
+
+        assert client.sections["1"] == "final"
+
+
+class TestCheckpoints:
+    """Test suite for Redis checkpoints and cross-process resume"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_every_n_chars_and_resume_after_close(self):
+        redis = FakeRedis()
+        registry = GenerationStreamRegistry(redis_client=redis)
+        client = Client()
+        stream = registry.open("ch-1", sender=client.send, checkpoint_chars=10)
+
+        await stream.start_section("1", "Intro")
+        for _ in range(5):
+            await stream.publish("1", "12345")
+
+        # 25 chars at 10-char intervals: mid-section checkpoints exist
+        await stream.checkpoint_written()
+        checkpoint = redis.hgetall("chapter_stream:ch-1")
+        assert checkpoint["section:1"]["text"] == "1234512345" * 2
+        assert stream.checkpoints == 2
+
+        await stream.complete_section("1")
+        await registry.close("ch-1")
+
+        assert registry.get("ch-1") is None
+        events = registry.replay("ch-1", 0)
+        assert events[0]["event"] == "section_stream_snapshot"
+        assert events[0]["data"]["sections"]["1"] == {"title": "Intro", "text": "12345" * 5, "complete": True}
+        assert registry.replay("ch-1", events[0]["data"]["seq"]) == []
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_writes_only_changed_sections(self):
+        redis = FakeRedis()
+        redis.values["chapter_stream:ch-1"] = {"section:9": json.dumps({"text": "earlier run"})}
+        stream = ChapterStream("ch-1", sender=Client().send, redis_client=redis, checkpoint_chars=10)
+
+        await stream.start_section("1", "Intro")
+        await stream.publish("1", "x" * 10)
+        await stream.complete_section("1")
+        await stream.start_section("2", "Anatomy")
+        await stream.publish("2", "y" * 10)
+        await stream.close()
+
+        # Section 1 is not rewritten once section 2 streams
+        assert redis.writes == [
+            ["section:1", "seq"],
+            ["section:1", "seq"],
+            ["section:2", "seq"],
+            ["seq"],
+        ]
+        checkpoint = redis.hgetall("chapter_stream:ch-1")
+        assert "section:9" not in checkpoint
+        assert checkpoint["section:2"]["text"] == "y" * 10 and checkpoint["seq"] == stream.seq
+
+
+class TestProviderStream:
+    """Test suite for AIProviderService.generate_text_stream"""
+
+    @pytest.fixture
+    def service(self):
+        from backend.services.ai_provider_service import AIProviderService
+
+        svc = AIProviderService.__new__(AIProviderService)
+        breaker = Mock()
+        breaker.is_call_allowed.return_value = True
+        svc.circuit_breakers = Mock()
+        svc.circuit_breakers.get_breaker.return_value = breaker
+        return svc
+
+    @staticmethod
+    def _chunks(provider, texts, fail_after=None):
+        async def stream(*args, **kwargs):
+            full = ""
+            for i, text in enumerate(texts):
+                if fail_after is not None and i == fail_after:
+                    raise RuntimeError(f"{provider} stream broke")
+                full += text
+                yield {"chunk": text, "full_text": full, "provider": provider}
+            if fail_after is not None and fail_after >= len(texts):
+                raise RuntimeError(f"{provider} stream broke")
+        return stream
+
+    @pytest.mark.asyncio
+    async def test_streams_chunks_then_result(self, service):
+        from backend.services.ai_provider_service import AIProvider, AITask
+
+        service._generate_claude_streaming = self._chunks("claude", ["Hel", "lo"])
+
+        events = [e async for e in service.generate_text_stream("p", AITask.SECTION_WRITING,
+                                                                provider=AIProvider.CLAUDE)]
+
+        assert [e["chunk"] for e in events[:-1]] == ["Hel", "lo"]
+        assert events[-1]["text"] == "Hello"
+        assert events[-1]["provider"] == "claude"
+        assert events[-1]["tokens_used"] > 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_chunk(self, service):
+        from backend.services.ai_provider_service import AIProvider, AITask
+
+        service._generate_claude_streaming = self._chunks("claude", ["x"], fail_after=0)
+        service._generate_gpt4_streaming = self._chunks("gpt4o", ["ok"])
+
+        events = [e async for e in service.generate_text_stream("p", AITask.SECTION_WRITING,
+                                                                provider=AIProvider.CLAUDE)]
+
+        assert events[-1]["text"] == "ok"
+        assert events[-1]["provider"] == "gpt4o"
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_raises(self, service):
+        from backend.services.ai_provider_service import AIProvider, AITask
+
+        service._generate_claude_streaming = self._chunks("claude", ["a", "b"], fail_after=1)
+        service._generate_gpt4_streaming = self._chunks("gpt4o", ["ok"])
+
+        with pytest.raises(RuntimeError, match="claude stream broke"):
+            async for _ in service.generate_text_stream("p", AITask.SECTION_WRITING,
+                                                        provider=AIProvider.CLAUDE):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_thread_bridge_bounds_sdk_reads(self):
+        from backend.services import ai_provider_service
+
+        read = []
+
+        def sdk_stream():
+            for i in range(100):
+                read.append(i)
+                yield i
+
+        with patch.object(ai_provider_service, "STREAM_CHUNK_BUFFER", 4):
+            bridge = ai_provider_service._iterate_in_thread(sdk_stream)
+            assert await bridge.__anext__() == 0
+            await asyncio.sleep(0.05)
+            # Consumer paused: the worker thread stops reading near the buffer size
+            assert len(read) <= 7
+            await bridge.aclose()
+
+    @pytest.mark.asyncio
+    async def test_thread_bridge_uses_dedicated_pool(self):
+        import threading
+
+        from backend.services import ai_provider_service
+
+        def sdk_stream():
+            yield threading.current_thread().name
+
+        names = [name async for name in ai_provider_service._iterate_in_thread(sdk_stream)]
+
+        # Not the default executor shared with asyncio.to_thread callers
+        assert names[0].startswith("provider-stream")
+
+
+class TestOrchestratorStreaming:
+    """Test suite for streamed section generation in the orchestrator"""
+
+    @pytest.mark.asyncio
+    async def test_section_tokens_reach_stream(self):
+        from backend.services.chapter_orchestrator import ChapterOrchestrator
+
+        async def generate_text_stream(**kwargs):
+            for token in ["Intro ", "text"]:
+                yield {"chunk": token, "provider": "claude"}
+            yield {"text": "Intro text", "model": "m", "cost_usd": 0.01}
+
+        with patch("backend.services.chapter_orchestrator.AIProviderService"), \
+                patch("backend.services.chapter_orchestrator.ResearchService"), \
+                patch("backend.services.chapter_orchestrator.DeduplicationService"), \
+                patch("backend.services.chapter_orchestrator.FactCheckingService"):
+            orchestrator = ChapterOrchestrator(MagicMock())
+        orchestrator.ai_service.generate_text_stream = generate_text_stream
+        orchestrator.ai_service.generate_text = AsyncMock()
+
+        client = Client()
+        stream = _stream(client)
+        result = await orchestrator._generate_section_content(
+            chapter_title="Glioma",
+            section_plan={"title": "Intro"},
+            section_hints={},
+            relevant_sources=[],
+            section_num=1,
+            stream=stream
+        )
+        await stream.close()
+
+        assert result["content"] == "Intro text"
+        assert result["cost_usd"] == 0.01
+        assert client.sections == {"1": "Intro text"}
+        orchestrator.ai_service.generate_text.assert_not_called()
@@ -0,0 +1,130 @@
+"""
+Tests for Image Duplicate Detection Service
+Tests blocked similarity search, union-find clustering and bulk marking
+"""
+
+import uuid
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from backend.services.image_duplicate_detection_service import (
+    ImageDuplicateDetectionService,
+    ImageRecord,
+    UnionFind,
+)
+
+
+def _record(quality=0.5, size=1000):
+    return ImageRecord(
+        id=uuid.uuid4(),
+        file_path="/data/images/x.png",
+        page_number=1,
+        quality_score=quality,
+        confidence_score=0.5,
+        file_size_bytes=size
+    )
+
+
+def _normalized(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def service():
+    return ImageDuplicateDetectionService(Mock())
+
+
+class TestUnionFind:
+    """Test suite for union-find clustering"""
+
+    def test_transitive_groups(self):
+        union_find = UnionFind(6)
+        union_find.union(0, 1)
+        union_find.union(1, 2)
+        union_find.union(4, 5)
+
+        groups = sorted(sorted(g) for g in union_find.groups())
+        assert groups == [[0, 1, 2], [4, 5]]
+
+    def test_singletons_are_not_groups(self):
+        assert UnionFind(3).groups() == []
+
+
+class TestMatrixSimilarPairs:
+    """Test suite for blocked matrix similarity"""
+
+    def test_matches_brute_force_across_blocks(self, service):
+        rng = np.random.RandomState(0)
+        base = rng.randn(40, 16)
+        # Plant near-copies of rows 0..9 at rows 40..49
+        matrix = _normalized(np.vstack([base, base[:10] + rng.randn(10, 16) * 0.01]))
+
+        service.BLOCK_SIZE = 7  # force many blocks
+        pairs = set(service._matrix_similar_pairs(matrix, 0.99))
+
+        similarities = matrix @ matrix.T
+        expected = {
+            (i, j)
+            for i in range(len(matrix))
+            for j in range(i + 1, len(matrix))
+            if similarities[i, j] >= 0.99
+        }
+        assert pairs == expected
+        assert {(i, i + 40) for i in range(10)} <= pairs
+
+    def test_similarity_tiles_fit_the_byte_budget(self, service):
+        rng = np.random.RandomState(1)
+        base = rng.randn(30, 8)
+        matrix = _normalized(np.vstack([base, base + rng.randn(30, 8) * 0.01]))
+        service.BLOCK_SIZE = 8
+        service.BLOCK_BYTES = 8 * 5 * matrix.dtype.itemsize  # 8 x 5 tiles
+
+        with patch.object(np, "nonzero", wraps=np.nonzero) as nonzero:
+            pairs = set(service._matrix_similar_pairs(matrix, 0.99))
+
+        assert max(call.args[0].size for call in nonzero.call_args_list) <= 8 * 5
+        similarities = matrix @ matrix.T
+        expected = {
+            (i, j)
+            for i in range(len(matrix))
+            for j in range(i + 1, len(matrix))
+            if similarities[i, j] >= 0.99
+        }
+        assert pairs == expected
+        assert {(i, i + 30) for i in range(30)} <= pairs
+
+    def test_no_self_pairs(self, service):
+        matrix = _normalized(np.eye(4))
+        assert list(service._matrix_similar_pairs(matrix, 0.5)) == []
+
+
+class TestDuplicateGroups:
+    """Test suite for grouping and marking"""
+
+    def test_groups_sorted_best_quality_first(self, service):
+        records = [_record(quality=0.2), _record(quality=0.9), _record(quality=0.5), _record()]
+        groups = service._find_duplicate_groups(records, [(0, 1), (1, 2)])
+
+        assert len(groups) == 1
+        assert [r.quality_score for r in groups[0]] == [0.9, 0.5, 0.2]
+
+    def test_mark_duplicates_uses_bulk_update(self, service):
+        records = [_record(quality=0.9), _record(), _record()]
+        service.MARK_BATCH_SIZE = 1
+
+        marked = service._mark_duplicates([records])
+
+        assert marked == 2
+        assert service.db.execute.call_count == 2
+        params = [call.args[1][0] for call in service.db.execute.call_args_list]
+        assert all(p['duplicate_of_id'] == records[0].id for p in params)
+        assert {p['id'] for p in params} == {records[1].id, records[2].id}
+        service.db.commit.assert_called_once()
+
+    def test_space_saved_excludes_original(self, service):
+        mb = 1024 * 1024
+        group = [_record(size=5 * mb), _record(size=2 * mb), _record(size=1 * mb)]
+        assert service._calculate_space_saved([group]) == 3.0
@@ -0,0 +1,162 @@
+"""
+Tests for batched PDF image extraction
+Tests early skipping, pool/inline equivalence, thumbnails and the bulk insert
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fitz
+import pytest
+from PIL import Image as PILImage
+
+from backend.services import image_extraction
+from backend.services.image_extraction import extract_image_batch, extract_pdf_images
+from backend.services.pdf_service import PDFService
+from backend.services.storage_service import StorageService
+
+
+def png(width, height, seed):
+    img = PILImage.effect_noise((width, height), 40 + seed).convert("RGB")
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    with patch("backend.services.storage_service.settings") as settings:
+        settings.STORAGE_BASE_PATH = str(tmp_path / "storage")
+        yield StorageService()
+
+
+@pytest.fixture
+def figure_pdf(tmp_path):
+    """3 pages: 4 distinct figures, one figure placed twice, one re-embedded copy and one icon"""
+    doc = fitz.open()
+    figures = [png(240, 180, seed) for seed in range(4)]
+    for page_num in range(3):
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(20, 20, 200, 160), stream=figures[page_num])
+        page.insert_image(fitz.Rect(20, 400, 40, 420), stream=png(12, 12, 9))  # icon
+    # Same image object placed again on the last page (shared xref)
+    last = doc[2]
+    last.insert_image(fitz.Rect(300, 20, 500, 160), xref=last.get_images()[0][0])
+    # Fourth figure, plus an identical copy stored as a separate image object
+    last.insert_image(fitz.Rect(20, 200, 200, 340), stream=figures[3])
+    doc.new_page().insert_image(fitz.Rect(20, 20, 200, 160), stream=figures[3])
+
+    path = tmp_path / "atlas.pdf"
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def _extract_in_daemon(path, storage, queue):
+    started = []
+    pool = image_extraction.Pool
+    with patch.object(image_extraction, "Pool", side_effect=lambda **kw: started.append(kw) or pool(**kw)):
+        rows, _ = extract_pdf_images(path, storage, workers=2)
+    queue.put((len(rows), started))
+
+
+class TestExtractPDFImages:
+    """Test suite for extract_pdf_images"""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_figures_stored_and_repeats_skipped(self, figure_pdf, storage, workers):
+        rows, stats = extract_pdf_images(figure_pdf, storage, workers=workers)
+
+        assert stats.extracted == len(rows) == 4
+        assert stats.skipped_small >= 1
+        assert stats.skipped_duplicate >= 2
+        assert [(r["page_number"], r["width"], r["height"]) for r in rows] == [
+            (1, 240, 180), (2, 240, 180), (3, 240, 180), (3, 240, 180)
+        ]
+        for row in rows:
+            assert os.path.getsize(row["file_path"]) == row["file_size_bytes"]
+            with PILImage.open(row["thumbnail_path"]) as thumb:
+                assert thumb.format == "JPEG"
+                assert max(thumb.size) <= 300
+
+    def test_pool_starts_in_daemonic_process(self, figure_pdf, storage):
+        # Celery prefork children are daemonic; extract_images_task runs in one
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        child = context.Process(target=_extract_in_daemon, args=(figure_pdf, storage, queue), daemon=True)
+        child.start()
+        extracted, started = queue.get(timeout=60)
+        child.join()
+
+        assert extracted == 4
+        assert started == [{"processes": 2}]
+
+    def test_without_thumbnails(self, figure_pdf, storage):
+        rows, _ = extract_pdf_images(figure_pdf, storage, workers=0, create_thumbnails=False)
+
+        assert rows and all(r["thumbnail_path"] is None for r in rows)
+
+    def test_failed_image_reported_per_job(self, figure_pdf, tmp_path):
+        with fitz.open(figure_pdf) as doc:
+            xref = doc[0].get_images()[0][0]
+            content_sha256 = hashlib.sha256(doc.extract_image(xref)["image"]).hexdigest()
+        image_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+        jobs = [
+            {"xref": 99999, "image_id": image_ids[0], "page_number": 1, "image_index_on_page": 0},
+            {"xref": xref, "image_id": image_ids[1], "page_number": 1, "image_index_on_page": 0}
+        ]
+
+        results = extract_image_batch(figure_pdf, jobs, str(tmp_path), None, (300, 300))
+
+        assert "error" in results[0]
+        assert results[1]["file_path"] == str(
+            tmp_path / content_sha256[:2] / content_sha256[2:4] / f"{content_sha256}.png"
+        )
+        assert results[1]["content_sha256"] == content_sha256
+        assert results[1]["id"] == uuid.UUID(image_ids[1])
+        assert results[1]["thumbnail_path"] is None
+
+    def test_figure_shared_across_pdfs_stored_once(self, figure_pdf, storage):
+        first, _ = extract_pdf_images(figure_pdf, storage, workers=0)
+        thumbnails = {r["thumbnail_path"]: os.path.getmtime(r["thumbnail_path"]) for r in first}
+        second, _ = extract_pdf_images(figure_pdf, storage, workers=0)
+
+        # Same files and thumbnails, distinct rows
+        assert [r["file_path"] for r in second] == [r["file_path"] for r in first]
+        assert {r["thumbnail_path"]: os.path.getmtime(r["thumbnail_path"]) for r in second} == thumbnails
+        assert not {r["id"] for r in first} & {r["id"] for r in second}
+        stored = [p for p in storage.image_storage_path.rglob("*") if p.is_file()]
+        assert len(stored) == 4
+
+
+class TestPDFServiceExtractImages:
+    """Test suite for PDFService.extract_images persistence"""
+
+    def test_rows_inserted_in_one_statement(self, figure_pdf, storage):
+        db = MagicMock()
+        pdf = SimpleNamespace(id=uuid.uuid4(), file_path=figure_pdf, indexing_status="text_extracted")
+        db.query.return_value.filter.return_value.first.return_value = pdf
+
+        service = PDFService(db)
+        service.storage = storage
+        with patch("backend.services.image_extraction.settings.PDF_IMAGE_EXTRACTION_WORKERS", 0):
+            result = service.extract_images(str(pdf.id))
+
+        # Bulk insert, then one statement taking the blob references
+        assert db.execute.call_count == 2
+        rows = db.execute.call_args_list[0].args[1]
+        assert len(rows) == result["successful_extractions"] == 4
+        blob_params = db.execute.call_args_list[1].args[1]
+        assert blob_params["kind"] == "image"
+        assert sorted(blob_params["shas"]) == sorted(r["content_sha256"] for r in rows)
+        assert blob_params["refs"] == [1, 1, 1, 1]
+        assert all(r["pdf_id"] == pdf.id and r["is_duplicate"] is False for r in rows)
+        db.add.assert_not_called()
+        assert pdf.images_extracted is True
+        assert pdf.total_images == result["total_images"]
+        assert result["skipped_duplicate"] >= 2
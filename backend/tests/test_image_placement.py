@@ -0,0 +1,59 @@
+"""
+Tests for Image Placement
+Tests the similarity matrix and global capacity-constrained assignment
+"""
+
+import numpy as np
+
+from backend.services.image_placement import assign_images, cosine_similarity_matrix
+
+
+class TestCosineSimilarityMatrix:
+    """Test suite for pairwise cosine similarity"""
+
+    def test_matrix_shape_and_values(self):
+        scores = cosine_similarity_matrix([[1, 0], [0, 2]], [[1, 0], [1, 1], [0, 0]])
+
+        assert scores.shape == (2, 3)
+        assert scores[0, 0] == np.float32(1.0)
+        assert np.isclose(scores[1, 1], 1 / np.sqrt(2))
+        assert scores[0, 2] == 0.0  # zero vector
+
+    def test_empty_inputs(self):
+        assert cosine_similarity_matrix([], [[1, 0]]).shape == (0, 1)
+
+
+class TestAssignImages:
+    """Test suite for global image assignment"""
+
+    def test_image_goes_to_best_section_not_first(self):
+        # A per-section greedy pass would give image 0 to slot 0
+        scores = np.array([
+            [0.6, 0.5],
+            [0.9, 0.1],
+        ])
+
+        assignments = assign_images(scores, [1, 1])
+
+        assert [image for image, _ in assignments[0]] == [1]
+        assert [image for image, _ in assignments[1]] == [0]
+
+    def test_no_image_reused_and_caps_respected(self):
+        scores = np.array([
+            [0.9, 0.8, 0.7, 0.6],
+            [0.95, 0.85, 0.75, 0.65],
+        ])
+
+        assignments = assign_images(scores, [3, 1])
+        placed = [image for slot in assignments for image, _ in slot]
+
+        assert len(placed) == len(set(placed)) == 4
+        assert len(assignments[1]) == 1
+        assert [image for image, _ in assignments[0]] == [1, 2, 3]
+
+    def test_min_score_threshold(self):
+        scores = np.array([[0.5, 0.2], [0.1, 0.05]])
+
+        assignments = assign_images(scores, [2, 2], min_score=0.15)
+
+        assert assignments == [[(0, 0.5), (1, np.float32(0.2))], []]
@@ -0,0 +1,220 @@
+"""
+Tests for LLM Response Cache
+Tests key construction, size controls, eviction and avoided-cost metrics
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from backend.services.llm_response_cache import LLMResponseCache
+
+
+class FakeRedis:
+    """In-memory stand-in for redis_manager (JSON round-trip like the real one)"""
+
+    def __init__(self):
+        self.values = {}
+        self.index = {}
+
+    def make_key(self, *parts, namespace="app"):
+        return ":".join([namespace, *parts])
+
+    def get(self, key, deserialize="json", default=None):
+        raw = self.values.get(key)
+        return json.loads(raw) if raw is not None else default
+
+    def set(self, key, value, ttl=None, serialize="json"):
+        self.values[key] = json.dumps(value)
+        return True
+
+    def delete(self, *keys):
+        return sum(self.values.pop(k, None) is not None for k in keys)
+
+    def zadd(self, key, mapping, serialize="json"):
+        self.index.update(mapping)
+        return len(mapping)
+
+    def zcard(self, key):
+        return len(self.index)
+
+    def zrange(self, key, start, end, withscores=False, deserialize="json"):
+        return sorted(self.index, key=self.index.get)[start:end + 1]
+
+    def zrem(self, key, *members, serialize="json"):
+        return sum(self.index.pop(m, None) is not None for m in members)
+
+
+RESULT = {"text": "ok", "provider": "claude", "model": "m", "tokens_used": 120, "cost_usd": 0.012}
+
+
+@pytest.fixture
+def metrics():
+    return Mock()
+
+
+@pytest.fixture
+def cache(metrics):
+    return LLMResponseCache(redis_client=FakeRedis(), metrics_service=metrics)
+
+
+class TestKeys:
+    """Test suite for cache key construction"""
+
+    def test_identical_requests_share_a_key(self, cache):
+        params = {"temperature": 0.2, "max_tokens": 100}
+
+        assert cache.make_key("claude", "m", "p", params=params) == cache.make_key(
+            "claude", "m", "p", params=dict(reversed(list(params.items())))
+        )
+
+    @pytest.mark.parametrize("change", [
+        {"provider": "gpt4"},
+        {"model": "other"},
+        {"prompt": "p2"},
+        {"system_prompt": "s"},
+        {"schema": {"name": "x"}},
+        {"params": {"temperature": 0.3}},
+        {"image_bytes": b"img"},
+    ])
+    def test_any_component_changes_the_key(self, cache, change):
+        base = {"provider": "claude", "model": "m", "prompt": "p", "params": {"temperature": 0.2}}
+
+        assert cache.make_key(**base) != cache.make_key(**{**base, **change})
+
+
+class TestStorage:
+    """Test suite for get/set and size controls"""
+
+    def test_hit_is_free_and_records_avoided_cost(self, cache, metrics):
+        key = cache.make_key("claude", "m", "p")
+        assert cache.get(key) is None
+        assert cache.set(key, RESULT, latency_ms=2000)
+
+        hit = cache.get(key, task_type="fact_checking")
+
+        assert hit["text"] == "ok"
+        assert hit["cache_hit"] is True
+        assert hit["cost_usd"] == 0.0
+        assert hit["cost_avoided_usd"] == 0.012
+        assert 1900 < hit["latency_avoided_ms"] <= 2000
+        kwargs = metrics.record_cache_hit.call_args.kwargs
+        assert kwargs["task_type"] == "fact_checking"
+        assert kwargs["cost_avoided_usd"] == 0.012
+        assert kwargs["total_tokens"] == 120
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_metrics_failure_does_not_fail_hit(self, cache, metrics):
+        metrics.record_cache_hit.side_effect = RuntimeError("db down")
+        key = cache.make_key("claude", "m", "p")
+        cache.set(key, RESULT, latency_ms=10)
+
+        assert cache.get(key)["cache_hit"] is True
+
+    def test_oversized_entries_are_not_cached(self, cache):
+        key = cache.make_key("claude", "m", "p")
+
+        with patch("backend.services.llm_response_cache.settings") as mock_settings:
+            mock_settings.LLM_RESPONSE_CACHE_ENABLED = True
+            mock_settings.LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES = 100
+            assert cache.set(key, {**RESULT, "text": "x" * 200}, latency_ms=10) is False
+
+        assert cache.get(key) is None
+
+    def test_oldest_entries_evicted_past_limit(self, cache):
+        keys = [cache.make_key("claude", "m", f"p{i}") for i in range(4)]
+
+        with patch("backend.services.llm_response_cache.settings") as mock_settings:
+            mock_settings.LLM_RESPONSE_CACHE_ENABLED = True
+            mock_settings.LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES = 10_000
+            mock_settings.LLM_RESPONSE_CACHE_MAX_ENTRIES = 2
+            for i, key in enumerate(keys):
+                with patch("backend.services.llm_response_cache.time.time", return_value=float(i)):
+                    cache.set(key, RESULT, latency_ms=10)
+
+            assert [cache.get(k) is not None for k in keys] == [False, False, True, True]
+
+    def test_disabled_cache_is_bypassed(self, cache):
+        key = cache.make_key("claude", "m", "p")
+
+        with patch("backend.services.llm_response_cache.settings") as mock_settings:
+            mock_settings.LLM_RESPONSE_CACHE_ENABLED = False
+            assert cache.set(key, RESULT, latency_ms=10) is False
+            assert cache.get(key) is None
+
+
+class TestProviderIntegration:
+    """Test suite for opt-in caching in AIProviderService"""
+
+    @pytest.fixture
+    def service(self, cache):
+        from backend.services.ai_provider_service import AIProviderService
+
+        with patch("backend.services.ai_provider_service.llm_response_cache", cache):
+            svc = AIProviderService.__new__(AIProviderService)
+            svc.metrics_service = None
+            svc._try_provider_with_circuit_breaker = AsyncMock(
+                return_value={**RESULT, "model": "claude-model"}
+            )
+            yield svc
+
+    @pytest.mark.asyncio
+    async def test_opt_in_calls_provider_once(self, service):
+        from backend.services.ai_provider_service import AIProvider, AITask
+
+        with patch.dict(
+            "backend.services.ai_provider_service.PROVIDER_MODELS",
+            {AIProvider.CLAUDE: "claude-model"}
+        ):
+            first = await service.generate_text("p", AITask.FACT_CHECKING, temperature=0.2,
+                                                provider=AIProvider.CLAUDE, cache=True)
+            second = await service.generate_text("p", AITask.FACT_CHECKING, temperature=0.2,
+                                                 provider=AIProvider.CLAUDE, cache=True)
+
+        assert service._try_provider_with_circuit_breaker.await_count == 1
+        assert first["cost_usd"] == 0.012
+        assert second["cache_hit"] is True and second["cost_usd"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_without_opt_in_nothing_is_cached(self, service):
+        from backend.services.ai_provider_service import AIProvider, AITask
+
+        for _ in range(2):
+            await service.generate_text("p", AITask.FACT_CHECKING, provider=AIProvider.CLAUDE)
+
+        assert service._try_provider_with_circuit_breaker.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fallback_responses_are_not_cached(self, service):
+        from backend.services.ai_provider_service import AIProvider, AITask
+
+        service._try_provider_with_circuit_breaker.return_value = {**RESULT, "model": "fallback-model"}
+
+        with patch.dict(
+            "backend.services.ai_provider_service.PROVIDER_MODELS",
+            {AIProvider.CLAUDE: "claude-model"}
+        ):
+            for _ in range(2):
+                await service.generate_text("p", AITask.FACT_CHECKING,
+                                            provider=AIProvider.CLAUDE, cache=True)
+
+        assert service._try_provider_with_circuit_breaker.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_vision_fallback_responses_are_not_cached(self, service):
+        import base64
+        from backend.services.ai_provider_service import AITask
+
+        service._generate_claude_vision = AsyncMock(side_effect=RuntimeError("overloaded"))
+        service._generate_openai_vision = AsyncMock(return_value={**RESULT, "model": "gpt-4o"})
+        image = base64.b64encode(b"image-bytes").decode("ascii")
+
+        with patch("backend.services.ai_provider_service.settings") as mock_settings:
+            mock_settings.ANTHROPIC_MODEL = "claude-model"
+            for _ in range(2):
+                await service.generate_vision_analysis_with_fallback(
+                    image, "describe", AITask.IMAGE_ANALYSIS, cache=True
+                )
+
+        assert service._generate_openai_vision.await_count == 2
@@ -0,0 +1,248 @@
+"""
+Tests for LLM Request Scheduler
+Tests budget admission against a fake rate-limited provider, priority ordering,
+token settlement and queueing-delay metrics
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import pytest
+
+from backend.services.llm_scheduler import (
+    LLMScheduler,
+    LocalTokenBucket,
+    ProviderLimits,
+    RequestPriority,
+    SchedulerTimeoutError,
+    estimate_tokens,
+    get_request_priority,
+    request_priority,
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class FakeProvider:
+    """
+    Local provider enforcing a request limit per sliding window
+
+    Raises RateLimited (429) when more than `max_requests` calls start within
+    any `window` seconds.
+    """
+
+    def __init__(self, max_requests: int, window: float, latency: float = 0.005):
+        self.max_requests = max_requests
+        self.window = window
+        self.latency = latency
+        self.started = deque()
+        self.calls = 0
+        self.rejected = 0
+
+    async def generate(self, tokens: int = 100):
+        now = time.monotonic()
+        while self.started and now - self.started[0] > self.window:
+            self.started.popleft()
+        if len(self.started) >= self.max_requests:
+            self.rejected += 1
+            raise RateLimited("429 rate limit exceeded")
+        self.started.append(now)
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"tokens_used": tokens}
+
+
+def _scheduler(rpm=1200, tpm=10_000_000, burst_seconds=0.25, **kwargs):
+    limits = {"fake": ProviderLimits(rpm, tpm, burst_seconds)}
+    return LLMScheduler(limits=limits, distributed=False, **kwargs)
+
+
+async def _call(scheduler, provider, priority=None, tokens=100):
+    async with scheduler.admit("fake", tokens, priority) as admission:
+        result = await provider.generate(tokens)
+        scheduler.settle(admission, result["tokens_used"])
+    return admission
+
+
+class TestAdmission:
+    """Test suite for budget admission"""
+
+    @pytest.mark.asyncio
+    async def test_unscheduled_burst_triggers_429s(self):
+        # 20 req/s with 5 burst: the provider allows 10 starts per 0.25s
+        provider = FakeProvider(max_requests=10, window=0.25)
+
+        results = await asyncio.gather(*(provider.generate() for _ in range(30)), return_exceptions=True)
+
+        assert provider.rejected == 20
+        assert sum(isinstance(r, RateLimited) for r in results) == 20
+
+    @pytest.mark.asyncio
+    async def test_scheduled_burst_stays_within_provider_limits(self):
+        provider = FakeProvider(max_requests=10, window=0.25)
+        scheduler = _scheduler(rpm=1200, burst_seconds=0.25)
+
+        admissions = await asyncio.gather(*(_call(scheduler, provider) for _ in range(30)))
+
+        assert provider.rejected == 0
+        assert provider.calls == 30
+        # 5 burst, then 20/s refill: the last request waits ~(30 - 5) / 20 s
+        assert max(a.queue_delay for a in admissions) == pytest.approx(1.25, abs=0.3)
+
+        stats = scheduler.stats()["providers"]["fake"]["interactive"]
+        assert stats["admitted"] == 30
+        assert stats["max_queue_delay_ms"] > stats["avg_queue_delay_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_token_budget_limits_large_requests(self):
+        provider = FakeProvider(max_requests=100, window=1.0)
+        # Ample requests, 6000 tokens/s with 1500 burst
+        scheduler = _scheduler(rpm=6000, tpm=360_000, burst_seconds=0.25)
+
+        start = time.monotonic()
+        await asyncio.gather(*(_call(scheduler, provider, tokens=1500) for _ in range(3)))
+
+        # Burst covers one request; the next two wait 0.25s each for tokens
+        assert time.monotonic() - start == pytest.approx(0.5, abs=0.15)
+
+    @pytest.mark.asyncio
+    async def test_timeout_when_budget_cannot_admit(self):
+        scheduler = _scheduler(rpm=60, burst_seconds=1, max_wait=0.05)
+        provider = FakeProvider(max_requests=100, window=1.0)
+
+        await _call(scheduler, provider)
+        with pytest.raises(SchedulerTimeoutError):
+            await _call(scheduler, provider)
+
+        assert scheduler.stats()["providers"]["fake"]["interactive"]["timeouts"] == 1
+
+    def test_blocking_admission_shares_the_budget(self):
+        scheduler = _scheduler(rpm=60, burst_seconds=1, max_wait=0.05)
+
+        with scheduler.admit_blocking("fake", 100, RequestPriority.BATCH) as admission:
+            assert admission.priority == RequestPriority.BATCH
+        with pytest.raises(SchedulerTimeoutError):
+            with scheduler.admit_blocking("fake", 100):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_blocking_admission_refused_inside_event_loop(self):
+        with pytest.raises(RuntimeError):
+            with _scheduler().admit_blocking("fake", 100):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_unknown_provider_is_not_queued(self):
+        scheduler = _scheduler()
+
+        admission = await scheduler.acquire("other", 10_000)
+
+        assert admission.queue_delay == 0.0
+
+
+class TestPriority:
+    """Test suite for interactive-before-batch ordering"""
+
+    @pytest.mark.asyncio
+    async def test_interactive_requests_overtake_queued_batch_work(self):
+        provider = FakeProvider(max_requests=100, window=1.0, latency=0)
+        # One request per 50ms, no burst
+        scheduler = _scheduler(rpm=1200, burst_seconds=0.05, interactive_reserve=0.0)
+        order = []
+
+        async def tracked(name, priority):
+            await _call(scheduler, provider, priority)
+            order.append(name)
+
+        batch = [asyncio.create_task(tracked(f"batch-{i}", RequestPriority.BATCH)) for i in range(4)]
+        await asyncio.sleep(0.01)
+        interactive = [
+            asyncio.create_task(tracked(f"interactive-{i}", RequestPriority.INTERACTIVE)) for i in range(2)
+        ]
+        await asyncio.gather(*batch, *interactive)
+
+        # batch-0 took the initial token; both interactive requests go next
+        assert order[:3] == ["batch-0", "interactive-0", "interactive-1"]
+
+    @pytest.mark.asyncio
+    async def test_priority_from_context(self):
+        scheduler = _scheduler()
+        provider = FakeProvider(max_requests=100, window=1.0)
+
+        with request_priority(RequestPriority.BATCH):
+            assert get_request_priority() == RequestPriority.BATCH
+            admission = await asyncio.create_task(_call(scheduler, provider))
+
+        assert admission.priority == RequestPriority.BATCH
+        assert get_request_priority() == RequestPriority.INTERACTIVE
+
+    def test_batch_cannot_use_interactive_reserve(self):
+        bucket = LocalTokenBucket(ProviderLimits(600, 1_000_000, burst_seconds=1), clock=lambda: 0.0)
+
+        # 10 request capacity, 20% reserved for interactive work
+        admitted = [bucket.try_acquire(10, reserve=0.2)[0] for _ in range(10)]
+
+        assert admitted.count(True) == 8
+        assert bucket.try_acquire(10)[0] is True
+
+
+class TestSettlement:
+    """Test suite for token estimates and settlement"""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("a" * 400, None, "b" * 40, max_tokens=100) == 210
+
+    @pytest.mark.asyncio
+    async def test_settle_refunds_overestimate(self):
+        scheduler = _scheduler(rpm=6000, tpm=60_000, burst_seconds=1)
+
+        def bucket_tokens():
+            return scheduler._buckets["fake"].tokens
+
+        admission = await scheduler.acquire("fake", 800)
+        assert bucket_tokens() == pytest.approx(200, abs=5)
+
+        scheduler.settle(admission, 100)
+        scheduler.settle(admission, 100)  # settling twice has no effect
+
+        assert bucket_tokens() == pytest.approx(900, abs=5)
+
+    def test_redis_outage_falls_back_to_local_budget(self):
+        from unittest.mock import Mock
+
+        from backend.services.llm_scheduler import RedisTokenBucket
+
+        redis = Mock()
+        redis.make_key.return_value = "ai:llm_scheduler:fake"
+        redis.get_client.side_effect = ConnectionError("down")
+        bucket = RedisTokenBucket("fake", ProviderLimits(60, 60_000, burst_seconds=1), redis)
+
+        assert bucket.try_acquire(10) == (True, 0.0)
+        assert bucket.try_acquire(10)[0] is False
+        # Not retried during the cooldown
+        assert redis.get_client.call_count == 1
+
+    def test_redis_drain_empties_bucket_once(self):
+        from unittest.mock import Mock
+
+        from backend.services.llm_scheduler import _DRAIN_SCRIPT, RedisTokenBucket
+
+        redis = Mock()
+        redis.make_key.return_value = "ai:llm_scheduler:fake"
+        scripts = {}
+        redis.get_client.return_value.register_script.side_effect = (
+            lambda source: scripts.setdefault(source, Mock())
+        )
+        bucket = RedisTokenBucket("fake", ProviderLimits(60, 60_000, burst_seconds=1), redis)
+
+        bucket.drain()
+        bucket.drain()
+
+        # Sets requests to 0 (idempotent) instead of decrementing per 429
+        drain = scripts[_DRAIN_SCRIPT]
+        assert drain.call_count == 2
+        assert drain.call_args.kwargs["args"][1:] == [60_000, 1000]
+        assert all(not script.called for source, script in scripts.items() if source != _DRAIN_SCRIPT)
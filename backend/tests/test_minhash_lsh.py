@@ -0,0 +1,146 @@
+"""
+Tests for MinHash-LSH primitives
+Tests shingling, signature estimation, band hashing and the in-memory index
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from backend.services.minhash_lsh import (
+    LSHIndex,
+    MinHasher,
+    band_hashes,
+    jaccard,
+    lsh_threshold,
+    shingle,
+)
+
+
+def _random_text(rng: random.Random, words: int = 300) -> str:
+    vocabulary = [f"term{i}" for i in range(5000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def _mutate(rng: random.Random, text: str, fraction: float) -> str:
+    words = text.split()
+    for _ in range(int(len(words) * fraction)):
+        words[rng.randrange(len(words))] = f"edit{rng.randrange(10**6)}"
+    return " ".join(words)
+
+
+@pytest.fixture
+def hasher():
+    return MinHasher(num_perm=128, seed=1)
+
+
+class TestShingling:
+    """Test suite for shingling and exact Jaccard"""
+
+    def test_shingle_is_case_and_punctuation_insensitive(self):
+        assert shingle("The Circle of Willis, anatomy!", k=2) == shingle("the circle of willis anatomy", k=2)
+
+    def test_shingle_short_text_yields_single_shingle(self):
+        assert len(shingle("two words", k=5)) == 1
+
+    def test_shingle_empty_text(self):
+        assert shingle("", k=5) == set()
+
+    def test_jaccard_identical_and_disjoint(self):
+        a = shingle("alpha beta gamma delta epsilon zeta", k=2)
+        b = shingle("one two three four five six", k=2)
+        assert jaccard(a, a) == 1.0
+        assert jaccard(a, b) == 0.0
+        assert jaccard(a, set()) == 0.0
+
+
+class TestMinHasher:
+    """Test suite for MinHash signatures"""
+
+    def test_signature_is_deterministic(self, hasher):
+        text = "middle cerebral artery aneurysm clipping technique"
+        other = MinHasher(num_perm=128, seed=1)
+        assert np.array_equal(hasher.signature_from_text(text), other.signature_from_text(text))
+
+    def test_signature_shape_and_dtype(self, hasher):
+        signature = hasher.signature_from_text("a b c d e f g")
+        assert signature.shape == (128,)
+        assert signature.dtype == np.uint32
+
+    def test_estimate_tracks_exact_jaccard(self, hasher):
+        rng = random.Random(7)
+        base = _random_text(rng)
+        variant = _mutate(rng, base, 0.05)
+
+        exact = jaccard(shingle(base), shingle(variant))
+        estimate = MinHasher.estimate_jaccard(
+            hasher.signature_from_text(base),
+            hasher.signature_from_text(variant)
+        )
+        assert abs(exact - estimate) < 0.15
+
+    def test_bytes_round_trip(self, hasher):
+        signature = hasher.signature_from_text("pituitary adenoma transsphenoidal approach")
+        assert np.array_equal(MinHasher.from_bytes(MinHasher.to_bytes(signature)), signature)
+
+
+class TestBandHashes:
+    """Test suite for LSH band hashing"""
+
+    def test_band_hashes_fit_signed_bigint(self, hasher):
+        hashes = band_hashes(hasher.signature_from_text("x y z w v u"), bands=32, rows=4)
+        assert len(hashes) == 32
+        assert all(-(1 << 63) <= h < (1 << 63) for h in hashes)
+
+    def test_band_hashes_rejects_short_signature(self, hasher):
+        with pytest.raises(ValueError):
+            band_hashes(hasher.signature_from_text("x y z"), bands=64, rows=4)
+
+    def test_threshold(self):
+        assert 0.4 < lsh_threshold(32, 4) < 0.45
+
+
+class TestLSHIndex:
+    """Test suite for the in-memory LSH index"""
+
+    def test_rejects_indivisible_bands(self):
+        with pytest.raises(ValueError):
+            LSHIndex(num_perm=128, bands=30)
+
+    def test_near_duplicates_become_candidates(self, hasher):
+        rng = random.Random(11)
+        index = LSHIndex(num_perm=128, bands=32)
+
+        base = _random_text(rng)
+        index.add("original", hasher.signature_from_text(base))
+        index.add("edited", hasher.signature_from_text(_mutate(rng, base, 0.02)))
+        for i in range(50):
+            index.add(f"unrelated-{i}", hasher.signature_from_text(_random_text(rng)))
+
+        pairs = index.candidate_pairs()
+        assert ("edited", "original") in pairs
+        # Unrelated random documents should almost never collide
+        assert len(pairs) < 5
+
+    def test_query_excludes_self(self, hasher):
+        index = LSHIndex()
+        signature = hasher.signature_from_text("cavernous sinus lateral wall anatomy")
+        index.add("doc", signature)
+        assert index.query(signature) == {"doc"}
+        assert index.query(signature, exclude="doc") == set()
+
+    def test_remove_and_replace(self, hasher):
+        index = LSHIndex()
+        first = hasher.signature_from_text("one two three four five six seven")
+        second = hasher.signature_from_text("eight nine ten eleven twelve thirteen")
+
+        index.add("doc", first)
+        index.add("doc", second)
+        assert len(index) == 1
+        assert index.query(first) == set()
+
+        index.remove("doc")
+        assert "doc" not in index
+        assert index.query(second) == set()
+        index.remove("doc")  # idempotent
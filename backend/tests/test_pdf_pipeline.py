@@ -0,0 +1,248 @@
+"""
+Tests for the PDF processing pipeline canvas
+Tests DAG structure, queue routing, image analysis fan-out, image embedding
+resume and timing report
+"""
+
+import json
+import uuid
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from celery.canvas import _chain, chord, group
+
+from backend.services import background_tasks
+from backend.services.background_tasks import (
+    analyze_images_task,
+    build_pdf_pipeline,
+    finalize_pdf_processing,
+    generate_image_embeddings_task,
+    pipeline_timings,
+)
+from backend.services.celery_app import celery_app
+
+TASKS = "backend.services.background_tasks."
+
+
+def route(task_name):
+    return celery_app.conf.task_routes.get(TASKS + task_name, {}).get("queue", "default")
+
+
+class TestPipelineCanvas:
+    """Test suite for the DAG built by build_pdf_pipeline"""
+
+    def test_text_first_then_branches_join_on_finalize(self):
+        pipeline = build_pdf_pipeline("pdf-1")
+
+        assert isinstance(pipeline, _chain)
+        first, join = pipeline.tasks
+        assert first.task == TASKS + "extract_text_task"
+        assert isinstance(join, chord)
+        assert join.body.task == TASKS + "finalize_pdf_processing"
+
+        branches = list(join.tasks)
+        assert len(branches) == 3
+        image_branch = [t.task for t in branches[0].tasks]
+        assert image_branch == [
+            TASKS + "extract_images_task",
+            TASKS + "analyze_images_task",
+            TASKS + "generate_image_embeddings_task",
+        ]
+        assert [b.task for b in branches[1:]] == [
+            TASKS + "generate_embeddings_task",
+            TASKS + "extract_citations_task",
+        ]
+
+    def test_signatures_are_immutable(self):
+        pipeline = build_pdf_pipeline("pdf-1")
+        join = pipeline.tasks[1]
+        signatures = [pipeline.tasks[0], join.body, *join.tasks[0].tasks, *list(join.tasks)[1:]]
+
+        assert all(sig.immutable and sig.args == ("pdf-1",) for sig in signatures)
+
+    def test_queue_routes(self):
+        assert route("extract_images_task") == "images"
+        assert route("analyze_images_task") == "images"
+        assert route("analyze_image_batch_task") == "images"
+        assert route("generate_embeddings_task") == "embeddings"
+        assert route("generate_image_embeddings_task") == "embeddings"
+        assert route("extract_text_task") == "default"
+
+
+class TestImageAnalysisFanOut:
+    """Test suite for splitting image analysis into sub-batch tasks"""
+
+    @pytest.fixture
+    def db(self):
+        db = MagicMock()
+        with patch.object(background_tasks.DatabaseTask, "db_session", db):
+            yield db
+
+    def test_fans_out_in_sub_batches(self, db):
+        image_ids = [(uuid.uuid4(),) for _ in range(19)]
+        db.query.return_value.filter.return_value.all.return_value = image_ids
+        db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(title="Skull Base")
+
+        with patch.object(background_tasks.settings, "PDF_IMAGE_ANALYSIS_BATCH_SIZE", 8), \
+                patch.object(analyze_images_task, "replace", side_effect=lambda sig: RuntimeError(sig)) as replace:
+            with pytest.raises(RuntimeError):
+                analyze_images_task.run("pdf-1")
+
+        fan_out = replace.call_args.args[0]
+        assert isinstance(fan_out, group)
+        batches = list(fan_out.tasks)
+        assert [len(b.args[1]) for b in batches] == [8, 8, 3]
+        assert [b.args[3] for b in batches] == [0, 1, 2]
+        assert all(b.task == TASKS + "analyze_image_batch_task" for b in batches)
+        assert batches[0].args[2] == {"pdf_title": "Skull Base", "pdf_id": "pdf-1"}
+
+    def test_nothing_to_analyze(self, db):
+        db.query.return_value.filter.return_value.all.return_value = []
+
+        with patch.object(analyze_images_task, "replace") as replace:
+            result = analyze_images_task.run("pdf-1")
+
+        assert result["status"] == "no_images"
+        replace.assert_not_called()
+
+
+class FakeRedisManager:
+    """Key/value store with RedisManager's set/get/delete signatures"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def set(self, key, value, ttl=None, serialize="json"):
+        self.values[key] = json.dumps(value)
+        self.ttls[key] = ttl
+        return True
+
+    def get(self, key, deserialize="json", default=None):
+        return json.loads(self.values[key]) if key in self.values else default
+
+    def delete(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+
+class TestImageEmbeddingsTask:
+    """Test suite for the single-loop, resumable image embedding task"""
+
+    def run_task(self, cursor, embed):
+        service = MagicMock()
+        service.generate_pdf_image_embeddings = embed
+        # Without a cursor mock the real TaskCheckpoint is used
+        checkpoint = (
+            patch.object(background_tasks, "TaskCheckpoint", return_value=cursor)
+            if cursor else nullcontext()
+        )
+        with patch.object(background_tasks.DatabaseTask, "db_session", MagicMock()), \
+                checkpoint, \
+                patch.object(background_tasks, "_record_step"), \
+                patch.object(background_tasks, "EmbeddingService", return_value=service), \
+                patch.object(background_tasks.emitter, "emit_pdf_processing_event", new=AsyncMock()), \
+                patch("backend.services.image_duplicate_detection_service.ImageDuplicateDetectionService") as dedup:
+            dedup.return_value.inherit_canonical_results.return_value = 2
+            return generate_image_embeddings_task.run("pdf-1")
+
+    def test_resumes_from_cursor_and_clears_it(self):
+        cursor = MagicMock()
+        cursor.get_metadata.return_value = {"last_image_id": "img-5", "embedded_count": 6}
+
+        async def embed(pdf_id, after_id, on_progress):
+            on_progress("img-9", 4)
+            return {"embedded_count": 4, "failed_count": 0, "requests": 1}
+
+        embed_mock = AsyncMock(side_effect=embed)
+        result = self.run_task(cursor, embed_mock)
+
+        assert embed_mock.await_args.kwargs["after_id"] == "img-5"
+        cursor.set_metadata.assert_called_once_with({"last_image_id": "img-9", "embedded_count": 10})
+        cursor.clear_checkpoint.assert_called_once()
+        assert result["image_embeddings"] == 10
+        assert result["inherited_from_canonical"] == 2
+
+    def test_failure_keeps_cursor_and_retries(self):
+        cursor = MagicMock()
+        cursor.get_metadata.return_value = None
+
+        with patch.object(generate_image_embeddings_task, "retry", side_effect=RuntimeError("retry")) as retry:
+            with pytest.raises(RuntimeError, match="retry"):
+                self.run_task(cursor, AsyncMock(side_effect=ConnectionError("db gone")))
+
+        cursor.clear_checkpoint.assert_not_called()
+        assert isinstance(retry.call_args.kwargs["exc"], ConnectionError)
+
+    def test_retry_resumes_from_stored_cursor(self):
+        redis = FakeRedisManager()
+
+        async def fail_after_first_batch(pdf_id, after_id, on_progress):
+            on_progress("img-3", 3)
+            raise ConnectionError("db gone")
+
+        async def finish(pdf_id, after_id, on_progress):
+            on_progress("img-7", 4)
+            return {"embedded_count": 4, "failed_count": 0, "requests": 1}
+
+        resumed = AsyncMock(side_effect=finish)
+        retry = patch.object(
+            generate_image_embeddings_task, "retry", side_effect=RuntimeError("retry")
+        )
+        with patch("backend.services.task_checkpoint.redis_manager", redis):
+            with retry, pytest.raises(RuntimeError, match="retry"):
+                self.run_task(None, AsyncMock(side_effect=fail_after_first_batch))
+            ttl = background_tasks.settings.TASK_CHECKPOINT_TTL
+            assert list(redis.ttls.values()) == [ttl]
+
+            result = self.run_task(None, resumed)
+
+        assert resumed.await_args.kwargs["after_id"] == "img-3"
+        assert result["image_embeddings"] == 7
+        assert redis.values == {}
+
+
+class TestPipelineTimings:
+    """Test suite for the wall-time report"""
+
+    STEPS = {
+        "text_extraction": {"status": "completed", "metadata": {"duration_seconds": 4.0}},
+        "image_analysis_0": {"status": "completed", "metadata": {"duration_seconds": 10.0}},
+        "image_analysis_1": {"status": "completed", "metadata": {"duration_seconds": 9.5}},
+        "text_embeddings": {"status": "completed", "metadata": {"duration_seconds": 6.0}},
+        "legacy_step": {"status": "completed", "metadata": {}},
+    }
+
+    def test_sub_batches_summed(self):
+        timings = pipeline_timings(self.STEPS)
+
+        assert timings["step_seconds"] == {"text_extraction": 4.0, "image_analysis": 19.5, "text_embeddings": 6.0}
+        assert timings["total_step_seconds"] == 29.5
+        assert timings["image_analysis_batches"] == 2
+
+    def test_finalize_reports_wall_time(self):
+        pdf = SimpleNamespace(
+            indexing_status="processing",
+            processing_started_at=1000.0,
+            processing_completed_at=None,
+            extracted_text="text"
+        )
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = pdf
+        checkpoint = MagicMock()
+        checkpoint.get_all_steps.return_value = self.STEPS
+
+        with patch.object(background_tasks.DatabaseTask, "db_session", db), \
+                patch.object(background_tasks, "TaskCheckpoint", return_value=checkpoint), \
+                patch.object(background_tasks.time, "time", return_value=1020.0), \
+                patch.object(background_tasks.emitter, "emit_pdf_processing_event", new=AsyncMock()) as emit, \
+                patch("backend.services.similarity_service.SimilarityService"):
+            summary = finalize_pdf_processing.run("pdf-1")
+
+        assert summary["wall_time_seconds"] == 20.0
+        assert summary["total_step_seconds"] == 29.5
+        assert summary["step_seconds"]["image_analysis"] == 19.5
+        assert pdf.indexing_status == "completed"
+        checkpoint.clear_checkpoint.assert_called_once()
+        assert "20.0s" in emit.await_args.args[3]
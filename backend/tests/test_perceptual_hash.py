@@ -0,0 +1,154 @@
+"""
+Tests for perceptual image hashing and near-duplicate linking
+Tests hash robustness, BK-tree search and canonical assignment at extraction
+"""
+
+import io
+import random
+import uuid
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from backend.services.pdf_service import PDFService
+from backend.services.perceptual_hash import (
+    BKTree,
+    PerceptualDuplicateIndex,
+    dhash,
+    hamming,
+    image_hashes,
+    phash,
+    to_signed,
+    to_unsigned,
+)
+
+
+def figure(seed, size=(640, 480)):
+    """Diagram-like image: a few random shapes on a gradient"""
+    rng = random.Random(seed)
+    gradient = np.linspace(40, 220, size[0], dtype=np.uint8)[None, :, None].repeat(size[1], 0).repeat(3, 2)
+    img = Image.fromarray(gradient)
+    draw = ImageDraw.Draw(img)
+    for _ in range(6):
+        x, y = rng.randrange(size[0] - 100), rng.randrange(size[1] - 100)
+        draw.ellipse([x, y, x + rng.randint(40, 200), y + rng.randint(40, 200)], fill=tuple(rng.randrange(256) for _ in range(3)))
+    return img
+
+
+def reencoded(img, scale=0.5, quality=60):
+    small = img.resize((int(img.width * scale), int(img.height * scale)), Image.Resampling.BILINEAR)
+    buffer = io.BytesIO()
+    small.save(buffer, "JPEG", quality=quality)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+class TestHashes:
+    """Test suite for pHash/dHash"""
+
+    @pytest.mark.parametrize("hash_function", [phash, dhash])
+    def test_rescaled_reencoded_copy_is_close(self, hash_function):
+        for seed in range(5):
+            original = figure(seed)
+            assert hamming(hash_function(original), hash_function(reencoded(original))) <= 6
+
+    def test_different_figures_are_not_linked(self):
+        index = PerceptualDuplicateIndex(phash_radius=8, dhash_radius=10)
+        for seed in range(8):
+            img = figure(seed)
+            assert index.find(*image_hashes(img)) is None
+            index.add(seed, *image_hashes(img))
+
+        assert len(index) == 8
+
+    def test_hashes_are_64_bit_and_roundtrip_signed(self):
+        for value in image_hashes(figure(1)):
+            assert 0 <= value < 1 << 64
+            assert to_unsigned(to_signed(value)) == value
+            assert -(1 << 63) <= to_signed(value) < 1 << 63
+
+    def test_transparent_image(self):
+        img = figure(2).convert("RGBA")
+        img.putalpha(200)
+
+        assert hamming(phash(img), phash(figure(2))) <= 10
+
+
+class TestBKTree:
+    """Test suite for Hamming-radius search"""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        values = [rng.getrandbits(64) for _ in range(500)]
+        # Near neighbours of the first few values
+        values += [v ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for v in values[:50]]
+        tree = BKTree()
+        for index, value in enumerate(values):
+            tree.add(value, index)
+
+        for query in values[:60]:
+            expected = sorted(i for i, v in enumerate(values) if hamming(query, v) <= 4)
+            found = sorted(payload for _, _, payload in tree.search(query, 4))
+            assert found == expected
+
+        assert len(tree) == len(values)
+
+    def test_equal_hashes_keep_all_payloads(self):
+        tree = BKTree()
+        tree.add(7, "a")
+        tree.add(7, "b")
+
+        assert [p for _, _, p in tree.search(7, 0)] == ["a", "b"]
+
+    def test_dhash_must_confirm(self):
+        index = PerceptualDuplicateIndex(phash_radius=4, dhash_radius=4)
+        index.add("canonical", 0b1111, 0)
+
+        assert index.find(0b1110, 0b1)["image_id"] == "canonical"
+        assert index.find(0b1110, (1 << 20) - 1) is None
+
+
+class TestLinkPerceptualDuplicates:
+    """Test suite for canonical assignment during PDFService.extract_images"""
+
+    def row(self, img):
+        p, d = image_hashes(img)
+        return {"id": uuid.uuid4(), "phash": to_signed(p), "dhash": to_signed(d)}
+
+    def test_links_to_library_and_earlier_images(self):
+        library_id = uuid.uuid4()
+        library_phash, library_dhash = image_hashes(figure(1))
+        db = MagicMock()
+        db.query.return_value.filter.return_value = [(library_id, to_signed(library_phash), to_signed(library_dhash))]
+
+        rows = [
+            self.row(reencoded(figure(1))),      # same figure as an analyzed library image
+            self.row(figure(2)),                 # new canonical
+            self.row(reencoded(figure(2), 0.7)), # repeat of the previous row
+            self.row(figure(3)),
+            {"id": uuid.uuid4(), "phash": None, "dhash": None},
+        ]
+
+        with patch("backend.services.pdf_service.StorageService"):
+            service = PDFService(db)
+        duplicates = service._link_perceptual_duplicates(rows)
+
+        assert duplicates == 2
+        assert [r["is_duplicate"] for r in rows] == [True, False, True, False, False]
+        assert rows[0]["duplicate_of_id"] == library_id
+        assert rows[2]["duplicate_of_id"] == rows[1]["id"]
+        assert rows[3]["duplicate_of_id"] is None
+
+    def test_disabled(self):
+        db = MagicMock()
+        rows = [self.row(figure(1)), self.row(figure(1))]
+
+        with patch("backend.services.pdf_service.StorageService"):
+            service = PDFService(db)
+        with patch("backend.services.pdf_service.settings") as settings:
+            settings.PDF_IMAGE_PERCEPTUAL_DEDUP = False
+            assert service._link_perceptual_duplicates(rows) == 0
+
+        assert all(r["is_duplicate"] is False for r in rows)
+        db.query.assert_not_called()
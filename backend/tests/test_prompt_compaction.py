@@ -0,0 +1,182 @@
+"""
+Tests for Prompt Compaction
+Tests token budgets, near-duplicate removal and relevance ranking of source passages
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.services.prompt_compaction import (
+    SourceCompactor,
+    count_tokens,
+    section_outline,
+    split_passages,
+)
+
+TOPICS = [
+    "Glioblastoma resection extent correlates with overall survival.",
+    "Awake craniotomy preserves language function during tumor removal.",
+    "Temozolomide chemotherapy follows radiotherapy in standard care.",
+    "Fluorescence guided surgery with 5-ALA improves resection rates.",
+    "Intraoperative MRI allows detection of residual tumor.",
+    "MGMT promoter methylation predicts response to alkylating agents.",
+]
+
+
+def synthetic_sources(count=12, sentences=8):
+    """Sources with long abstracts; every third one repeats an earlier abstract"""
+    sources = []
+    for i in range(count):
+        abstract = " ".join(
+            f"{TOPICS[(i + j) % len(TOPICS)]} Cohort {i} observation {j} was reported in detail."
+            for j in range(sentences)
+        )
+        if i % 3 == 2:
+            abstract = sources[i - 1]["abstract"]
+        sources.append({
+            "title": f"Study {i}",
+            "authors": ["Smith J", "Lee K", "Patel R"],
+            "year": 2015 + i % 8,
+            "journal": "J Neurosurg",
+            "doi": f"10.3171/jns.{i}",
+            "abstract": abstract,
+            "relevance_score": 0.9 - i * 0.01,
+        })
+    return sources
+
+
+class FakeEmbedder:
+    """Embeds text as counts of a few keywords"""
+
+    KEYWORDS = ("survival", "language", "chemotherapy", "fluorescence", "mri", "methylation")
+
+    def __init__(self):
+        self.calls = 0
+        self.batch_sizes = []
+
+    async def generate_embeddings_batch(self, texts):
+        self.calls += 1
+        self.batch_sizes.append(len(texts))
+        return {"embeddings": [
+            [text.lower().count(k) + 0.01 for k in self.KEYWORDS] for text in texts
+        ]}
+
+
+class TestTokenBudget:
+    """Test suite for per-call budget enforcement"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("budget", [60, 150, 400, 1200])
+    async def test_packed_block_never_exceeds_budget(self, budget):
+        compactor = SourceCompactor(FakeEmbedder())
+
+        result = await compactor.pack("Extent of resection and survival", synthetic_sources(), budget)
+
+        assert result.tokens == count_tokens(result.text)
+        assert result.tokens <= budget
+        assert result.raw_tokens > budget
+        assert result.tokens_saved == result.raw_tokens - result.tokens
+
+    @pytest.mark.asyncio
+    async def test_small_sources_fit_without_dropping_passages(self):
+        sources = synthetic_sources(count=2, sentences=2)
+        compactor = SourceCompactor()
+
+        result = await compactor.pack("Survival", sources, budget=5000)
+
+        assert result.passages_used == result.passages_total
+        assert result.sources_used == [0, 1]
+        assert result.text.startswith("[S1] Smith J, Lee K et al. (2015). Study 0. J Neurosurg. doi:10.3171/jns.0")
+
+    @pytest.mark.asyncio
+    async def test_totals_accumulate_across_calls(self):
+        compactor = SourceCompactor()
+        first = await compactor.pack("Survival", synthetic_sources(), 200)
+        second = await compactor.pack("Language", synthetic_sources(), 300)
+
+        assert compactor.totals["calls"] == 2
+        assert compactor.totals["tokens_saved"] == first.tokens_saved + second.tokens_saved
+
+    def test_passages_respect_max_tokens(self):
+        source = synthetic_sources(count=1, sentences=30)[0]
+
+        passages = split_passages(0, source, max_tokens=50)
+
+        assert len(passages) > 1
+        assert all(p.tokens <= 50 for p in passages)
+
+
+class TestPassageSelection:
+    """Test suite for de-duplication and relevance ranking"""
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_abstracts_kept_once(self):
+        sources = synthetic_sources(count=6)
+        sources[4]["abstract"] = sources[3]["abstract"].replace("reported in detail", "described in detail", 1)
+
+        result = await SourceCompactor().pack("Survival", sources, budget=100000)
+
+        assert result.duplicates_dropped > 0
+        assert 2 not in result.sources_used  # Exact copy of source 1
+        assert 4 not in result.sources_used  # Near copy of source 3
+
+    @pytest.mark.asyncio
+    async def test_most_relevant_passages_packed_first(self):
+        sources = [
+            {"title": "Chemo", "abstract": "Temozolomide chemotherapy schedules and chemotherapy toxicity."},
+            {"title": "Language", "abstract": "Awake mapping of language areas protects language outcomes."},
+        ]
+        embedder = FakeEmbedder()
+        compactor = SourceCompactor(embedder)
+        outline = section_outline({"title": "Language mapping", "key_points": ["language preservation"]})
+        budget = count_tokens("[S1] Unknown (n.d.). Language\n" + sources[1]["abstract"]) + 3
+
+        result = await compactor.pack(outline, sources, budget)
+
+        assert result.sources_used == [1]
+        assert "Awake mapping" in result.text
+
+    @pytest.mark.asyncio
+    async def test_prepare_embeds_chapter_in_one_request(self):
+        embedder = FakeEmbedder()
+        compactor = SourceCompactor(embedder)
+        sources = synthetic_sources()
+        outlines = ["Survival", "Language"]
+
+        await compactor.prepare(outlines, sources)
+        for outline in outlines:
+            await compactor.pack(outline, sources, 300)
+
+        assert embedder.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_prepare_splits_embedding_requests(self):
+        embedder = FakeEmbedder()
+        compactor = SourceCompactor(embedder)
+        sources = synthetic_sources()
+        outlines = ["Survival", "Language"]
+
+        with patch("backend.services.prompt_compaction.settings.PROMPT_PASSAGE_EMBEDDING_BATCH_SIZE", 8):
+            await compactor.prepare(outlines, sources)
+            for outline in outlines:
+                await compactor.pack(outline, sources, 300)
+
+        assert embedder.calls > 1
+        assert max(embedder.batch_sizes) <= 8
+        assert sum(embedder.batch_sizes) == len(compactor._vectors)
+
+    @pytest.mark.asyncio
+    async def test_keyword_ranking_when_embeddings_fail(self):
+        ai_service = MagicMock()
+        ai_service.generate_embeddings_batch = AsyncMock(side_effect=RuntimeError("quota"))
+        sources = [
+            {"title": "Chemo", "abstract": "Temozolomide chemotherapy schedules and toxicity."},
+            {"title": "Fluorescence", "abstract": "Fluorescence guided resection with 5-ALA."},
+        ]
+        budget = count_tokens("[S1] Unknown (n.d.). Fluorescence\n" + sources[1]["abstract"]) + 3
+
+        result = await SourceCompactor(ai_service).pack("Fluorescence guided resection", sources, budget)
+
+        assert result.sources_used == [1]
+        assert result.tokens <= budget
@@ -0,0 +1,119 @@
+"""
+Tests for Research Service
+Tests batched internal retrieval (one embedding request, database-side scoring)
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from backend.services.research_service import ResearchService
+
+
+def _pdf_row(query_index, similarity, title="Glioma Review", pdf_id=None, chunk_index=0):
+    return SimpleNamespace(
+        query_index=query_index, id=pdf_id or uuid.uuid4(), filename="paper.pdf", title=title,
+        authors=["Smith"], publication_year=2022, journal="J Neurosurg", doi=None,
+        pmid=None, total_pages=10, total_words=5000, file_path="/data/paper.pdf",
+        chunk_index=chunk_index, chunk_preview=f"Passage {chunk_index}", similarity=similarity
+    )
+
+
+def _chunk_row(query_index, chapter_id, similarity):
+    return SimpleNamespace(
+        query_index=query_index, chapter_id=chapter_id, similarity=similarity,
+        chunk_preview="Resection margins...", preceding_heading="Surgery",
+        chapter_title="Gliomas", source_type="textbook_chapter",
+        book_title="Youmans", book_authors=["Winn"], publication_year=2022
+    )
+
+
+@pytest.fixture
+def service():
+    with patch("backend.services.research_service.AIProviderService"), \
+            patch("backend.services.research_service.ChapterVectorSearchService"):
+        service = ResearchService(Mock())
+    service.ai_service.generate_embeddings_batch = AsyncMock(
+        return_value={"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+    )
+    return service
+
+
+class TestInternalResearchParallel:
+    """Test suite for batched internal research"""
+
+    @pytest.mark.asyncio
+    async def test_single_embedding_request_and_two_statements(self, service):
+        chapter_id = uuid.uuid4()
+        pdf_result = Mock(fetchall=Mock(return_value=[_pdf_row(1, 0.9), _pdf_row(2, 0.8)]))
+        chunk_result = Mock(fetchall=Mock(return_value=[
+            _chunk_row(1, chapter_id, 0.95),
+            _chunk_row(1, chapter_id, 0.85),  # same chapter, weaker chunk
+        ]))
+        service.db.execute.side_effect = [Mock(), pdf_result, chunk_result]
+
+        results = await service.internal_research_parallel(["glioma", "meningioma"], 5, 0.7)
+
+        service.ai_service.generate_embeddings_batch.assert_awaited_once_with(["glioma", "meningioma"])
+        # SET LOCAL hnsw.ef_search, then one statement per parent type
+        assert service.db.execute.call_count == 3
+        set_ef, pdf_query, chunk_query = service.db.execute.call_args_list
+        assert "hnsw.ef_search" in str(set_ef.args[0])
+
+        params = pdf_query.args[1]
+        assert params["vectors"] == ["[0.1,0.2]", "[0.3,0.4]"]
+        # Each scan stays within its parent type (partial HNSW indexes)
+        assert "pdf_id IS NOT NULL" in str(pdf_query.args[0])
+        assert "chapter_id IS NOT NULL" in str(chunk_query.args[0])
+
+        # Query 1: chapter (0.95) ranked above PDF (0.9); duplicate chunk collapsed
+        assert results[0]["chapter_id"] == str(chapter_id)
+        assert len(results) == 3
+
+    @pytest.mark.asyncio
+    async def test_per_query_cap(self, service):
+        rows = [_pdf_row(1, 0.9 - i * 0.01, title=f"Paper {i}") for i in range(4)]
+        service.db.execute.side_effect = [
+            Mock(),
+            Mock(fetchall=Mock(return_value=rows)),
+            Mock(fetchall=Mock(return_value=[])),
+        ]
+
+        results = await service.internal_research_parallel(["a", "b"], 2, 0.5)
+
+        assert [r["title"] for r in results] == ["Paper 0", "Paper 1"]
+
+    @pytest.mark.asyncio
+    async def test_pdf_chunks_ranked_per_pdf(self, service):
+        pdf_id = uuid.uuid4()
+        rows = [
+            _pdf_row(1, 0.82, title="Long Review", pdf_id=pdf_id, chunk_index=3),
+            _pdf_row(1, 0.91, title="Long Review", pdf_id=pdf_id, chunk_index=40),
+            _pdf_row(1, 0.88, title="Case Series"),
+        ]
+        service.db.execute.side_effect = [
+            Mock(),
+            Mock(fetchall=Mock(return_value=rows)),
+            Mock(fetchall=Mock(return_value=[])),
+        ]
+
+        results = await service.internal_research_parallel(["a", "b"], 5, 0.5)
+
+        assert [(r["title"], r["relevance_score"]) for r in results] == [
+            ("Long Review", 0.91), ("Case Series", 0.88)
+        ]
+        # Best matching passage, wherever it sits in the document
+        assert results[0]["content_preview"] == "Passage 40"
+
+    @pytest.mark.asyncio
+    async def test_empty_queries_skip_embedding(self, service):
+        assert await service.internal_research_parallel([]) == []
+        service.ai_service.generate_embeddings_batch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_returns_empty(self, service):
+        service.ai_service.generate_embeddings_batch.side_effect = RuntimeError("quota")
+        assert await service.internal_research_parallel(["a"]) == []
+        service.db.execute.assert_not_called()
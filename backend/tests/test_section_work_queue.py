@@ -0,0 +1,176 @@
+"""
+Tests for Sliding-Window Work Queue
+Tests ordering, no batch barriers, retry with backoff and adaptive concurrency
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services.section_work_queue import (
+    AdaptiveConcurrencyLimiter,
+    SlidingWindowExecutor,
+    is_rate_limit_error,
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def _executor(initial=2, maximum=2, max_attempts=3):
+    limiter = AdaptiveConcurrencyLimiter(initial=initial, maximum=maximum)
+    executor = SlidingWindowExecutor(limiter, max_attempts=max_attempts, base_delay=0.001, max_delay=0.002)
+    return limiter, executor
+
+
+class TestSlidingWindowExecutor:
+    """Test suite for the sliding-window executor"""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self):
+        _, executor = _executor(initial=3, maximum=3)
+
+        async def job(index, delay):
+            await asyncio.sleep(delay)
+            return index
+
+        completion_order = []
+
+        async def on_complete(index, result):
+            completion_order.append(index)
+
+        results = await executor.run([0.03, 0.01, 0.02], job, on_complete)
+
+        assert results == [0, 1, 2]
+        assert completion_order == [1, 2, 0]
+
+    @pytest.mark.asyncio
+    async def test_slow_job_does_not_block_free_slots(self):
+        _, executor = _executor(initial=2, maximum=2)
+        started = []
+
+        async def job(index, delay):
+            started.append(index)
+            await asyncio.sleep(delay)
+            return index
+
+        # With batch barriers item 2 would wait for the slow item 0
+        task = asyncio.ensure_future(executor.run([0.2, 0.01, 0.01, 0.01], job))
+        await asyncio.sleep(0.1)
+        assert started == [0, 1, 2, 3]
+        await task
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_limit(self):
+        limiter, executor = _executor(initial=2, maximum=2)
+
+        async def job(index, item):
+            await asyncio.sleep(0.005)
+            return item
+
+        await executor.run(list(range(10)), job)
+        assert limiter.peak_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self):
+        _, executor = _executor()
+        attempts = {}
+
+        async def job(index, item):
+            attempts[index] = attempts.get(index, 0) + 1
+            if attempts[index] < 3:
+                raise ConnectionError("transient")
+            return "ok"
+
+        assert await executor.run(["a"], job) == ["ok"]
+        assert executor.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_final_failure_returned_as_exception(self):
+        _, executor = _executor(max_attempts=2)
+
+        async def job(index, item):
+            if item == "bad":
+                raise ValueError("boom")
+            return item
+
+        results = await executor.run(["good", "bad"], job)
+        assert results[0] == "good"
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_concurrency(self):
+        limiter, executor = _executor(initial=8, maximum=8, max_attempts=2)
+        calls = []
+
+        async def job(index, item):
+            calls.append(index)
+            if len(calls) == 1:
+                raise RateLimited("too many requests")
+            return item
+
+        await executor.run([1], job)
+        assert limiter.rate_limited == 1
+        assert limiter.slots <= 4
+
+    @pytest.mark.asyncio
+    async def test_blocking_sdk_calls_overlap(self):
+        from backend.services.ai_provider_service import AIProviderService
+
+        _, executor = _executor(initial=4, maximum=4)
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def create(**kwargs):
+            # The sync SDK blocks its thread for the whole request
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.2)
+            with lock:
+                in_flight.pop()
+            return SimpleNamespace(
+                content=[SimpleNamespace(text="ok")],
+                usage=SimpleNamespace(input_tokens=10, output_tokens=5)
+            )
+
+        service = AIProviderService.__new__(AIProviderService)
+        service.claude_client = MagicMock()
+        service.claude_client.messages.create.side_effect = create
+
+        async def job(index, prompt):
+            return await service._generate_claude(prompt, None, 100, 0.2)
+
+        started = time.monotonic()
+        results = await executor.run(["a", "b", "c", "d"], job)
+
+        assert [r["text"] for r in results] == ["ok"] * 4
+        assert max(peak) == 4
+        assert time.monotonic() - started < 0.6
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test suite for AIMD limit adjustments"""
+
+    def test_additive_increase_bounded(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=4, latency_target=10)
+        for _ in range(50):
+            limiter.record_success(1.0)
+        assert limiter.slots == 4
+
+    def test_slow_responses_shrink_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=2, maximum=8, latency_target=10)
+        for _ in range(20):
+            limiter.record_success(30.0)
+        assert limiter.slots == 2
+
+    def test_rate_limit_detection(self):
+        assert is_rate_limit_error(RateLimited())
+        assert is_rate_limit_error(Exception("Error code: 429 - rate limit exceeded"))
+        assert not is_rate_limit_error(ValueError("bad schema"))
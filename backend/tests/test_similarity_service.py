@@ -0,0 +1,211 @@
+"""
+Tests for Similarity Service
+Tests batched similarity scoring, bulk detail resolution and bulk caching
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from backend.services.similarity_service import SimilarityService
+
+
+def _result(rows):
+    result = Mock()
+    result.__iter__ = Mock(return_value=iter(rows))
+    result.fetchone = Mock(return_value=rows[0] if rows else None)
+    return result
+
+
+class FakeDB:
+    """Routes text() queries to canned rows and records executions"""
+
+    def __init__(self, embeddings=None, cached=None, details=None):
+        self.embeddings = embeddings or {}
+        self.cached = cached or []
+        self.details = details or []
+        self.executed = []
+        self.commit = Mock()
+        self.rollback = Mock()
+
+    def execute(self, query, params=None):
+        sql = str(query)
+        self.executed.append((sql, params))
+
+        if 'FROM similarity_cache' in sql and 'SELECT' in sql:
+            return _result(self.cached)
+        if 'FROM chapter_embeddings' in sql:
+            ids = params['content_ids']
+            return _result([(i, self.embeddings[i]) for i in ids if i in self.embeddings])
+        if 'get_similar_content' in sql:
+            return _result([('chapter', 'c2', 0.91), ('chapter', 'c3', 0.85)])
+        if 'FROM chapters' in sql:
+            return _result(self.details)
+        return _result([])
+
+    def count(self, fragment):
+        return sum(1 for sql, _ in self.executed if fragment in sql)
+
+
+@pytest.fixture
+def embeddings():
+    return {
+        'c1': '[1.0, 0.0, 0.0]',  # text literal, as returned by raw text() queries
+        'c2': [1.0, 1.0, 0.0],
+        'c3': np.array([0.0, 0.0, 2.0]),
+    }
+
+
+class TestBatchSimilarity:
+    """Test suite for calculate_similarities_batch"""
+
+    def test_vector_scores_from_single_embedding_fetch(self, embeddings):
+        db = FakeDB(embeddings=embeddings)
+        service = SimilarityService(db)
+
+        pairs = [
+            ('chapter', 'c1', 'chapter', 'c2'),
+            ('chapter', 'c1', 'chapter', 'c3'),
+            ('chapter', 'c2', 'chapter', 'c3'),
+        ]
+        scores = service.calculate_similarities_batch(pairs, method='vector')
+
+        assert scores[pairs[0]] == pytest.approx(1 / np.sqrt(2), abs=1e-6)
+        assert scores[pairs[1]] == pytest.approx(0.0, abs=1e-6)
+        assert db.count('FROM chapter_embeddings') == 1
+
+    def test_missing_embedding_yields_none(self, embeddings):
+        db = FakeDB(embeddings=embeddings)
+        service = SimilarityService(db)
+
+        pair = ('chapter', 'c1', 'chapter', 'missing')
+        assert service.calculate_similarities_batch([pair])[pair] is None
+
+    def test_new_scores_cached_in_one_statement(self, embeddings):
+        db = FakeDB(embeddings=embeddings)
+        service = SimilarityService(db)
+
+        pairs = [('chapter', 'c1', 'chapter', 'c2'), ('chapter', 'c2', 'chapter', 'c3')]
+        service.calculate_similarities_batch(pairs)
+
+        inserts = [params for sql, params in db.executed if 'INSERT INTO similarity_cache' in sql]
+        assert len(inserts) == 1
+        assert len(inserts[0]) == 2
+        db.commit.assert_called_once()
+
+    def test_cached_pairs_skip_embedding_fetch(self):
+        # Cached in reverse orientation still matches
+        db = FakeDB(cached=[('chapter', 'c2', 'chapter', 'c1', 0.5)])
+        service = SimilarityService(db)
+
+        pair = ('chapter', 'c1', 'chapter', 'c2')
+        assert service.calculate_similarities_batch([pair]) == {pair: 0.5}
+        assert db.count('FROM chapter_embeddings') == 0
+
+    def test_single_pair_and_batch_text_scores_agree(self):
+        texts = {
+            'c1': "Awake craniotomy preserves language function during glioma resection in adults",
+            'c2': "Awake craniotomy preserves language function during glioma resection in kids",
+        }
+        service = SimilarityService(FakeDB())
+        service._get_content_text = lambda content_type, content_id: texts[content_id]
+        service._get_contents_by_ids = lambda content_type, ids: {
+            i: {'id': i, 'text': texts[i]} for i in ids
+        }
+        pair = ('chapter', 'c1', 'chapter', 'c2')
+
+        single = service.calculate_similarity(*pair, method='text')
+        batch = service.calculate_similarities_batch([pair], method='text', use_cache=False)
+
+        assert 0.0 < single < 1.0
+        assert batch == {pair: pytest.approx(single)}
+
+    def test_cache_reads_are_scoped_to_method(self):
+        db = FakeDB()
+        service = SimilarityService(db)
+
+        service.calculate_similarities_batch([('chapter', 'c1', 'chapter', 'c2')], method='text')
+
+        sql, params = next((sql, p) for sql, p in db.executed if 'FROM similarity_cache' in sql)
+        assert 'similarity_method = :method' in sql and params['method'] == 'text'
+
+    def test_unknown_method(self):
+        service = SimilarityService(FakeDB())
+        pair = ('chapter', 'a', 'chapter', 'b')
+        assert service.calculate_similarities_batch([pair], method='bogus') == {pair: None}
+
+
+class TestFindSimilarByVector:
+    """Test suite for bulk detail resolution"""
+
+    def test_details_resolved_in_one_query(self):
+        created = datetime(2025, 1, 1)
+        db = FakeDB(details=[('c2', 'Meningioma', created), ('c3', 'Glioma', created)])
+        service = SimilarityService(db)
+
+        results = service._find_similar_by_vector('chapter', 'c1', 0.7, 10)
+
+        assert [r['id'] for r in results] == ['c2', 'c3']
+        assert results[0]['title'] == 'Meningioma'
+        assert db.count('FROM chapters') == 1
+
+
+class TestMinHashSignatures:
+    """Test suite for signature parameters in the staleness check"""
+
+    def test_refresh_compares_bands_and_seed(self):
+        db = FakeDB()
+        service = SimilarityService(db)
+
+        service.refresh_signatures('chapter')
+
+        sql, params = next(
+            (sql, p) for sql, p in db.executed if 'LEFT JOIN content_minhash_signatures' in sql
+        )
+        assert 's.lsh_bands IS DISTINCT FROM :lsh_bands' in sql
+        assert 's.seed IS DISTINCT FROM :seed' in sql
+        assert params['lsh_bands'] == service.lsh_bands
+        assert params['seed'] == service.minhasher.seed
+
+    def test_stored_signature_records_bands_and_seed(self):
+        db = FakeDB()
+        service = SimilarityService(db)
+        signature = service.minhasher.signature([1, 2, 3])
+
+        service._store_signature('chapter', 'c1', signature, 3)
+
+        sql, params = db.executed[0]
+        assert 'lsh_bands = EXCLUDED.lsh_bands' in sql and 'seed = EXCLUDED.seed' in sql
+        assert (params['lsh_bands'], params['seed']) == (service.lsh_bands, service.minhasher.seed)
+        assert db.count('INSERT INTO content_lsh_buckets') == 1
+
+    def test_signature_older_than_content_is_not_current(self):
+        db = FakeDB()
+        service = SimilarityService(db)
+
+        assert service._has_signature('chapter', 'c1') is False
+
+        sql, params = db.executed[0]
+        assert 'JOIN chapters t ON t.id = s.content_id' in sql
+        assert 't.updated_at <= s.indexed_at' in sql
+        assert params['content_id'] == 'c1'
+
+    def test_duplicate_thresholds_are_jaccard_scale(self):
+        service = SimilarityService(FakeDB())
+        words = [f"word{i}" for i in range(200)]
+        edited = list(words)
+        for i in range(0, 200, 20):
+            edited[i] = f"edit{i}"  # 5% of the words changed
+        service.refresh_signatures = Mock(return_value=0)
+        service._get_lsh_candidate_pairs = Mock(return_value=[('c1', 'c2')])
+        service._get_contents_by_ids = Mock(return_value={
+            cid: {'id': cid, 'title': cid, 'created_at': None, 'text': ' '.join(body)}
+            for cid, body in (('c1', words), ('c2', edited))
+        })
+
+        assert service.detect_duplicates('chapter', strict=True) == []
+        [pair] = service.detect_duplicates('chapter', strict=False)
+        assert 0.5 < pair['similarity_score'] < 0.8
+        assert pair['is_exact_duplicate'] is False
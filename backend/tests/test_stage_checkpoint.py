@@ -0,0 +1,257 @@
+"""
+Tests for Stage Checkpoints
+Tests stage reuse by inputs hash, invalidation of downstream stages, and
+resuming a chapter generation killed mid-pipeline
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.database.models import Chapter
+from backend.services.stage_checkpoint import StageCheckpointer, content_hash
+from backend.services.stage_scheduler import Stage, StageGraph, StageScheduler
+from backend.services.task_checkpoint import TaskCheckpoint
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis_manager hash commands"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hset(self, name, key, value, serialize="json"):
+        self.hashes.setdefault(name, {})[key] = value
+        return 1
+
+    def hget(self, name, key, deserialize="json", default=None):
+        return self.hashes.get(name, {}).get(key, default)
+
+    def hlen(self, name):
+        return len(self.hashes.get(name, {}))
+
+    def hgetall(self, name, deserialize="json"):
+        return dict(self.hashes.get(name, {}))
+
+    def expire(self, key, ttl):
+        return True
+
+    def delete(self, *keys):
+        return sum(self.hashes.pop(k, None) is not None for k in keys)
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch("backend.services.task_checkpoint.redis_manager", fake):
+        yield fake
+
+
+def _graph(calls, values, topic="glioma"):
+    """a -> b -> c, each stage writes values[name] from its input"""
+    def stage(name, source):
+        async def run():
+            calls.append(name)
+            values[name] = f"{values.get(source, topic)}>{name}"
+        return run
+
+    return StageGraph([
+        Stage("a", stage("a", None), inputs=("topic",), outputs=("x",)),
+        Stage("b", stage("b", "a"), inputs=("x",), outputs=("y",)),
+        Stage("c", stage("c", "b"), inputs=("y",), outputs=("z",)),
+    ], initial=("topic",))
+
+
+def _checkpointer(values, topic="glioma"):
+    return StageCheckpointer(
+        TaskCheckpoint("ch-1", "chapter_generation"),
+        initial_inputs={"topic": topic},
+        capture=lambda name: {"value": values[name]},
+        restore=lambda name, outputs: values.__setitem__(name, outputs["value"])
+    )
+
+
+class TestStageCheckpointer:
+    """Test suite for checkpointed stage execution"""
+
+    @pytest.mark.asyncio
+    async def test_completed_stages_restored_not_rerun(self, redis):
+        calls, values = [], {}
+        await StageScheduler(_checkpointer(values).wrap(_graph(calls, values))).run()
+
+        calls2, values2 = [], {}
+        checkpointer = _checkpointer(values2)
+        await StageScheduler(checkpointer.wrap(_graph(calls2, values2))).run()
+
+        assert calls2 == []
+        assert checkpointer.reused == ["a", "b", "c"]
+        assert values2 == values
+
+    @pytest.mark.asyncio
+    async def test_changed_output_invalidates_downstream(self, redis):
+        calls, values = [], {}
+        await StageScheduler(_checkpointer(values).wrap(_graph(calls, values))).run()
+
+        # Stage b must re-run and now produces a different output
+        checkpoint = TaskCheckpoint("ch-1", "chapter_generation")
+        checkpoint.mark_step_failed("b", "forced")
+        calls2, values2 = [], {}
+        graph = _graph(calls2, values2)
+
+        async def new_b():
+            calls2.append("b")
+            values2["b"] = "changed"
+        graph.stages["b"].run = new_b
+
+        checkpointer = _checkpointer(values2)
+        await StageScheduler(checkpointer.wrap(graph)).run()
+
+        assert checkpointer.reused == ["a"]
+        assert calls2 == ["b", "c"]
+        assert values2["c"] == "changed>c"
+
+    @pytest.mark.asyncio
+    async def test_new_initial_inputs_rerun_everything(self, redis):
+        calls, values = [], {}
+        await StageScheduler(_checkpointer(values).wrap(_graph(calls, values))).run()
+
+        calls2, values2 = [], {}
+        graph = _graph(calls2, values2, topic="meningioma")
+        await StageScheduler(_checkpointer(values2, topic="meningioma").wrap(graph)).run()
+
+        assert calls2 == ["a", "b", "c"]
+        assert values2["c"] == "meningioma>a>b>c"
+
+    def test_content_hash_ignores_key_order(self):
+        assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+STAGES = [
+    ("_stage_1_input_validation", "stage_1_input"),
+    ("_stage_2_context_building", "stage_2_context"),
+    ("_stage_3_internal_research", "stage_3_internal_research"),
+    ("_stage_4_external_research", "stage_4_external_research"),
+    ("_stage_5_synthesis_planning", "stage_5_synthesis_metadata"),
+    ("_stage_6_section_generation", "sections"),
+    ("_stage_7_image_integration", "sections"),
+    ("_stage_8_citation_network", "references"),
+    ("_stage_9_quality_assurance", "depth_score"),
+    ("_stage_10_fact_checking", "stage_10_fact_check"),
+    ("_stage_11_formatting", "stage_11_formatting"),
+    ("_stage_12_review_refinement", "stage_12_review"),
+    ("_stage_13_finalization", "version"),
+    ("_stage_14_delivery", "generation_status"),
+]
+
+
+def _orchestrator(chapter, calls, hang_at=None, started=None):
+    """Orchestrator whose stages write chapter fields and record their calls"""
+    from backend.services.chapter_orchestrator import ChapterOrchestrator
+
+    with patch("backend.services.chapter_orchestrator.AIProviderService"), \
+            patch("backend.services.chapter_orchestrator.ResearchService"), \
+            patch("backend.services.chapter_orchestrator.DeduplicationService"), \
+            patch("backend.services.chapter_orchestrator.FactCheckingService"):
+        orchestrator = ChapterOrchestrator(MagicMock())
+    orchestrator.db.query.return_value.filter.return_value.first.return_value = chapter
+
+    def stub(method, field):
+        async def run(chapter, *args):
+            calls.append(method)
+            if method == hang_at:
+                started.set()
+                await asyncio.Event().wait()
+            if method == "_stage_6_section_generation":
+                chapter.sections = [{"title": "Intro", "content": "generated"}]
+            elif method == "_stage_7_image_integration":
+                chapter.sections = [{**s, "images": ["fig1"]} for s in chapter.sections]
+            elif method == "_stage_14_delivery":
+                chapter.generation_status = "completed"
+            else:
+                setattr(chapter, field, f"{method}:{chapter.title}")
+        return run
+
+    for method, field in STAGES:
+        setattr(orchestrator, method, stub(method, field))
+    return orchestrator
+
+
+class TestChapterResume:
+    """Fault injection: kill a chapter generation mid-pipeline and resume it"""
+
+    @pytest.mark.asyncio
+    async def test_killed_run_resumes_at_first_incomplete_stage(self, redis):
+        chapter = Chapter(id=uuid.uuid4(), title="Glioblastoma", generation_status="stage_1_input")
+        first_calls, started = [], asyncio.Event()
+        orchestrator = _orchestrator(chapter, first_calls, hang_at="_stage_12_review_refinement", started=started)
+
+        with patch("backend.services.chapter_orchestrator.emitter", AsyncMock()):
+            run = asyncio.create_task(orchestrator._run_pipeline(chapter, chapter.title))
+            await asyncio.wait_for(started.wait(), timeout=5)
+            run.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await run
+
+            # Simulate a fresh process: all in-memory stage state is lost
+            sections_before = chapter.sections
+            chapter.sections = None
+            chapter.stage_3_internal_research = None
+
+            resumed_calls = []
+            resumed = await _orchestrator(chapter, resumed_calls).resume_chapter(str(chapter.id))
+
+        assert "_stage_13_finalization" not in first_calls
+        assert resumed_calls == [
+            "_stage_12_review_refinement", "_stage_13_finalization", "_stage_14_delivery"
+        ]
+        assert resumed.generation_status == "completed"
+        assert resumed.sections == sections_before
+        assert resumed.sections[0]["images"] == ["fig1"]
+        assert resumed.stage_3_internal_research == "_stage_3_internal_research:Glioblastoma"
+        assert len(resumed.stage_timings["reused_stages"]) == 11
+        # Successful run clears the checkpoint
+        assert redis.hashes == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_is_rerun_on_resume(self, redis):
+        chapter = Chapter(id=uuid.uuid4(), title="Meningioma", generation_status="stage_1_input")
+        calls = []
+        orchestrator = _orchestrator(chapter, calls)
+        orchestrator._stage_10_fact_checking = AsyncMock(side_effect=RuntimeError("provider down"))
+
+        with patch("backend.services.chapter_orchestrator.emitter", AsyncMock()):
+            with pytest.raises(RuntimeError):
+                await orchestrator._run_pipeline(chapter, chapter.title)
+            assert chapter.generation_status == "failed"
+
+            resumed_calls = []
+            await _orchestrator(chapter, resumed_calls).resume_chapter(str(chapter.id))
+
+        assert "_stage_10_fact_checking" in resumed_calls
+        assert "_stage_6_section_generation" not in resumed_calls
+        assert chapter.generation_status == "completed"
+        assert chapter.generation_error is None
+
+
+class TestSectionCheckpoints:
+    """Test suite for reuse of sections generated before a crash"""
+
+    @pytest.mark.asyncio
+    async def test_generated_section_reused_until_plan_changes(self, redis):
+        chapter = Chapter(id=uuid.uuid4(), title="Glioma")
+        orchestrator = _orchestrator(chapter, [])
+        orchestrator._generate_section_content = AsyncMock(return_value={
+            "content": "text", "word_count": 1, "sources_used": [], "cost_usd": 0.05, "model": "m"
+        })
+        plan = {"title": "Intro", "section_type": "custom"}
+
+        first, first_cost = await orchestrator._generate_single_section(chapter, plan, 0, [])
+        again, again_cost = await orchestrator._generate_single_section(chapter, plan, 0, [])
+        await orchestrator._generate_single_section(chapter, {**plan, "title": "Overview"}, 0, [])
+
+        assert orchestrator._generate_section_content.await_count == 2
+        assert again == first
+        assert (first_cost, again_cost) == (0.05, 0.0)
@@ -0,0 +1,117 @@
+"""
+Tests for Stage Scheduler
+Tests dependency resolution, concurrent execution, failure handling and critical path
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services.stage_scheduler import Stage, StageGraph, StageScheduler
+
+
+def _sleeper(log, name, seconds):
+    async def run():
+        log.append(("start", name))
+        await asyncio.sleep(seconds)
+        log.append(("end", name))
+    return run
+
+
+class TestStageGraph:
+    """Test suite for graph validation"""
+
+    def test_dependencies_from_artifacts(self):
+        graph = StageGraph([
+            Stage("a", None, inputs=("topic",), outputs=("x",)),
+            Stage("b", None, inputs=("x",), outputs=("y",)),
+            Stage("c", None, inputs=("x",), outputs=("z",)),
+            Stage("d", None, inputs=("y", "z"), outputs=()),
+        ], initial=("topic",))
+
+        assert graph.dependencies == {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+        assert graph.order == ["a", "b", "c", "d"]
+
+    def test_unknown_input_rejected(self):
+        with pytest.raises(ValueError, match="no stage produces"):
+            StageGraph([Stage("a", None, inputs=("missing",))])
+
+    def test_duplicate_producer_rejected(self):
+        with pytest.raises(ValueError, match="produced by both"):
+            StageGraph([Stage("a", None, outputs=("x",)), Stage("b", None, outputs=("x",))])
+
+    def test_cycle_rejected(self):
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraph([
+                Stage("a", None, inputs=("y",), outputs=("x",)),
+                Stage("b", None, inputs=("x",), outputs=("y",)),
+            ])
+
+
+class TestStageScheduler:
+    """Test suite for scheduled execution"""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        log = []
+        graph = StageGraph([
+            Stage("root", _sleeper(log, "root", 0), outputs=("x",)),
+            Stage("left", _sleeper(log, "left", 0.05), inputs=("x",), outputs=("l",)),
+            Stage("right", _sleeper(log, "right", 0.05), inputs=("x",), outputs=("r",)),
+            Stage("join", _sleeper(log, "join", 0), inputs=("l", "r")),
+        ])
+
+        report = await StageScheduler(graph).run()
+
+        assert log.index(("start", "right")) < log.index(("end", "left"))
+        assert log[-1] == ("end", "join")
+        assert report["wall_time_s"] < report["sum_stage_time_s"]
+        assert set(report["stages"]) == {"root", "left", "right", "join"}
+
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_slowest_branch(self):
+        log = []
+        graph = StageGraph([
+            Stage("root", _sleeper(log, "root", 0), outputs=("x",)),
+            Stage("fast", _sleeper(log, "fast", 0.01), inputs=("x",), outputs=("f",)),
+            Stage("slow", _sleeper(log, "slow", 0.08), inputs=("x",), outputs=("s",)),
+            Stage("join", _sleeper(log, "join", 0), inputs=("f", "s")),
+        ])
+
+        report = await StageScheduler(graph).run()
+
+        assert report["critical_path"] == ["root", "slow", "join"]
+        assert report["critical_path_s"] >= 0.08
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_stages(self):
+        log = []
+
+        async def boom():
+            raise RuntimeError("provider down")
+
+        graph = StageGraph([
+            Stage("fails", boom, outputs=("a",)),
+            Stage("slow", _sleeper(log, "slow", 1), outputs=("b",)),
+            Stage("after", _sleeper(log, "after", 0), inputs=("a", "b")),
+        ])
+        scheduler = StageScheduler(graph)
+
+        with pytest.raises(RuntimeError, match="provider down"):
+            await scheduler.run()
+
+        assert scheduler.failed_stage == "fails"
+        assert ("end", "slow") not in log
+        assert ("start", "after") not in log
+
+    @pytest.mark.asyncio
+    async def test_on_start_hook_runs_before_stage(self):
+        log = []
+
+        async def announce():
+            log.append("announced")
+
+        graph = StageGraph([Stage("only", _sleeper(log, "only", 0), on_start=announce)])
+        await StageScheduler(graph).run()
+
+        assert log == ["announced", ("start", "only"), ("end", "only")]
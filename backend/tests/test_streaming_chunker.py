@@ -0,0 +1,125 @@
+"""
+Tests for Streaming Chunker
+Tests token-sized chunks, exact offsets, overlap, heading tracking and lazy output
+"""
+
+from unittest.mock import patch
+
+from backend.services import streaming_chunker
+from backend.services.streaming_chunker import iter_chunks
+from backend.utils.tokenizer import count_tokens
+
+
+def chapter_text(sections=6, paragraphs=8, sentences=5):
+    parts = []
+    for s in range(sections):
+        parts.append(f"{s + 1}. Section {s + 1} heading")
+        for p in range(paragraphs):
+            parts.append(" ".join(
+                f"Sentence {i} of paragraph {p} in section {s} describes the surgical corridor."
+                for i in range(sentences)
+            ))
+    return "\n\n".join(parts)
+
+
+class TestStreamingChunker:
+    """Test suite for the single-pass chunker"""
+
+    def test_chunks_respect_token_size_and_offsets(self):
+        text = chapter_text()
+
+        chunks = list(iter_chunks(text, chunk_size=200, overlap=40))
+
+        assert len(chunks) > 5
+        for chunk in chunks:
+            assert text[chunk["start_offset"]:chunk["end_offset"]] == chunk["text"]
+            assert count_tokens(chunk["text"]) <= 200
+            assert abs(chunk["token_count"] - count_tokens(chunk["text"])) <= 10
+
+    def test_every_paragraph_is_covered(self):
+        text = chapter_text()
+        chunks = list(iter_chunks(text, chunk_size=150, overlap=30))
+
+        for paragraph in text.split("\n\n"):
+            start = text.index(paragraph)
+            assert any(c["start_offset"] <= start and start + len(paragraph) <= c["end_offset"] for c in chunks)
+
+    def test_overlap_starts_at_sentence_boundary(self):
+        text = chapter_text()
+        chunks = list(iter_chunks(text, chunk_size=200, overlap=40))
+
+        overlapping = 0
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk["start_offset"] >= previous["start_offset"]
+            if chunk["start_offset"] < previous["end_offset"]:
+                overlapping += 1
+                assert count_tokens(text[chunk["start_offset"]:previous["end_offset"]]) <= 40
+                assert text[chunk["start_offset"]] == "S"  # "Sentence ..."
+        assert overlapping > 0
+
+    def test_no_overlap(self):
+        text = chapter_text()
+        chunks = list(iter_chunks(text, chunk_size=200, overlap=0))
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk["start_offset"] > previous["end_offset"]
+
+    def test_long_paragraph_split_by_sentences(self):
+        text = chapter_text(sections=1, paragraphs=1, sentences=60)
+
+        chunks = list(iter_chunks(text, chunk_size=100, overlap=0))
+
+        assert len(chunks) > 5
+        assert all(count_tokens(c["text"]) <= 100 for c in chunks)
+        assert all(c["text"].endswith(".") for c in chunks)
+
+    def test_unpunctuated_text_split_at_word_boundaries(self):
+        rows = "\n".join(
+            f"| Grade {i} | tumor volume {i * 3} cm3 | resection {i % 100} percent |" for i in range(400)
+        )
+        text = "Table 1\n" + rows + "\n\nClosing paragraph."
+
+        chunks = list(iter_chunks(text, chunk_size=100, overlap=0))
+
+        assert len(chunks) > 10
+        assert all(count_tokens(c["text"]) <= 100 for c in chunks)
+        assert all(text[c["start_offset"]:c["end_offset"]] == c["text"] for c in chunks)
+        assert all(not c["text"][0].isspace() and not c["text"][-1].isspace() for c in chunks)
+        words = [w for c in chunks for w in c["text"].split()]
+        assert words == text.split()
+
+    def test_word_longer_than_chunk_is_cut(self):
+        text = "Scan " + "x7Q" * 500 + " end"
+
+        chunks = list(iter_chunks(text, chunk_size=50, overlap=0))
+
+        assert all(count_tokens(c["text"]) <= 50 for c in chunks)
+        assert "".join(c["text"] for c in chunks).replace(" ", "") == text.replace(" ", "")
+
+    def test_headings_tracked(self):
+        text = chapter_text(sections=3, paragraphs=2)
+
+        chunks = list(iter_chunks(text, chunk_size=120, overlap=0))
+
+        assert chunks[0]["preceding_heading"] == "1. Section 1 heading"
+        assert chunks[-1]["preceding_heading"] == "3. Section 3 heading"
+        headings = [h for c in chunks for h in (c["contains_headings"] or [])]
+        assert headings == ["1. Section 1 heading", "2. Section 2 heading", "3. Section 3 heading"]
+
+    def test_chunks_yielded_before_text_is_consumed(self):
+        text = chapter_text(sections=40)
+        calls = []
+
+        def counting(value):
+            calls.append(len(value))
+            return count_tokens(value)
+
+        with patch.object(streaming_chunker, "count_tokens", side_effect=counting):
+            first = next(iter_chunks(text, chunk_size=200, overlap=40))
+
+        assert first["start_offset"] == 0
+        assert sum(calls) < len(text) / 10
+
+    def test_empty_text(self):
+        assert list(iter_chunks("", chunk_size=100)) == []
+        assert list(iter_chunks("\n\n  \n\n", chunk_size=100)) == []
@@ -0,0 +1,237 @@
+"""
+Tests for streamed textbook uploads
+Tests chunked streaming and hashing, rejection of bad uploads, duplicate
+handling at upload time and progress reporting of the ingestion job
+"""
+
+import contextvars
+import hashlib
+import io
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from backend.api import textbook_routes
+from backend.services import textbook_ingestion_tasks, upload_ingestion
+from backend.services.textbook_ingestion_tasks import ingest_textbook_upload
+from backend.services.upload_ingestion import (
+    UploadRejectedError,
+    claim_inflight_upload,
+    stream_upload_to_disk,
+)
+
+
+def pdf_bytes(size):
+    return b"%PDF-1.7\n" + os.urandom(size - 9)
+
+
+def upload(content, filename="book.pdf"):
+    return UploadFile(io.BytesIO(content), filename=filename)
+
+
+class CountingReader(io.BytesIO):
+    """BytesIO that records the size of every read"""
+
+    def __init__(self, content):
+        super().__init__(content)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+class TestStreamUploadToDisk:
+    """Test suite for stream_upload_to_disk"""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_chunks_and_hashes(self, tmp_path):
+        content = pdf_bytes(10_000)
+        reader = CountingReader(content)
+
+        streamed = await stream_upload_to_disk(
+            UploadFile(reader, filename="book.pdf"), str(tmp_path), chunk_size=1024
+        )
+
+        assert streamed.sha256 == hashlib.sha256(content).hexdigest()
+        assert streamed.size_bytes == len(content)
+        assert streamed.original_filename == "book.pdf"
+        with open(streamed.path, "rb") as f:
+            assert f.read() == content
+        # Never more than one chunk read at a time
+        assert set(reader.reads) == {1024}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content,filename,status_code", [
+        (b"not a pdf at all", "book.pdf", 400),
+        (b"", "book.pdf", 400),
+        (pdf_bytes(100), "book.txt", 400),
+        (pdf_bytes(5000), "book.pdf", 413),
+    ])
+    async def test_rejected_uploads_leave_no_file(self, tmp_path, content, filename, status_code):
+        with pytest.raises(UploadRejectedError) as excinfo:
+            await stream_upload_to_disk(upload(content, filename), str(tmp_path), max_bytes=4096, chunk_size=1024)
+
+        assert excinfo.value.status_code == status_code
+        assert os.listdir(tmp_path) == []
+
+
+class TestInflightClaim:
+    """Test suite for in-flight upload registration"""
+
+    def test_claim_and_existing_job(self):
+        client = MagicMock()
+        client.set.side_effect = [True, False]
+        client.get.return_value = b"job-1"
+
+        with patch.object(upload_ingestion.redis_manager, "get_client", return_value=client):
+            assert claim_inflight_upload("abc", "job-1") is None
+            assert claim_inflight_upload("abc", "job-2") == "job-1"
+
+        assert client.set.call_args.kwargs["nx"] is True
+
+    def test_redis_unavailable_does_not_block_upload(self):
+        with patch.object(upload_ingestion.redis_manager, "get_client", side_effect=ConnectionError("down")):
+            assert claim_inflight_upload("abc", "job-1") is None
+
+
+class TestAcceptUpload:
+    """Test suite for the request half of uploads"""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        storage = MagicMock()
+        storage.upload_staging_path = tmp_path
+        storage.store_staged_pdf.side_effect = lambda path, filename, sha256: {"file_path": path}
+        return storage
+
+    @pytest.fixture
+    def user(self):
+        return SimpleNamespace(id="user-1", is_admin=False)
+
+    @pytest.mark.asyncio
+    async def test_new_content_queues_job(self, storage, user):
+        content = pdf_bytes(3000)
+
+        with patch.object(textbook_routes, "find_ingested_book", return_value=None), \
+                patch.object(textbook_routes, "claim_inflight_upload", return_value=None), \
+                patch.object(textbook_routes, "TaskService") as task_service, \
+                patch.object(textbook_routes.ingest_textbook_upload, "apply_async") as apply_async:
+            result = await textbook_routes._accept_upload(upload(content), user, MagicMock(), storage)
+
+        assert result.status == "accepted" and result.book_id is None
+        assert result.content_sha256 == hashlib.sha256(content).hexdigest()
+        assert task_service.return_value.create_task.call_args.kwargs["task_id"] == result.job_id
+        assert apply_async.call_args.kwargs["task_id"] == result.job_id
+        assert apply_async.call_args.kwargs["kwargs"]["content_sha256"] == result.content_sha256
+        assert apply_async.call_args.kwargs["kwargs"]["file_size_bytes"] == 3000
+
+    @pytest.mark.asyncio
+    async def test_existing_book_is_not_reprocessed(self, storage, user, tmp_path):
+        book = SimpleNamespace(id="book-1")
+
+        with patch.object(textbook_routes, "find_ingested_book", return_value=book), \
+                patch.object(textbook_routes.ingest_textbook_upload, "apply_async") as apply_async:
+            result = await textbook_routes._accept_upload(upload(pdf_bytes(3000)), user, MagicMock(), storage)
+
+        assert (result.status, result.book_id, result.job_id) == ("duplicate", "book-1", None)
+        apply_async.assert_not_called()
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_inflight_upload_returns_running_job(self, storage, user, tmp_path):
+        with patch.object(textbook_routes, "find_ingested_book", return_value=None), \
+                patch.object(textbook_routes, "claim_inflight_upload", return_value="job-1"), \
+                patch.object(textbook_routes.ingest_textbook_upload, "apply_async") as apply_async:
+            result = await textbook_routes._accept_upload(upload(pdf_bytes(3000)), user, MagicMock(), storage)
+
+        assert (result.status, result.job_id) == ("duplicate", "job-1")
+        apply_async.assert_not_called()
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_queue_failure_releases_claim(self, storage, user, tmp_path):
+        with patch.object(textbook_routes, "find_ingested_book", return_value=None), \
+                patch.object(textbook_routes, "claim_inflight_upload", return_value=None), \
+                patch.object(textbook_routes, "release_inflight_upload") as release, \
+                patch.object(textbook_routes, "TaskService"), \
+                patch.object(textbook_routes.ingest_textbook_upload, "apply_async", side_effect=ConnectionError):
+            with pytest.raises(ConnectionError):
+                await textbook_routes._accept_upload(upload(pdf_bytes(3000)), user, MagicMock(), storage)
+
+        release.assert_called_once()
+        assert os.listdir(tmp_path) == []
+
+
+class TestIngestTextbookUpload:
+    """Test suite for the worker half of uploads"""
+
+    def run(self, process_pdf, existing_book=None):
+        db = MagicMock()
+        with patch.object(textbook_ingestion_tasks.DatabaseTask, "db_session", db), \
+                patch.object(textbook_ingestion_tasks, "find_ingested_book", return_value=existing_book), \
+                patch.object(textbook_ingestion_tasks, "TaskService") as task_service, \
+                patch.object(textbook_ingestion_tasks, "TextbookProcessorService") as processor, \
+                patch.object(textbook_ingestion_tasks, "queue_book_pipelines",
+                             return_value={"pdf_id": "pdf-1", "embedding_tasks_queued": 12}), \
+                patch.object(textbook_ingestion_tasks, "release_inflight_upload") as release:
+            processor.return_value.process_pdf.side_effect = process_pdf
+            # Own context: task_prerun sets worker-only state (LLM request priority)
+            result = contextvars.copy_context().run(lambda: ingest_textbook_upload.apply(
+                kwargs={
+                    "file_path": "/data/book.pdf",
+                    "original_filename": "book.pdf",
+                    "content_sha256": "abc",
+                    "file_size_bytes": 3000
+                },
+                task_id="job-1"
+            ))
+        return result, task_service.return_value.update_task_status, processor, release
+
+    def test_progress_and_result_recorded(self):
+        def process_pdf(**kwargs):
+            kwargs["progress_callback"](50, "chapters")
+            return {"book_id": "00000000-0000-0000-0000-000000000001", "chapters_created": 12,
+                    "pdf_type": "textbook", "total_pages": 300}
+
+        result, update_status, processor, release = self.run(process_pdf)
+
+        assert result.get()["book_id"] == "00000000-0000-0000-0000-000000000001"
+        calls = [(c.args[0], c.args[1], c.kwargs.get("progress")) for c in update_status.call_args_list]
+        assert calls == [
+            ("job-1", "processing", 1),
+            ("job-1", "processing", 45),
+            ("job-1", "processing", 90),
+            ("job-1", "completed", 100),
+        ]
+        assert update_status.call_args.kwargs["result"]["embedding_tasks_queued"] == 12
+        assert processor.return_value.process_pdf.call_args.kwargs["content_sha256"] == "abc"
+        release.assert_called_once_with("abc")
+
+    def test_failure_recorded_and_claim_released(self):
+        def process_pdf(**kwargs):
+            raise ValueError("corrupt PDF")
+
+        result, update_status, _, release = self.run(process_pdf)
+
+        assert result.failed()
+        assert update_status.call_args.args[1] == "failed"
+        assert update_status.call_args.kwargs["error"] == "corrupt PDF"
+        release.assert_called_once_with("abc")
+
+    def test_content_ingested_meanwhile_is_reused(self):
+        book = SimpleNamespace(
+            id="book-1", total_chapters=7, book_metadata={"pdf_type": "textbook"},
+            total_pages=120, pdf_id="pdf-1"
+        )
+
+        result, update_status, processor, release = self.run(None, existing_book=book)
+
+        assert result.get()["book_id"] == "book-1"
+        assert result.get()["reused"] is True
+        processor.return_value.process_pdf.assert_not_called()
+        assert update_status.call_args.args[1] == "completed"
+        release.assert_called_once_with("abc")
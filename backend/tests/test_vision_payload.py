@@ -0,0 +1,147 @@
+"""
+Tests for Vision Payload Preparation
+Tests downscaling, format choice, byte budget, passthrough and caching
+"""
+
+import base64
+import io
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from backend.services.image_analysis_service import ImageAnalysisService
+from backend.services.vision_payload import VisionPayloadCache, prepare_image_bytes, target_size
+
+
+def photo(width, height, image_format="PNG"):
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    pixels = (gradient + rng.normal(0, 20, (height, width, 3))).clip(0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def diagram(width, height):
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    for x in range(0, width, 40):
+        draw.line([(x, 0), (width - x, height)], fill="black", width=3)
+    buffer = io.BytesIO()
+    img.save(buffer, "BMP")
+    return buffer.getvalue()
+
+
+def decoded(payload):
+    return Image.open(io.BytesIO(base64.b64decode(payload.image_base64)))
+
+
+class TestPrepareImageBytes:
+    """Test suite for payload downscaling and re-encoding"""
+
+    def test_target_size_limits(self):
+        assert target_size(6000, 4000, 1568, 10_000_000) == (1568, 1045)
+        width, height = target_size(1500, 1500, 1568, 1_150_000)
+        assert width * height <= 1_150_000 and width == height
+        assert target_size(800, 600, 1568, 1_150_000) == (800, 600)
+
+    def test_large_scan_downscaled_within_budget(self):
+        data = photo(2400, 1800)
+
+        payload = prepare_image_bytes(data, max_edge=1568, max_pixels=1_150_000, max_bytes=400_000)
+
+        assert payload.resized
+        assert payload.image_format == "JPEG"
+        assert payload.sent_bytes <= 400_000 < payload.original_bytes
+        assert payload.bytes_saved == payload.original_bytes - payload.sent_bytes
+        with decoded(payload) as img:
+            assert img.size == (payload.width, payload.height)
+            assert max(img.size) <= 1568 and img.size[0] * img.size[1] <= 1_150_000
+
+    def test_line_art_kept_lossless(self):
+        payload = prepare_image_bytes(diagram(3000, 2000), max_edge=1568, max_pixels=1_150_000, max_bytes=1_000_000)
+
+        assert payload.image_format == "PNG"
+        assert payload.sent_bytes < payload.original_bytes
+
+    def test_small_image_sent_untouched(self):
+        data = photo(400, 300, "JPEG")
+
+        payload = prepare_image_bytes(data, max_edge=1568, max_pixels=1_150_000, max_bytes=1_000_000)
+
+        assert base64.b64decode(payload.image_base64) == data
+        assert payload.image_format == "JPEG"
+        assert payload.bytes_saved == 0 and not payload.resized
+
+    def test_unsupported_format_converted(self):
+        payload = prepare_image_bytes(diagram(300, 200), max_edge=1568, max_pixels=1_150_000, max_bytes=1_000_000)
+
+        assert payload.image_format in ("PNG", "JPEG")
+        assert not payload.resized
+
+    def test_budget_enforced_by_shrinking(self):
+        payload = prepare_image_bytes(photo(1500, 1000), max_edge=1568, max_pixels=1_150_000, max_bytes=30_000)
+
+        assert payload.sent_bytes <= 30_000
+        assert payload.width < 1500
+
+
+class TestVisionPayloadCache:
+    """Test suite for the content-hash payload cache"""
+
+    def test_same_content_prepared_once(self, tmp_path):
+        data = photo(2000, 1500)
+        first, copy = tmp_path / "a.png", tmp_path / "b.png"
+        first.write_bytes(data)
+        copy.write_bytes(data)
+        cache = VisionPayloadCache(max_entries=4)
+
+        with patch("backend.services.vision_payload.prepare_image_bytes", wraps=prepare_image_bytes) as prepare:
+            payloads = [cache.prepare(str(first)), cache.prepare(str(first)), cache.prepare(str(copy))]
+
+        assert prepare.call_count == 1
+        assert payloads[0] is payloads[1] is payloads[2]
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_lru_eviction(self, tmp_path):
+        cache = VisionPayloadCache(max_entries=1)
+        paths = []
+        for index in range(2):
+            path = tmp_path / f"{index}.jpg"
+            path.write_bytes(photo(200 + index, 100, "JPEG"))
+            paths.append(str(path))
+
+        cache.prepare(paths[0])
+        cache.prepare(paths[1])
+        cache.prepare(paths[0])
+
+        assert cache.misses == 3
+
+
+class TestAnalyzeImagePayload:
+    """Test suite for ImageAnalysisService sending prepared payloads"""
+
+    @pytest.mark.asyncio
+    async def test_sends_downscaled_payload_and_sizes(self, tmp_path):
+        path = tmp_path / "scan.png"
+        path.write_bytes(photo(2000, 1400))
+
+        with patch("backend.services.image_analysis_service.AIProviderService"):
+            service = ImageAnalysisService()
+        service.ai_service.generate_vision_analysis_with_fallback = AsyncMock(return_value={
+            "text": '{"image_type": "MRI", "confidence": 0.9}',
+            "provider": "claude",
+            "cost_usd": 0.01,
+            "tokens_used": 100
+        })
+
+        result = await service.analyze_image(str(path))
+
+        kwargs = service.ai_service.generate_vision_analysis_with_fallback.await_args.kwargs
+        sent = base64.b64decode(kwargs["image_base64"])
+        assert kwargs["original_image_bytes"] == path.stat().st_size
+        assert len(sent) == result["payload_bytes_sent"] < path.stat().st_size
+        assert kwargs["image_format"] == "JPEG"
+        assert result["payload_bytes_saved"] == path.stat().st_size - len(sent)
@@ -20,6 +20,12 @@ class EventType(str, Enum):
     SECTION_GENERATED = "section_generated"
     SECTION_REGENERATED = "section_regenerated"
 
+    # Section token streaming events
+    SECTION_STREAM_STARTED = "section_stream_started"
+    SECTION_TOKEN = "section_token"
+    SECTION_STREAM_COMPLETED = "section_stream_completed"
+    SECTION_STREAM_SNAPSHOT = "section_stream_snapshot"
+
     # Task events
     TASK_STARTED = "task_started"
     TASK_PROGRESS = "task_progress"
@@ -0,0 +1,50 @@
+"""
+Local token counting
+Counts tokens without a provider call (tiktoken when installed)
+
+Used wherever text is sized in tokens before it is sent anywhere: prompt
+source budgets and embedding chunks.
+"""
+
+import math
+import re
+
+from backend.config import settings
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_TOKEN_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+        except Exception as e:
+            logger.warning(f"Tokenizer unavailable, using approximate token counts: {str(e)}")
+            _encoding = False
+    return _encoding or None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of `text` with the local tokenizer
+
+    Without tiktoken, words and punctuation are counted with long words
+    split every 4 characters, which slightly over-counts BPE tokens.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PIECE_PATTERN.findall(text))
@@ -13,7 +13,7 @@ const textbookAPI = {
    *
    * @param {File} file - PDF file to upload
    * @param {Function} onUploadProgress - Progress callback (percent)
-   * @returns {Promise<UploadResponse>}
+   * @returns {Promise<UploadResponse>} job_id to poll, or book_id if the file was already uploaded
    */
   upload: async (file, onUploadProgress) => {
     const formData = new FormData();
@@ -59,6 +59,18 @@ const textbookAPI = {
     return response.data;
   },
 
+  /**
+   * Get progress of an upload ingestion job (classification, chapter extraction)
+   * GET /textbooks/upload-jobs/:jobId
+   *
+   * @param {string} jobId - Job ID returned by upload/batchUpload
+   * @returns {Promise<UploadJobResponse>} book_id is set once completed
+   */
+  getUploadJob: async (jobId) => {
+    const response = await apiClient.get(`/textbooks/upload-jobs/${jobId}`);
+    return response.data;
+  },
+
   /**
    * Get upload/processing progress for a book
    * GET /textbooks/upload-progress/:bookId
@@ -20,6 +20,8 @@ const UploadProgressCard = ({
 }) => {
   const [status, setStatus] = useState('queued'); // queued, uploading, processing, completed, failed, cancelled
   const [uploadProgress, setUploadProgress] = useState(0);
+  const [jobId, setJobId] = useState(null);
+  const [jobProgress, setJobProgress] = useState(0);
   const [bookId, setBookId] = useState(null);
   const [processingData, setProcessingData] = useState(null);
   const [errorMessage, setErrorMessage] = useState('');
@@ -31,16 +33,20 @@ const UploadProgressCard = ({
     }
   }, [status]);
 
-  // Poll processing progress
+  // Poll chapter extraction (job), then embedding progress (book)
   useEffect(() => {
-    if (status === 'processing' && bookId) {
+    if (status === 'processing' && (bookId || jobId)) {
       const interval = setInterval(() => {
-        fetchProgress();
+        if (bookId) {
+          fetchProgress();
+        } else {
+          fetchJob();
+        }
       }, 3000); // Poll every 3 seconds
 
       return () => clearInterval(interval);
     }
-  }, [status, bookId]);
+  }, [status, bookId, jobId]);
 
   /**
    * Upload file to backend
@@ -50,18 +56,17 @@ const UploadProgressCard = ({
     try {
       const response = await textbookAPI.upload(file, setUploadProgress);
 
-      setBookId(response.book_id);
       setStatus('processing');
-      setProcessingData({
-        bookId: response.book_id,
-        chaptersCreated: response.chapters_created,
-        totalPages: response.total_pages,
-        pdfType: response.pdf_type,
-        embeddingTasksQueued: response.embedding_tasks_queued
-      });
-
-      if (onUploadComplete) {
-        onUploadComplete(response.book_id);
+      if (response.book_id) {
+        // Identical file already uploaded: follow the existing book
+        setBookId(response.book_id);
+        setProcessingData({ bookId: response.book_id });
+        if (onUploadComplete) {
+          onUploadComplete(response.book_id);
+        }
+      } else {
+        // Chapters are extracted in the background
+        setJobId(response.job_id);
       }
     } catch (error) {
       setStatus('failed');
@@ -73,6 +78,39 @@ const UploadProgressCard = ({
     }
   };
 
+  /**
+   * Fetch chapter extraction job progress from backend
+   */
+  const fetchJob = async () => {
+    try {
+      const job = await textbookAPI.getUploadJob(jobId);
+      setJobProgress(job.progress || 0);
+
+      if (job.status === 'completed') {
+        setBookId(job.book_id);
+        setProcessingData({
+          bookId: job.book_id,
+          chaptersCreated: job.result?.chapters_created,
+          totalPages: job.result?.total_pages,
+          pdfType: job.result?.pdf_type,
+          embeddingTasksQueued: job.result?.embedding_tasks_queued
+        });
+        if (onUploadComplete) {
+          onUploadComplete(job.book_id);
+        }
+      } else if (job.status === 'failed' || job.status === 'cancelled') {
+        setStatus('failed');
+        const message = job.error || 'Processing failed';
+        setErrorMessage(message);
+        if (onError) {
+          onError(file.name, message);
+        }
+      }
+    } catch (error) {
+      console.error('Failed to fetch job progress:', error);
+    }
+  };
+
   /**
    * Fetch processing progress from backend
    */
@@ -116,6 +154,8 @@ const UploadProgressCard = ({
 
 Message('');
     setUploadProgress(0);
+    setJobId(null);
+    setJobProgress(0);
     setBookId(null);
     setProcessingData(null);
   };
@@ -172,8 +212,8 @@ Message('');
           <div className="text-sm text-gray-600 space-y-1">
             <p>
               {formatFileSize(file.size)}
-              {processingData && ` • ${processingData.totalPages} pages`}
-              {processingData && ` • ${processingData.chaptersCreated} chapters`}
+              {processingData?.totalPages && ` • ${processingData.totalPages} pages`}
+              {processingData?.chaptersCreated && ` • ${processingData.chaptersCreated} chapters`}
               {processingData?.pdfType && ` • ${getPdfTypeText(processingData.pdfType)}`}
             </p>
           </div>
@@ -209,6 +249,14 @@ Message('');
         </div>
       )}
 
+      {/* Chapter Extraction Progress */}
+      {status === 'processing' && !bookId && (
+        <div>
+          <p className="text-sm text-gray-700 mb-2">Detecting and extracting chapters...</p>
+          <ProgressBar progress={jobProgress} size="md" />
+        </div>
+      )}
+
       {/* Processing Progress */}
       {status === 'processing' && processingData && (
         <div>
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Chapter Pipeline Scheduling Benchmark
+Measures end-to-end wall time of the 14-stage pipeline with a stubbed AI provider
+
+Every stage is replaced by a stub that makes its typical number of AI provider
+calls against a fake provider with fixed latency, so the measurement isolates
+scheduling: the real ChapterOrchestrator stage graph run by StageScheduler,
+versus the same stages executed one after another (previous behaviour).
+
+Usage:
+    python tests/benchmarks/chapter_pipeline_benchmark.py [--latency 0.2] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Settings validation needs these; the benchmark never contacts real services
+for key, value in {
+    "DB_PASSWORD": "benchmark",
+    "JWT_SECRET": "benchmark-secret-benchmark-secret-benchmark",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "GOOGLE_API_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(key, value)
+
+from backend.services.chapter_orchestrator import ChapterOrchestrator
+from backend.services.stage_scheduler import StageScheduler
+
+
+# Sequential provider round-trips per stage (approximate production profile)
+STAGE_CALLS = {
+    "stage_1_input_validation": 1,
+    "stage_2_context_building": 1,
+    "stage_3_internal_research": 2,   # query embeddings + relevance filtering
+    "stage_4_external_research": 3,   # PubMed + AI research + relevance filtering
+    "stage_5_synthesis_planning": 1,
+    "stage_6_section_generation": 6,  # sliding window over sections
+    "stage_7_image_integration": 2,   # caption batches
+    "stage_8_citation_network": 0,
+    "stage_9_quality_assurance": 0,
+    "stage_10_fact_checking": 3,
+    "stage_11_formatting": 0,
+    "stage_12_review_refinement": 1,
+    "stage_13_finalization": 0,
+    "stage_14_delivery": 0,
+}
+
+
+class StubAIProvider:
+    """Fake provider: fixed latency per call, counts calls"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_text(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"text": "", "tokens_used": 0, "cost_usd": 0.0}
+
+
+def build_orchestrator(provider: StubAIProvider) -> ChapterOrchestrator:
+    with patch("backend.services.chapter_orchestrator.AIProviderService", return_value=provider), \
+            patch("backend.services.chapter_orchestrator.ResearchService"), \
+            patch("backend.services.chapter_orchestrator.DeduplicationService"), \
+            patch("backend.services.chapter_orchestrator.FactCheckingService"):
+        orchestrator = ChapterOrchestrator(MagicMock())
+
+    def stub(calls: int):
+        async def run(*args, **kwargs):
+            for _ in range(calls):
+                await provider.generate_text("prompt")
+        return run
+
+    for name, calls in STAGE_CALLS.items():
+        setattr(orchestrator, f"_{name}", stub(calls))
+
+    return orchestrator
+
+
+async def no_progress(*args, **kwargs):
+    return None
+
+
+async def run_sequential(orchestrator: ChapterOrchestrator) -> float:
+    graph = orchestrator._build_stage_graph(MagicMock(), "Glioblastoma")
+    start = time.perf_counter()
+    for name in graph.order:
+        await graph.stages[name].run()
+    return time.perf_counter() - start
+
+
+async def run_scheduled(orchestrator: ChapterOrchestrator):
+    graph = orchestrator._build_stage_graph(MagicMock(), "Glioblastoma")
+    start = time.perf_counter()
+    report = await StageScheduler(graph).run()
+    return time.perf_counter() - start, report
+
+
+def print_header(title: str):
+    print(f"\n{'='*80}")
+    print(f"  {title}")
+    print(f"{'='*80}\n")
+
+
+def print_result(metric: str, value, unit: str = ""):
+    print(f"  ✓ {metric}: {value}{unit}")
+
+
+async def main_async(latency: float, runs: int):
+    print_header(f"Chapter Pipeline Benchmark: stub provider latency {latency * 1000:.0f}ms")
+
+    provider = StubAIProvider(latency)
+    orchestrator = build_orchestrator(provider)
+
+    with patch("backend.services.chapter_orchestrator.emitter.emit_chapter_progress", no_progress):
+        sequential = [await run_sequential(orchestrator) for _ in range(runs)]
+        scheduled = []
+        report = None
+        for _ in range(runs):
+            elapsed, report = await run_scheduled(orchestrator)
+            scheduled.append(elapsed)
+
+    sequential_best = min(sequential)
+    scheduled_best = min(scheduled)
+
+    print_result("Provider calls per run", sum(STAGE_CALLS.values()))
+    print_result("Sequential wall time (best)", f"{sequential_best:.2f}", "s")
+    print_result("DAG scheduler wall time (best)", f"{scheduled_best:.2f}", "s")
+    print_result("Speedup", f"{sequential_best / scheduled_best:.2f}", "x")
+    print_result("Critical path", " -> ".join(report["critical_path"]))
+    print_result("Critical path time", f"{report['critical_path_s']:.2f}", "s")
+
+    print_header("Per-stage timings (last scheduled run)")
+    for name, timing in report["stages"].items():
+        print(
+            f"  {name:<30} start {timing['started_at_s']:6.2f}s  "
+            f"end {timing['finished_at_s']:6.2f}s  ({timing['duration_s']:.2f}s)"
+        )
+
+    return {
+        "sequential_seconds": sequential_best,
+        "scheduled_seconds": scheduled_best,
+        "critical_path": report["critical_path"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chapter pipeline scheduling benchmark")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub provider latency per call (seconds)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.latency, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Chapter Chunker Scaling Benchmark
+Measures chunking time from 10 KB to 10 MB of chapter text
+
+Benchmarks:
+1. Streaming chunker (iter_chunks): single pass, token-counted units
+2. Previous intelligent_chunk (kept below for comparison): text.find per
+   chunk and a scan of every known heading per paragraph; only run up to
+   --legacy-max bytes because it grows quadratically
+3. Time to first chunk, which bounds when embedding can start
+
+Linear scaling shows as a constant MB/s across sizes.
+
+Usage:
+    python tests/benchmarks/chunker_scaling_benchmark.py [--sizes-kb 10 100 1000 10000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Settings validation needs these; the benchmark never contacts real services
+for key, value in {
+    "DB_PASSWORD": "benchmark",
+    "JWT_SECRET": "benchmark-secret-benchmark-secret-benchmark",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "GOOGLE_API_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(key, value)
+
+from backend.services.streaming_chunker import iter_chunks
+
+
+def build_text(size_bytes: int, seed: int = 42) -> str:
+    """Chapter-like text: numbered headings every ~12 paragraphs of 3-8 sentences"""
+    rng = random.Random(seed)
+    vocabulary = [
+        "tumor", "resection", "cortex", "artery", "ventricle", "patients", "outcome",
+        "craniotomy", "approach", "dura", "nerve", "margin", "imaging", "surgical",
+        "the", "of", "and", "with", "was", "in", "for", "after", "during",
+    ]
+    parts, size, section = [], 0, 0
+    while size < size_bytes:
+        if len(parts) % 12 == 0:
+            section += 1
+            parts.append(f"{section}. SECTION {section} OVERVIEW")
+        sentences = [
+            " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 24))).capitalize() + "."
+            for _ in range(rng.randint(3, 8))
+        ]
+        parts.append(" ".join(sentences))
+        size += len(parts[-1]) + 2
+    return "\n\n".join(parts)[:size_bytes]
+
+
+def legacy_chunk(text: str, chunk_size: int = 1024, overlap: int = 128):
+    """Previous intelligent_chunk (respect_boundaries=True)"""
+    chunk_size_chars = chunk_size * 4
+    overlap_chars = overlap * 4
+    chunks = []
+    headings_pattern = r'^([A-Z][A-Z\s]+|[\dIVX]+\.?\s+[^\n]+)$'
+    headings = {}
+    for i, line in enumerate(text.split('\n')):
+        if re.match(headings_pattern, line.strip()):
+            headings[i] = line.strip()
+
+    current_chunk, current_offset = "", 0
+    for paragraph in text.split('\n\n'):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        any(heading in paragraph for heading in headings.values())
+        if len(current_chunk) + len(paragraph) > chunk_size_chars and current_chunk:
+            chunks.append(current_chunk.strip())
+            sentences = re.split(r'[.!?]\s+', current_chunk)
+            overlap_text = ""
+            for sentence in reversed(sentences):
+                if len(overlap_text) + len(sentence) > overlap_chars:
+                    break
+                overlap_text = sentence + ". " + overlap_text
+            current_offset += len(current_chunk) - len(overlap_text)
+            current_chunk = overlap_text + "\n\n" + paragraph
+        elif current_chunk:
+            current_chunk += "\n\n" + paragraph
+        else:
+            current_chunk = paragraph
+            current_offset = text.find(paragraph)
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def print_header(title: str):
+    print(f"\n{'='*80}")
+    print(f"  {title}")
+    print(f"{'='*80}\n")
+
+
+def print_result(metric: str, value, unit: str = ""):
+    print(f"  ✓ {metric}: {value}{unit}")
+
+
+def run(sizes_kb, legacy_max_kb: int, chunk_size: int, overlap: int):
+    print_header(f"Chunker Scaling: {chunk_size}-token chunks, {overlap}-token overlap")
+
+    results = []
+    for size_kb in sizes_kb:
+        text = build_text(size_kb * 1024)
+        mb = len(text) / (1024 * 1024)
+
+        start = time.perf_counter()
+        chunks = iter_chunks(text, chunk_size=chunk_size, overlap=overlap)
+        next(chunks)
+        first_chunk = time.perf_counter() - start
+        count = 1 + sum(1 for _ in chunks)
+        streaming = time.perf_counter() - start
+
+        legacy = None
+        if size_kb <= legacy_max_kb:
+            start = time.perf_counter()
+            legacy_chunk(text, chunk_size, overlap)
+            legacy = time.perf_counter() - start
+
+        results.append({"size_kb": size_kb, "chunks": count, "streaming_s": streaming, "legacy_s": legacy})
+        print_result(
+            f"{size_kb:>6} KB",
+            f"{count:>6} chunks, streaming {streaming:8.3f}s ({mb / streaming:5.2f} MB/s, "
+            f"first chunk {first_chunk * 1000:.1f}ms)"
+            + (f", previous {legacy:8.3f}s" if legacy is not None else ", previous skipped")
+        )
+
+    print()
+    for smaller, larger in zip(results, results[1:]):
+        growth = larger["size_kb"] / smaller["size_kb"]
+        print_result(
+            f"{smaller['size_kb']} KB -> {larger['size_kb']} KB ({growth:.0f}x input)",
+            f"streaming {larger['streaming_s'] / smaller['streaming_s']:.1f}x time"
+            + (
+                f", previous {larger['legacy_s'] / smaller['legacy_s']:.1f}x time"
+                if larger["legacy_s"] and smaller["legacy_s"] else ""
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chapter chunker scaling benchmark")
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--legacy-max-kb", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--overlap", type=int, default=128)
+    args = parser.parse_args()
+
+    run(args.sizes_kb, args.legacy_max_kb, args.chunk_size, args.overlap)
+
+
+if __name__ == "__main__":
+    main()
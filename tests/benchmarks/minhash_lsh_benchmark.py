@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+MinHash-LSH Duplicate Detection Benchmark
+Measures near-duplicate detection at 10k documents against the old all-pairs approach
+
+Benchmarks:
+1. Signature generation (shingling + MinHash)
+2. LSH candidate generation
+3. Exact Jaccard verification of candidates
+4. Extrapolated all-pairs SequenceMatcher cost (previous implementation)
+
+Usage:
+    python tests/benchmarks/minhash_lsh_benchmark.py [--docs 10000] [--words 400]
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+from difflib import SequenceMatcher
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from backend.services.minhash_lsh import LSHIndex, MinHasher, jaccard, shingle
+
+
+def build_corpus(num_docs: int, words: int, duplicate_rate: float, seed: int = 42):
+    """Synthetic corpus with planted near-duplicates (2% word edits)"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(20000)]
+
+    corpus = {}
+    planted = set()
+    for i in range(num_docs):
+        doc_id = f"doc-{i}"
+        if corpus and rng.random() < duplicate_rate:
+            source_id = rng.choice(list(corpus.keys())[-200:])
+            tokens = corpus[source_id].split()
+            for _ in range(max(1, len(tokens) // 50)):
+                tokens[rng.randrange(len(tokens))] = rng.choice(vocabulary)
+            corpus[doc_id] = " ".join(tokens)
+            planted.add(tuple(sorted((source_id, doc_id), key=str)))
+        else:
+            corpus[doc_id] = " ".join(rng.choice(vocabulary) for _ in range(words))
+    return corpus, planted
+
+
+def print_header(title: str):
+    print(f"\n{'='*80}")
+    print(f"  {title}")
+    print(f"{'='*80}\n")
+
+
+def print_result(metric: str, value, unit: str = ""):
+    print(f"  ✓ {metric}: {value}{unit}")
+
+
+def run(num_docs: int, words: int, threshold: float):
+    print_header(f"MinHash-LSH Benchmark: {num_docs} documents x {words} words")
+
+    corpus, planted = build_corpus(num_docs, words, duplicate_rate=0.05)
+    hasher = MinHasher(num_perm=128, seed=1)
+    index = LSHIndex(num_perm=128, bands=32)
+
+    # 1. Signatures
+    start = time.perf_counter()
+    shingle_sets = {doc_id: shingle(text) for doc_id, text in corpus.items()}
+    for doc_id, shingles in shingle_sets.items():
+        index.add(doc_id, hasher.signature(shingles))
+    index_time = time.perf_counter() - start
+    print_result("Shingle + signature + index", f"{index_time:.2f}", "s")
+    print_result("Per document", f"{index_time / num_docs * 1000:.2f}", "ms")
+
+    # 2. Candidates
+    start = time.perf_counter()
+    candidates = index.candidate_pairs()
+    candidate_time = time.perf_counter() - start
+    print_result("Candidate pairs", len(candidates))
+    print_result("Candidate generation", f"{candidate_time:.3f}", "s")
+
+    # 3. Verification
+    start = time.perf_counter()
+    duplicates = {
+        pair for pair in candidates
+        if jaccard(shingle_sets[pair[0]], shingle_sets[pair[1]]) >= threshold
+    }
+    verify_time = time.perf_counter() - start
+    print_result("Verified duplicates", len(duplicates))
+    print_result("Verification", f"{verify_time:.3f}", "s")
+
+    recall = len(duplicates & planted) / len(planted) if planted else 1.0
+    print_result("Recall on planted duplicates", f"{recall * 100:.1f}", "%")
+
+    total = index_time + candidate_time + verify_time
+    print_result("Total LSH pipeline", f"{total:.2f}", "s")
+
+    # 4. Previous all-pairs cost, extrapolated from a sample
+    sample_ids = list(corpus.keys())[:30]
+    sample_pairs = [(a, b) for i, a in enumerate(sample_ids) for b in sample_ids[i + 1:]]
+    start = time.perf_counter()
+    for a, b in sample_pairs:
+        SequenceMatcher(None, corpus[a], corpus[b]).ratio()
+    per_pair = (time.perf_counter() - start) / len(sample_pairs)
+    all_pairs = num_docs * (num_docs - 1) // 2
+    print_result("All-pairs comparisons (previous)", f"{all_pairs:,}")
+    print_result("Estimated all-pairs SequenceMatcher time", f"{per_pair * all_pairs / 3600:.1f}", "h")
+    print_result("Speedup", f"{per_pair * all_pairs / total:,.0f}", "x")
+
+    return {
+        "documents": num_docs,
+        "index_seconds": index_time,
+        "candidate_pairs": len(candidates),
+        "verified_duplicates": len(duplicates),
+        "recall": recall,
+        "total_seconds": total,
+        "estimated_all_pairs_seconds": per_pair * all_pairs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash-LSH duplicate detection benchmark")
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--threshold", type=float, default=0.80)
+    args = parser.parse_args()
+
+    # Near-linear scaling check at 1/4, 1/2 and full size
+    results = [run(n, args.words, args.threshold) for n in (args.docs // 4, args.docs // 2, args.docs)]
+
+    print_header("Scaling")
+    for result in results:
+        print_result(
+            f"{result['documents']:>6} docs",
+            f"{result['total_seconds']:.2f}s "
+            f"({result['total_seconds'] / result['documents'] * 1000:.2f} ms/doc)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Section Streaming Time-to-First-Token Benchmark
+Measures when a WebSocket client first sees section text, buffered vs streamed
+
+A local fake streaming provider stands in for the SDK: a blocking generator
+that waits `--first-token` seconds, then yields `--tokens` tokens every
+`--token-interval` seconds. It is plugged into the real AIProviderService
+streaming path (worker-thread bridge, fallback chain, circuit breaker)
+and the orchestrator's section text helper, which forwards tokens through a
+ChapterStream to a fake client.
+
+Buffered mode is the previous behaviour: the client sees the section only
+once the full completion has been generated.
+
+Usage:
+    python tests/benchmarks/streaming_ttft_benchmark.py [--sections 4] [--tokens 200]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Settings validation needs these; the benchmark never contacts real services
+for key, value in {
+    "DB_PASSWORD": "benchmark",
+    "JWT_SECRET": "benchmark-secret-benchmark-secret-benchmark",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "GOOGLE_API_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(key, value)
+
+# Measure streaming latency only, not the provider budget (50 RPM for Claude)
+os.environ.setdefault("LLM_SCHEDULER_ENABLED", "false")
+
+from backend.services.ai_provider_service import AIProviderService, AIProvider, AITask, _iterate_in_thread
+from backend.services.chapter_orchestrator import ChapterOrchestrator
+from backend.services.generation_stream import ChapterStream
+
+
+class FakeStreamingProvider:
+    """Blocking token stream with fixed first-token latency and token interval"""
+
+    def __init__(self, first_token: float, token_interval: float, tokens: int):
+        self.first_token = first_token
+        self.token_interval = token_interval
+        self.tokens = tokens
+
+    def sdk_stream(self):
+        time.sleep(self.first_token)
+        for i in range(self.tokens):
+            if i:
+                time.sleep(self.token_interval)
+            yield f"tok{i} "
+
+    async def stream(self, prompt, system_prompt, max_tokens, temperature, usage=None):
+        full_text = ""
+        async for text in _iterate_in_thread(self.sdk_stream):
+            full_text += text
+            yield {"chunk": text, "full_text": full_text, "provider": "claude"}
+        if usage is not None:
+            usage.update(input_tokens=len(prompt) // 4, output_tokens=self.tokens)
+
+    async def generate(self, *args, **kwargs):
+        text = ""
+        async for chunk in self.stream("prompt", None, 0, 0):
+            text = chunk["full_text"]
+        return {"text": text, "model": "fake", "cost_usd": 0.0}
+
+
+class FakeClient:
+    """Records when the first text of each section arrives"""
+
+    def __init__(self, start: float, delay: float = 0.0):
+        self.start = start
+        self.delay = delay
+        self.first_text = {}
+
+    async def send(self, event):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        data = event["data"]
+        if event["event"] in ("section_token", "section_generated"):
+            key = data.get("stream_id") or str(data.get("section_number"))
+            self.first_text.setdefault(key, time.perf_counter() - self.start)
+
+
+def build(provider: FakeStreamingProvider) -> ChapterOrchestrator:
+    service = AIProviderService.__new__(AIProviderService)
+    breaker = Mock()
+    breaker.is_call_allowed.return_value = True
+    service.circuit_breakers = Mock()
+    service.circuit_breakers.get_breaker.return_value = breaker
+    service._generate_claude_streaming = provider.stream
+    service.generate_text = provider.generate
+
+    with patch("backend.services.chapter_orchestrator.AIProviderService", return_value=service), \
+            patch("backend.services.chapter_orchestrator.ResearchService"), \
+            patch("backend.services.chapter_orchestrator.DeduplicationService"), \
+            patch("backend.services.chapter_orchestrator.FactCheckingService"):
+        return ChapterOrchestrator(MagicMock())
+
+
+async def run_buffered(orchestrator: ChapterOrchestrator, sections: int) -> dict:
+    client = FakeClient(time.perf_counter())
+
+    async def section(n: int):
+        response = await orchestrator._generate_section_text(
+            None, str(n), f"Section {n}", prompt="p", task=AITask.SECTION_WRITING, provider=AIProvider.CLAUDE
+        )
+        await client.send({"event": "section_generated", "data": {"section_number": n, "text": response["text"]}})
+
+    await asyncio.gather(*(section(n) for n in range(1, sections + 1)))
+    return {"ttft": client.first_text, "total": time.perf_counter() - client.start}
+
+
+async def run_streamed(orchestrator: ChapterOrchestrator, sections: int, client_delay: float) -> dict:
+    client = FakeClient(time.perf_counter(), delay=client_delay)
+    stream = ChapterStream("benchmark", sender=client.send, redis_client=MagicMock())
+
+    async def section(n: int):
+        await orchestrator._generate_section_text(
+            stream, str(n), f"Section {n}", prompt="p", task=AITask.SECTION_WRITING, provider=AIProvider.CLAUDE
+        )
+
+    await asyncio.gather(*(section(n) for n in range(1, sections + 1)))
+    await stream.close()
+    return {"ttft": client.first_text, "total": time.perf_counter() - client.start, "stats": stream.stats()}
+
+
+def print_header(title: str):
+    print(f"\n{'='*80}")
+    print(f"  {title}")
+    print(f"{'='*80}\n")
+
+
+def print_result(metric: str, value, unit: str = ""):
+    print(f"  ✓ {metric}: {value}{unit}")
+
+
+async def main_async(args):
+    print_header(
+        f"Section Streaming TTFT: {args.sections} sections × {args.tokens} tokens, "
+        f"first token {args.first_token * 1000:.0f}ms, {args.token_interval * 1000:.0f}ms/token"
+    )
+
+    provider = FakeStreamingProvider(args.first_token, args.token_interval, args.tokens)
+    orchestrator = build(provider)
+
+    buffered = await run_buffered(orchestrator, args.sections)
+    streamed = await run_streamed(orchestrator, args.sections, client_delay=0.0)
+    slow = await run_streamed(orchestrator, args.sections, client_delay=args.slow_client_delay)
+
+    def avg_ms(result):
+        values = list(result["ttft"].values())
+        return sum(values) / len(values) * 1000
+
+    print_result("Buffered: avg time to first text", f"{avg_ms(buffered):.0f}", "ms")
+    print_result("Streamed: avg time to first text", f"{avg_ms(streamed):.0f}", "ms")
+    print_result("Streamed (slow client): avg time to first text", f"{avg_ms(slow):.0f}", "ms")
+    print_result("TTFT improvement", f"{avg_ms(buffered) / avg_ms(streamed):.1f}", "x")
+    print_result("Buffered total", f"{buffered['total']:.2f}", "s")
+    print_result("Streamed total", f"{streamed['total']:.2f}", "s")
+    print_result(
+        "Slow client total / dropped events",
+        f"{slow['total']:.2f}s / {slow['stats']['dropped']}"
+    )
+
+    return {
+        "buffered_ttft_ms": avg_ms(buffered),
+        "streamed_ttft_ms": avg_ms(streamed),
+        "slow_client_ttft_ms": avg_ms(slow),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Section streaming time-to-first-token benchmark")
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--first-token", type=float, default=0.3, help="Provider first-token latency (seconds)")
+    parser.add_argument("--token-interval", type=float, default=0.01, help="Seconds between tokens")
+    parser.add_argument("--slow-client-delay", type=float, default=0.002, help="Per-event send delay of the slow client")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -204,21 +204,22 @@ class TestEmbeddingService:
 
     @pytest.mark.asyncio
     async def test_generate_pdf_embeddings(self, db_session, sample_pdf):
-        """Test PDF embedding generation"""
-        with patch.object(EmbeddingService, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
-            mock_embed.return_value = [0.1] * 1536
-
-            service = EmbeddingService(db_session)
+        """Test PDF chunk embedding generation"""
+        service = EmbeddingService(db_session)
+        service.ai_service.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: {"embeddings": [[0.1] * 1536 for _ in texts], "dimensions": 1536, "cost_usd": 0.0}
+        )
 
-            # Set extracted text for sample PDF
-            sample_pdf.extracted_text = "Sample neurosurgical text content"
-            db_session.commit()
+        # Set extracted text for sample PDF
+        sample_pdf.extracted_text = "Sample neurosurgical text content"
+        db_session.commit()
 
-            result = await service.generate_pdf_embeddings(str(sample_pdf.id))
+        result = await service.generate_pdf_embeddings(str(sample_pdf.id))
 
-            assert result["pdf_id"] == str(sample_pdf.id)
-            assert result["status"] == "completed"
-            assert result["full_embedding_dim"] == 1536
+        assert result["pdf_id"] == str(sample_pdf.id)
+        assert result["status"] == "completed"
+        assert result["embedding_dim"] == 1536
+        assert result["num_chunks"] == 1
 
 
 # ==================== API Endpoint Tests ====================